@@ -0,0 +1,248 @@
+#!/usr/bin/env python3.9
+# -*- coding: utf-8 -*-
+"""Long lived crawl worker - reads crawl requests as JSON lines on stdin
+(or a unix domain socket) and writes crawl responses as JSON lines on stdout
+(or the socket). See ```cloudfeaster.worker``` for details of the protocol.
+"""
+
+import logging
+import optparse
+import re
+import signal
+import sys
+import time
+
+import cloudfeaster
+from cloudfeaster.artifacts import ArtifactManager
+from cloudfeaster.browser import BrowserPool
+from cloudfeaster.cache import DiskCrawlResultCache
+from cloudfeaster.cache import MemoryCrawlResultCache
+from cloudfeaster.spider import SpiderDiscovery
+from cloudfeaster.worker import CrawlWorker
+
+
+_logger = logging.getLogger(__name__)
+
+
+def _check_logging_level(option, opt, value):
+    """Type checking function for command line parser's 'logginglevel' type."""
+    reg_ex_pattern = "^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$"
+    reg_ex = re.compile(reg_ex_pattern, re.IGNORECASE)
+    if reg_ex.match(value):
+        return getattr(logging, value.upper())
+    fmt = (
+        "option %s: should be one of "
+        "DEBUG, INFO, WARNING, ERROR or CRITICAL"
+    )
+    raise optparse.OptionValueError(fmt % opt)
+
+
+class CommandLineOption(optparse.Option):
+    """Adds new option types to the command line parser's base option types."""
+    new_types = (
+        'logginglevel',
+    )
+    TYPES = optparse.Option.TYPES + new_types
+    TYPE_CHECKER = optparse.Option.TYPE_CHECKER.copy()
+    TYPE_CHECKER['logginglevel'] = _check_logging_level
+
+
+class CommandLineParser(optparse.OptionParser):
+
+    def __init__(self):
+
+        optparse.OptionParser.__init__(
+            self,
+            'usage: %prog [options]',
+            description='long lived crawl worker',
+            version='%%prog %s' % cloudfeaster.__version__,
+            option_class=CommandLineOption)
+
+        default = None
+        fmt = 'serve crawl requests on this unix domain socket rather than stdin - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--socket',
+            action='store',
+            dest='socket_filename',
+            default=default,
+            type='string',
+            help=help)
+
+        default = 1
+        fmt = 'warm browsers per paranoia level & proxy (0 = new browser per crawl) - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--browser-pool-size',
+            action='store',
+            dest='browser_pool_size',
+            default=default,
+            type='int',
+            help=help)
+
+        default = 50
+        fmt = 'crawls before a pooled browser is recycled - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--max-leases',
+            action='store',
+            dest='max_leases',
+            default=default,
+            type='int',
+            help=help)
+
+        default = 0
+        fmt = 'cache up to this many crawl results in memory (0 = no caching) - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--cache-size',
+            action='store',
+            dest='cache_size',
+            default=default,
+            type='int',
+            help=help)
+
+        default = None
+        fmt = 'cache crawl results in this directory rather than in memory - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--cache-dir',
+            action='store',
+            dest='cache_dir',
+            default=default,
+            type='string',
+            help=help)
+
+        default = None
+        fmt = 'write debug files below this directory (ex /dev/shm) - default = $CLF_ARTIFACT_DIR or temp dir'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--artifact-dir',
+            action='store',
+            dest='artifact_dir',
+            default=default,
+            type='string',
+            help=help)
+
+        default = 128
+        fmt = 'retain at most this many MB of debug files - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--artifact-retention',
+            action='store',
+            dest='artifact_retention_in_mb',
+            default=default,
+            type='int',
+            help=help)
+
+        default = False
+        fmt = 'discover, load and validate all spiders at startup - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--preload',
+            action='store_true',
+            dest='preload',
+            default=default,
+            help=help)
+
+        default = False
+        fmt = 'include sample spiders when preloading - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--samples',
+            action='store_true',
+            dest='samples',
+            default=default,
+            help=help)
+
+        default = logging.ERROR
+        fmt = (
+            "logging level [DEBUG,INFO,WARNING,ERROR,CRITICAL] - "
+            "default = %s"
+        )
+        help = fmt % logging.getLevelName(default)
+        self.add_option(
+            "--log",
+            action="store",
+            dest="logging_level",
+            default=default,
+            type="logginglevel",
+            help=help)
+
+    def parse_args(self, *args, **kwargs):
+        (clo, cla) = optparse.OptionParser.parse_args(self, *args, **kwargs)
+        if len(cla) != 0:
+            sys.stderr.write(self.get_usage())
+            sys.exit(0)
+
+        if clo.browser_pool_size < 0:
+            self.error('--browser-pool-size must be >= 0')
+
+        if clo.max_leases < 1:
+            self.error('--max-leases must be >= 1')
+
+        if clo.cache_size < 0:
+            self.error('--cache-size must be >= 0')
+
+        if clo.cache_size and clo.cache_dir:
+            self.error('--cache-size and --cache-dir are mutually exclusive')
+
+        if clo.artifact_retention_in_mb < 0:
+            self.error('--artifact-retention must be >= 0')
+
+        return (clo, cla)
+
+
+if __name__ == "__main__":
+    #
+    # parse command line
+    #
+    clp = CommandLineParser()
+    (clo, cla) = clp.parse_args()
+
+    #
+    # configure logging ... remember gmt = utc
+    #
+    logging.Formatter.converter = time.gmtime
+    logging.basicConfig(
+        level=clo.logging_level,
+        datefmt='%Y-%m-%d %H:%M:%S',
+        format='%(asctime)s %(levelname)s %(module)s:%(lineno)d %(message)s')
+
+    #
+    # SIGTERM (ex docker stop) raises SystemExit so pooled browsers are quit
+    #
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+
+    if clo.cache_dir:
+        crawl_result_cache = DiskCrawlResultCache(clo.cache_dir)
+    elif clo.cache_size:
+        crawl_result_cache = MemoryCrawlResultCache(clo.cache_size)
+    else:
+        crawl_result_cache = None
+
+    browser_pool = BrowserPool(clo.browser_pool_size, clo.max_leases) if clo.browser_pool_size else None
+    try:
+        artifact_manager = ArtifactManager(clo.artifact_dir, clo.artifact_retention_in_mb * 1024 * 1024)
+        worker = CrawlWorker(browser_pool, crawl_result_cache, artifact_manager)
+
+        if clo.preload:
+            spiders_by_category = SpiderDiscovery(clo.samples).discover()
+            full_spider_class_names = set([
+                metadata['fullyQualifiedClassName']
+                for spiders_by_name in spiders_by_category.values()
+                for metadata in spiders_by_name.values()
+            ])
+            worker.preload(sorted(full_spider_class_names))
+
+        if clo.socket_filename:
+            worker.serve_unix_socket(clo.socket_filename)
+        else:
+            # anything a spider writes to stdout would corrupt crawl responses
+            (crawl_responses_fp, sys.stdout) = (sys.stdout, sys.stderr)
+            worker.serve(sys.stdin, crawl_responses_fp)
+    finally:
+        if browser_pool:
+            browser_pool.close()
+
+    sys.exit(0)
@@ -13,6 +13,7 @@ import time
 
 import cloudfeaster
 from cloudfeaster.spider import SpiderDiscovery
+from cloudfeaster.spider import SpiderDiscoveryError
 import cloudfeaster.samples
 
 
@@ -63,6 +64,58 @@ class CommandLineParser(optparse.OptionParser):
             default=default,
             help=help)
 
+        default = os.environ.get('CLF_SPIDER_INDEX', None)
+        fmt = 'spider index file - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--index',
+            action='store',
+            dest='index_filename',
+            default=default,
+            type='string',
+            help=help)
+
+        default = False
+        fmt = 'ignore existing spider index and rebuild it - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--rebuild-index',
+            action='store_true',
+            dest='rebuild_index',
+            default=default,
+            help=help)
+
+        default = False
+        fmt = 'write spider index but not discovered spiders (ex at image build time) - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--index-only',
+            action='store_true',
+            dest='index_only',
+            default=default,
+            help=help)
+
+        default = False
+        fmt = 'discover spiders by parsing rather than importing spider modules - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--static',
+            action='store_true',
+            dest='static',
+            default=default,
+            help=help)
+
+        default = 1
+        fmt = 'number of processes used to import spider modules (0 = one per cpu) - default = {default}'
+        help = fmt.format(default=default)
+        self.add_option(
+            '--processes',
+            action='store',
+            dest='processes',
+            default=default,
+            type='int',
+            help=help)
+
         default = logging.ERROR
         fmt = (
             "logging level [DEBUG,INFO,WARNING,ERROR,CRITICAL] - "
@@ -83,6 +136,15 @@ class CommandLineParser(optparse.OptionParser):
             sys.stderr.write(self.get_usage())
             sys.exit(0)
 
+        if (clo.rebuild_index or clo.index_only) and not clo.index_filename:
+            self.error('--rebuild-index and --index-only require --index or CLF_SPIDER_INDEX')
+
+        if clo.processes < 0:
+            self.error('--processes must be >= 0')
+
+        if clo.static and (clo.index_filename or clo.rebuild_index or clo.index_only):
+            self.error('--static can\'t be used with --index, CLF_SPIDER_INDEX, --rebuild-index or --index-only')
+
         return (clo, cla)
 
 
@@ -105,8 +167,17 @@ if __name__ == "__main__":
     #
     # now discover some spiders:-)
     #
-    sd = SpiderDiscovery(clo.samples)
-    output = sd.discover()
+    sd = SpiderDiscovery(clo.samples, clo.index_filename, clo.rebuild_index, clo.static, clo.processes)
+    try:
+        output = sd.discover()
+    except SpiderDiscoveryError as ex:
+        for module_name in sorted(ex.errors.keys()):
+            for error in ex.errors[module_name]:
+                sys.stderr.write('%s: %s\n' % (module_name, error))
+        sys.exit(1)
+
+    if clo.index_only:
+        sys.exit(0)
 
     #
     # add _metadata
@@ -0,0 +1,173 @@
+"""This module implements an asyncio native crawl API. :py:class:`cloudfeaster.spider.SpiderCrawler`
+blocks while it starts a browser, crawls and writes debug files. :py:class:`AsyncSpiderCrawler`
+runs the blocking work on the bounded thread pool of an :py:class:`AsyncCrawlExecutor`
+so an asyncio service can await crawls without blocking its event loop.
+
+    async def get_wheels():
+        crawler = AsyncSpiderCrawler('cloudfeaster.samples.pythonwheels.PythonWheelsSpider')
+        return await crawler.crawl()
+
+Cancelling the task awaiting a crawl cancels the crawl - a crawl which hasn't
+started never starts and a crawl in progress is abandoned with its browser
+being killed (see :py:meth:`cloudfeaster.spider.SpiderCrawler.cancel`).
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+
+from . import spider
+
+_logger = logging.getLogger(__name__)
+
+
+class AsyncCrawlExecutor(object):
+    """Runs crawls on a thread pool of ```max_concurrent_crawls``` (default = number of cpus)
+    threads. Crawls beyond ```max_concurrent_crawls``` wait in the event loop (not in the
+    thread pool's queue) so waiting crawls are cheap to cancel and callers get
+    backpressure. An :py:class:`AsyncCrawlExecutor` must only be used from one event loop
+    at a time.
+
+    If ```browser_pool``` (a :py:class:`cloudfeaster.browser.BrowserPool`) is supplied
+    crawls lease browsers from the pool. If ```crawl_result_cache``` (a
+    :py:class:`cloudfeaster.cache.CrawlResultCache`) is supplied crawl results
+    are cached for each spider's ```ttl```.
+    """
+
+    def __init__(self, max_concurrent_crawls=None, browser_pool=None, crawl_result_cache=None):
+        object.__init__(self)
+
+        self.max_concurrent_crawls = max_concurrent_crawls or os.cpu_count()
+        self.browser_pool = browser_pool
+        self.crawl_result_cache = crawl_result_cache
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_crawls,
+            thread_name_prefix='async-crawl')
+
+        # created on first use in each event loop since semaphores are bound to an event loop
+        self._semaphore = None
+        self._semaphore_loop = None
+
+        self.number_running = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exec_type, exec_val, ex_tb):
+        self.shutdown(wait=False)
+
+    async def crawl(self, spider_class_or_name, *args, **kwargs):
+        """Crawl the spider class (or fully qualified spider class name) ```spider_class_or_name```
+        with crawl args ```args``` and return a :py:class:`cloudfeaster.spider.CrawlResponse`.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_crawls)
+            self._semaphore_loop = loop
+
+        semaphore = self._semaphore
+        await semaphore.acquire()
+
+        try:
+            spider_crawler = spider.SpiderCrawler(
+                spider_class_or_name,
+                browser_pool=self.browser_pool,
+                crawl_result_cache=self.crawl_result_cache)
+
+            crawl_future = concurrent.futures.Future()
+            executor_future = self._executor.submit(_crawl, spider_crawler, crawl_future, args, kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        # the semaphore is released when the crawl's thread finishes (or the crawl is
+        # cancelled before it starts) rather than when the awaiting coroutine is cancelled
+        # or the crawl times out so there are never more than max_concurrent_crawls crawls
+        # in the thread pool - see _crawl()
+        self.number_running += 1
+
+        def crawl_done(executor_future):
+            self.number_running -= 1
+            semaphore.release()
+
+        executor_future.add_done_callback(lambda executor_future: _call_soon(loop, crawl_done, executor_future))
+
+        try:
+            return await asyncio.wrap_future(crawl_future)
+        except asyncio.CancelledError:
+            _logger.info('crawl of %s cancelled', spider_class_or_name)
+            spider_crawler.cancel()
+            raise
+
+    def shutdown(self, wait=True):
+        """Shutdown the thread pool. If ```wait``` is ```True``` block until
+        in progress crawls have finished.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+def _crawl(spider_crawler, crawl_future, args, kwargs):
+    """Called in the thread pool. ```crawl_future``` resolves as soon as the crawl
+    returns but a crawl which timed out, or was cancelled, can leave behind a crawl
+    thread which is still running so the thread pool's thread is only released once
+    the crawl's crawl threads have exited - see
+    :py:meth:`cloudfeaster.spider.SpiderCrawler.wait_for_crawl_threads`.
+    """
+    if not crawl_future.set_running_or_notify_cancel():
+        # the awaiting coroutine was cancelled before the crawl started
+        return
+
+    try:
+        crawl_future.set_result(spider_crawler.crawl(*args, **kwargs))
+    except BaseException as ex:
+        crawl_future.set_exception(ex)
+    finally:
+        spider_crawler.wait_for_crawl_threads()
+
+
+def _call_soon(loop, callback, *args):
+    """Call ```callback``` in ```loop```'s thread - done callbacks of
+    ```concurrent.futures.Future``` run in the thread pool.
+    """
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        # the event loop is closed so nothing is waiting on the semaphore
+        pass
+
+
+_default_executor = None
+
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor():
+    """Return the :py:class:`AsyncCrawlExecutor` used by :py:class:`AsyncSpiderCrawler`
+    when no executor is supplied. The default executor is created on first use.
+    """
+    global _default_executor
+
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = AsyncCrawlExecutor()
+        return _default_executor
+
+
+class AsyncSpiderCrawler(object):
+    """asyncio equivalent of :py:class:`cloudfeaster.spider.SpiderCrawler`. Crawls
+    run on ```executor``` (an :py:class:`AsyncCrawlExecutor`) or, if ```executor```
+    isn't supplied, on the executor returned by :py:func:`get_default_executor`.
+    """
+
+    def __init__(self, full_spider_class_name, executor=None):
+        object.__init__(self)
+
+        self.full_spider_class_name = full_spider_class_name
+        self.executor = executor
+
+    async def crawl(self, *args, **kwargs):
+        executor = self.executor or get_default_executor()
+        return await executor.crawl(self.full_spider_class_name, *args, **kwargs)
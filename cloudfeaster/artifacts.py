@@ -0,0 +1,222 @@
+"""This module implements management of the debug files (crawl log, chromedriver
+log and screenshot) created by each crawl. Each crawl's artifacts are written
+to a per-crawl directory created by an :py:class:`ArtifactManager`. Artifact
+files are created by their writers (the logging module, chromedriver and
+selenium) so the only file descriptor the artifact manager holds open for a
+crawl is the crawl's in progress marker (see below).
+
+Artifacts which have been exported (ex inlined in a crawl result as data URIs)
+are deleted immediately. Artifacts referenced by filename in a crawl result are
+retained so they can be read after the crawl. The artifact manager deletes the
+oldest retained artifacts once their combined size exceeds a retention cap so
+a long lived worker never fills the file system.
+
+Several processes (ex crawl workers) can share an artifact directory. While a
+crawl is in progress the process running the crawl holds an exclusive ```flock()```
+on a marker file for the crawl's directory so other processes never evict the
+crawl's artifacts. The lock is released when the crawl's artifacts are retained
+or deleted, or when the process exits, so the artifacts of a crawl whose process
+died are evicted as usual.
+
+By default artifacts are written below the system temp directory. Set the
+```CLF_ARTIFACT_DIR``` environment variable to use a different file system
+(ex ```/dev/shm``` so artifacts are written to tmpfs rather than disk).
+"""
+
+import fcntl
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+
+_logger = logging.getLogger(__name__)
+
+
+class CrawlArtifacts(object):
+    """A single crawl's artifacts - created by :py:meth:`ArtifactManager.create`."""
+
+    def __init__(self, directory, artifact_manager):
+        object.__init__(self)
+
+        self.directory = directory
+        self.artifact_manager = artifact_manager
+
+    def filename(self, name):
+        """Return the name of the file for the artifact called ```name```.
+        The file isn't created.
+        """
+        return os.path.join(self.directory, name)
+
+    def retain(self):
+        """Keep the artifacts after the crawl subject to the artifact manager's retention cap."""
+        self.artifact_manager._retain(self)
+
+    def delete(self):
+        """Delete the artifacts."""
+        self.artifact_manager._delete(self)
+
+
+def _directory_size_in_bytes(directory):
+    size_in_bytes = 0
+    for dir_entry in os.scandir(directory):
+        try:
+            size_in_bytes += dir_entry.stat().st_size
+        except OSError:
+            pass
+    return size_in_bytes
+
+
+class ArtifactManager(object):
+    """Creates per-crawl artifact directories below ```directory``` (default is the
+    ```CLF_ARTIFACT_DIR``` environment variable or, if it isn't set, the system temp
+    directory) and deletes the oldest retained artifacts when the combined size of
+    retained artifacts exceeds ```max_retained_size_in_bytes```.
+    """
+
+    _crawl_directory_prefix = 'crawl-'
+
+    def __init__(self, directory=None, max_retained_size_in_bytes=128 * 1024 * 1024):
+        object.__init__(self)
+
+        directory = directory or os.environ.get('CLF_ARTIFACT_DIR', None) or tempfile.gettempdir()
+        self.directory = os.path.join(directory, 'clf-artifacts')
+        self._markers_directory = os.path.join(directory, 'clf-artifacts-in-progress')
+        self.max_retained_size_in_bytes = max_retained_size_in_bytes
+
+        self._lock = threading.Lock()
+
+        # directories of this process' crawls which are in progress - never evicted -
+        # to the crawl's locked in progress marker file
+        self._active_directories = {}
+
+    def _marker_filename(self, directory):
+        return os.path.join(self._markers_directory, os.path.basename(directory))
+
+    def create(self):
+        """Create the artifact directory for a new crawl and return a :py:class:`CrawlArtifacts`."""
+        os.makedirs(self.directory, exist_ok=True)
+        os.makedirs(self._markers_directory, exist_ok=True)
+        directory = os.path.join(self.directory, '%s%s' % (type(self)._crawl_directory_prefix, uuid.uuid4().hex))
+
+        # the marker is locked before the directory is created so other processes
+        # sharing self.directory never see the directory without a locked marker
+        marker_fp = open(self._marker_filename(directory), 'w')
+        try:
+            fcntl.flock(marker_fp, fcntl.LOCK_EX)
+            os.mkdir(directory, 0o700)
+        except Exception:
+            self._unlock_marker(directory, marker_fp)
+            raise
+
+        with self._lock:
+            self._active_directories[directory] = marker_fp
+
+        return CrawlArtifacts(directory, self)
+
+    def _finish(self, crawl_artifacts):
+        """The crawl which owns ```crawl_artifacts``` is no longer in progress."""
+        with self._lock:
+            marker_fp = self._active_directories.pop(crawl_artifacts.directory, None)
+        if marker_fp is not None:
+            self._unlock_marker(crawl_artifacts.directory, marker_fp)
+
+    def _unlock_marker(self, directory, marker_fp):
+        # unlinked before it's unlocked (by closing it) so a process which finds
+        # the marker unlocked knows the marker's crawl process died
+        try:
+            os.unlink(self._marker_filename(directory))
+        except OSError:
+            pass
+        marker_fp.close()
+
+    def _is_in_progress(self, directory):
+        """True if a crawl, in this or another process, is using ```directory```."""
+        if directory in self._active_directories:
+            return True
+
+        marker_filename = self._marker_filename(directory)
+        try:
+            marker_fp = open(marker_filename, 'r')
+        except OSError:
+            return False
+
+        with marker_fp:
+            try:
+                fcntl.flock(marker_fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+
+            # the crawl's process died during the crawl
+            try:
+                os.unlink(marker_filename)
+            except OSError:
+                pass
+            return False
+
+    def _retain(self, crawl_artifacts):
+        self._finish(crawl_artifacts)
+
+        try:
+            is_empty = not os.listdir(crawl_artifacts.directory)
+        except OSError:
+            return
+
+        if is_empty:
+            self._rmtree(crawl_artifacts.directory)
+            return
+
+        self._evict()
+
+    def _delete(self, crawl_artifacts):
+        self._finish(crawl_artifacts)
+
+        self._rmtree(crawl_artifacts.directory)
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            size_in_bytes = 0
+            for dir_entry in os.scandir(self.directory):
+                if not dir_entry.name.startswith(type(self)._crawl_directory_prefix):
+                    continue
+                if self._is_in_progress(dir_entry.path):
+                    continue
+                try:
+                    mtime = dir_entry.stat().st_mtime
+                    size = _directory_size_in_bytes(dir_entry.path)
+                except OSError:
+                    continue
+                entries.append((mtime, size, dir_entry.path))
+                size_in_bytes += size
+
+            if size_in_bytes <= self.max_retained_size_in_bytes:
+                return
+
+            for (_, size, directory) in sorted(entries):
+                if size_in_bytes <= self.max_retained_size_in_bytes:
+                    break
+                _logger.info("deleting retained crawl artifacts '%s'", directory)
+                self._rmtree(directory)
+                size_in_bytes -= size
+
+    def _rmtree(self, directory):
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+_default_artifact_manager = None
+
+_default_artifact_manager_lock = threading.Lock()
+
+
+def get_default_artifact_manager():
+    """Return the :py:class:`ArtifactManager` used by :py:class:`cloudfeaster.spider.SpiderCrawler`
+    when no artifact manager is supplied. The default artifact manager is created on first use.
+    """
+    global _default_artifact_manager
+
+    with _default_artifact_manager_lock:
+        if _default_artifact_manager is None:
+            _default_artifact_manager = ArtifactManager()
+        return _default_artifact_manager
@@ -0,0 +1,600 @@
+"""This module contains the selenium based browser used by spiders to crawl
+web sites. The module is imported on first use of :py:class:`Browser`,
+:py:class:`RemoteBrowser` or :py:class:`WebElement` via ```cloudfeaster.spider```
+(ex ```spider.Browser```) so that importing ```cloudfeaster.spider```
+(ex during spider discovery) doesn't pay the cost of importing selenium.
+"""
+
+import contextlib
+import logging
+import os
+import signal
+import threading
+import urllib.parse
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.chrome.options import Options
+import selenium.webdriver.remote.webelement
+import selenium.webdriver.support.select
+
+import cloudfeaster_extension
+from . import extraction
+from . import tracing
+
+_logger = logging.getLogger(__name__)
+
+
+def _descendant_pids(pid):
+    """Return the pids of all descendants of process ```pid``` by walking
+    the parent pids in ```/proc```. Returns an empty list on platforms
+    without ```/proc```.
+    """
+    child_pids_by_parent_pid = {}
+    try:
+        proc_entries = os.listdir('/proc')
+    except OSError:
+        return []
+
+    for proc_entry in proc_entries:
+        if not proc_entry.isdigit():
+            continue
+        try:
+            with open(os.path.join('/proc', proc_entry, 'stat'), 'r') as fp:
+                stat = fp.read()
+        except OSError:
+            # process exited while walking /proc
+            continue
+        # 2nd field (the command) can contain spaces and parens so parse from the last paren
+        parent_pid = int(stat[stat.rindex(')') + 2:].split()[1])
+        child_pids_by_parent_pid.setdefault(parent_pid, []).append(int(proc_entry))
+
+    descendant_pids = []
+    parent_pids = [pid]
+    while parent_pids:
+        child_pids = child_pids_by_parent_pid.get(parent_pids.pop(), [])
+        descendant_pids.extend(child_pids)
+        parent_pids.extend(child_pids)
+
+    return descendant_pids
+
+
+def _kill_process_tree(pid):
+    """SIGKILL process ```pid``` and all of its descendants. Descendants are
+    found before anything is killed since killing a process reparents its children.
+    """
+    for pid_to_kill in [pid] + _descendant_pids(pid):
+        try:
+            os.kill(pid_to_kill, signal.SIGKILL)
+        except OSError:
+            # process already exited
+            pass
+
+
+def _origin(url):
+    """Return the origin (ex ```https://www.example.com```) of an http or https ```url```
+    or ```None``` for other urls (ex ```about:blank```).
+    """
+    split_url = urllib.parse.urlsplit(url)
+    default_ports = {'http': 80, 'https': 443}
+    if split_url.scheme not in default_ports or not split_url.hostname:
+        return None
+
+    host = split_url.hostname if ':' not in split_url.hostname else '[%s]' % split_url.hostname
+    port = split_url.port
+    if port is None or port == default_ports[split_url.scheme]:
+        return '%s://%s' % (split_url.scheme, host)
+    return '%s://%s:%d' % (split_url.scheme, host, port)
+
+
+class RemoteBrowser(webdriver.Remote):
+
+    def __init__(self, remote_chromedriver, url, paranoia_level):
+        webdriver.Remote.__init__(self, remote_chromedriver)
+
+        # chromedriver's Chrome DevTools Protocol endpoint - see execute_cdp_cmd()
+        self.command_executor._commands['executeCdpCommand'] = ('POST', '/session/$sessionId/goog/cdp/execute')
+
+        self._url = url
+        self._paranoia_level = paranoia_level
+
+    def __enter__(self):
+        """Along with ```___exit___()``` implements the standard
+        context manager pattern which, if a none-None url was
+        supplied in the ```Browser```'s ctr,
+        directs the browser to the specified url when entering
+        the context and closes the browser when exiting the
+        context. The pattern just makes using
+        ```Browser``` way, way cleaner.
+        """
+        if self._url:
+            self.get(self._url)
+        return self
+
+    def __exit__(self, exec_type, exec_val, ex_tb):
+        """See ```___enter___()```."""
+        self.quit()
+
+    def create_web_element(self, element_id):
+        """Override the default implementation of
+        ```webdriver.Chrome.create_web_element```
+        to return a ```WebElement``` instead of a
+        ```selenium.webdriver.remote.webelement.WebElement```.
+        """
+        return WebElement(self._paranoia_level, self, element_id)
+
+    def execute(self, driver_command, params=None):
+        """Override ```webdriver.Remote.execute``` so webdriver commands,
+        including those issued by :py:class:`WebElement`, can be traced -
+        see ```cloudfeaster.tracing```.
+        """
+        return tracing.execute(super(RemoteBrowser, self).execute, driver_command, params)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Equivalent of ```webdriver.Chrome.execute_cdp_cmd()``` - execute the
+        Chrome DevTools Protocol command ```cmd``` with ```cmd_args```.
+        """
+        return self.execute('executeCdpCommand', {'cmd': cmd, 'params': cmd_args})['value']
+
+    def extract(self, row_xpath, columns):
+        """Extract a list of dicts, one per element matching ```row_xpath```,
+        using a single webdriver command - see ```cloudfeaster.extraction```.
+        """
+        return extraction.extract(self, row_xpath, columns)
+
+    def snapshot(self):
+        """Return a :py:class:`cloudfeaster.snapshot.Snapshot` of the current page.
+        XPaths are evaluated against the snapshot locally rather than by chromedriver -
+        see ```cloudfeaster.snapshot```.
+        """
+        # lxml is only imported if a spider uses snapshots
+        from . import snapshot
+        return snapshot.take_snapshot(self, self._paranoia_level)
+
+    def kill(self):
+        """Abandon the browser without waiting for in-flight webdriver commands.
+        Chrome and chromedriver aren't local processes so the best that can be
+        done is to ask the remote chromedriver to end the session without
+        blocking the caller.
+        """
+        threading.Thread(target=self._quit_quietly, name='kill-remote-browser', daemon=True).start()
+
+    def _quit_quietly(self):
+        try:
+            self.quit()
+        except Exception as ex:
+            _logger.info('error quitting remote browser - %s', ex)
+
+
+class Browser(webdriver.Chrome):
+    """This class extends ```webdriver.Chrome``` to add new functionality
+    and override existing functionality that is well suited to writing
+    webdriver based Spiders.
+    """
+
+    @classmethod
+    def get_chrome_options(cls, paranoia_level, fixtures_proxy=None):
+        """If ```fixtures_proxy``` is supplied, Chrome uses the
+        :py:class:`cloudfeaster.netfixtures.NetworkFixtures` proxy at ```fixtures_proxy```
+        (a ```(host, port)``` tuple) rather than the proxy returned by
+        ```cloudfeaster_extension.proxy()```.
+        """
+        chrome_options = Options()
+
+        binary_location = os.environ.get('CLF_CHROME', None)
+        if binary_location:
+            chrome_options.binary_location = binary_location
+            _logger.info('using chrome binary >>>%s<<<', chrome_options.binary_location)
+
+        #
+        # -- https://peter.sh/experiments/chromium-command-line-switches/
+        #
+        chrome_options_str_format = (
+            '--headless|'
+            '--window-size=1280x1024|'
+            '--no-sandbox|'
+            '--disable-gpu|'
+            '--disable-software-rasterizer|'
+            '--single-process|'
+            '--disable-dev-shm-usage|'
+            '--user-agent={user_agent}'
+        )
+        chrome_options_str = os.environ.get(
+            'CLF_CHROME_OPTIONS',
+            chrome_options_str_format.format(user_agent=cloudfeaster_extension.user_agent()))
+        for chrome_option in chrome_options_str.split('|'):
+            chrome_options.add_argument(chrome_option)
+            _logger.info('using chrome option >>>%s<<<', chrome_option)
+
+        (proxy_host, proxy_port) = fixtures_proxy or cloudfeaster_extension.proxy(paranoia_level)
+        if proxy_host is not None and proxy_port is not None:
+            chrome_option = '--proxy-server=%s:%d' % (proxy_host, proxy_port)
+            chrome_options.add_argument(chrome_option)
+            _logger.info('using chrome option >>>%s<<<', chrome_option)
+
+        if fixtures_proxy:
+            # the network fixtures proxy intercepts HTTPS using a self-signed certificate
+            chrome_option = '--ignore-certificate-errors'
+            chrome_options.add_argument(chrome_option)
+            _logger.info('using chrome option >>>%s<<<', chrome_option)
+
+        return chrome_options
+
+    def __init__(self, url, paranoia_level, chromedriver_log_file, fixtures_proxy=None):
+        """Create a new instance of :py:class:`Browser`.
+
+        See :py:meth:`Browser.___enter___` to understand how and when the
+        ```url``` argument is used and :py:meth:`Browser.get_chrome_options`
+        for ```fixtures_proxy```.
+        """
+        chrome_options = type(self).get_chrome_options(paranoia_level, fixtures_proxy)
+
+        service_args = []
+
+        # nice reference @ http://chromedriver.chromium.org/logging
+        if chromedriver_log_file:
+            _logger.info('chromedriver logs @ >>>%s<<<', chromedriver_log_file)
+
+            service_args.append('--verbose')
+            service_args.append('--log-path=%s' % chromedriver_log_file)
+
+        webdriver.Chrome.__init__(
+            self,
+            chrome_options=chrome_options,
+            service_args=service_args)
+
+        self._url = url
+        self._paranoia_level = paranoia_level
+
+    def __enter__(self):
+        """Along with ```___exit___()``` implements the standard
+        context manager pattern which, if a none-None url was
+        supplied in the ```Browser```'s ctr,
+        directs the browser to the specified url when entering
+        the context and closes the browser when exiting the
+        context. The pattern just makes using
+        ```Browser``` way, way cleaner.
+        """
+        if self._url:
+            self.get(self._url)
+        return self
+
+    def __exit__(self, exec_type, exec_val, ex_tb):
+        """See ```___enter___()```."""
+        self.quit()
+
+    def create_web_element(self, element_id):
+        """Override the default implementation of
+        ```webdriver.Chrome.create_web_element```
+        to return a :py:class:`WebElement` instead of a
+        ```selenium.webdriver.remote.webelement.WebElement```.
+        """
+        return WebElement(self._paranoia_level, self, element_id)
+
+    def execute(self, driver_command, params=None):
+        """Override ```webdriver.Chrome.execute``` so webdriver commands,
+        including those issued by :py:class:`WebElement`, can be traced -
+        see ```cloudfeaster.tracing```.
+        """
+        return tracing.execute(super(Browser, self).execute, driver_command, params)
+
+    def extract(self, row_xpath, columns):
+        """Extract a list of dicts, one per element matching ```row_xpath```,
+        using a single webdriver command - see ```cloudfeaster.extraction```.
+        """
+        return extraction.extract(self, row_xpath, columns)
+
+    def snapshot(self):
+        """Return a :py:class:`cloudfeaster.snapshot.Snapshot` of the current page.
+        XPaths are evaluated against the snapshot locally rather than by chromedriver -
+        see ```cloudfeaster.snapshot```.
+        """
+        # lxml is only imported if a spider uses snapshots
+        from . import snapshot
+        return snapshot.take_snapshot(self, self._paranoia_level)
+
+    def kill(self):
+        """Unlike ```quit()```, which sends webdriver commands and so can block
+        forever if chromedriver or chrome is hung, kill chromedriver and all of
+        chrome's processes. Any in-flight webdriver commands fail once the
+        processes are killed. The browser can't be used after it's been killed.
+        """
+        process = getattr(self.service, 'process', None)
+        if process is None:
+            return
+
+        _logger.info('killing chromedriver (pid %d) and its descendants', process.pid)
+        _kill_process_tree(process.pid)
+        process.wait()
+
+
+class WebElement(selenium.webdriver.remote.webelement.WebElement):
+    """This class extends ```selenium.webdriver.remote.webelement.WebElement```
+    to add new functionality and override existing functionality that is well
+    suited to writing webdriver based Spiders.
+    """
+
+    def __init__(self, paranoia_level, *args, **kwargs):
+        selenium.webdriver.remote.webelement.WebElement.__init__(self, *args, **kwargs)
+
+        self._paranoia_level = paranoia_level
+
+    def __eq__(self, other):
+        """This is here only to resolve https://lgtm.com/rules/9990086/."""
+        if not isinstance(other, WebElement):
+            return False
+        if not selenium.webdriver.remote.webelement.WebElement.__eq__(self, other):
+            return False
+        return self._paranoia_level == other._paranoia_level
+
+    def get_text(self):
+        """This method exists so spider code can access element data
+        using a set of methods instead of a text property and some
+        other methods like ```get_int()``` and ```get_float()```.
+        """
+        return self.text
+
+    def _get_number(self, number_type, reg_ex):
+        return extraction.to_number(number_type, self.get_text(), reg_ex)
+
+    def get_int(self, reg_ex=None):
+        return self._get_number(int, reg_ex)
+
+    def get_float(self, reg_ex=None):
+        return self._get_number(float, reg_ex)
+
+    def get_selected(self):
+        """This method is here only to act as a shortcut so that a spider
+        author can write a single line of code to get the correctly selected
+        option in a list rather than the few lines of code that's seen
+        in this method's implementation.
+
+        If an option is selected the option's text is returned otherwise
+        None is returned.
+        """
+        select = selenium.webdriver.support.select.Select(self)
+        try:
+            return select.first_selected_option
+        except NoSuchElementException:
+            return None
+
+    def select_by_visible_text(self, visible_text):
+        """This method is here only to act as a shortcut so that a spider
+        author can write a single line of code to select an option in a list
+        rather than two lines of code. Perhaps not a huge saving by every
+        little bit helps. As an aside, feels like this is the way the
+        select functionality should have been implemented anyway.
+        """
+        select = selenium.webdriver.support.select.Select(self)
+        select.select_by_visible_text(visible_text)
+
+    def send_keys(self, value):
+        """:ODD: yes this implementation pattern looks odd. This approach is used
+        so there's a default implemenation which can be used during development
+        but also provides a clean approach to override the implementation.
+        """
+        cloudfeaster_extension.send_keys(self._paranoia_level, self, value)
+
+
+class _PooledBrowser(object):
+    """A :py:class:`Browser` or :py:class:`RemoteBrowser` in a :py:class:`BrowserPool`
+    along with the number of times the browser has been leased.
+    """
+
+    def __init__(self, browser):
+        object.__init__(self)
+
+        self.browser = browser
+        self.number_leases = 0
+
+
+class BrowserPool(object):
+    """Starting Chrome and chromedriver typically takes 1-3 seconds which, for short
+    crawls, is most of the crawl's duration. A :py:class:`BrowserPool` keeps up to
+    ```size``` warm browsers per paranoia level and proxy and leases them to crawls
+    via :py:meth:`BrowserPool.lease`. Typical usage is to pass a pool to
+    :py:class:`cloudfeaster.spider.SpiderCrawler`.
+
+        with BrowserPool(size=2) as browser_pool:
+            for crawl_args in many_crawl_args:
+                crawler = spider.SpiderCrawler(PyPISpider, browser_pool=browser_pool)
+                crawl_result = crawler.crawl(*crawl_args)
+
+    When a lease ends the browser is reset before the browser is returned to the pool -
+    all but one window is closed, the browser navigates to ```about:blank``` and, using
+    the Chrome DevTools Protocol, all storage (cookies, local & session storage, IndexedDB,
+    Cache Storage, service workers, etc) for every origin the lease's windows and frames
+    visited is cleared along with the HTTP cache and all cookies. A browser is discarded
+    (quit) rather than returned to the pool if resetting fails (ex the Chrome DevTools
+    Protocol isn't available), if the lease ended with an exception or if the browser has
+    been leased ```max_leases``` times. Browsers are health checked when they're leased
+    and broken sessions are discarded.
+
+    If ```remote_chromedriver``` isn't supplied the ```CLF_REMOTE_CHROMEDRIVER```
+    environment variable is used - see :py:meth:`cloudfeaster.spider.SpiderCrawler._get_browser`.
+    """
+
+    def __init__(self, size=2, max_leases=50, remote_chromedriver=None):
+        object.__init__(self)
+
+        self.size = size
+        self.max_leases = max_leases
+        self.remote_chromedriver = remote_chromedriver or os.environ.get('CLF_REMOTE_CHROMEDRIVER', None)
+
+        self._lock = threading.Lock()
+
+        # (paranoia level, proxy) -> list of idle _PooledBrowser
+        self._idle_browsers = {}
+
+        self._closed = False
+
+        self.number_browsers_created = 0
+        self.number_leases = 0
+        self.number_browsers_discarded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exec_type, exec_val, ex_tb):
+        self.close()
+
+    def _key(self, paranoia_level):
+        return (paranoia_level, cloudfeaster_extension.proxy(paranoia_level))
+
+    def _create_browser(self, paranoia_level):
+        """This private method exists to allow unit tests to mock out the method."""
+        if self.remote_chromedriver:
+            return RemoteBrowser(self.remote_chromedriver, None, paranoia_level)
+        return Browser(None, paranoia_level, None)
+
+    def warm(self, paranoia_level, number_browsers=None):
+        """Start browsers for ```paranoia_level``` so the pool has ```number_browsers```
+        (default = pool's size) idle browsers. Call at startup so the first crawls
+        don't pay the cost of starting a browser.
+        """
+        number_browsers = self.size if number_browsers is None else min(number_browsers, self.size)
+        key = self._key(paranoia_level)
+
+        with self._lock:
+            number_browsers_to_create = number_browsers - len(self._idle_browsers.get(key, []))
+
+        for _ in range(number_browsers_to_create):
+            self._release(key, self._new_pooled_browser(paranoia_level))
+
+    @contextlib.contextmanager
+    def lease(self, url, paranoia_level):
+        """Lease a browser for ```paranoia_level```, direct the browser to ```url```
+        (if ```url``` isn't None) and yield the browser. The browser is returned
+        to the pool when the context exits. A lease has the same shape as using
+        :py:class:`Browser` as a context manager.
+        """
+        key = self._key(paranoia_level)
+        pooled_browser = self._acquire(key, paranoia_level)
+
+        try:
+            if url:
+                pooled_browser.browser.get(url)
+            yield pooled_browser.browser
+        except BaseException:
+            self._discard(pooled_browser, 'lease ended with an exception')
+            raise
+
+        if self.max_leases <= pooled_browser.number_leases:
+            self._discard(pooled_browser, 'leased %d times' % pooled_browser.number_leases)
+        elif not self._reset(pooled_browser.browser):
+            self._discard(pooled_browser, 'reset failed')
+        else:
+            self._release(key, pooled_browser)
+
+    def _acquire(self, key, paranoia_level):
+        while True:
+            with self._lock:
+                idle_browsers = self._idle_browsers.get(key, [])
+                pooled_browser = idle_browsers.pop() if idle_browsers else None
+
+            if pooled_browser is None:
+                _logger.info('starting browser for paranoia level %s', paranoia_level)
+                pooled_browser = self._new_pooled_browser(paranoia_level)
+                break
+
+            if self._is_healthy(pooled_browser.browser):
+                break
+
+            self._discard(pooled_browser, 'failed health check')
+
+        with self._lock:
+            pooled_browser.number_leases += 1
+            self.number_leases += 1
+
+        return pooled_browser
+
+    def _new_pooled_browser(self, paranoia_level):
+        pooled_browser = _PooledBrowser(self._create_browser(paranoia_level))
+        with self._lock:
+            self.number_browsers_created += 1
+        return pooled_browser
+
+    def _release(self, key, pooled_browser):
+        with self._lock:
+            idle_browsers = self._idle_browsers.setdefault(key, [])
+            if not self._closed and len(idle_browsers) < self.size:
+                idle_browsers.append(pooled_browser)
+                return
+
+        self._discard(pooled_browser, 'pool full or closed')
+
+    def _discard(self, pooled_browser, reason):
+        _logger.info('discarding browser - %s', reason)
+        with self._lock:
+            self.number_browsers_discarded += 1
+        try:
+            pooled_browser.browser.quit()
+        except Exception as ex:
+            _logger.info('error quitting discarded browser - %s', ex)
+
+    def _is_healthy(self, browser):
+        """A browser is healthy if it responds to a cheap webdriver command."""
+        try:
+            browser.current_url
+            return True
+        except Exception as ex:
+            _logger.info('browser health check failed - %s', ex)
+            return False
+
+    def _reset(self, browser):
+        """Clear all state a crawl might have left in the browser so the next
+        lease starts with what looks like a freshly started browser. Returns
+        False if the browser couldn't be reset.
+        """
+        try:
+            origins = set()
+
+            window_handles = browser.window_handles
+            for window_handle in reversed(window_handles):
+                browser.switch_to.window(window_handle)
+                origins.update(self._visited_origins(browser))
+                # session storage is per window
+                browser.execute_script(
+                    'try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}')
+                if window_handle != window_handles[0]:
+                    browser.close()
+
+            browser.get('about:blank')
+            browser.execute_cdp_cmd('Page.resetNavigationHistory', {})
+
+            for origin in sorted(origins):
+                browser.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            browser.execute_cdp_cmd('Network.clearBrowserCache', {})
+            # unlike delete_all_cookies() this clears cookies for all domains
+            browser.execute_cdp_cmd('Network.clearBrowserCookies', {})
+
+            return True
+        except Exception as ex:
+            _logger.info('error resetting browser - %s', ex)
+            return False
+
+    def _visited_origins(self, browser):
+        """Return the origins of the current window's navigation history
+        and of the current page's frames (ex third party iframes).
+        """
+        urls = [entry['url'] for entry in browser.execute_cdp_cmd('Page.getNavigationHistory', {})['entries']]
+
+        frame_trees = [browser.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']]
+        while frame_trees:
+            frame_tree = frame_trees.pop()
+            urls.append(frame_tree['frame']['url'])
+            frame_trees.extend(frame_tree.get('childFrames', []))
+
+        return set(origin for origin in (_origin(url) for url in urls) if origin)
+
+    def close(self):
+        """Quit all idle browsers. Browsers which are leased when the pool
+        is closed are quit when their lease ends.
+        """
+        with self._lock:
+            self._closed = True
+            idle_browsers = [pooled_browser for value in self._idle_browsers.values() for pooled_browser in value]
+            self._idle_browsers = {}
+
+        for pooled_browser in idle_browsers:
+            self._discard(pooled_browser, 'pool closed')
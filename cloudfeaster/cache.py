@@ -0,0 +1,251 @@
+"""This module implements caches of crawl results. Spider metadata declares
+a ```ttl``` (default ```60s```) - the length of time a crawl result remains
+valid. A crawl result cache is used by :py:class:`cloudfeaster.spider.SpiderCrawler`
+to return a recent crawl result rather than starting a browser and crawling
+again.
+
+    crawl_result_cache = MemoryCrawlResultCache(max_entries=1000)
+    crawler = spider.SpiderCrawler(PyPISpider, crawl_result_cache=crawl_result_cache)
+    crawl_result = crawler.crawl(*crawl_args)
+
+Crawl results are keyed on the spider's fully qualified class name, the spider's version
+(see :py:meth:`cloudfeaster.spider.Spider.version`) and the hashes of the crawl args
+(see :py:func:`cloudfeaster.privacy.hash_crawl_arg`) so spiders never share crawl results,
+changing a spider's source invalidates the spider's cached crawl results and crawl args are
+never stored in the clear. Only successful crawl results are cached and ```_debug``` isn't cached since debug
+files describe a specific crawl.
+
+Two backends are provided - :py:class:`MemoryCrawlResultCache` and
+:py:class:`DiskCrawlResultCache`. Both evict the least recently used
+crawl results to stay within their size limits. Other backends can
+be plugged in by deriving from :py:class:`CrawlResultCache`.
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from . import privacy
+
+_logger = logging.getLogger(__name__)
+
+
+def crawl_result_cache_key(full_spider_class_name, spider_version, args, kwargs=None):
+    """Generate a cache key from a spider's fully qualified class name (```module.ClassName```),
+    the spider's version and the spider's crawl args. Spiders in the same module have the same
+    version so the class name is required to stop spiders sharing crawl results.
+    """
+    hashed_crawl_args = [privacy.hash_crawl_arg(arg) for arg in args]
+    hashed_crawl_args.extend([
+        privacy.hash_crawl_arg('%s=%s' % (name, value))
+        for (name, value) in sorted((kwargs or {}).items())
+    ])
+
+    key = json.dumps([full_spider_class_name, spider_version, hashed_crawl_args])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class CrawlResultCache(object):
+    """Abstract base class for crawl result caches. Derived classes implement
+    :py:meth:`CrawlResultCache._get`, :py:meth:`CrawlResultCache._put`
+    and :py:meth:`CrawlResultCache.clear`.
+    """
+
+    def __init__(self):
+        object.__init__(self)
+
+        self.number_hits = 0
+        self.number_misses = 0
+
+    def get(self, key):
+        """Return the unexpired crawl result (a dict) for ```key``` or ```None```."""
+        now = time.time()
+
+        entry = self._get(key)
+        if entry is not None:
+            (expires, crawl_result) = entry
+            if now < expires:
+                self.number_hits += 1
+                return crawl_result
+
+        self.number_misses += 1
+        return None
+
+    def put(self, key, crawl_result, ttl_in_seconds):
+        """Cache ```crawl_result``` (a dict) for ```ttl_in_seconds```."""
+        crawl_result = {k: v for (k, v) in crawl_result.items() if k != '_debug'}
+        self._put(key, time.time() + ttl_in_seconds, json.dumps(crawl_result))
+
+    def _get(self, key):
+        """Return ```(expires, crawl_result)``` for ```key``` or ```None```."""
+        raise NotImplementedError()
+
+    def _put(self, key, expires, serialized_crawl_result):
+        """Cache ```serialized_crawl_result``` (a JSON string) until ```expires```
+        (seconds since the epoch) evicting crawl results as required.
+        """
+        raise NotImplementedError()
+
+    def clear(self):
+        raise NotImplementedError()
+
+
+class MemoryCrawlResultCache(CrawlResultCache):
+    """In memory LRU crawl result cache holding at most ```max_entries``` crawl
+    results whose combined size is at most ```max_size_in_bytes``` (size being
+    the length of the JSON encoded crawl results).
+    """
+
+    def __init__(self, max_entries=1000, max_size_in_bytes=64 * 1024 * 1024):
+        CrawlResultCache.__init__(self)
+
+        self.max_entries = max_entries
+        self.max_size_in_bytes = max_size_in_bytes
+
+        self._lock = threading.Lock()
+
+        # key -> (expires, serialized crawl result) ordered from least to most recently used
+        self._entries = collections.OrderedDict()
+        self._size_in_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return None
+
+            (expires, serialized_crawl_result) = entry
+            if expires <= time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        return (expires, json.loads(serialized_crawl_result))
+
+    def _put(self, key, expires, serialized_crawl_result):
+        if self.max_size_in_bytes < len(serialized_crawl_result):
+            _logger.info('crawl result too big to cache (%d bytes)', len(serialized_crawl_result))
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires, serialized_crawl_result)
+            self._size_in_bytes += len(serialized_crawl_result)
+
+            while self.max_entries < len(self._entries) or self.max_size_in_bytes < self._size_in_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Must be called with ```self._lock``` held."""
+        (_, serialized_crawl_result) = self._entries.pop(key)
+        self._size_in_bytes -= len(serialized_crawl_result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+
+
+class DiskCrawlResultCache(CrawlResultCache):
+    """Crawl result cache which stores each crawl result as a JSON file in
+    ```directory``` so cached crawl results survive restarts and can be
+    shared by processes on the same host. When the combined size of the
+    files exceeds ```max_size_in_bytes``` the least recently used (by
+    modification time) crawl results are removed. Expired crawl results
+    are removed when they're read.
+    """
+
+    _filename_extension = '.json'
+
+    def __init__(self, directory, max_size_in_bytes=256 * 1024 * 1024):
+        CrawlResultCache.__init__(self)
+
+        self.directory = directory
+        self.max_size_in_bytes = max_size_in_bytes
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + type(self)._filename_extension)
+
+    def _get(self, key):
+        filename = self._filename(key)
+        try:
+            with open(filename, 'r', encoding='utf-8') as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+        expires = entry['expires']
+        if expires <= time.time():
+            self._unlink(filename)
+            return None
+
+        try:
+            # mark the crawl result as recently used
+            os.utime(filename)
+        except OSError:
+            pass
+
+        return (expires, entry['crawlResult'])
+
+    def _put(self, key, expires, serialized_crawl_result):
+        entry = '{"expires": %s, "crawlResult": %s}' % (json.dumps(expires), serialized_crawl_result)
+        if self.max_size_in_bytes < len(entry):
+            _logger.info('crawl result too big to cache (%d bytes)', len(entry))
+            return
+
+        # write then rename so readers never see a partially written file
+        (fd, temp_filename) = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+            fp.write(entry)
+        os.replace(temp_filename, self._filename(key))
+
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            size_in_bytes = 0
+            for dir_entry in os.scandir(self.directory):
+                if not dir_entry.name.endswith(type(self)._filename_extension):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                size_in_bytes += stat.st_size
+
+            if size_in_bytes <= self.max_size_in_bytes:
+                return
+
+            for (_, size, filename) in sorted(entries):
+                if size_in_bytes <= self.max_size_in_bytes:
+                    break
+                self._unlink(filename)
+                size_in_bytes -= size
+
+    def _unlink(self, filename):
+        try:
+            os.unlink(filename)
+        except OSError:
+            pass
+
+    def clear(self):
+        for dir_entry in os.scandir(self.directory):
+            if dir_entry.name.endswith(type(self)._filename_extension):
+                self._unlink(dir_entry.path)
@@ -0,0 +1,219 @@
+"""This module implements single-flight coalescing of identical crawls.
+When several callers ask for the same spider with the same crawl args at
+the same time, :py:class:`CrawlCoalescer` runs one crawl and fans the
+resulting :py:class:`cloudfeaster.spider.CrawlResponse` out to every
+caller. Only crawls which are in flight are coalesced so coalescing
+never changes the freshness of crawl results - see
+:py:mod:`cloudfeaster.cache` for reusing recent crawl results.
+
+Each caller gets its own copy of the crawl response's ```_metadata```
+so callers can annotate crawl responses without affecting each other.
+Debug files which would be streamed by :py:meth:`cloudfeaster.spider.CrawlResponse.dump`
+(and deleted once written) are inlined once before the crawl response is
+fanned out so every caller's crawl response includes the debug files.
+"""
+
+import concurrent.futures
+import copy
+import threading
+
+from . import privacy
+from . import util
+
+
+def crawl_key(spider_class_or_name, args, kwargs=None):
+    """Generate a key identifying a crawl from the spider's fully qualified
+    class name and the hashes of the crawl args so crawl args are never
+    held in the clear.
+    """
+    if isinstance(spider_class_or_name, str):
+        full_spider_class_name = spider_class_or_name
+    else:
+        full_spider_class_name = '%s.%s' % (spider_class_or_name.__module__, spider_class_or_name.__name__)
+
+    hashed_crawl_args = tuple(privacy.hash_crawl_arg(arg) for arg in args)
+    hashed_crawl_kwargs = tuple(
+        privacy.hash_crawl_arg('%s=%s' % (name, value))
+        for (name, value) in sorted((kwargs or {}).items())
+    )
+
+    return (full_spider_class_name, hashed_crawl_args, hashed_crawl_kwargs)
+
+
+def _inline_debug_files(crawl_response):
+    """Replace :py:class:`cloudfeaster.util.DataURIFile` values in ```_debug```
+    with data URIs and delete the crawl's artifacts. Called once per crawl
+    before the crawl response is fanned out.
+    """
+    debug = crawl_response.get('_debug', None)
+    if isinstance(debug, dict):
+        for (key, value) in list(debug.items()):
+            if isinstance(value, util.DataURIFile):
+                data_uri = util.file_to_data_uri_scheme(value)
+                if data_uri:
+                    debug[key] = data_uri
+                else:
+                    del debug[key]
+        if not debug:
+            del crawl_response['_debug']
+
+    crawl_artifacts = getattr(crawl_response, 'crawl_artifacts', None)
+    if crawl_artifacts is not None:
+        crawl_artifacts.delete()
+        crawl_response.crawl_artifacts = None
+
+    return crawl_response
+
+
+def _copy_crawl_response(crawl_response):
+    """Shallow copy ```crawl_response``` except for ```_metadata``` which is deep copied
+    and ```_debug``` which is copied. The copy doesn't own the crawl's artifacts.
+    """
+    crawl_response_copy = copy.copy(crawl_response)
+    crawl_response_copy.__dict__.pop('crawl_artifacts', None)
+    if '_metadata' in crawl_response_copy:
+        crawl_response_copy['_metadata'] = copy.deepcopy(crawl_response['_metadata'])
+    if '_debug' in crawl_response_copy:
+        crawl_response_copy['_debug'] = dict(crawl_response['_debug'])
+    return crawl_response_copy
+
+
+def _relay(in_flight_future, relay_future):
+    """Resolve ```relay_future``` with ```in_flight_future```'s outcome inlining debug files."""
+    if in_flight_future.cancelled():
+        relay_future.cancel()
+        return
+
+    relay_future.set_running_or_notify_cancel()
+
+    exception = in_flight_future.exception()
+    if exception is not None:
+        relay_future.set_exception(exception)
+        return
+
+    try:
+        relay_future.set_result(_inline_debug_files(in_flight_future.result()))
+    except Exception as ex:
+        relay_future.set_exception(ex)
+
+
+class CrawlCoalescer(object):
+    """Coalesces identical in-flight crawls identified by a key generated
+    by :py:func:`crawl_key`.
+
+        coalescer = CrawlCoalescer()
+
+        key = crawl_key(PyPISpider, crawl_args)
+        crawl_response = coalescer.crawl(key, lambda: spider.SpiderCrawler(PyPISpider).crawl(*crawl_args))
+
+    :py:meth:`CrawlCoalescer.crawl` blocks the calling thread and
+    :py:meth:`CrawlCoalescer.submit` is for callers which start crawls
+    asynchronously (ex :py:class:`cloudfeaster.executor.CrawlExecutor`).
+    """
+
+    def __init__(self):
+        object.__init__(self)
+
+        self._lock = threading.Lock()
+
+        # key -> future for the in-flight crawl
+        self._in_flight = {}
+
+        self.number_crawls = 0
+        self.number_coalesced_crawls = 0
+
+    def __len__(self):
+        """Number of in-flight crawls."""
+        with self._lock:
+            return len(self._in_flight)
+
+    def crawl(self, key, crawl):
+        """If a crawl for ```key``` is in flight wait for it to finish otherwise call
+        ```crawl()```, which must return a :py:class:`cloudfeaster.spider.CrawlResponse`,
+        in the calling thread. Either way return a copy of the crawl response.
+        """
+        with self._lock:
+            future = self._in_flight.get(key, None)
+            if future is None:
+                future = concurrent.futures.Future()
+                future.set_running_or_notify_cancel()
+                self._in_flight[key] = future
+                self.number_crawls += 1
+                is_leader = True
+            else:
+                self.number_coalesced_crawls += 1
+                is_leader = False
+
+        if is_leader:
+            try:
+                future.set_result(_inline_debug_files(crawl()))
+            except BaseException as ex:
+                future.set_exception(ex)
+            finally:
+                self._remove(key, future)
+
+        return _copy_crawl_response(future.result())
+
+    def submit(self, key, submit_crawl):
+        """If a crawl for ```key``` is in flight return a future which resolves to
+        a copy of the in-flight crawl's crawl response. Otherwise call ```submit_crawl()```,
+        which must start a crawl and return a ```concurrent.futures.Future```, and
+        return a future which resolves to a copy of the started crawl's crawl response.
+
+        Cancelling a returned future doesn't cancel the in-flight crawl. If the
+        in-flight crawl is cancelled all the returned futures are cancelled.
+        ```submit_crawl()``` is called without holding the coalescer's lock so it can
+        block or call :py:meth:`CrawlCoalescer.submit` without blocking other callers.
+        """
+        with self._lock:
+            in_flight_future = self._in_flight.get(key, None)
+            if in_flight_future is None:
+                # a placeholder which callers for the same key wait on while the crawl is
+                # submitted and which is resolved with the submitted crawl's outcome - debug
+                # files are inlined exactly once as the outcome is relayed
+                in_flight_future = concurrent.futures.Future()
+                self._in_flight[key] = in_flight_future
+                self.number_crawls += 1
+                is_leader = True
+            else:
+                self.number_coalesced_crawls += 1
+                is_leader = False
+
+        if is_leader:
+            # outside the lock because callbacks run immediately if the future is already done
+            in_flight_future.add_done_callback(lambda future: self._remove(key, future))
+
+            # outside the lock so a slow (ex the executor's queue is full) or re-entrant
+            # submit_crawl() doesn't block callers for other keys
+            try:
+                submitted_future = submit_crawl()
+            except BaseException as ex:
+                in_flight_future.set_running_or_notify_cancel()
+                in_flight_future.set_exception(ex)
+                raise
+
+            submitted_future.add_done_callback(lambda future: _relay(future, in_flight_future))
+
+        future = concurrent.futures.Future()
+        in_flight_future.add_done_callback(lambda in_flight_future: self._fan_out(in_flight_future, future))
+        return future
+
+    def _remove(self, key, future):
+        with self._lock:
+            if self._in_flight.get(key, None) is future:
+                del self._in_flight[key]
+
+    def _fan_out(self, in_flight_future, future):
+        if in_flight_future.cancelled():
+            future.cancel()
+            return
+
+        if not future.set_running_or_notify_cancel():
+            # cancelled by the caller
+            return
+
+        exception = in_flight_future.exception()
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(_copy_crawl_response(in_flight_future.result()))
@@ -0,0 +1,227 @@
+"""This module implements :py:class:`CrawlExecutor` which runs many crawls
+across many spiders concurrently while honoring each spider's
+```maxConcurrentCrawls``` metadata and a node level cap on concurrent crawls.
+"""
+
+import collections
+import concurrent.futures
+import logging
+import os
+import threading
+
+from . import coalesce
+from . import spider
+
+_logger = logging.getLogger(__name__)
+
+
+class _SpiderCrawls(object):
+    """Crawls for a single spider class - ```pending``` crawls are
+    waiting for one of the spider's ```max_concurrent_crawls``` slots.
+    """
+
+    def __init__(self, max_concurrent_crawls):
+        object.__init__(self)
+
+        self.max_concurrent_crawls = max_concurrent_crawls
+        self.number_running = 0
+
+        # deque of (future, spider class, crawl args)
+        self.pending = collections.deque()
+
+
+class CrawlExecutor(object):
+    """Runs crawls on a bounded pool of threads. At most ```max_concurrent_crawls```
+    (default = number of cpus) crawls run at once across all spiders and at
+    most ```maxConcurrentCrawls``` (see :py:meth:`cloudfeaster.spider.Spider.get_validated_metadata`)
+    crawls run at once for any single spider.
+
+    Crawls waiting for one of their spider's slots are queued by the executor
+    rather than occupying a thread so a spider with lots of queued crawls never
+    starves other spiders of threads. Crawls for a single spider start in the
+    order they were submitted.
+
+    The future of a crawl which exceeds its max crawl time resolves as soon as
+    the crawl times out but the crawl keeps its slot (and thread) until its
+    abandoned crawl thread exits (see :py:meth:`cloudfeaster.spider.SpiderCrawler.wait_for_crawl_threads`)
+    so the caps bound the crawls which are actually running.
+
+        with CrawlExecutor(max_concurrent_crawls=8) as crawl_executor:
+            future = crawl_executor.submit('cloudfeaster.samples.pypi.PyPISpider', 'dave', 'secret')
+            crawl_response = future.result()
+
+    Browsers are separate processes so threads are sufficient to crawl concurrently.
+    If ```browser_pool``` (a :py:class:`cloudfeaster.browser.BrowserPool`) is supplied
+    crawls lease browsers from the pool. If ```crawl_result_cache``` (a
+    :py:class:`cloudfeaster.cache.CrawlResultCache`) is supplied crawl results
+    are cached for each spider's ```ttl```.
+
+    If ```coalesce_crawls``` is ```True``` a crawl which is identical (same spider and
+    crawl args) to a pending or running crawl isn't run - instead its future
+    resolves to a copy of the pending or running crawl's crawl response -
+    see :py:class:`cloudfeaster.coalesce.CrawlCoalescer`.
+    """
+
+    def __init__(self, max_concurrent_crawls=None, browser_pool=None, crawl_result_cache=None, coalesce_crawls=False):
+        object.__init__(self)
+
+        self.max_concurrent_crawls = max_concurrent_crawls or os.cpu_count()
+        self.browser_pool = browser_pool
+        self.crawl_result_cache = crawl_result_cache
+        self.crawl_coalescer = coalesce.CrawlCoalescer() if coalesce_crawls else None
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_crawls,
+            thread_name_prefix='crawl')
+
+        self._lock = threading.Lock()
+
+        # notified each time a crawl finishes
+        self._crawl_finished = threading.Condition(self._lock)
+
+        # spider class -> _SpiderCrawls
+        self._spider_crawls = {}
+
+        # fully qualified spider class name -> spider class
+        self._spider_classes = {}
+
+        self._shutdown = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exec_type, exec_val, ex_tb):
+        self.shutdown()
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop accepting crawls. If ```cancel_pending``` is ```True``` crawls which
+        haven't started are cancelled. If ```wait``` is ```True``` this method returns
+        once all running (and, if not cancelled, pending) crawls have finished.
+        If ```wait``` is ```False``` pending crawls are always cancelled.
+        """
+        futures_to_cancel = []
+
+        with self._lock:
+            self._shutdown = True
+
+            if cancel_pending or not wait:
+                for spider_crawls in self._spider_crawls.values():
+                    while spider_crawls.pending:
+                        (future, _, _) = spider_crawls.pending.popleft()
+                        futures_to_cancel.append(future)
+
+        # cancelling runs the futures' callbacks so cancel outside the lock
+        for future in futures_to_cancel:
+            future.cancel()
+
+        if wait:
+            # once nothing is pending all crawls have been handed to the thread
+            # pool and shutting down the thread pool waits for them to finish
+            with self._lock:
+                while any(spider_crawls.pending for spider_crawls in self._spider_crawls.values()):
+                    self._crawl_finished.wait()
+
+        self._executor.shutdown(wait=wait)
+
+    def _get_spider_class(self, spider_class_or_name):
+        if not isinstance(spider_class_or_name, str):
+            return (spider_class_or_name, None)
+
+        spider_class = self._spider_classes.get(spider_class_or_name, None)
+        if spider_class:
+            return (spider_class, None)
+
+        (spider_class, crawl_response) = spider.SpiderCrawler(spider_class_or_name)._get_spider_class()
+        if spider_class:
+            self._spider_classes[spider_class_or_name] = spider_class
+
+        return (spider_class, crawl_response)
+
+    def submit(self, spider_class_or_name, *args):
+        """Schedule a crawl of the spider class (or fully qualified spider class
+        name) ```spider_class_or_name``` with crawl args ```args``` and return a
+        ```concurrent.futures.Future``` whose result will be a
+        :py:class:`cloudfeaster.spider.CrawlResponse`.
+        """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot submit crawls after shutdown')
+
+        if self.crawl_coalescer is not None:
+            key = coalesce.crawl_key(spider_class_or_name, args)
+            return self.crawl_coalescer.submit(key, lambda: self._submit(spider_class_or_name, args))
+
+        return self._submit(spider_class_or_name, args)
+
+    def _submit(self, spider_class_or_name, args):
+        future = concurrent.futures.Future()
+
+        (spider_class, crawl_response) = self._get_spider_class(spider_class_or_name)
+        if crawl_response:
+            future.set_running_or_notify_cancel()
+            future.set_result(crawl_response)
+            return future
+
+        try:
+            max_concurrent_crawls = spider_class.get_validated_metadata()['maxConcurrentCrawls']
+        except Exception:
+            # SpiderCrawler will generate the appropriate crawl response for invalid metadata
+            max_concurrent_crawls = 1
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot submit crawls after shutdown')
+
+            spider_crawls = self._spider_crawls.get(spider_class, None)
+            if spider_crawls is None:
+                spider_crawls = _SpiderCrawls(max_concurrent_crawls)
+                self._spider_crawls[spider_class] = spider_crawls
+
+            spider_crawls.pending.append((future, spider_class, args))
+            self._start_pending_crawls(spider_crawls)
+
+        return future
+
+    def as_completed(self, crawl_requests):
+        """Submit all ```crawl_requests``` - an iterable of ```(spider_class_or_name, args)```
+        tuples - and generate ```(crawl_request, crawl_response)``` tuples as crawls finish.
+        """
+        crawl_requests_by_future = {}
+        for crawl_request in crawl_requests:
+            (spider_class_or_name, args) = crawl_request
+            crawl_requests_by_future[self.submit(spider_class_or_name, *args)] = crawl_request
+
+        for future in concurrent.futures.as_completed(crawl_requests_by_future):
+            yield (crawl_requests_by_future[future], future.result())
+
+    def _start_pending_crawls(self, spider_crawls):
+        """Must be called with ```self._lock``` held."""
+        while spider_crawls.number_running < spider_crawls.max_concurrent_crawls and spider_crawls.pending:
+            (future, spider_class, args) = spider_crawls.pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                # cancelled while pending
+                continue
+
+            spider_crawls.number_running += 1
+            self._executor.submit(self._crawl, spider_crawls, future, spider_class, args)
+
+    def _crawl(self, spider_crawls, future, spider_class, args):
+        spider_crawler = None
+        try:
+            spider_crawler = spider.SpiderCrawler(
+                spider_class,
+                browser_pool=self.browser_pool,
+                crawl_result_cache=self.crawl_result_cache)
+            future.set_result(spider_crawler.crawl(*args))
+        except BaseException as ex:
+            future.set_exception(ex)
+        finally:
+            # a crawl which timed out resolves its future right away but its
+            # slot is only released once its abandoned crawl thread has exited
+            if spider_crawler is not None:
+                spider_crawler.wait_for_crawl_threads()
+
+            with self._lock:
+                spider_crawls.number_running -= 1
+                self._start_pending_crawls(spider_crawls)
+                self._crawl_finished.notify_all()
@@ -0,0 +1,171 @@
+"""This module implements bulk extraction of tabular data from a page.
+Extracting a table one element at a time with ```find_elements()```,
+```get_text()```, ```get_float()``` and ```get_attribute()``` costs a
+chromedriver round trip per value. :py:func:`extract` evaluates a row XPath
+and a set of columns in the browser with a single ```execute_script()```
+and returns a list of dicts - one per row.
+
+    rates = browser.extract(
+        '//table[@id="rates"]/tbody/tr',
+        {
+            'currency': 'td[1]',
+            'url': {'xpath': 'td[1]/a', 'attribute': 'href'},
+            'rate': {'xpath': 'td[2]', 'type': float},
+            'history': {'xpath': 'td[3]//a', 'all': True},
+        })
+
+A column is either a relative XPath (the value is the text of the first matching
+element) or a dict with the keys
+
+* ```xpath``` - XPath relative to the row (default ```.``` ie the row itself)
+* ```attribute``` - use the value of this attribute rather than the element's text
+* ```type``` - one of ```str``` (the default), ```int``` or ```float``` - numbers are
+  parsed with the same semantics as :py:meth:`cloudfeaster.browser.WebElement.get_int`
+  and :py:meth:`cloudfeaster.browser.WebElement.get_float`
+* ```reg_ex``` - a regular expression (compiled or not) with a single group which
+  identifies the number in the text - only used when ```type``` is ```int``` or ```float```
+* ```all``` - if ```True``` the value is a list with a value for every matching element
+
+If no element matches a column's XPath the column's value is ```None```
+(or an empty list if ```all``` is ```True```).
+"""
+
+import re
+
+_non_digit_and_non_dot_reg_ex = re.compile(r'[^\d^\.]')
+
+
+def to_number(number_type, text, reg_ex=None):
+    """Convert ```text``` to an ```int``` or ```float``` (```number_type```).
+    If ```reg_ex``` is supplied it must match ```text``` and have a single
+    group which identifies the number otherwise ```None``` is returned.
+    All characters other than digits and ```.``` are ignored.
+    """
+    if reg_ex:
+        match = reg_ex.match(text)
+        if match is None:
+            return None
+        match_groups = match.groups()
+        if 1 != len(match_groups):
+            return None
+        text = match_groups[0]
+
+    text = _non_digit_and_non_dot_reg_ex.sub('', text)
+    return number_type(text)
+
+
+_column_keys = set(['xpath', 'attribute', 'type', 'reg_ex', 'all'])
+
+_column_types = [str, int, float]
+
+
+def _normalize_column(name, column):
+    if isinstance(column, str):
+        column = {'xpath': column}
+
+    if not isinstance(column, dict):
+        raise ValueError("column '%s' must be an xpath or a dict" % name)
+
+    unknown_keys = set(column.keys()) - _column_keys
+    if unknown_keys:
+        raise ValueError("column '%s' has unknown keys %s" % (name, sorted(unknown_keys)))
+
+    column_type = column.get('type', str)
+    if column_type not in _column_types:
+        raise ValueError("column '%s' has invalid type %s" % (name, column_type))
+
+    reg_ex = column.get('reg_ex', None)
+    if isinstance(reg_ex, str):
+        reg_ex = re.compile(reg_ex)
+
+    return {
+        'xpath': column.get('xpath', '.'),
+        'attribute': column.get('attribute', None),
+        'type': column_type,
+        'reg_ex': reg_ex,
+        'all': bool(column.get('all', False)),
+    }
+
+
+# arguments[0] is the row xpath and arguments[1] is a list of [xpath, attribute, all] - one per column.
+# text is the element's rendered text (like selenium's WebElement.text) and, like selenium's
+# WebElement.get_attribute(), an attribute's property (ex the absolute url for href) is
+# preferred to the attribute's value
+_extract_script = '''
+var rowXPath = arguments[0];
+var columns = arguments[1];
+
+function evaluate(xpath, contextNode) {
+    var result = document.evaluate(xpath, contextNode, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+
+function value(node, attribute) {
+    if (attribute === null) {
+        var text = (node.innerText === undefined) ? node.textContent : node.innerText;
+        return (text === null || text === undefined) ? '' : text.trim();
+    }
+    var property = node[attribute];
+    if (typeof property === 'string' || typeof property === 'number' || typeof property === 'boolean') {
+        return String(property);
+    }
+    return node.getAttribute ? node.getAttribute(attribute) : null;
+}
+
+return evaluate(rowXPath, document).map(function(row) {
+    return columns.map(function(column) {
+        var nodes = evaluate(column[0], row);
+        if (column[2]) {
+            return nodes.map(function(node) { return value(node, column[1]); });
+        }
+        return nodes.length ? value(nodes[0], column[1]) : null;
+    });
+});
+'''
+
+
+def normalize_columns(columns):
+    """Validate ```columns``` (see module docstring) and return a list of
+    column names and a list of columns as dicts with all keys present.
+    Raises ```ValueError``` if a column is invalid.
+    """
+    names = list(columns.keys())
+    return (names, [_normalize_column(name, columns[name]) for name in names])
+
+
+def _convert(column, value):
+    if value is None or column['type'] is str:
+        return value
+    return to_number(column['type'], value, column['reg_ex'])
+
+
+def rows_to_dicts(names, columns, rows):
+    """Convert ```rows``` - a list of lists of raw (text or attribute) values
+    with one value per column - to a list of dicts applying each column's type.
+    """
+    dicts = []
+    for row in rows:
+        d = {}
+        for (name, column, value) in zip(names, columns, row):
+            if column['all']:
+                d[name] = [_convert(column, v) for v in value]
+            else:
+                d[name] = _convert(column, value)
+        dicts.append(d)
+    return dicts
+
+
+def extract(browser, row_xpath, columns):
+    """Implements ```Browser.extract()``` and ```RemoteBrowser.extract()``` - see module docstring."""
+    (names, normalized_columns) = normalize_columns(columns)
+
+    rows = browser.execute_script(
+        _extract_script,
+        row_xpath,
+        [[column['xpath'], column['attribute'], column['all']] for column in normalized_columns])
+
+    return rows_to_dicts(names, normalized_columns, rows)
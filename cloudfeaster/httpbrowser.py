@@ -0,0 +1,197 @@
+"""This module implements the browser used by spiders whose metadata declares
+```"engine": "http"```. Many spiders scrape server rendered pages and use Chrome
+only to fetch HTML. :py:class:`HTTPBrowser` fetches pages with urllib3 (connections
+are pooled across crawls) and parses them with lxml - see ```cloudfeaster.snapshot```.
+It implements the read only subset of the :py:class:`cloudfeaster.browser.Browser`
+interface - ```get()```, ```find_element()```, ```find_elements()```, ```extract()```,
+```current_url```, ```page_source``` and ```title``` - and elements support the
+:py:class:`cloudfeaster.browser.WebElement` helpers ```get_text()```, ```get_int()```,
+```get_float()```, ```get_selected()``` and ```get_attribute()```.
+
+Javascript doesn't run, forms can't be submitted and there are no screenshots.
+Selenium isn't imported - locators are selenium's ```By``` constants or their values
+(ex ```'xpath'```).
+"""
+
+import threading
+import urllib.parse
+
+import urllib3
+
+import cloudfeaster_extension
+from . import snapshot
+from . import tracing
+
+_empty_page_source = '<html><head></head><body></body></html>'
+
+# (proxy host, proxy port) -> urllib3.PoolManager - see _get_pool_manager()
+_pool_managers = {}
+
+_pool_managers_lock = threading.Lock()
+
+
+def _get_pool_manager(paranoia_level):
+    """Return the pool manager for ```paranoia_level```'s proxy. Pool managers are shared
+    by all :py:class:`HTTPBrowser` instances so connections are reused across crawls.
+    """
+    (proxy_host, proxy_port) = cloudfeaster_extension.proxy(paranoia_level)
+
+    with _pool_managers_lock:
+        key = (proxy_host, proxy_port)
+        pool_manager = _pool_managers.get(key, None)
+        if pool_manager is None:
+            kwargs = _pool_manager_kwargs()
+            if proxy_host is not None and proxy_port is not None:
+                proxy_url = 'http://%s:%d' % (proxy_host, proxy_port)
+                pool_manager = urllib3.ProxyManager(proxy_url, **kwargs)
+            else:
+                pool_manager = urllib3.PoolManager(**kwargs)
+            _pool_managers[key] = pool_manager
+
+        return pool_manager
+
+
+def _create_fixtures_pool_manager(fixtures_proxy):
+    """Return a pool manager for the network fixtures proxy ```fixtures_proxy```. The
+    proxy listens on a new port each time network fixtures are started so, rather than
+    being shared, the pool manager belongs to a single :py:class:`HTTPBrowser` and
+    is cleared when the browser quits.
+    """
+    from . import netfixtures
+
+    kwargs = _pool_manager_kwargs()
+    # the network fixtures proxy intercepts HTTPS using its own certificate
+    kwargs.update(netfixtures.pool_manager_kwargs())
+    return urllib3.ProxyManager('http://%s:%d' % fixtures_proxy, **kwargs)
+
+
+def _pool_manager_kwargs():
+    return {
+        'maxsize': 10,
+        'headers': {'User-Agent': cloudfeaster_extension.user_agent()},
+    }
+
+
+def _charset(content_type):
+    """Return the charset parameter of a ```Content-Type``` header or ```None```."""
+    for param in (content_type or '').split(';')[1:]:
+        (name, _, value) = param.partition('=')
+        if name.strip().lower() == 'charset':
+            return value.strip().strip('"\'') or None
+    return None
+
+
+def _final_url(url, response):
+    """Return the absolute URL of the page ```response``` loaded after following redirects
+    from ```url```. ```Location``` headers can be relative (urllib3 1.26's ```geturl()```
+    returns the last one as is) so each redirect is resolved against the previous URL.
+    """
+    for request in (response.retries.history if response.retries else ()):
+        if request.redirect_location:
+            url = urllib.parse.urljoin(url, request.redirect_location)
+    return url
+
+
+class HTTPBrowser(object):
+    """A :py:class:`cloudfeaster.browser.Browser` compatible browser which fetches
+    pages over HTTP without Chrome - see module docstring.
+
+    If ```fixtures_proxy``` is supplied, pages are fetched through the
+    :py:class:`cloudfeaster.netfixtures.NetworkFixtures` proxy at
+    ```fixtures_proxy``` (a ```(host, port)``` tuple) rather than the
+    proxy returned by ```cloudfeaster_extension.proxy()```.
+    """
+
+    def __init__(self, url, paranoia_level, timeout=30, fixtures_proxy=None):
+        object.__init__(self)
+
+        self._url = url
+        self._paranoia_level = paranoia_level
+        self._timeout = urllib3.Timeout(total=timeout)
+
+        if fixtures_proxy is None:
+            self._pool_manager = _get_pool_manager(paranoia_level)
+            self._owns_pool_manager = False
+        else:
+            self._pool_manager = _create_fixtures_pool_manager(fixtures_proxy)
+            self._owns_pool_manager = True
+        self._snapshot = snapshot.Snapshot(_empty_page_source, 'about:blank', paranoia_level)
+
+    def __enter__(self):
+        """As per :py:class:`cloudfeaster.browser.Browser` get the url supplied
+        to the ctr, if there is one, when entering the context.
+        """
+        if self._url:
+            self.get(self._url)
+        return self
+
+    def __exit__(self, exec_type, exec_val, ex_tb):
+        self.quit()
+
+    def get(self, url):
+        """Fetch ```url```, following redirects. HTTP error responses (ex 404) aren't
+        errors - as per a browser, the response's page is loaded.
+        """
+        tracing.execute(self._execute, 'get', {'url': url})
+
+    def _execute(self, driver_command, params):
+        response = self._pool_manager.request(
+            'GET',
+            params['url'],
+            timeout=self._timeout,
+            redirect=True)
+        charset = _charset(response.headers.get('Content-Type', None)) or 'utf-8'
+        try:
+            page_source = response.data.decode(charset, errors='replace')
+        except LookupError:
+            # unknown charset
+            page_source = response.data.decode('utf-8', errors='replace')
+
+        url = _final_url(params['url'], response)
+        if not page_source.strip():
+            # lxml can't parse an empty document
+            page_source = _empty_page_source
+        self._snapshot = snapshot.Snapshot(page_source, url, self._paranoia_level)
+
+        return {'value': page_source}
+
+    @property
+    def current_url(self):
+        return self._snapshot.current_url
+
+    @property
+    def page_source(self):
+        return self._snapshot.page_source
+
+    @property
+    def title(self):
+        return self._snapshot.title
+
+    # 'id' is selenium's By.ID - see cloudfeaster.snapshot
+    def find_elements(self, by='id', value=None):
+        return self._snapshot.find_elements(by, value)
+
+    def find_element(self, by='id', value=None):
+        return self._snapshot.find_element(by, value)
+
+    def extract(self, row_xpath, columns):
+        return self._snapshot.extract(row_xpath, columns)
+
+    def snapshot(self):
+        """The current page is already a snapshot."""
+        return self._snapshot
+
+    def save_screenshot(self, filename):
+        """There are no screenshots - returns ```False``` like selenium does when a screenshot can't be saved."""
+        return False
+
+    def quit(self):
+        """Connections belong to the shared pool manager so there's nothing to close
+        unless the browser has its own pool manager for a network fixtures proxy.
+        """
+        if self._owns_pool_manager:
+            self._pool_manager.clear()
+
+    def kill(self):
+        """In-flight requests are bounded by the browser's timeout so there's nothing to kill."""
+        pass
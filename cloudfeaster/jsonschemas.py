@@ -1,7 +1,24 @@
-"""This module loads all jsonschemas."""
+"""This module loads all jsonschemas and provides validators for them.
+
+Creating a jsonschema validator means determining the validator class
+for the schema, checking the schema and building a ref resolver. This
+is surprisingly expensive when done for every validation so validators
+are compiled once, on first use, and reused thereafter. Use
+:py:func:`validate_metadata` and :py:func:`validate_crawl_result`
+rather than calling ```jsonschema.validate()``` directly.
+
+Neither ```jsonschema``` nor the schemas are loaded until they're first
+used so importing this module is cheap.
+"""
 
 import json
+import logging
 import os
+import sys
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
 
 
 def _load_jsonschema(schema_name):
@@ -14,6 +31,111 @@ def _load_jsonschema(schema_name):
         return json.load(fp)
 
 
-spider_metadata = _load_jsonschema('spider_metadata')
+_schema_names = ['spider_metadata', 'crawl_result']
+
+
+def __getattr__(name):
+    """PEP 562 module level ```__getattr__()``` which loads ```spider_metadata```
+    and ```crawl_result``` schemas on first use.
+    """
+    if name in _schema_names:
+        schema = _load_jsonschema(name)
+        globals()[name] = schema
+        return schema
+
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+class _Validator(object):
+    """Wraps a jsonschema validator which is compiled on first use
+    and keeps track of how much time has been spent validating
+    documents against the schema. If ```schema``` is None the schema
+    is loaded by name on first use.
+    """
+
+    def __init__(self, schema_name, schema=None):
+        object.__init__(self)
+
+        self.schema_name = schema_name
+        self.schema = schema
+
+        self.number_validations = 0
+        self.validation_time_in_ms = 0.0
+
+        self._lock = threading.Lock()
+        self._validator = None
+        self._best_match = None
+
+    def _compile(self):
+        with self._lock:
+            if self._validator is None:
+                import jsonschema
+
+                if self.schema is None:
+                    self.schema = getattr(sys.modules[__name__], self.schema_name)
+
+                validator_class = jsonschema.validators.validator_for(self.schema)
+                validator_class.check_schema(self.schema)
+
+                self._best_match = jsonschema.exceptions.best_match
+                self._validator = validator_class(self.schema)
+
+                _logger.info("compiled jsonschema validator for '%s'", self.schema_name)
+
+        return self._validator
+
+    def validate(self, instance, first_error_only=False):
+        """Validate ```instance``` raising ```jsonschema.ValidationError```
+        if ```instance``` is invalid. By default, like ```jsonschema.validate()```,
+        all errors are found and the most relevant error is raised. If
+        ```first_error_only``` is ```True``` validation stops and the first
+        error found is raised.
+        """
+        start = time.monotonic()
+        try:
+            validator = self._validator or self._compile()
+
+            errors = validator.iter_errors(instance)
+            error = next(errors, None) if first_error_only else self._best_match(errors)
+            if error is not None:
+                raise error
+        finally:
+            duration_in_ms = 1000.0 * (time.monotonic() - start)
+            self.number_validations += 1
+            self.validation_time_in_ms += duration_in_ms
+            _logger.debug("validated against '%s' in %.3f ms", self.schema_name, duration_in_ms)
+
+    def get_timings(self):
+        return {
+            'numberValidations': self.number_validations,
+            'validationTimeInMs': self.validation_time_in_ms,
+        }
+
+
+_spider_metadata_validator = _Validator('spider_metadata')
+
+_crawl_result_validator = _Validator('crawl_result')
+
+
+def validate_metadata(metadata, first_error_only=False):
+    """Validate spider metadata against the ```spider_metadata``` schema.
+    See :py:meth:`_Validator.validate` for details.
+    """
+    _spider_metadata_validator.validate(metadata, first_error_only)
+
+
+def validate_crawl_result(crawl_result, first_error_only=False):
+    """Validate a crawl result against the ```crawl_result``` schema.
+    See :py:meth:`_Validator.validate` for details.
+    """
+    _crawl_result_validator.validate(crawl_result, first_error_only)
+
 
-crawl_result = _load_jsonschema('crawl_result')
+def get_validation_timings():
+    """Returns a dict, keyed by schema name, describing the number of validations
+    and cumulative time spent validating against each schema.
+    """
+    return {
+        validator.schema_name: validator.get_timings()
+        for validator in [_spider_metadata_validator, _crawl_result_validator]
+    }
@@ -0,0 +1,218 @@
+"""This module implements crawl scoped log capture. Rather than reconfiguring
+the logging module for every crawl, a single queue backed handler is added
+to the root logger the first time a crawl's log is captured. A filter on the
+handler routes each log record to the :py:class:`CrawlLog` of the crawl which
+emitted it - the current crawl is tracked with a ```contextvars.ContextVar```
+so concurrent crawls in different threads (or asyncio tasks) each capture
+only their own log records.
+
+Log records are formatted in the emitting thread and appended to the crawl
+log's in-memory ring buffer. Writing to the crawl log's file happens on a
+single background thread so crawl threads never wait on file I/O.
+
+    crawl_log = CrawlLog('/tmp/crawl-log.txt', logging.INFO)
+    crawl_log.start()
+    try:
+        ... crawl ...
+    finally:
+        crawl_log.close()
+
+Threads started by a crawl must be started with a copy of the crawl's context
+(see ```contextvars.copy_context()```) for their log records to be captured.
+"""
+
+import collections
+import contextvars
+import logging
+import queue
+import threading
+import time
+
+_current_crawl_log = contextvars.ContextVar('crawl_log', default=None)
+
+
+def get_current_crawl_log():
+    """Return the :py:class:`CrawlLog` capturing log records in the current context or ```None```."""
+    return _current_crawl_log.get()
+
+
+class CrawlLog(object):
+    """Captures log records at ```level``` or above emitted in the context
+    in which :py:meth:`CrawlLog.start` was called. The most recent ```max_lines```
+    formatted log records are kept in memory and, if ```filename``` isn't
+    ```None```, all formatted log records are asynchronously appended to
+    ```filename```. If ```redactor``` (a :py:class:`cloudfeaster.privacy.Redactor`)
+    is supplied formatted log records are redacted before being kept or written.
+    """
+
+    def __init__(self, filename, level=logging.ERROR, max_lines=10000, redactor=None):
+        object.__init__(self)
+
+        self.filename = filename
+        self.level = level
+        self.redactor = redactor
+
+        self._lines = collections.deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+
+        self._fp = None
+        self._closed = False
+        self._token = None
+
+    def start(self):
+        """Start capturing log records emitted in the current context."""
+        _install()
+        _lower_root_logger_level(self.level)
+        self._token = _current_crawl_log.set(self)
+
+    def close(self):
+        """Stop capturing log records and wait for all captured log records
+        to be written to the crawl log's file. Log records emitted after
+        the crawl log is closed (ex by an abandoned crawl thread) are kept
+        in memory but not written.
+        """
+        if self._token is not None:
+            try:
+                _current_crawl_log.reset(self._token)
+            except ValueError:
+                # close() called from a different context than start()
+                pass
+            self._token = None
+
+        if self._closed:
+            return
+
+        flushed = threading.Event()
+        _queue.put(_CloseCrawlLog(self, flushed))
+        flushed.wait()
+
+    @property
+    def lines(self):
+        """The most recent formatted log records."""
+        with self._lock:
+            return list(self._lines)
+
+    def _redact(self, line):
+        return self.redactor.redact(line) if self.redactor else line
+
+    def _append(self, line):
+        with self._lock:
+            self._lines.append(line)
+
+    def _write(self, line):
+        """Called on the writer thread."""
+        if self._closed or not self.filename:
+            return
+
+        if self._fp is None:
+            self._fp = open(self.filename, 'a', encoding='utf-8')
+
+        self._fp.write(line)
+        self._fp.write('\n')
+
+    def _close_file(self):
+        """Called on the writer thread. The file is created even if no
+        log records were captured so the crawl log always exists.
+        """
+        self._closed = True
+        if self._fp is None and self.filename:
+            self._fp = open(self.filename, 'a', encoding='utf-8')
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+class _CloseCrawlLog(object):
+    """Queued by :py:meth:`CrawlLog.close` - since the queue is FIFO all the crawl
+    log's log records have been written when the writer thread reaches it.
+    """
+
+    def __init__(self, crawl_log, flushed):
+        object.__init__(self)
+
+        self.crawl_log = crawl_log
+        self.flushed = flushed
+
+
+class _CrawlLogFilter(logging.Filter):
+    """Accept log records emitted while a crawl log is capturing and
+    at or above the crawl log's level. The crawl log is attached to
+    the log record.
+    """
+
+    def filter(self, record):
+        crawl_log = _current_crawl_log.get()
+        if crawl_log is None or record.levelno < crawl_log.level:
+            return False
+
+        record.crawl_log = crawl_log
+        return True
+
+
+def _write_queued_log_records():
+    while True:
+        item = _queue.get()
+        try:
+            if isinstance(item, _CloseCrawlLog):
+                item.crawl_log._close_file()
+                item.flushed.set()
+            else:
+                (crawl_log, line) = item
+                crawl_log._write(line)
+        except Exception:
+            # never let one crawl's log kill the writer thread
+            pass
+
+
+_queue = queue.SimpleQueue()
+
+_formatter = logging.Formatter('%(asctime)s.%(msecs)03d+00:00 %(levelname)s %(module)s:%(lineno)d %(message)s')
+# only this formatter uses utc - logging.Formatter.converter is left alone
+_formatter.converter = time.gmtime
+
+_handler = None
+
+_install_lock = threading.Lock()
+
+
+def _install():
+    """Add the crawl log handler to the root logger and start the writer thread - once."""
+    global _handler
+
+    with _install_lock:
+        if _handler is not None:
+            return
+
+        import logging.handlers
+
+        class CrawlLogHandler(logging.handlers.QueueHandler):
+
+            def enqueue(self, record):
+                line = record.crawl_log._redact(record.msg)
+                record.crawl_log._append(line)
+                self.queue.put((record.crawl_log, line))
+
+        _handler = CrawlLogHandler(_queue)
+        _handler.setFormatter(_formatter)
+        _handler.addFilter(_CrawlLogFilter())
+        logging.getLogger().addHandler(_handler)
+
+        threading.Thread(target=_write_queued_log_records, name='crawl-log-writer', daemon=True).start()
+
+
+def _lower_root_logger_level(level):
+    """Log records below the root logger's level never reach the crawl log
+    handler so lower the root logger's level if required. The root logger's
+    other handlers are given the root logger's original level so they
+    continue to see the same log records.
+    """
+    with _install_lock:
+        root_logger = logging.getLogger()
+        if root_logger.level <= level:
+            return
+
+        for handler in root_logger.handlers:
+            if handler is not _handler and handler.level < root_logger.level:
+                handler.setLevel(root_logger.level)
+
+        root_logger.setLevel(level)
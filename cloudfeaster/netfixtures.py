@@ -0,0 +1,452 @@
+"""This module implements network fixtures - record a crawl's network traffic
+once and replay it for later crawls so crawls can be benchmarked offline
+against identical inputs. Timings of crawls against live sites are too
+noisy to compare :py:class:`cloudfeaster.browser.Browser`, spider code,
+engines or framework overhead.
+
+While a :py:class:`NetworkFixtures` is started a local proxy listens on
+:py:attr:`NetworkFixtures.proxy` and :py:class:`cloudfeaster.spider.SpiderCrawler`
+passes the proxy to Chrome or :py:class:`cloudfeaster.httpbrowser.HTTPBrowser`
+so all of the crawl's requests go through the proxy.
+
+* in record mode the proxy forwards requests to the network (via the proxy
+  returned by ```cloudfeaster_extension.proxy()```)
+  and when the proxy is stopped the responses are saved in the fixture archive
+* in replay mode the proxy is a stand-in server which answers requests from the
+  fixture archive without touching the network - requests for the same url are
+  answered in the order they were recorded (the last response is repeated),
+  a request without an exact match is answered by the first response recorded for
+  the same url ignoring the query string and requests with no match at all get a
+  ```404``` and are counted as misses
+
+    network_fixtures = netfixtures.NetworkFixtures('pypi-fixtures.json', netfixtures.REPLAY)
+    crawler = spider.SpiderCrawler(PyPISpider, network_fixtures=network_fixtures)
+    crawl_result = crawler.crawl()
+
+HTTPS is intercepted - the proxy terminates TLS using a self-signed certificate
+generated with the ```openssl``` command line tool so the browser has to accept
+the proxy's certificate (see :py:func:`pool_manager_kwargs`). Since the proxy
+listens on the loopback interface it can't be used with a remote chromedriver.
+
+The fixture archive is a JSON document.
+
+    {
+        "version": 1,
+        "exchanges": [
+            {
+                "method": "GET",
+                "url": "https://pypi.org/project/cloudfeaster/",
+                "status": 200,
+                "reason": "OK",
+                "headers": [["Content-Type", "text/html; charset=UTF-8"], ...],
+                "body": "<base64 encoded body>"
+            },
+            ...
+        ]
+    }
+"""
+
+import base64
+import http.server
+import json
+import logging
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import urllib.parse
+
+import urllib3
+
+import cloudfeaster_extension
+
+_logger = logging.getLogger(__name__)
+
+RECORD = 'record'
+
+REPLAY = 'replay'
+
+_archive_version = 1
+
+# headers which apply to a single connection and so aren't forwarded, recorded or replayed
+_hop_by_hop_headers = set([
+    'connection',
+    'keep-alive',
+    'proxy-authenticate',
+    'proxy-authorization',
+    'proxy-connection',
+    'te',
+    'trailer',
+    'transfer-encoding',
+    'upgrade',
+])
+
+# see _get_certificate()
+_certificate = None
+
+_certificate_hostname = 'cloudfeaster-network-fixtures'
+
+_certificate_lock = threading.Lock()
+
+
+def certificate_file():
+    """The name of the file containing the self-signed certificate proxies use to intercept HTTPS."""
+    return _get_certificate()[0]
+
+
+def pool_manager_kwargs():
+    """Keyword arguments for a urllib3 pool manager using a :py:class:`NetworkFixtures`
+    proxy so HTTPS responses are verified using the proxy's certificate
+    rather than the certificates of the hosts being crawled.
+    """
+    return {
+        'ca_certs': certificate_file(),
+        'server_hostname': _certificate_hostname,
+    }
+
+
+def _get_certificate():
+    """Return the names of the certificate and private key files used by
+    proxies to terminate TLS. The self-signed certificate is generated the
+    first time it's needed and shared by all proxies.
+    """
+    global _certificate
+
+    with _certificate_lock:
+        if _certificate is None:
+            directory = tempfile.mkdtemp(prefix='clf-netfixtures-')
+            certificate_file = os.path.join(directory, 'certificate.pem')
+            key_file = os.path.join(directory, 'key.pem')
+            args = [
+                'openssl',
+                'req',
+                '-x509',
+                '-newkey', 'rsa:2048',
+                '-nodes',
+                '-days', '1',
+                '-subj', '/CN=%s' % _certificate_hostname,
+                '-addext', 'subjectAltName=DNS:%s' % _certificate_hostname,
+                '-keyout', key_file,
+                '-out', certificate_file,
+            ]
+            try:
+                subprocess.run(args, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            except Exception:
+                shutil.rmtree(directory, ignore_errors=True)
+                raise
+            _certificate = (certificate_file, key_file)
+
+        return _certificate
+
+
+class FixtureArchive(object):
+    """The responses recorded for a crawl - see module docstring for the file format."""
+
+    def __init__(self, exchanges=None):
+        object.__init__(self)
+
+        self.exchanges = exchanges if exchanges is not None else []
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r') as fp:
+            archive = json.load(fp)
+
+        if archive.get('version', None) != _archive_version:
+            raise ValueError("'%s' isn't a version %d fixture archive" % (filename, _archive_version))
+
+        return cls(archive['exchanges'])
+
+    def save(self, filename):
+        with open(filename, 'w') as fp:
+            json.dump({'version': _archive_version, 'exchanges': self.exchanges}, fp, indent=2)
+
+    def add(self, method, url, status, reason, headers, body):
+        self.exchanges.append({
+            'method': method,
+            'url': url,
+            'status': status,
+            'reason': reason,
+            'headers': [[name, value] for (name, value) in headers],
+            'body': base64.b64encode(body).decode('ascii'),
+        })
+
+
+class _Replayer(object):
+    """Answers requests from a :py:class:`FixtureArchive` - see module docstring."""
+
+    def __init__(self, archive):
+        object.__init__(self)
+
+        # (method, url) -> list of exchanges in the order they were recorded
+        self._exchanges = {}
+        # (method, url without query string) -> first exchange recorded
+        self._exchanges_ignoring_query = {}
+        for exchange in archive.exchanges:
+            key = (exchange['method'], exchange['url'])
+            self._exchanges.setdefault(key, []).append(exchange)
+            key = (exchange['method'], _strip_query(exchange['url']))
+            self._exchanges_ignoring_query.setdefault(key, exchange)
+
+        # (method, url) -> number of times the url has been requested
+        self._request_counts = {}
+        self._lock = threading.Lock()
+
+    def response(self, method, url):
+        """Returns ```None``` if there's no response for the request."""
+        with self._lock:
+            exchanges = self._exchanges.get((method, url), None)
+            if exchanges:
+                request_count = self._request_counts.get((method, url), 0)
+                self._request_counts[(method, url)] = request_count + 1
+                return exchanges[min(request_count, len(exchanges) - 1)]
+
+            return self._exchanges_ignoring_query.get((method, _strip_query(url)), None)
+
+
+def _strip_query(url):
+    return urllib.parse.urlunsplit(urllib.parse.urlsplit(url)._replace(query='', fragment=''))
+
+
+class _ProxyRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Handles requests for :py:class:`NetworkFixtures`' proxy. Plain HTTP requests
+    arrive with an absolute url. For HTTPS the client sends ```CONNECT host:port```,
+    TLS is terminated and requests then arrive on the tunnel with just a path.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    # host:port of the CONNECT request for requests arriving on an HTTPS tunnel
+    _tunnel = None
+
+    def do_CONNECT(self):
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        self.wfile.flush()
+
+        try:
+            self.connection = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError) as ex:
+            # ex the client doesn't accept the proxy's certificate
+            _logger.info("unable to intercept HTTPS to '%s' - %s", self.path, ex)
+            self.close_connection = True
+            return
+
+        self._tunnel = self.path
+        self.rfile = self.connection.makefile('rb', self.rbufsize)
+        self.wfile = self.connection.makefile('wb')
+        self.close_connection = False
+
+    def finish(self):
+        http.server.BaseHTTPRequestHandler.finish(self)
+        if self._tunnel is not None:
+            # the server only closes the socket it accepted and not the TLS socket wrapping it
+            self.connection.close()
+
+    def do_GET(self):
+        self._proxy()
+
+    do_DELETE = do_GET
+    do_HEAD = do_GET
+    do_OPTIONS = do_GET
+    do_PATCH = do_GET
+    do_POST = do_GET
+    do_PUT = do_GET
+
+    def log_message(self, format, *args):
+        _logger.debug('%s - %s', self.address_string(), format % args)
+
+    def _url(self):
+        if self._tunnel is None:
+            return self.path
+
+        (host, _, port) = self._tunnel.rpartition(':')
+        netloc = host if port == '443' else self._tunnel
+        return 'https://%s%s' % (netloc, self.path)
+
+    def _proxy(self):
+        url = self._url()
+        if not url.startswith('http://') and not url.startswith('https://'):
+            self._send(400, 'Bad Request', [], b'')
+            return
+
+        content_length = int(self.headers.get('Content-Length', 0) or 0)
+        request_body = self.rfile.read(content_length) if content_length else None
+
+        try:
+            response = self.server.network_fixtures._response(self.command, url, self.headers, request_body)
+        except Exception as ex:
+            _logger.error("error proxying %s '%s' - %s", self.command, url, ex)
+            self._send(502, 'Bad Gateway', [], b'')
+            return
+
+        if response is None:
+            self._send(404, 'Not Found', [], b'')
+            return
+
+        (status, reason, headers, body) = response
+        self._send(status, reason, headers, body)
+
+    def _send(self, status, reason, headers, body):
+        self.send_response(status, reason)
+        for (name, value) in headers:
+            if name.lower() not in _hop_by_hop_headers and name.lower() != 'content-length':
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+class _ProxyServer(http.server.ThreadingHTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, network_fixtures, ssl_context):
+        http.server.ThreadingHTTPServer.__init__(self, ('127.0.0.1', 0), _ProxyRequestHandler)
+
+        self.network_fixtures = network_fixtures
+        self.ssl_context = ssl_context
+
+
+class NetworkFixtures(object):
+    """Record a crawl's network traffic to, or replay it from, the fixture
+    archive ```filename``` - ```mode``` is :py:data:`RECORD` or :py:data:`REPLAY`.
+    See module docstring.
+    """
+
+    def __init__(self, filename, mode):
+        object.__init__(self)
+
+        if mode not in [RECORD, REPLAY]:
+            raise ValueError("invalid network fixtures mode '%s'" % mode)
+
+        self.filename = filename
+        self.mode = mode
+
+        # the archive being replayed is loaded once - see start()
+        self._replay_archive = None
+
+        # the state below is reset each time the proxy is started
+        self._server = None
+        self._upstream = None
+        self._replayer = None
+        self._record_archive = None
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._misses = 0
+
+    @property
+    def proxy(self):
+        """The proxy's ```(host, port)``` or ```(None, None)``` if the proxy isn't started."""
+        if self._server is None:
+            return (None, None)
+        return self._server.server_address[:2]
+
+    def start(self, paranoia_level):
+        """Start the proxy - see :py:attr:`NetworkFixtures.proxy`."""
+        if self._server is not None:
+            raise RuntimeError('network fixtures already started')
+
+        self._requests = 0
+        self._misses = 0
+
+        if self.mode == RECORD:
+            self._record_archive = FixtureArchive()
+            self._upstream = self._create_upstream(cloudfeaster_extension.proxy(paranoia_level))
+        else:
+            if self._replay_archive is None:
+                self._replay_archive = FixtureArchive.load(self.filename)
+            self._replayer = _Replayer(self._replay_archive)
+
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(*_get_certificate())
+
+        self._server = _ProxyServer(self, ssl_context)
+        threading.Thread(target=self._server.serve_forever, name='netfixtures-proxy', daemon=True).start()
+
+        proxy = self.proxy
+        _logger.info("%s network fixtures '%s' using proxy %s:%d", self.mode, self.filename, proxy[0], proxy[1])
+
+    def stop(self):
+        """Stop the proxy and, in record mode, save the fixture archive."""
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+        if self.mode == RECORD:
+            self._upstream.clear()
+            self._upstream = None
+            self._record_archive.save(self.filename)
+
+    def summary(self):
+        """Summary of the last time the proxy was started for ```_metadata.networkFixtures```."""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'requests': self._requests,
+                'misses': self._misses,
+            }
+
+    def _create_upstream(self, proxy):
+        (proxy_host, proxy_port) = proxy
+        # responses are recorded as they arrive so redirects aren't followed and bodies aren't decoded
+        kwargs = {'retries': False}
+        if proxy_host is not None and proxy_port is not None:
+            return urllib3.ProxyManager('http://%s:%d' % (proxy_host, proxy_port), **kwargs)
+        return urllib3.PoolManager(**kwargs)
+
+    def _response(self, method, url, headers, body):
+        """Called by the proxy for each request. Returns ```None``` if
+        there's no response otherwise ```(status, reason, headers, body)```.
+        """
+        with self._lock:
+            self._requests += 1
+
+        if self.mode == REPLAY:
+            exchange = self._replayer.response(method, url)
+            if exchange is None:
+                _logger.info("no network fixture for %s '%s'", method, url)
+                with self._lock:
+                    self._misses += 1
+                return None
+
+            return (
+                exchange['status'],
+                exchange['reason'],
+                exchange['headers'],
+                base64.b64decode(exchange['body']))
+
+        request_headers = {
+            name: value
+            for (name, value) in headers.items()
+            if name.lower() not in _hop_by_hop_headers and name.lower() != 'host'
+        }
+        response = self._upstream.request(
+            method,
+            url,
+            body=body,
+            headers=request_headers,
+            redirect=False,
+            preload_content=False,
+            decode_content=False)
+        try:
+            response_body = response.read(decode_content=False)
+        finally:
+            response.release_conn()
+
+        response_headers = [
+            (name, value)
+            for (name, value) in response.headers.iteritems()
+            if name.lower() not in _hop_by_hop_headers and name.lower() != 'content-length'
+        ]
+
+        with self._lock:
+            self._record_archive.add(method, url, response.status, response.reason, response_headers, response_body)
+
+        return (response.status, response.reason, response_headers, response_body)
@@ -4,6 +4,201 @@ configuration related to privacy.
 
 import hashlib
 import logging
+import os
+import re
+import tempfile
+
+# with up to this many patterns finding matches with one str.find() per
+# pattern is faster than the trie regular expression - see
+# tests/benchmarks/redaction.py
+_max_str_find_patterns = 12
+
+
+def _trie_reg_ex_pattern(node):
+    """Generate a regular expression pattern from a trie (see :py:class:`Redactor`).
+    Common prefixes are factored out so the regular expression engine does a
+    single comparison per character rather than one per pattern. At any position
+    the longest pattern matches.
+    """
+    prefix = []
+    while True:
+        children = sorted(k for k in node.keys() if k)
+        is_terminal = '' in node
+        if len(children) != 1 or is_terminal:
+            break
+        prefix.append(re.escape(children[0]))
+        node = node[children[0]]
+
+    if not children:
+        return ''.join(prefix)
+
+    alternatives = [re.escape(child) + _trie_reg_ex_pattern(node[child]) for child in children]
+    pattern = alternatives[0] if len(alternatives) == 1 else '(?:%s)' % '|'.join(alternatives)
+    if is_terminal:
+        pattern = '(?:%s)?' % pattern
+
+    return ''.join(prefix) + pattern
+
+
+class Redactor(object):
+    """Replaces crawl args with their hashes (see :py:func:`hash_crawl_arg`).
+    All the patterns for all the crawl args are compiled into a single regular
+    expression, built from a trie of the patterns, so text is redacted in one
+    pass regardless of the number of crawl args. For the common case of a few
+    crawl args, matches are instead found with one ```str.find()``` per pattern
+    which is faster and finds the same matches.
+
+    Each crawl arg is redacted as is and in the form chromedriver
+    uses to log keys sent to an element (```"s", "e", "c", "r", "e", "t"```).
+    """
+
+    def __init__(self, crawl_args):
+        object.__init__(self)
+
+        # pattern -> replacement
+        self._replacements = {}
+        for crawl_arg in crawl_args:
+            crawl_arg = str(crawl_arg)
+            if not crawl_arg:
+                continue
+
+            hashed_crawl_arg = hash_crawl_arg(crawl_arg)
+            self._replacements[crawl_arg] = hashed_crawl_arg
+
+            pattern = '"' + '", "'.join(crawl_arg) + '"'
+            replacement = '"' + '", "'.join(hashed_crawl_arg) + '"'
+            self._replacements[pattern] = replacement
+
+        # trie of patterns - each node is a dict of character -> child node
+        # with '' as a key if a pattern ends at the node
+        trie = {}
+        for pattern in self._replacements.keys():
+            node = trie
+            for c in pattern:
+                node = node.setdefault(c, {})
+            node[''] = None
+
+        self._reg_ex = re.compile(_trie_reg_ex_pattern(trie)) if trie else None
+        self._max_pattern_length = max((len(pattern) for pattern in self._replacements.keys()), default=0)
+
+        # the patterns if matches are found with str.find() rather than the regular expression
+        self._str_find_patterns = None
+        if len(self._replacements) <= _max_str_find_patterns:
+            self._str_find_patterns = tuple(self._replacements.keys())
+
+    def __bool__(self):
+        return self._reg_ex is not None
+
+    def _replace(self, match):
+        return self._replacements[match.group(0)]
+
+    def _matches(self, text):
+        """Yield ```(start, end, pattern)``` for each match in ```text``` - at the
+        leftmost position where a pattern matches the longest pattern matches
+        and the search continues after the match.
+        """
+        if self._str_find_patterns is None:
+            for match in self._reg_ex.finditer(text):
+                yield (match.start(), match.end(), match.group(0))
+            return
+
+        # pattern -> start of the pattern's next match
+        starts = {}
+        for pattern in self._str_find_patterns:
+            start = text.find(pattern)
+            if 0 <= start:
+                starts[pattern] = start
+
+        while starts:
+            (pattern, start) = min(starts.items(), key=lambda item: (item[1], -len(item[0])))
+            end = start + len(pattern)
+            yield (start, end, pattern)
+
+            for (other_pattern, other_start) in list(starts.items()):
+                if other_start < end:
+                    other_start = text.find(other_pattern, end)
+                    if other_start < 0:
+                        del starts[other_pattern]
+                    else:
+                        starts[other_pattern] = other_start
+
+    def redact(self, text):
+        """Return ```text``` with crawl args replaced by their hashes."""
+        patterns = self._str_find_patterns
+        if patterns is None:
+            return self._reg_ex.sub(self._replace, text)
+
+        # most text (ex a log message) contains no crawl args
+        for pattern in patterns:
+            if pattern in text:
+                break
+        else:
+            return text
+
+        pieces = []
+        position = 0
+        for (start, end, pattern) in self._matches(text):
+            pieces.append(text[position:start])
+            pieces.append(self._replacements[pattern])
+            position = end
+        pieces.append(text[position:])
+        return ''.join(pieces)
+
+    def redact_stream(self, input_fp, output_fp, chunk_size=256 * 1024):
+        """Copy the text file ```input_fp``` to the text file ```output_fp```
+        redacting as the text is copied. The text is read in chunks of
+        ```chunk_size``` characters so memory use doesn't depend on the size
+        of ```input_fp``` - crawl args which span chunks are still redacted.
+        """
+        buffer = ''
+        while True:
+            chunk = input_fp.read(chunk_size)
+            buffer += chunk
+            if not chunk:
+                output_fp.write(self.redact(buffer))
+                return
+
+            if self._reg_ex is None:
+                output_fp.write(buffer)
+                buffer = ''
+                continue
+
+            # a match starting before safe_end can't extend past the end of buffer
+            # so everything before safe_end (or the end of the last match starting
+            # before safe_end) can be redacted and written now
+            safe_end = len(buffer) - self._max_pattern_length + 1
+            start = 0
+            for (match_start, match_end, pattern) in self._matches(buffer):
+                if safe_end <= match_start:
+                    break
+                output_fp.write(buffer[start:match_start])
+                output_fp.write(self._replacements[pattern])
+                start = match_end
+
+            end = max(start, safe_end)
+            output_fp.write(buffer[start:end])
+            buffer = buffer[end:]
+
+    def redact_file(self, filename):
+        """Redact ```filename``` in place. The redacted text is written to a temp
+        file which then replaces ```filename``` so ```filename``` is never partially
+        redacted. Bytes which aren't valid UTF-8 are preserved.
+        """
+        if self._reg_ex is None:
+            return
+
+        (fd, temp_filename) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)))
+        try:
+            with open(filename, 'r', encoding='utf-8', errors='surrogateescape', newline='') as input_fp:
+                with os.fdopen(fd, 'w', encoding='utf-8', errors='surrogateescape', newline='') as output_fp:
+                    self.redact_stream(input_fp, output_fp)
+            os.replace(temp_filename, filename)
+        except Exception:
+            try:
+                os.unlink(temp_filename)
+            except OSError:
+                pass
+            raise
 
 
 class RedactingFormatter(object):
@@ -20,21 +215,10 @@ class RedactingFormatter(object):
 
     def __init__(self, original_formatter, crawl_args):
         self.original_formatter = original_formatter
-
-        self._patterns_and_replacements = []
-        for crawl_arg in crawl_args:
-            replacement = hash_crawl_arg(crawl_arg)
-            self._patterns_and_replacements.append((crawl_arg, replacement))
-
-            pattern = '"' + '", "'.join(crawl_arg) + '"'
-            replacement = '"' + '", "'.join(hash_crawl_arg(crawl_arg)) + '"'
-            self._patterns_and_replacements.append((pattern, replacement))
+        self._redactor = Redactor(crawl_args)
 
     def format(self, record):
-        msg = self.original_formatter.format(record)
-        for (pattern, replacement) in self._patterns_and_replacements:
-            msg = msg.replace(pattern, replacement)
-        return msg
+        return self._redactor.redact(self.original_formatter.format(record))
 
     def __getattr__(self, attr):
         return getattr(self.original_formatter, attr)
@@ -45,30 +229,19 @@ class RedactingFilter(logging.Filter):
     def __init__(self, crawl_args):
         super(RedactingFilter, self).__init__()
 
-        self._patterns_and_replacements = []
-        for crawl_arg in crawl_args:
-            replacement = hash_crawl_arg(crawl_arg)
-            self._patterns_and_replacements.append((crawl_arg, replacement))
-
-            pattern = '"' + '", "'.join(crawl_arg) + '"'
-            replacement = '"' + '", "'.join(hash_crawl_arg(crawl_arg)) + '"'
-            self._patterns_and_replacements.append((pattern, replacement))
+        self._redactor = Redactor(crawl_args)
 
     def filter(self, record):
-        record.msg = self.redact(record.msg)
+        record.msg = self._redact(record.msg)
         if isinstance(record.args, dict):
-            for k in record.args.keys():
-                record.args[k] = self._redact(record.args[k])
-        else:
+            record.args = {k: self._redact(v) for (k, v) in record.args.items()}
+        elif record.args:
             record.args = tuple(self._redact(arg) for arg in record.args)
         return True
 
     def _redact(self, msg):
-        msg = None
-        # isinstance(msg, basestring) and msg or str(msg)
-        for (pattern, replacement) in self._patterns_and_replacements:
-            msg = msg.replace(pattern, replacement)
-        return msg
+        # only strings are redacted so args retain their type for %d etc
+        return self._redactor.redact(msg) if isinstance(msg, str) else msg
 
 
 def hash_crawl_arg(crawl_arg):
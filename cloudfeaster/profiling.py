@@ -0,0 +1,124 @@
+"""This module implements the profilers used to profile a spider's ```crawl()```
+when profiling is enabled by the ```profile``` spider metadata or the
+```CLF_PROFILE``` environment variable. Two profilers are available:
+
+* ```cprofile``` - deterministic profiling using ```cProfile``` with stats
+  saved in ```pstats``` format (load with ```pstats.Stats(filename)``` or
+  tools like snakeviz)
+* ```sample``` - a low overhead sampling profiler which periodically captures
+  the stack of the crawl's thread with stacks saved in collapsed stack format
+  (one ```frame;frame;frame count``` line per unique stack) ready for flame
+  graph tools
+
+A profiler profiles the thread which calls :py:meth:`start`. :py:meth:`stop`
+can be called more than once and from any thread (ex when a crawl times out)
+though ```cprofile``` only stops profiling when :py:meth:`stop` is called by
+the profiled thread.
+"""
+
+import collections
+import os
+import sys
+import threading
+
+
+class CProfileProfiler(object):
+
+    filename = 'profile.pstats'
+
+    def __init__(self):
+        object.__init__(self)
+
+        self._profile = None
+        self._thread_id = None
+
+    def start(self):
+        import cProfile
+
+        self._thread_id = threading.get_ident()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self):
+        # cProfile.Profile.disable() stops profiling the calling thread
+        # so calling it from any other thread would be a mistake
+        if threading.get_ident() == self._thread_id:
+            self._profile.disable()
+
+    def dump(self, filename):
+        self._profile.dump_stats(filename)
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', code.co_name)
+    # ';' separates frames and ' ' separates the stack from the count in collapsed stacks
+    frame_name = '%s:%s:%d' % (os.path.basename(code.co_filename), name, code.co_firstlineno)
+    return frame_name.replace(';', ':').replace(' ', '_')
+
+
+class SamplingProfiler(object):
+    """Samples the stack of the thread which calls :py:meth:`start` every
+    ```interval``` seconds. Sampling happens on a separate thread so the
+    profiled thread only pays for the sampling thread holding the GIL.
+    """
+
+    filename = 'profile-collapsed.txt'
+
+    def __init__(self, interval=0.005):
+        object.__init__(self)
+
+        self.interval = interval
+
+        # tuple of frame names (outermost first) -> number of samples
+        self.stacks = collections.Counter()
+        self.number_samples = 0
+
+        self._thread_id = None
+        self._stopped = threading.Event()
+        self._sampling_thread = None
+
+    def start(self):
+        self._thread_id = threading.get_ident()
+        self._sampling_thread = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampling_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._sampling_thread.join()
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id, None)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.reverse()
+
+            self.stacks[tuple(stack)] += 1
+            self.number_samples += 1
+
+    def dump(self, filename):
+        with open(filename, 'w', encoding='utf-8') as fp:
+            for (stack, count) in sorted(self.stacks.items()):
+                fp.write('%s %d\n' % (';'.join(stack), count))
+
+
+_profilers = {
+    'cprofile': CProfileProfiler,
+    'sample': SamplingProfiler,
+}
+
+
+def create_profiler(profiler_name):
+    """Return a new profiler for ```profiler_name``` (```cprofile``` or ```sample```)
+    or ```None``` if ```profiler_name``` is ```off```.
+    """
+    if profiler_name == 'off':
+        return None
+
+    return _profilers[profiler_name]()
@@ -1,10 +1,8 @@
 #!/usr/bin/env python3.9
 # -*- coding: utf-8 -*-
 
-import json
 import sys
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
 from cloudfeaster import spider
@@ -24,51 +22,41 @@ class PythonWheelsSpider(spider.Spider):
 
         data = {}
 
-        xpath = "//div[@class='releases']/table/thead/tr/th"
-        table_header_elements = web_driver_wait.until(lambda browser: browser.find_elements(By.XPATH, xpath))
-        table_headers = [table_header_element.get_text() for table_header_element in table_header_elements]
+        xpath = "//div[@class='releases']/table/thead/tr"
+        columns = {
+            'headers': {'xpath': 'th', 'all': True},
+        }
+        table_headers = web_driver_wait.until(lambda browser: browser.extract(xpath, columns))[0]['headers']
 
-        branch_index = table_headers.index('Branch')
-        branch_date_index = table_headers.index('Branch date')
-        end_of_support_index = table_headers.index('End of support')
-        minor_releases_index = table_headers.index('Minor releases')
+        # XPath positions are 1 based
+        branch_td = 'td[%d]' % (table_headers.index('Branch') + 1)
+        branch_date_td = 'td[%d]' % (table_headers.index('Branch date') + 1)
+        end_of_support_td = 'td[%d]' % (table_headers.index('End of support') + 1)
+        minor_releases_td = 'td[%d]' % (table_headers.index('Minor releases') + 1)
 
         xpath = "//div[@class='releases']/table/tbody/tr"
-        release_elements = web_driver_wait.until(lambda browser: browser.find_elements(By.XPATH, xpath))
-        for release_element in release_elements:
-            release_child_elements = release_element.find_elements(By.XPATH, 'td')
-
-            branch_element = release_child_elements[branch_index]
-            branch = branch_element.get_text()
+        columns = {
+            'branch': branch_td,
+            'url': {'xpath': branch_td + '/a', 'attribute': 'href'},
+            'date': branch_date_td,
+            'eol': end_of_support_td,
+            'minorReleases': {'xpath': minor_releases_td + '/a', 'all': True},
+        }
+        releases = web_driver_wait.until(lambda browser: browser.extract(xpath, columns))
+        for release in releases:
+            branch = release.pop('branch')
             if 'edge' == branch:
                 continue
 
-            url_elements = branch_element.find_elements(By.XPATH, 'a')
-            url_element = url_elements[0]
-            url = url_element.get_attribute('href')
-
-            branch_date_element = release_child_elements[branch_date_index]
-            branch_date = branch_date_element.get_text()
-
-            end_of_support_element = release_child_elements[end_of_support_index]
-            end_of_support = end_of_support_element.get_text()
-
-            minor_releases_elements = release_child_elements[minor_releases_index].find_elements(By.XPATH, 'a')
-            minor_releases = [minor_releases_element.get_text() for minor_releases_element in minor_releases_elements]
-
-            data[branch] = {
-                'date': branch_date,
-                'eol': end_of_support,
-                'url': url,
-                'minorReleases': minor_releases,
-            }
+            data[branch] = release
 
         return spider.CrawlResponseOk(data)
 
 
 if __name__ == '__main__':
     crawl_args = spider.CLICrawlArgs(PythonWheelsSpider)
-    crawler = spider.SpiderCrawler(PythonWheelsSpider)
+    crawler = spider.SpiderCrawler(PythonWheelsSpider, stream_inline_debug=True)
     crawl_result = crawler.crawl(*crawl_args)
-    print(json.dumps(crawl_result))
+    crawl_result.dump(sys.stdout)
+    print('')
     sys.exit(1 if crawl_result.status_code else 0)
@@ -6,7 +6,6 @@ work with identifying and authenticating factors. The key thing to
 focus on with this spider is get_metadata().
 """
 
-import json
 import sys
 
 from selenium.webdriver.common.by import By
@@ -90,7 +89,8 @@ class PyPISpider(spider.Spider):
 
 if __name__ == '__main__':
     crawl_args = spider.CLICrawlArgs(PyPISpider)
-    crawler = spider.SpiderCrawler(PyPISpider)
+    crawler = spider.SpiderCrawler(PyPISpider, stream_inline_debug=True)
     crawl_result = crawler.crawl(*crawl_args)
-    print(json.dumps(crawl_result))
+    crawl_result.dump(sys.stdout)
+    print('')
     sys.exit(1 if crawl_result.status_code else 0)
@@ -1,10 +1,8 @@
 #!/usr/bin/env python3.9
 # -*- coding: utf-8 -*-
 
-import json
 import sys
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
 from cloudfeaster import spider
@@ -24,31 +22,25 @@ class PythonWheelsSpider(spider.Spider):
 
         data = {}
 
-        rank = 1
-
         xpath = "//span[@ng-bind='package.name']"
-        package_name_elements = web_driver_wait.until(lambda browser: browser.find_elements(By.XPATH, xpath))
-        for package_name_element in package_name_elements:
-            package_name = package_name_element.get_text()
-
-            link_element = package_name_element.find_element(By.XPATH, '..')
-            link = link_element.get_attribute('href')
-
-            data[package_name] = {
+        columns = {
+            'name': '.',
+            'link': {'xpath': '..', 'attribute': 'href'},
+        }
+        packages = web_driver_wait.until(lambda browser: browser.extract(xpath, columns))
+        for (rank, package) in enumerate(packages[:10], start=1):
+            data[package['name']] = {
                 'rank': rank,
-                'link': link,
+                'link': package['link'],
             }
 
-            rank += 1
-            if 10 < rank:
-                break
-
         return spider.CrawlResponseOk(data)
 
 
 if __name__ == '__main__':
     crawl_args = spider.CLICrawlArgs(PythonWheelsSpider)
-    crawler = spider.SpiderCrawler(PythonWheelsSpider)
+    crawler = spider.SpiderCrawler(PythonWheelsSpider, stream_inline_debug=True)
     crawl_result = crawler.crawl(*crawl_args)
-    print(json.dumps(crawl_result))
+    crawl_result.dump(sys.stdout)
+    print('')
     sys.exit(1 if crawl_result.status_code else 0)
@@ -1,11 +1,9 @@
 #!/usr/bin/env python3.9
 # -*- coding: utf-8 -*-
 
-import json
 import re
 import sys
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 
 from cloudfeaster import spider
@@ -38,16 +36,17 @@ class XEExchangeRatesSpider(spider.Spider):
         web_driver_wait = WebDriverWait(browser, ten_seconds)
 
         xpath = '//h2[text()="Live Currency Rates"]/../table/tbody/tr'
-        table_row_elements = web_driver_wait.until(lambda browser: browser.find_elements(By.XPATH, xpath))
-        for table_row_element in table_row_elements:
-            from_to_element = table_row_element.find_elements(By.XPATH, 'td[1]/a')[0]
-            rate_element = table_row_element.find_elements(By.XPATH, 'td[2]')[0]
-            from_to = from_to_element.get_text()
-            match = _currency_reg_ex.match(from_to)
+        columns = {
+            'from_to': 'td[1]/a',
+            'rate': {'xpath': 'td[2]', 'type': float},
+        }
+        table_rows = web_driver_wait.until(lambda browser: browser.extract(xpath, columns))
+        for table_row in table_rows:
+            match = _currency_reg_ex.match(table_row['from_to'])
             data['rates'].append({
                 'from': match.group('from'),
                 'to': match.group('to'),
-                'rate': rate_element.get_float(),
+                'rate': table_row['rate'],
             })
 
         return spider.CrawlResponseOk(data)
@@ -55,7 +54,8 @@ class XEExchangeRatesSpider(spider.Spider):
 
 if __name__ == '__main__':
     crawl_args = spider.CLICrawlArgs(XEExchangeRatesSpider)
-    crawler = spider.SpiderCrawler(XEExchangeRatesSpider)
+    crawler = spider.SpiderCrawler(XEExchangeRatesSpider, stream_inline_debug=True)
     crawl_result = crawler.crawl(*crawl_args)
-    print(json.dumps(crawl_result))
+    crawl_result.dump(sys.stdout)
+    print('')
     sys.exit(1 if crawl_result.status_code else 0)
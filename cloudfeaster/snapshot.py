@@ -0,0 +1,296 @@
+"""This module implements page snapshots. Read only spiders spend most of a
+crawl in chromedriver round trips - one per ```find_element()```,
+```get_text()```, ```get_attribute()```, etc. :py:meth:`cloudfeaster.browser.Browser.snapshot`
+serializes the page's DOM with a single round trip and returns a :py:class:`Snapshot`
+which evaluates XPaths locally using lxml. :py:class:`Snapshot` and :py:class:`SnapshotElement`
+implement the read only subset of the :py:class:`cloudfeaster.browser.Browser` and
+:py:class:`cloudfeaster.browser.WebElement` interfaces so existing spider code works
+unchanged.
+
+    page = browser.snapshot()
+    for row in page.find_elements(By.XPATH, '//table/tbody/tr'):
+        rate = row.find_element(By.XPATH, 'td[2]').get_float()
+
+A snapshot is not the browser - Javascript doesn't run, there's no CSS and so
+no notion of visibility (an element's text includes the text of hidden
+descendants) and the snapshot doesn't change when the page changes.
+"""
+
+import re
+import urllib.parse
+
+import lxml.etree
+import lxml.html
+
+from . import extraction
+
+# importing selenium.webdriver is expensive and snapshots are used by the
+# http engine which doesn't need selenium so locators are compared with
+# the values of selenium's By constants (ex By.XPATH == 'xpath') and
+# selenium's exceptions are only imported when they're raised
+_BY_ID = 'id'
+_BY_XPATH = 'xpath'
+_BY_LINK_TEXT = 'link text'
+_BY_PARTIAL_LINK_TEXT = 'partial link text'
+_BY_NAME = 'name'
+_BY_TAG_NAME = 'tag name'
+_BY_CLASS_NAME = 'class name'
+
+
+_whitespace_reg_ex = re.compile(r'\s+')
+
+# lxml won't parse a str with an encoding declaration
+_xml_declaration_reg_ex = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+_spaces_reg_ex = re.compile(r' +')
+
+# text of these elements is never rendered
+_non_text_tags = set(['script', 'style', 'noscript', 'template', 'head'])
+
+# elements which selenium renders on their own line
+_block_tags = set([
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+    'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main',
+    'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul',
+])
+
+# table cells are separated by a space
+_cell_tags = set(['td', 'th'])
+
+# attributes whose value, like selenium's WebElement.get_attribute(), is a resolved url
+_url_attributes = set(['href', 'src', 'action'])
+
+
+def _xpath_literal(value):
+    """Quote ```value``` as an XPath 1.0 string literal."""
+    if '"' not in value:
+        return '"%s"' % value
+    if "'" not in value:
+        return "'%s'" % value
+    return 'concat(%s)' % ', \'"\', '.join('"%s"' % part for part in value.split('"'))
+
+
+def _locator_to_xpath(by, value):
+    """Translate a selenium locator to an XPath relative to the element being searched."""
+    if by == _BY_XPATH:
+        return value
+    if by == _BY_ID:
+        return './/*[@id=%s]' % _xpath_literal(value)
+    if by == _BY_NAME:
+        return './/*[@name=%s]' % _xpath_literal(value)
+    if by == _BY_TAG_NAME:
+        return './/%s' % value
+    if by == _BY_CLASS_NAME:
+        return './/*[contains(concat(" ", normalize-space(@class), " "), %s)]' % _xpath_literal(' %s ' % value)
+    if by == _BY_LINK_TEXT:
+        return './/a[normalize-space(.)=%s]' % _xpath_literal(value.strip())
+    if by == _BY_PARTIAL_LINK_TEXT:
+        return './/a[contains(., %s)]' % _xpath_literal(value)
+    raise ValueError("snapshots don't support locating elements by '%s'" % by)
+
+
+def _text(element):
+    """Approximate the text selenium would return for ```element``` - whitespace
+    is collapsed, leading and trailing whitespace is removed, ```<br>```
+    and block elements (ex ```<p>``` and ```<div>```) start new lines and
+    table cells are separated by a space.
+    """
+    fragments = []
+
+    def walk(e):
+        if not isinstance(e.tag, str) or e.tag in _non_text_tags:
+            # comments and processing instructions have non-str tags
+            return
+        if e.tag == 'br':
+            fragments.append('\n')
+            return
+
+        is_block = e.tag in _block_tags
+        if is_block:
+            fragments.append('\n')
+        # whitespace (including newlines) in the page source is collapsed so
+        # the only newlines in fragments are the ones added for <br> & blocks
+        if e.text:
+            fragments.append(_whitespace_reg_ex.sub(' ', e.text))
+        for child in e:
+            walk(child)
+            if child.tail:
+                fragments.append(_whitespace_reg_ex.sub(' ', child.tail))
+        if is_block:
+            fragments.append('\n')
+        elif e.tag in _cell_tags:
+            fragments.append(' ')
+
+    walk(element)
+
+    lines = ''.join(fragments).split('\n')
+    return '\n'.join(line for line in (_spaces_reg_ex.sub(' ', line).strip() for line in lines) if line)
+
+
+class _Searchable(object):
+    """find_element() and find_elements() shared by :py:class:`Snapshot` and :py:class:`SnapshotElement`."""
+
+    def find_elements(self, by=_BY_ID, value=None):
+        """As per selenium, an XPath which selects something other than
+        elements (ex ```//a/@href```, ```//td/text()``` or ```count(//tr)```)
+        raises ```InvalidSelectorException```.
+        """
+        nodes = self._nodes(_locator_to_xpath(by, value))
+        for node in nodes:
+            if not isinstance(node, lxml.etree.ElementBase):
+                raise _invalid_selector(value, node)
+        return [SnapshotElement(self._snapshot, node) for node in nodes]
+
+    def find_element(self, by=_BY_ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            from selenium.common.exceptions import NoSuchElementException
+            raise NoSuchElementException('Unable to locate element: {"method":"%s","selector":"%s"}' % (by, value))
+        return elements[0]
+
+    def _nodes(self, xpath):
+        """Evaluate ```xpath``` and return the selected nodes - elements, attribute values,
+        text, comments, etc. Raises ```InvalidSelectorException``` if ```xpath``` doesn't
+        select nodes (ex ```count(//tr)```).
+        """
+        results = self._element.xpath(xpath)
+        if not isinstance(results, list):
+            raise _invalid_selector(xpath, results)
+        return results
+
+
+def _invalid_selector(xpath, result):
+    from selenium.common.exceptions import InvalidSelectorException
+    return InvalidSelectorException(
+        "the result of the xpath expression '%s' is %r - it should be an element" % (xpath, result))
+
+
+def _node_value(snapshot, node, attribute):
+    """Like ```value()``` in :py:data:`cloudfeaster.extraction._extract_script` - an
+    attribute value or text selected by an XPath (ex ```a/@href``` or ```td/text()```)
+    is its own value and has no attributes.
+    """
+    if isinstance(node, lxml.etree.ElementBase):
+        return SnapshotElement(snapshot, node)._value(attribute)
+    if attribute is not None:
+        return None
+    # comments and processing instructions have text
+    text = node if isinstance(node, str) else node.text
+    return (text or '').strip()
+
+
+class Snapshot(_Searchable):
+    """A snapshot of a page's DOM - see :py:meth:`cloudfeaster.browser.Browser.snapshot`."""
+
+    def __init__(self, page_source, url=None, paranoia_level=None):
+        object.__init__(self)
+
+        self.page_source = page_source
+        self.current_url = url
+        self._paranoia_level = paranoia_level
+
+        self._snapshot = self
+        if isinstance(page_source, str):
+            page_source = _xml_declaration_reg_ex.sub('', page_source, count=1)
+        self._element = lxml.html.document_fromstring(page_source)
+
+    @property
+    def title(self):
+        titles = self._element.xpath('/html/head/title')
+        return _text(titles[0]) if titles else ''
+
+    def extract(self, row_xpath, columns):
+        """Like :py:meth:`cloudfeaster.browser.Browser.extract` but evaluated locally."""
+        (names, normalized_columns) = extraction.normalize_columns(columns)
+
+        rows = []
+        for row_element in self.find_elements(_BY_XPATH, row_xpath):
+            row = []
+            for column in normalized_columns:
+                nodes = row_element._nodes(column['xpath'])
+                values = [_node_value(self, node, column['attribute']) for node in nodes]
+                if column['all']:
+                    row.append(values)
+                else:
+                    row.append(values[0] if values else None)
+            rows.append(row)
+
+        return extraction.rows_to_dicts(names, normalized_columns, rows)
+
+
+class SnapshotElement(_Searchable):
+    """An element in a :py:class:`Snapshot` which behaves like a read only
+    :py:class:`cloudfeaster.browser.WebElement`.
+    """
+
+    def __init__(self, snapshot, element):
+        object.__init__(self)
+
+        self._snapshot = snapshot
+        self._element = element
+
+    def __eq__(self, other):
+        if not isinstance(other, SnapshotElement):
+            return False
+        return self._element is other._element
+
+    def __hash__(self):
+        return hash(self._element)
+
+    @property
+    def tag_name(self):
+        return self._element.tag
+
+    @property
+    def text(self):
+        return _text(self._element)
+
+    def get_text(self):
+        return self.text
+
+    def get_int(self, reg_ex=None):
+        return extraction.to_number(int, self.get_text(), reg_ex)
+
+    def get_float(self, reg_ex=None):
+        return extraction.to_number(float, self.get_text(), reg_ex)
+
+    def get_attribute(self, name):
+        """Return the value of the attribute ```name``` or ```None``` if the element
+        doesn't have the attribute. As per selenium, urls are resolved relative
+        to the snapshot's url.
+        """
+        value = self._element.get(name)
+        if value is not None and name in _url_attributes and self._snapshot.current_url:
+            return urllib.parse.urljoin(self._snapshot.current_url, value)
+        return value
+
+    def get_selected(self):
+        """Like :py:meth:`cloudfeaster.browser.WebElement.get_selected` return the
+        selected option or ```None``` if no option is selected. As per browsers,
+        the first option of a single selection ```<select>``` without a ```selected```
+        option is selected.
+        """
+        if self._element.tag != 'select':
+            from selenium.common.exceptions import UnexpectedTagNameException
+            raise UnexpectedTagNameException('Select only works on <select> elements, not on %s' % self._element.tag)
+
+        options = self._element.xpath('.//option')
+        for option in options:
+            if option.get('selected') is not None:
+                return SnapshotElement(self._snapshot, option)
+
+        if options and self._element.get('multiple') is None:
+            return SnapshotElement(self._snapshot, options[0])
+
+        return None
+
+    def _value(self, attribute):
+        return self.get_text() if attribute is None else self.get_attribute(attribute)
+
+
+def take_snapshot(browser, paranoia_level):
+    """Implements ```Browser.snapshot()``` and ```RemoteBrowser.snapshot()```.
+    The DOM and the page's url are retrieved with a single webdriver command.
+    """
+    (page_source, url) = browser.execute_script('return [document.documentElement.outerHTML, document.URL];')
+    return Snapshot(page_source, url, paranoia_level)
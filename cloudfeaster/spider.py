@@ -7,34 +7,36 @@ Both :py:class:`Spider` and :py:class:`CrawlResponse`
 are defined in this module.
 """
 
+import ast
+import builtins
+import contextvars
 import copy
 import datetime
 import getpass
 import hashlib
 import inspect
-import imp
 import importlib
+import importlib.util
+import json
 import logging
-import logging.config
 import os
-import pkg_resources
 import pkgutil
+import random
 import re
 import sys
+import threading
 import time
 import tempfile
+import weakref
 
-import colorama
-import dateutil.parser
-import jsonschema
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-import selenium.webdriver.support.select
-
-import cloudfeaster_extension
+import cloudfeaster
+from . import artifacts
+from . import cache
 from . import jsonschemas
+from . import logcapture
 from . import privacy
+from . import profiling
+from . import tracing
 from . import util
 
 _logger = logging.getLogger(__name__)
@@ -48,6 +50,37 @@ _half_a_second = 0.5
 # making calls to time.sleep() easier to understand
 _one_second = 1
 
+# spider class -> (version, metadata, validated metadata) - see
+# Spider._get_cached_validated_metadata()
+_validated_metadata_cache = weakref.WeakKeyDictionary()
+
+
+# selenium is expensive to import so the selenium based classes live in
+# ```cloudfeaster.browser``` which is only imported when one of these
+# names is first used - see __getattr__() below
+_browser_names = ['Browser', 'RemoteBrowser', 'WebElement']
+
+
+def __getattr__(name):
+    """PEP 562 module level ```__getattr__()``` which permits ```spider.Browser```,
+    ```spider.RemoteBrowser``` and ```spider.WebElement``` to continue to work
+    without importing selenium when ```cloudfeaster.spider``` is imported.
+    """
+    if name in _browser_names:
+        from . import browser
+        return getattr(browser, name)
+
+    raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+def _load_source(module_name, filename):
+    """Replacement for the deprecated ```imp.load_source()```."""
+    spec = importlib.util.spec_from_file_location(module_name, filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
 
 def _snake_to_camel_case(s):
     return re.sub(
@@ -57,7 +90,55 @@ def _snake_to_camel_case(s):
 
 
 def _utc_now():
-    return datetime.datetime.utcnow().replace(tzinfo=dateutil.tz.tzutc())
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _elapsed_in_ms(started):
+    """Milliseconds since ```started``` (from ```time.monotonic()```)."""
+    return round(1000.0 * (time.monotonic() - started), 3)
+
+
+# duration unit -> number of seconds - see _duration_in_seconds()
+_seconds_per_duration_unit = {
+    's': 1,
+    'm': 60,
+    'h': 60 * 60,
+    'd': 24 * 60 * 60,
+}
+
+
+def _duration_in_seconds(duration):
+    """Convert a ```ttl``` or ```maxCrawlTime``` metadata value (ex ```45s``` or ```2m```) to seconds."""
+    return int(duration[:-1]) * _seconds_per_duration_unit[duration[-1].lower()]
+
+
+_profiler_names = ['off', 'cprofile', 'sample']
+
+_debug_capture_reg_ex = re.compile(r'^(always|onFailure|never|(100|[1-9]?[0-9])%)$')
+
+
+def _debug_capture(debug_capture_policy):
+    """Apply a ```debugCapture``` policy (```always```, ```onFailure```, ```never```
+    or a sampling percentage like ```10%```) to a single crawl. Returns a tuple
+    of booleans - should debug files be captured during the crawl and should
+    debug files be kept if the crawl succeeds.
+    """
+    if debug_capture_policy == 'always':
+        return (True, True)
+
+    if debug_capture_policy == 'onFailure':
+        return (True, False)
+
+    if debug_capture_policy == 'never':
+        return (False, False)
+
+    sampled = random.random() * 100.0 < int(debug_capture_policy[:-1])
+    return (sampled, sampled)
+
+
+def _is_inline_debug():
+    """Should debug files be inlined in crawl results - see ```CLF_INLINE_DEBUG```."""
+    return True if os.environ.get('CLF_INLINE_DEBUG', None) else False
 
 
 class Spider(object):
@@ -107,113 +188,73 @@ class Spider(object):
         by :py:meth:`Spider.get_metadata`
         to add aspects of the metadata which can be
         determined by inspecting the spider's source code.
+
+        Validation is expensive so validated metadata is cached
+        per spider class - see :py:meth:`Spider._get_cached_validated_metadata`.
+        The caller gets its own copy of the metadata and is therefore
+        free to modify the returned metadata without corrupting the cache.
         """
+        return copy.deepcopy(cls._get_cached_validated_metadata())
 
-        # making a copy of the metadata because we're going to
-        # potentially make modifications to the metadata and
-        # didn't want to mess with the original
-        metadata = copy.deepcopy(cls.get_metadata())
+    @classmethod
+    def _get_cached_validated_metadata(cls):
+        """Returns the same validated metadata as :py:meth:`Spider.get_validated_metadata`
+        but without making a copy of the metadata. The returned metadata is shared
+        by all callers so callers must treat it as read-only.
+
+        The cache is keyed on the spider's class and the spider's
+        :py:meth:`Spider.version`. Reloading a spider's module creates a new spider
+        class (and typically a new version) and therefore a cache miss. Since the cache
+        holds weak references to spider classes, stale classes from reloaded
+        modules drop out of the cache. As a final safety net, a cache entry is only
+        used if :py:meth:`Spider.get_metadata` still returns the metadata that
+        was originally validated.
+        """
+        metadata = cls.get_metadata()
 
         try:
-            jsonschema.validate(metadata, jsonschemas.spider_metadata)
-        except Exception as ex:
-            raise SpiderMetadataError(cls, ex=ex)
-
-        if not metadata.get('categories', []):
-            #
-            # A spider's fully qualified name will be something like gaming_spiders.miniclip.Spider
-            # so in this case the class name is Spider, module name is miniclip and the package
-            # name is gaming_spiders.
-            #
-            # Spiders are grouped into categories.
-            # A spider can appear in more than one category.
-            # A spider's categories are declared as part of the spider's metadata.
-            # If no categories are declared in a spider's metadata then the
-            # spider's default category is used.
-            #
-            metadata['categories'] = [cls.get_default_category()]
-
-        metadata['absoluteFilename'] = sys.modules[cls.__module__].__file__
-        metadata['fullyQualifiedClassName'] = '{module}.{cls}'.format(
-            module=cls.__module__,
-            cls=cls.__name__)
-
-        crawl_method_arg_names = cls._get_crawl_method_arg_names_for_use_as_factors()
-        if crawl_method_arg_names is None:
-            message_detail = "crawl() method arg names not found"
-            raise SpiderMetadataError(cls, message_detail=message_detail)
-
-        identifying_factors = metadata.get("identifyingFactors", {})
-        metadata["identifyingFactors"] = identifying_factors
-
-        authenticating_factors = metadata.get("authenticatingFactors", {})
-        metadata["authenticatingFactors"] = authenticating_factors
-
-        factors = list(identifying_factors.keys())
-        factors.extend(authenticating_factors.keys())
-
-        camel_cased_factors = [_snake_to_camel_case(factor) for factor in factors]
-        expected_camel_cased_crawl_method_arg_names = camel_cased_factors[:]
-
-        camel_cased_crawl_method_arg_names = [_snake_to_camel_case(arg) for arg in crawl_method_arg_names]
-        # :QUESTION: why is a `set()` being used here?
-        if set(expected_camel_cased_crawl_method_arg_names) != set(camel_cased_crawl_method_arg_names):
-            message_detail = "crawl() arg names and factor names don't match"
-            raise SpiderMetadataError(cls, message_detail=message_detail)
-
-        #
-        # factor display order ...
-        #
+            version = cls.version()
+        except (OSError, TypeError):
+            # no source code means no version which means don't cache
+            version = None
 
-        factor_display_order = metadata.get("factorDisplayOrder", None)
-        if factor_display_order is None:
-            metadata["factorDisplayOrder"] = camel_cased_crawl_method_arg_names
-        else:
-            if set(factors) != set(factor_display_order):
-                message_detail = "factors and factor display order don't match"
-                raise SpiderMetadataError(cls, message_detail=message_detail)
+        cache_entry = _validated_metadata_cache.get(cls, None)
+        if cache_entry and version is not None:
+            (cached_version, cached_metadata, validated_metadata) = cache_entry
+            if cached_version == version and cached_metadata == metadata:
+                return validated_metadata
 
-        #
-        # factor display names ...
-        #
+        validated_metadata = cls._validate_metadata(metadata)
 
-        # can only have factor display names for previously identified
-        # identifying and authenticating factors
-        factor_display_names = metadata.get("factorDisplayNames", {})
-        if not set(factor_display_names).issubset(set(factors)):
-            message_detail = "unknown factor(s) in factor display names"
-            raise SpiderMetadataError(cls, message_detail=message_detail)
-
-        # ensure each factor has a factor display name available for
-        # the default language
-        for factor_name in factors:
-            lang_to_display_name = factor_display_names.get(factor_name, {})
-            if "" not in lang_to_display_name:
-                lang_to_display_name[""] = factor_name
-            factor_display_names[factor_name] = lang_to_display_name
-        metadata["factorDisplayNames"] = factor_display_names
+        if version is not None:
+            _validated_metadata_cache[cls] = (version, copy.deepcopy(metadata), validated_metadata)
 
-        #
-        # TTL
-        #
-        metadata["ttl"] = metadata.get("ttl", "60s")
+        return validated_metadata
 
-        #
-        # max concurrent crawls
-        #
-        metadata["maxConcurrentCrawls"] = metadata.get("maxConcurrentCrawls", 3)
+    @classmethod
+    def _validate_metadata(cls, metadata):
+        """Does the real work for :py:meth:`Spider.get_validated_metadata`
+        ie. validates ```metadata``` and adds aspects of the metadata
+        which can be determined by inspecting the spider's source code.
+        """
 
-        #
-        # parnoia level
-        #
-        metadata["paranoiaLevel"] = metadata.get("paranoiaLevel", "low")
+        # making a copy of the metadata because we're going to
+        # potentially make modifications to the metadata and
+        # didn't want to mess with the original
+        metadata = copy.deepcopy(metadata)
 
-        #
-        # maximum crawl time
-        #
-        metadata["maxCrawlTime"] = metadata.get("maxCrawlTime", "30s")
+        try:
+            jsonschemas.validate_metadata(metadata)
+        except Exception as ex:
+            raise SpiderMetadataError(cls, ex=ex)
 
-        return metadata
+        return _complete_metadata(
+            cls,
+            metadata,
+            cls.get_default_category(),
+            sys.modules[cls.__module__].__file__,
+            _fully_qualified_class_name(cls),
+            cls._get_crawl_method_arg_names_for_use_as_factors())
 
     @classmethod
     def get_default_category(cls):
@@ -250,13 +291,13 @@ class Spider(object):
     @property
     def url(self):
         """Returns the URL that the spider will crawl."""
-        metadata = type(self).get_validated_metadata()
+        metadata = type(self)._get_cached_validated_metadata()
         return metadata.get("url", None)
 
     @property
     def paranoia_level(self):
         """Returns the spider's paranoia level."""
-        metadata = type(self).get_validated_metadata()
+        metadata = type(self)._get_cached_validated_metadata()
         return metadata["paranoiaLevel"]
 
     @classmethod
@@ -277,6 +318,135 @@ class Spider(object):
         raise NotImplementedError(fmt % self)
 
 
+def _complete_metadata(spider_class,
+                       metadata,
+                       default_category,
+                       absolute_filename,
+                       fully_qualified_class_name,
+                       crawl_method_arg_names):
+    """Once a spider's metadata has been validated against the spider metadata
+    jsonschema, this function verifies the metadata is consistent with
+    the spider's source code (ex the spider's ```crawl()``` method args and
+    the metadata's factors) and adds defaults for optional metadata. Note that
+    ```metadata``` is modified in place.
+
+    ```spider_class``` is used only to generate error messages and can be
+    either the spider's class or the spider's class name.
+    """
+    if not metadata.get('categories', []):
+        #
+        # A spider's fully qualified name will be something like gaming_spiders.miniclip.Spider
+        # so in this case the class name is Spider, module name is miniclip and the package
+        # name is gaming_spiders.
+        #
+        # Spiders are grouped into categories.
+        # A spider can appear in more than one category.
+        # A spider's categories are declared as part of the spider's metadata.
+        # If no categories are declared in a spider's metadata then the
+        # spider's default category is used.
+        #
+        metadata['categories'] = [default_category]
+
+    metadata['absoluteFilename'] = absolute_filename
+    metadata['fullyQualifiedClassName'] = fully_qualified_class_name
+
+    if crawl_method_arg_names is None:
+        message_detail = "crawl() method arg names not found"
+        raise SpiderMetadataError(spider_class, message_detail=message_detail)
+
+    identifying_factors = metadata.get("identifyingFactors", {})
+    metadata["identifyingFactors"] = identifying_factors
+
+    authenticating_factors = metadata.get("authenticatingFactors", {})
+    metadata["authenticatingFactors"] = authenticating_factors
+
+    factors = list(identifying_factors.keys())
+    factors.extend(authenticating_factors.keys())
+
+    camel_cased_factors = [_snake_to_camel_case(factor) for factor in factors]
+    expected_camel_cased_crawl_method_arg_names = camel_cased_factors[:]
+
+    camel_cased_crawl_method_arg_names = [_snake_to_camel_case(arg) for arg in crawl_method_arg_names]
+    # :QUESTION: why is a `set()` being used here?
+    if set(expected_camel_cased_crawl_method_arg_names) != set(camel_cased_crawl_method_arg_names):
+        message_detail = "crawl() arg names and factor names don't match"
+        raise SpiderMetadataError(spider_class, message_detail=message_detail)
+
+    #
+    # factor display order ...
+    #
+
+    factor_display_order = metadata.get("factorDisplayOrder", None)
+    if factor_display_order is None:
+        metadata["factorDisplayOrder"] = camel_cased_crawl_method_arg_names
+    else:
+        if set(factors) != set(factor_display_order):
+            message_detail = "factors and factor display order don't match"
+            raise SpiderMetadataError(spider_class, message_detail=message_detail)
+
+    #
+    # factor display names ...
+    #
+
+    # can only have factor display names for previously identified
+    # identifying and authenticating factors
+    factor_display_names = metadata.get("factorDisplayNames", {})
+    if not set(factor_display_names).issubset(set(factors)):
+        message_detail = "unknown factor(s) in factor display names"
+        raise SpiderMetadataError(spider_class, message_detail=message_detail)
+
+    # ensure each factor has a factor display name available for
+    # the default language
+    for factor_name in factors:
+        lang_to_display_name = factor_display_names.get(factor_name, {})
+        if "" not in lang_to_display_name:
+            lang_to_display_name[""] = factor_name
+        factor_display_names[factor_name] = lang_to_display_name
+    metadata["factorDisplayNames"] = factor_display_names
+
+    #
+    # TTL
+    #
+    metadata["ttl"] = metadata.get("ttl", "60s")
+
+    #
+    # max concurrent crawls
+    #
+    metadata["maxConcurrentCrawls"] = metadata.get("maxConcurrentCrawls", 3)
+
+    #
+    # parnoia level
+    #
+    metadata["paranoiaLevel"] = metadata.get("paranoiaLevel", "low")
+
+    #
+    # maximum crawl time
+    #
+    metadata["maxCrawlTime"] = metadata.get("maxCrawlTime", "30s")
+
+    #
+    # debug capture policy
+    #
+    metadata["debugCapture"] = metadata.get("debugCapture", "always")
+
+    #
+    # profiler used to profile crawl()
+    #
+    metadata["profile"] = metadata.get("profile", "off")
+
+    #
+    # trace webdriver commands
+    #
+    metadata["traceCommands"] = metadata.get("traceCommands", False)
+
+    #
+    # engine used to fetch pages - chrome or http
+    #
+    metadata["engine"] = metadata.get("engine", "chrome")
+
+    return metadata
+
+
 class SpiderMetadataError(Exception):
     """Raised by :py:meth:`Spider.get_validated_metadata` to indicate
     that :py:meth:`Spider.get_metadata` returned invalid metadata.
@@ -284,7 +454,7 @@ class SpiderMetadataError(Exception):
 
     def __init__(self, spider_class, message_detail=None, ex=None):
         fmt = "Spider class '%s' has invalid metadata"
-        message = fmt % spider_class.__name__
+        message = fmt % getattr(spider_class, '__name__', spider_class)
 
         if message_detail:
             message = "%s - %s" % (message, message_detail)
@@ -295,6 +465,22 @@ class SpiderMetadataError(Exception):
         Exception.__init__(self, message)
 
 
+class SpiderDiscoveryError(Exception):
+    """Raised by :py:meth:`SpiderDiscovery.discover` when discovering spiders
+    in parallel and one or more spider modules couldn't be imported or contain
+    spiders with invalid metadata. ```errors``` is a dict of spider module name
+    to a list of error messages for the module.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+
+        fmt = "Errors discovering spiders in %d module(s) - %s"
+        message = fmt % (len(errors), ', '.join(sorted(errors.keys())))
+
+        Exception.__init__(self, message)
+
+
 class CLICrawlArgs(list):
     """During spider authoring, spiders are run from the command line
     using the standard Python if __name__ == "__main__". In this mode,
@@ -327,7 +513,8 @@ class CLICrawlArgs(list):
             crawl_args = spider.CLICrawlArgs(MySpider)
             crawler = spider.SpiderCrawler(PyPISpider)
             crawl_result = crawler.crawl(*crawl_args)
-            print(json.dumps(crawl_result))
+            crawl_result.dump(sys.stdout)
+            print('')
             sys.exit(1 if crawl_result.status_code else 0)
 
     CLICrawlArgs depends heavily on a spider's metadata so spend
@@ -403,6 +590,7 @@ class CLICrawlArgs(list):
                 "\n".join(["- %d. %s" % (i + 1, enums[i]) for i in range(0, len(enums))]),
                 )
         else:
+            import colorama
             prompt = "%s%s%s> " % (colorama.Style.BRIGHT, factor_display_name, colorama.Style.RESET_ALL)
 
         sys.stdout.write(prompt)
@@ -442,6 +630,10 @@ class CrawlResponse(dict):
     SC_BAD_CREDENTIALS = 400 + 7
     SC_ACCOUNT_LOCKED_OUT = 400 + 8
     SC_COULD_NOT_CONFIRM_LOGIN_STATUS = 400 + 9
+    SC_INVALID_CRAWL_REQUEST = 400 + 10
+    SC_DEADLINE_EXCEEDED = 400 + 11
+    SC_CRAWL_TIMED_OUT = 400 + 12
+    SC_CRAWL_CANCELLED = 400 + 13
     SC_UNKNOWN = 500
 
     def __init__(self, status_code, status, *args, **kwargs):
@@ -457,6 +649,19 @@ class CrawlResponse(dict):
     def status_code(self):
         return self.get('_metadata', {}).get('status', {}).get('code', type(self).SC_UNKNOWN)
 
+    def dump(self, fp):
+        """Write the crawl response as JSON to the text file ```fp``` streaming
+        debug files into the output as data URIs (see :py:func:`cloudfeaster.util.write_json`)
+        rather than building the entire JSON document in memory. Once written,
+        streamed debug files are deleted.
+        """
+        util.write_json(self, fp)
+
+        crawl_artifacts = getattr(self, 'crawl_artifacts', None)
+        if crawl_artifacts is not None:
+            crawl_artifacts.delete()
+            self.crawl_artifacts = None
+
 
 class CrawlResponseOk(CrawlResponse):
 
@@ -536,6 +741,46 @@ class CrawlResponseCtrRaisedException(CrawlResponse):
                                **kwargs)
 
 
+class CrawlResponseInvalidCrawlRequest(CrawlResponse):
+
+    def __init__(self, message_detail, *args, **kwargs):
+        CrawlResponse.__init__(self,
+                               CrawlResponse.SC_INVALID_CRAWL_REQUEST,
+                               'invalid crawl request - %s' % message_detail,
+                               *args,
+                               **kwargs)
+
+
+class CrawlResponseDeadlineExceeded(CrawlResponse):
+
+    def __init__(self, *args, **kwargs):
+        CrawlResponse.__init__(self,
+                               CrawlResponse.SC_DEADLINE_EXCEEDED,
+                               'deadline exceeded before crawl started',
+                               *args,
+                               **kwargs)
+
+
+class CrawlResponseCrawlTimedOut(CrawlResponse):
+
+    def __init__(self, max_crawl_time, *args, **kwargs):
+        CrawlResponse.__init__(self,
+                               CrawlResponse.SC_CRAWL_TIMED_OUT,
+                               'spider crawl exceeded max crawl time of %s' % max_crawl_time,
+                               *args,
+                               **kwargs)
+
+
+class CrawlResponseCrawlCancelled(CrawlResponse):
+
+    def __init__(self, *args, **kwargs):
+        CrawlResponse.__init__(self,
+                               CrawlResponse.SC_CRAWL_CANCELLED,
+                               'spider crawl cancelled',
+                               *args,
+                               **kwargs)
+
+
 class CrawlResponseSpiderNotFound(CrawlResponse):
 
     def __init__(self, full_spider_class_name, *args, **kwargs):
@@ -546,6 +791,58 @@ class CrawlResponseSpiderNotFound(CrawlResponse):
                                **kwargs)
 
 
+class _Crawl(object):
+    """The state of a single :py:meth:`SpiderCrawler.crawl` shared by the caller's
+    thread and the crawl's thread - see :py:meth:`SpiderCrawler._crawl_with_watchdog`.
+    A crawl thread only ever updates its own ```_Crawl``` so a crawl thread which
+    is abandoned, because its crawl timed out or was cancelled, can't interfere
+    with later crawls.
+    """
+
+    def __init__(self):
+        object.__init__(self)
+
+        # the browser used by the crawl, whether the crawl exceeded its max crawl
+        # time or was cancelled and an event which is set when the crawl thread
+        # finishes or the crawl is cancelled - all guarded by lock
+        self.lock = threading.Lock()
+        self.browser = None
+        self.timed_out = False
+        self.cancelled = False
+        self.finished = threading.Event()
+
+        # how the crawl thread crawls - see SpiderCrawler._crawl()
+        self.capture_debug = True
+        self.keep_debug_on_success = True
+        self.profiler_name = 'off'
+        self.trace_commands = False
+        self.engine = 'chrome'
+        self.network_fixtures = None
+        self.crawl_artifacts = None
+
+        # what the crawl thread produces - the running profiler is
+        # here so the watchdog can stop the profiler if the crawl
+        # times out or is cancelled
+        self.crawl_response = None
+        self.phases = {}
+        self.profiler = None
+        self.command_trace = None
+        self.chromedriver_log_file = None
+        self.screenshot_file = None
+        self.profile_file = None
+        self.command_trace_file = None
+
+    @property
+    def aborted(self):
+        return self.timed_out or self.cancelled
+
+    def artifact_filename(self, name):
+        """Return the name of the file in the crawl's artifact directory
+        for the debug file called ```name```.
+        """
+        return self.crawl_artifacts.filename(name)
+
+
 class SpiderCrawler(object):
     """SpiderCrawler is a wrapper for ```Spider.crawl()``` ensuring
     exceptions are always caught and and instance of ```CrawlResponse```
@@ -556,38 +853,173 @@ class SpiderCrawler(object):
 
         if __name__ == '__main__':
             crawl_args = spider.CLICrawlArgs(PyPISpider)
-            crawler = spider.SpiderCrawler(PyPISpider)
+            crawler = spider.SpiderCrawler(PyPISpider, stream_inline_debug=True)
             crawl_result = crawler.crawl(crawl_args)
-            print(json.dumps(crawl_result))
+            crawl_result.dump(sys.stdout)
+            print('')
             sys.exit(1 if crawl_result.status_code else 0)
+
+    By default each crawl starts (and quits) a new browser. Supply
+    ```browser_pool``` (a :py:class:`cloudfeaster.browser.BrowserPool`) to
+    lease a warm browser from the pool instead.
+
+    If ```crawl_result_cache``` (a :py:class:`cloudfeaster.cache.CrawlResultCache`)
+    is supplied, successful crawl results are cached for the spider's ```ttl```
+    and a cached crawl result is returned, without crawling, if there is one.
+    ```_metadata.cacheHit``` indicates if the crawl result came from the cache.
+
+    When the ```CLF_INLINE_DEBUG``` environment variable is set debug files
+    are inlined in ```_debug``` as data URIs. By default the data URIs are
+    built in memory. If ```stream_inline_debug``` is ```True``` the values
+    in ```_debug``` are instead :py:class:`cloudfeaster.util.DataURIFile`
+    instances and the data URIs are streamed from the debug files when the
+    crawl response is written with :py:meth:`CrawlResponse.dump`.
+
+    Debug files are written to a per-crawl directory created by ```artifact_manager```
+    (a :py:class:`cloudfeaster.artifacts.ArtifactManager`) or, if ```artifact_manager```
+    isn't supplied, by the artifact manager returned by
+    :py:func:`cloudfeaster.artifacts.get_default_artifact_manager`. Inlined debug
+    files are deleted once they've been inlined (or, when streaming, written)
+    and other debug files are retained subject to the artifact manager's retention cap.
+
+    If ```network_fixtures``` (a :py:class:`cloudfeaster.netfixtures.NetworkFixtures`)
+    is supplied, or the ```CLF_RECORD_FIXTURES``` or ```CLF_REPLAY_FIXTURES```
+    environment variable is set, the crawl's network traffic is recorded to, or
+    replayed from, a fixture archive. Crawls using network fixtures don't use
+    ```browser_pool``` or ```crawl_result_cache```.
     """
 
-    def __init__(self, full_spider_class_name):
+    def __init__(self,
+                 full_spider_class_name,
+                 browser_pool=None,
+                 crawl_result_cache=None,
+                 stream_inline_debug=False,
+                 artifact_manager=None,
+                 network_fixtures=None):
         object.__init__(self)
 
         self.full_spider_class_name = full_spider_class_name
-
+        self.browser_pool = browser_pool
+        self.crawl_result_cache = crawl_result_cache
+        self.stream_inline_debug = stream_inline_debug
+        self.artifact_manager = artifact_manager
+        self.network_fixtures = network_fixtures
+
+        # the crawl's debug files - see _artifact_filename()
+        self._crawl_artifacts = None
+        self._crawl_log = None
+        self._redactor = None
         self.logging_file = None
         self.chromedriver_log_file = None
         self.screenshot_file = None
+        self.profile_file = None
+        self.command_trace_file = None
+
+        # the in progress crawl (a _Crawl) and, if cancel() is called
+        # when there's no crawl in progress, a flag which cancels
+        # the next crawl - see cancel()
+        self._lock = threading.Lock()
+        self._crawl_state = None
+        self._cancelled = False
+
+        # crawl threads which may still be running - see wait_for_crawl_threads()
+        self._crawl_threads = []
+
+        # phase -> duration in ms - see _record_phase()
+        self._phases = {}
+
+        # the crawl's webdriver command trace - see _start_command_trace()
+        self._command_trace = None
+
+        # see _get_network_fixtures()
+        self._network_fixtures = None
 
     def crawl(self, *args, **kwargs):
-        self._configure_logging(args)
+        crawl_state = self._start_crawl()
+        try:
+            return self._crawl(crawl_state, args, kwargs)
+        finally:
+            with self._lock:
+                if self._crawl_state is crawl_state:
+                    self._crawl_state = None
+
+    def _start_crawl(self):
+        """Reset the state left behind by the previous crawl and return
+        the state of a new crawl. If :py:meth:`SpiderCrawler.cancel` was called
+        when there was no crawl in progress the new crawl is cancelled.
+        """
+        self._phases = {}
+        self._command_trace = None
+        self._network_fixtures = None
+        self.logging_file = None
+        self.chromedriver_log_file = None
+        self.screenshot_file = None
+        self.profile_file = None
+        self.command_trace_file = None
+
+        crawl_state = _Crawl()
+        with self._lock:
+            crawl_state.cancelled = self._cancelled
+            self._cancelled = False
+            self._crawl_state = crawl_state
 
+        return crawl_state
+
+    def _crawl(self, crawl_state, args, kwargs):
         #
         # get the spider's class
         #
+        phase_started = time.monotonic()
         (spider_class, crawl_response) = self._get_spider_class()
         if crawl_response:
             return crawl_response
+        self._record_phase('spiderClass', phase_started)
+
+        self._network_fixtures = self._get_network_fixtures()
+        crawl_state.network_fixtures = self._network_fixtures
+
+        #
+        # return a cached crawl result if there is one
+        #
+        cache_key = self._get_cache_key(spider_class, args, kwargs)
+        if cache_key:
+            crawl_response = self._get_cached_crawl_response(cache_key)
+            if crawl_response:
+                return crawl_response
+
+        #
+        # decide if debug files (crawl log, chromedriver log and
+        # screenshot) are captured for this crawl
+        #
+        debug_capture_policy = self._get_debug_capture_policy(spider_class)
+        (crawl_state.capture_debug, crawl_state.keep_debug_on_success) = _debug_capture(debug_capture_policy)
+        if crawl_state.capture_debug:
+            self._configure_logging(list(args) + list(kwargs.values()))
+            crawl_state.crawl_artifacts = self._crawl_artifacts
+            crawl_state.profiler_name = self._get_profiler_name(spider_class)
+        crawl_state.trace_commands = self._get_trace_commands(spider_class)
+        crawl_state.engine = self._get_engine(spider_class)
 
         #
         # create an instance of the spider
         #
+        phase_started = time.monotonic()
         try:
             spider = spider_class()
         except Exception as ex:
+            self._discard_debug_files()
             return CrawlResponseCtrRaisedException(ex)
+        self._record_phase('spiderConstruction', phase_started)
+
+        #
+        # start recording or replaying the crawl's network traffic
+        #
+        if self._network_fixtures is not None:
+            try:
+                self._network_fixtures.start(spider.paranoia_level)
+            except Exception as ex:
+                self._discard_debug_files()
+                return CrawlResponseCrawlRaisedException(ex)
 
         #
         # call the spider's crawl() method, validate crawl
@@ -595,21 +1027,14 @@ class SpiderCrawler(object):
         #
         dt_start = _utc_now()
         try:
-            (_, self.chromedriver_log_file) = tempfile.mkstemp()
-            with self._get_browser(spider.url, spider.paranoia_level, self.chromedriver_log_file) as browser:
-                try:
-                    crawl_response = spider.crawl(browser, *args, **kwargs)
-                except Exception as ex:
-                    crawl_response = CrawlResponseCrawlRaisedException(ex)
-
-                if not isinstance(crawl_response, CrawlResponse):
-                    crawl_response = CrawlResponseInvalidCrawlReturnType()
-
-                self.screenshot_file = self._take_screenshot(browser)
+            max_crawl_time = spider_class.get_validated_metadata()['maxCrawlTime']
+            crawl_response = self._crawl_with_watchdog(crawl_state, spider, max_crawl_time, args, kwargs)
         except Exception as ex:
             crawl_response = CrawlResponseCrawlRaisedException(ex)
         dt_end = _utc_now()
 
+        self._stop_network_fixtures()
+
         crawl_response['_metadata'].update({
             'spider': {
                 'name': os.path.basename(sys.modules[type(spider).__module__].__file__),
@@ -621,9 +1046,23 @@ class SpiderCrawler(object):
             'crawlTime': {
                 'started': dt_start.isoformat(),
                 'durationInMs': int(1000.0 * (dt_end - dt_start).total_seconds()),
+                'phases': dict(self._phases),
             },
         })
 
+        if self._command_trace is not None:
+            crawl_response['_metadata']['webDriverCommands'] = self._command_trace.summary()
+
+        if self._network_fixtures is not None:
+            crawl_response['_metadata']['networkFixtures'] = self._network_fixtures.summary()
+
+        if crawl_response.status_code == CrawlResponse.SC_OK and not crawl_state.keep_debug_on_success:
+            self._discard_debug_files()
+
+        phase_started = time.monotonic()
+        self._close_logging_file()
+        self._redact_chromedriver_log()
+
         self._add_debug_file_to_crawl_response(
             'screenshot',
             self._file_to_data_uri_scheme(self.screenshot_file),
@@ -639,352 +1078,633 @@ class SpiderCrawler(object):
             self._file_to_data_uri_scheme(self.chromedriver_log_file),
             crawl_response)
 
+        self._add_debug_file_to_crawl_response(
+            'profile',
+            self._file_to_data_uri_scheme(self.profile_file),
+            crawl_response)
+
+        self._add_debug_file_to_crawl_response(
+            'webDriverTrace',
+            self._file_to_data_uri_scheme(self.command_trace_file),
+            crawl_response)
+
+        self._release_artifacts(crawl_response)
+        crawl_response['_metadata']['crawlTime']['phases']['artifactEncoding'] = _elapsed_in_ms(phase_started)
+
         #
         # verify ```crawl_response```
         #
+        phase_started = time.monotonic()
         try:
-            jsonschema.validate(crawl_response, jsonschemas.crawl_result)
+            jsonschemas.validate_crawl_result(crawl_response, first_error_only=True)
         except Exception as ex:
             return CrawlResponseInvalidCrawlResponse(ex)
+        crawl_response['_metadata']['crawlTime']['phases']['validation'] = _elapsed_in_ms(phase_started)
+
+        #
+        # cache successful crawl results
+        #
+        if cache_key:
+            crawl_response['_metadata']['cacheHit'] = False
+            if crawl_response.status_code == CrawlResponse.SC_OK:
+                ttl = spider_class.get_validated_metadata()['ttl']
+                self.crawl_result_cache.put(cache_key, crawl_response, _duration_in_seconds(ttl))
 
         return crawl_response
 
-    def _file_to_data_uri_scheme(self, filename):
-        is_inline_debug = True if os.environ.get('CLF_INLINE_DEBUG', None) else False
-        if not is_inline_debug:
-            return filename
+    def _get_cache_key(self, spider_class, args, kwargs):
+        """Returns ```None``` if crawl results shouldn't be cached."""
+        if self.crawl_result_cache is None or self._network_fixtures is not None:
+            return None
 
-        return util.file_to_data_uri_scheme(filename)
+        try:
+            # the spider's ttl is required to cache crawl results
+            spider_class.get_validated_metadata()
+        except SpiderMetadataError:
+            return None
 
-    def _add_debug_file_to_crawl_response(self, key, value, crawl_response):
-        if key and value:
-            if '_debug' not in crawl_response:
-                crawl_response['_debug'] = {}
+        return cache.crawl_result_cache_key(
+            _fully_qualified_class_name(spider_class),
+            spider_class.version(),
+            args,
+            kwargs)
 
-            crawl_response['_debug'][key] = value
+    def _get_cached_crawl_response(self, cache_key):
+        cached_crawl_result = self.crawl_result_cache.get(cache_key)
+        if cached_crawl_result is None:
+            return None
 
-    def _get_spider_class(self):
-        #
-        # deal with scenario where self.full_spider_class_name
-        # is in fact already a spider's class
-        #
-        if not isinstance(self.full_spider_class_name, str):
-            #
-            # so self.full_spider_class_name wasn't actually the name
-            # of the spider. or more precisely it wasn't a string and
-            # therefore we assume it's actually the spider's class
-            #
-            return (self.full_spider_class_name, None)
+        crawl_response = CrawlResponseOk()
+        crawl_response.update(cached_crawl_result)
+        crawl_response['_metadata']['cacheHit'] = True
 
-        #
-        # is self.full_spider_class_name actually a pointer to a
-        # spider sitting in some arbitrary file. this is particuarly
-        # useful when testing spiderhost.py
-        #
-        reg_ex_pattern = r'\s*(?P<spider_module_filename>.+.py):(?P<spider_class_name>[^\s]+Spider)\s*$'
-        reg_ex = re.compile(reg_ex_pattern, flags=re.IGNORECASE)
-        match = reg_ex.match(self.full_spider_class_name)
-        if match:
-            try:
-                spider_module_filename = match.group('spider_module_filename')
-                spider_class_name = match.group('spider_class_name')
-                spider_module = imp.load_source('doicareaboutthisname', spider_module_filename)
-                spider_class = getattr(spider_module, spider_class_name)
-                return (spider_class, None)
-            except Exception:
-                return (None, CrawlResponseSpiderNotFound(self.full_spider_class_name))
+        return crawl_response
 
-        #
-        # parse the full name of the spider, identify & load the
-        # module containing the spider and find the spider class
-        # in the loaded module
-        #
+    def _crawl_with_watchdog(self, crawl_state, spider, max_crawl_time, args, kwargs):
+        """A hung ```Spider.crawl()``` or a webdriver command which never returns
+        would otherwise block the caller forever. The crawl runs in a separate
+        thread and if the crawl hasn't finished after ```max_crawl_time``` the
+        browser (along with chromedriver and all of chrome's processes) is killed,
+        the crawl's profiler is stopped, the crawl thread is abandoned and a
+        :py:class:`CrawlResponseCrawlTimedOut` is returned. :py:meth:`SpiderCrawler.cancel`
+        abandons the crawl in the same way. The crawl thread only updates ```crawl_state```
+        so an abandoned crawl thread can't interfere with later crawls. An abandoned
+        crawl thread can keep running - see :py:meth:`SpiderCrawler.wait_for_crawl_threads`.
+        """
+        with crawl_state.lock:
+            if crawl_state.cancelled:
+                return CrawlResponseCrawlCancelled()
+
+        def crawl():
+            crawl_response = self._crawl_with_browser(crawl_state, spider, args, kwargs)
+            with crawl_state.lock:
+                crawl_state.crawl_response = crawl_response
+            crawl_state.finished.set()
+
+        # the crawl thread runs in a copy of this thread's context so its log records are captured
+        crawl_thread = threading.Thread(target=contextvars.copy_context().run, args=(crawl,), name='crawl', daemon=True)
+        crawl_thread.start()
+        with self._lock:
+            self._crawl_threads = [thread for thread in self._crawl_threads if thread.is_alive()]
+            self._crawl_threads.append(crawl_thread)
+        crawl_state.finished.wait(_duration_in_seconds(max_crawl_time))
+
+        with crawl_state.lock:
+            self._phases.update(crawl_state.phases)
+            self._command_trace = crawl_state.command_trace
+
+            if crawl_state.crawl_response is not None:
+                self.chromedriver_log_file = crawl_state.chromedriver_log_file
+                self.screenshot_file = crawl_state.screenshot_file
+                self.profile_file = crawl_state.profile_file
+                self.command_trace_file = crawl_state.command_trace_file
+                return crawl_state.crawl_response
+
+            if crawl_state.cancelled:
+                # cancel() has already killed the browser
+                browser = None
+                crawl_response = CrawlResponseCrawlCancelled()
+            else:
+                crawl_state.timed_out = True
+                browser = crawl_state.browser
+                crawl_response = CrawlResponseCrawlTimedOut(max_crawl_time)
+            profiler = crawl_state.profiler
+            crawl_state.profiler = None
+
+        if crawl_state.timed_out:
+            _logger.error('crawl exceeded max crawl time of %s - killing browser', max_crawl_time)
+
+        if browser is not None:
+            self._kill_browser(browser)
+
+        if profiler is not None:
+            self._stop_profiler(crawl_state, profiler)
+
+        return crawl_response
+
+    def cancel(self):
+        """Called from another thread to abandon an in progress crawl. The crawl's
+        browser is killed and :py:meth:`SpiderCrawler.crawl` returns a
+        :py:class:`CrawlResponseCrawlCancelled` without waiting for the spider's
+        ```crawl()``` to finish. If there's no crawl in progress the next crawl
+        is cancelled before it starts.
+        """
+        with self._lock:
+            crawl_state = self._crawl_state
+            if crawl_state is None:
+                self._cancelled = True
+                return
+
+        with crawl_state.lock:
+            crawl_state.cancelled = True
+            browser = crawl_state.browser
+
+        if browser is not None:
+            self._kill_browser(browser)
+
+        crawl_state.finished.set()
+
+    def wait_for_crawl_threads(self, timeout=None):
+        """A crawl which times out or is cancelled returns without waiting for its
+        crawl thread - the crawl's browser is killed so the crawl thread usually exits
+        soon after but a spider can keep the crawl thread running for as long as it likes.
+        Block until all crawl threads started by this crawler have exited or ```timeout```
+        seconds (default = wait forever) have elapsed and return ```True``` if all
+        crawl threads have exited. Callers which bound the number of concurrent crawls
+        call this method before starting another crawl so abandoned crawl threads
+        count against the bound.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            crawl_threads = list(self._crawl_threads)
+
+        for crawl_thread in crawl_threads:
+            crawl_thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+
+        with self._lock:
+            self._crawl_threads = [thread for thread in self._crawl_threads if thread.is_alive()]
+            return not self._crawl_threads
+
+    def _crawl_with_browser(self, crawl_state, spider, args, kwargs):
+        """Called in the crawl thread - see :py:meth:`SpiderCrawler._crawl_with_watchdog`."""
+        command_trace = None
         try:
-            split_full_spider_class_name = self.full_spider_class_name.split(".")
-            spider_module_name = ".".join(split_full_spider_class_name[:-1])
-            spider_class_name = split_full_spider_class_name[-1]
-            spider_module = importlib.import_module(spider_module_name)
-            spider_class = getattr(spider_module, spider_class_name)
-            return (spider_class, None)
-        except Exception:
-            return (None, CrawlResponseSpiderNotFound(self.full_spider_class_name))
+            phase_started = time.monotonic()
+            # pooled browsers would outlive the network fixtures proxy
+            use_browser_pool = (
+                self.browser_pool and
+                crawl_state.engine == 'chrome' and
+                crawl_state.network_fixtures is None
+            )
+            if use_browser_pool:
+                # pooled browsers outlive crawls so there's no per crawl chromedriver log
+                browser_context = self.browser_pool.lease(None, spider.paranoia_level)
+            else:
+                if crawl_state.capture_debug and crawl_state.engine == 'chrome':
+                    crawl_state.chromedriver_log_file = crawl_state.artifact_filename('chromedriver-log.txt')
+                # the crawl's requests go through the network fixtures proxy, if there is one
+                fixtures_proxy = crawl_state.network_fixtures.proxy if crawl_state.network_fixtures else None
+                browser_context = self._get_browser(
+                    spider.url,
+                    spider.paranoia_level,
+                    crawl_state.chromedriver_log_file,
+                    engine=crawl_state.engine,
+                    fixtures_proxy=fixtures_proxy)
+                self._set_browser(crawl_state, browser_context)
+            self._record_phase('browserLaunch', phase_started, crawl_state)
+
+            command_trace = self._start_command_trace(crawl_state)
+
+            # Browser.__enter__() navigates to the spider's url
+            phase_started = time.monotonic()
+            with browser_context as browser:
+                if use_browser_pool:
+                    self._set_browser(crawl_state, browser)
+                    browser.get(spider.url)
+                self._record_phase('navigation', phase_started, crawl_state)
+
+                profiler = self._start_profiler(crawl_state)
+                phase_started = time.monotonic()
+                try:
+                    crawl_response = spider.crawl(browser, *args, **kwargs)
+                except Exception as ex:
+                    crawl_response = CrawlResponseCrawlRaisedException(ex)
+                self._record_phase('crawl', phase_started, crawl_state)
+                self._stop_profiler(crawl_state, profiler)
+                self._stop_command_trace(crawl_state, command_trace)
 
-    def _get_browser(self, url, paranoia_level, chromedriver_log_file):
-        """This private method exists to allow unit tests to mock out the method.
-        export CLF_REMOTE_CHROMEDRIVER=http://host.docker.internal:9515
+                if not isinstance(crawl_response, CrawlResponse):
+                    crawl_response = CrawlResponseInvalidCrawlReturnType()
+
+                if crawl_state.capture_debug:
+                    if crawl_state.keep_debug_on_success or crawl_response.status_code != CrawlResponse.SC_OK:
+                        phase_started = time.monotonic()
+                        crawl_state.screenshot_file = self._take_screenshot(browser, crawl_state)
+                        self._record_phase('screenshot', phase_started, crawl_state)
+        except Exception as ex:
+            crawl_response = CrawlResponseCrawlRaisedException(ex)
+        finally:
+            self._stop_command_trace(crawl_state, command_trace)
+
+        return crawl_response
+
+    def _record_phase(self, phase, phase_started, crawl_state=None):
+        """Record the duration in ms of ```phase``` which started at
+        ```phase_started``` (from ```time.monotonic()```). Phases recorded
+        in the crawl thread are recorded in ```crawl_state```.
         """
-        remote_chromedriver = os.environ.get('CLF_REMOTE_CHROMEDRIVER', None)
-        if remote_chromedriver:
-            return RemoteBrowser(remote_chromedriver, url, paranoia_level)
-        return Browser(url, paranoia_level, chromedriver_log_file)
+        if crawl_state is None:
+            self._phases[phase] = _elapsed_in_ms(phase_started)
+            return
 
-    def _take_screenshot(self, browser):
-        """This is a private method which takes a screenshot of the browser's
-        current window and then adds the name of the temp file containing the
-        screenshot to the crawl response.
+        with crawl_state.lock:
+            crawl_state.phases[phase] = _elapsed_in_ms(phase_started)
+
+    def _set_browser(self, crawl_state, browser):
+        """Record the crawl's browser so the watchdog can kill it. If the crawl
+        has already timed out or been cancelled the browser is killed immediately.
         """
-        (_, no_extension_screenshot) = tempfile.mkstemp()
-        screenshot_file = no_extension_screenshot + '.png'
-        os.rename(no_extension_screenshot, screenshot_file)
-        browser.save_screenshot(screenshot_file)
-        return screenshot_file
+        with crawl_state.lock:
+            crawl_state.browser = browser
+            aborted = crawl_state.aborted
 
-    def _configure_logging(self, crawl_args):
-        clf_debug_value = os.environ.get('CLF_DEBUG', '')
-        reg_ex_pattern = '^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$'
-        reg_ex = re.compile(reg_ex_pattern, re.IGNORECASE)
-        logging_level = clf_debug_value.upper() if reg_ex.match(clf_debug_value) else 'ERROR'
+        if aborted:
+            self._kill_browser(browser)
 
-        (_, self.logging_file) = tempfile.mkstemp()
+    def _kill_browser(self, browser):
+        try:
+            browser.kill()
+        except Exception as ex:
+            _logger.error('error killing browser - %s', ex)
 
-        logging.Formatter.converter = time.gmtime
+    def _get_debug_capture_policy(self, spider_class):
+        """The ```CLF_DEBUG_CAPTURE``` environment variable overrides
+        the spider's ```debugCapture``` metadata.
+        """
+        debug_capture_policy = os.environ.get('CLF_DEBUG_CAPTURE', None)
+        if debug_capture_policy:
+            if _debug_capture_reg_ex.match(debug_capture_policy):
+                return debug_capture_policy
+            _logger.error("ignoring invalid CLF_DEBUG_CAPTURE '%s'", debug_capture_policy)
 
-        logging_config = {
-            'version': 1,
-            'disable_existing_loggers': False,
-            'formatters': {
-                'standard': {
-                    'format': '%(asctime)s.%(msecs)03d+00:00 %(levelname)s %(module)s:%(lineno)d %(message)s',
-                },
-            },
-            'handlers': {
-                'file': {
-                    'class': 'logging.FileHandler',
-                    'filename': self.logging_file,
-                    'mode': 'a',
-                    'formatter': 'standard',
-                    'filters': [
-                        # privacy.RedactingFilter(crawl_args),
-                    ],
-                },
-            },
-            'root': {
-                'level': logging_level,
-                'handlers': [
-                    'file',
-                ],
-            },
-        }
+        try:
+            return spider_class.get_validated_metadata()['debugCapture']
+        except SpiderMetadataError:
+            # the crawl will fail so capture everything
+            return 'always'
+
+    def _artifact_filename(self, name):
+        """Return the name of the file in this crawl's artifact directory
+        for the debug file called ```name```.
+        """
+        if self._crawl_artifacts is None:
+            artifact_manager = self.artifact_manager or artifacts.get_default_artifact_manager()
+            self._crawl_artifacts = artifact_manager.create()
 
-        logging.config.dictConfig(logging_config)
+        return self._crawl_artifacts.filename(name)
 
-        # :TODO: can this be configured in 'logging_config'?
-        # privacy.RedactingFormatter.install_for_all_handlers(crawl_args)
+    def _get_profiler_name(self, spider_class):
+        """The ```CLF_PROFILE``` environment variable overrides
+        the spider's ```profile``` metadata.
+        """
+        profiler_name = os.environ.get('CLF_PROFILE', None)
+        if profiler_name:
+            if profiler_name in _profiler_names:
+                return profiler_name
+            _logger.error("ignoring invalid CLF_PROFILE '%s'", profiler_name)
 
+        try:
+            return spider_class.get_validated_metadata()['profile']
+        except SpiderMetadataError:
+            return 'off'
+
+    def _start_profiler(self, crawl_state):
+        """Called in the crawl thread. Returns ```None``` if ```crawl()``` isn't profiled."""
+        profiler = profiling.create_profiler(crawl_state.profiler_name)
+        if profiler is None:
+            return None
 
-class RemoteBrowser(webdriver.Remote):
+        try:
+            profiler.start()
+        except Exception as ex:
+            # ex cProfile is already profiling this thread
+            _logger.error("unable to start '%s' profiler - %s", crawl_state.profiler_name, ex)
+            return None
 
-    def __init__(self, remote_chromedriver, url, paranoia_level):
-        webdriver.Remote.__init__(self, remote_chromedriver)
+        with crawl_state.lock:
+            crawl_state.profiler = profiler
 
-        self._url = url
-        self._paranoia_level = paranoia_level
+        return profiler
 
-    def __enter__(self):
-        """Along with ```___exit___()``` implements the standard
-        context manager pattern which, if a none-None url was
-        supplied in the ```Browser```'s ctr,
-        directs the browser to the specified url when entering
-        the context and closes the browser when exiting the
-        context. The pattern just makes using
-        ```Browser``` way, way cleaner.
+    def _stop_profiler(self, crawl_state, profiler):
+        """Called in the crawl thread when ```crawl()``` returns or by the watchdog
+        when the crawl times out or is cancelled. The profile isn't saved if the crawl
+        was abandoned.
         """
-        if self._url:
-            self.get(self._url)
-        return self
-
-    def __exit__(self, exec_type, exec_val, ex_tb):
-        """See ```___enter___()```."""
-        self.quit()
-
-    def create_web_element(self, element_id):
-        """Override the default implementation of
-        ```webdriver.Chrome.create_web_element```
-        to return a ```WebElement``` instead of a
-        ```selenium.webdriver.remote.webelement.WebElement```.
+        if profiler is None:
+            return
+
+        with crawl_state.lock:
+            if crawl_state.profiler is profiler:
+                crawl_state.profiler = None
+            aborted = crawl_state.aborted
+
+        try:
+            profiler.stop()
+            if aborted:
+                return
+            profile_file = crawl_state.artifact_filename(profiler.filename)
+            profiler.dump(profile_file)
+            with crawl_state.lock:
+                crawl_state.profile_file = profile_file
+        except Exception as ex:
+            _logger.error("error saving '%s' profile - %s", crawl_state.profiler_name, ex)
+
+    def _get_engine(self, spider_class):
+        try:
+            return spider_class.get_validated_metadata()['engine']
+        except SpiderMetadataError:
+            return 'chrome'
+
+    def _get_network_fixtures(self):
+        """The ```CLF_RECORD_FIXTURES``` and ```CLF_REPLAY_FIXTURES``` environment
+        variables are used if ```network_fixtures``` wasn't supplied to the ctr.
+        Returns ```None``` if network traffic isn't recorded or replayed.
         """
-        return WebElement(self._paranoia_level, self, element_id)
+        if self.network_fixtures is not None:
+            return self.network_fixtures
 
+        record_filename = os.environ.get('CLF_RECORD_FIXTURES', None)
+        replay_filename = os.environ.get('CLF_REPLAY_FIXTURES', None)
+        if not record_filename and not replay_filename:
+            return None
 
-class Browser(webdriver.Chrome):
-    """This class extends ```webdriver.Chrome``` to add new functionality
-    and override existing functionality that is well suited to writing
-    webdriver based Spiders.
-    """
+        if record_filename and replay_filename:
+            _logger.error('ignoring CLF_RECORD_FIXTURES and CLF_REPLAY_FIXTURES - only one can be set')
+            return None
 
-    @classmethod
-    def get_chrome_options(cls, paranoia_level):
-        chrome_options = Options()
+        # the proxy's dependencies are only imported when they're needed
+        from . import netfixtures
 
-        binary_location = os.environ.get('CLF_CHROME', None)
-        if binary_location:
-            chrome_options.binary_location = binary_location
-            _logger.info('using chrome binary >>>%s<<<', chrome_options.binary_location)
+        if record_filename:
+            return netfixtures.NetworkFixtures(record_filename, netfixtures.RECORD)
+        return netfixtures.NetworkFixtures(replay_filename, netfixtures.REPLAY)
 
-        #
-        # -- https://peter.sh/experiments/chromium-command-line-switches/
-        #
-        chrome_options_str_format = (
-            '--headless|'
-            '--window-size=1280x1024|'
-            '--no-sandbox|'
-            '--disable-gpu|'
-            '--disable-software-rasterizer|'
-            '--single-process|'
-            '--disable-dev-shm-usage|'
-            '--user-agent={user_agent}'
-        )
-        chrome_options_str = os.environ.get(
-            'CLF_CHROME_OPTIONS',
-            chrome_options_str_format.format(user_agent=cloudfeaster_extension.user_agent()))
-        for chrome_option in chrome_options_str.split('|'):
-            chrome_options.add_argument(chrome_option)
-            _logger.info('using chrome option >>>%s<<<', chrome_option)
-
-        (proxy_host, proxy_port) = cloudfeaster_extension.proxy(paranoia_level)
-        if proxy_host is not None and proxy_port is not None:
-            chrome_option = '--proxy-server=%s:%d' % (proxy_host, proxy_port)
-            chrome_options.add_argument(chrome_option)
-            _logger.info('using chrome option >>>%s<<<', chrome_option)
-
-        return chrome_options
-
-    def __init__(self, url, paranoia_level, chromedriver_log_file):
-        """Create a new instance of :py:class:`Browser`.
-
-        See :py:meth:`Browser.___enter___` to understand how and when the
-        ```url``` argument is used.
+    def _stop_network_fixtures(self):
+        """Stop the network fixtures proxy which, in record mode, saves the fixture archive."""
+        if self._network_fixtures is None:
+            return
+
+        try:
+            self._network_fixtures.stop()
+        except Exception as ex:
+            _logger.error("error stopping network fixtures '%s' - %s", self._network_fixtures.filename, ex)
+
+    def _get_trace_commands(self, spider_class):
+        """The ```CLF_TRACE_COMMANDS``` environment variable (```true``` or ```false```)
+        overrides the spider's ```traceCommands``` metadata.
         """
-        chrome_options = type(self).get_chrome_options(paranoia_level)
+        trace_commands = os.environ.get('CLF_TRACE_COMMANDS', None)
+        if trace_commands:
+            if trace_commands.lower() in ['true', 'false']:
+                return trace_commands.lower() == 'true'
+            _logger.error("ignoring invalid CLF_TRACE_COMMANDS '%s'", trace_commands)
 
-        service_args = []
+        try:
+            return spider_class.get_validated_metadata()['traceCommands']
+        except SpiderMetadataError:
+            return False
 
-        # nice reference @ http://chromedriver.chromium.org/logging
-        if chromedriver_log_file:
-            _logger.info('chromedriver logs @ >>>%s<<<', chromedriver_log_file)
+    def _start_command_trace(self, crawl_state):
+        """Called in the crawl thread. Returns ```None``` if webdriver commands aren't traced."""
+        if not crawl_state.trace_commands:
+            return None
 
-            service_args.append('--verbose')
-            service_args.append('--log-path=%s' % chromedriver_log_file)
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        with crawl_state.lock:
+            crawl_state.command_trace = command_trace
+        return command_trace
 
-        webdriver.Chrome.__init__(
-            self,
-            chrome_options=chrome_options,
-            service_args=service_args)
+    def _stop_command_trace(self, crawl_state, command_trace):
+        """Stop tracing and, if debug files are being captured, save the trace.
+        Only the first call for a trace does anything.
+        """
+        if command_trace is None or not command_trace.stop():
+            return
+
+        if not crawl_state.capture_debug:
+            return
+
+        try:
+            command_trace_file = crawl_state.artifact_filename('webdriver-trace.jsonl')
+            command_trace.dump(command_trace_file)
+            with crawl_state.lock:
+                crawl_state.command_trace_file = command_trace_file
+        except Exception as ex:
+            _logger.error('error saving webdriver command trace - %s', ex)
+
+    def _discard_debug_files(self):
+        self._close_logging_file()
+
+        if self._crawl_artifacts is not None:
+            self._crawl_artifacts.delete()
+            self._crawl_artifacts = None
 
-        self._url = url
-        self._paranoia_level = paranoia_level
+        self.logging_file = None
+        self.chromedriver_log_file = None
+        self.screenshot_file = None
+        self.profile_file = None
+        self.command_trace_file = None
 
-    def __enter__(self):
-        """Along with ```___exit___()``` implements the standard
-        context manager pattern which, if a none-None url was
-        supplied in the ```Browser```'s ctr,
-        directs the browser to the specified url when entering
-        the context and closes the browser when exiting the
-        context. The pattern just makes using
-        ```Browser``` way, way cleaner.
+    def _close_logging_file(self):
+        """Stop capturing the crawl's log and wait for the crawl log
+        to be written so it can be exported.
         """
-        if self._url:
-            self.get(self._url)
-        return self
-
-    def __exit__(self, exec_type, exec_val, ex_tb):
-        """See ```___enter___()```."""
-        self.quit()
-
-    def create_web_element(self, element_id):
-        """Override the default implementation of
-        ```webdriver.Chrome.create_web_element```
-        to return a :py:class:`WebElement` instead of a
-        ```selenium.webdriver.remote.webelement.WebElement```.
+        if self._crawl_log is not None:
+            self._crawl_log.close()
+            self._crawl_log = None
+
+    def _release_artifacts(self, crawl_response):
+        """Inlined debug files are deleted and debug files referenced by
+        filename are retained. When inlined debug files are streamed
+        they're deleted by :py:meth:`CrawlResponse.dump`.
         """
-        return WebElement(self._paranoia_level, self, element_id)
+        crawl_artifacts = self._crawl_artifacts
+        if crawl_artifacts is None:
+            return
 
+        self._crawl_artifacts = None
 
-class WebElement(selenium.webdriver.remote.webelement.WebElement):
-    """This class extends ```selenium.webdriver.remote.webelement.WebElement```
-    to add new functionality and override existing functionality that is well
-    suited to writing webdriver based Spiders.
-    """
+        if not _is_inline_debug():
+            crawl_artifacts.retain()
+        elif self.stream_inline_debug:
+            crawl_artifacts.retain()
+            crawl_response.crawl_artifacts = crawl_artifacts
+        else:
+            crawl_artifacts.delete()
 
-    _nonDigitAndNonDigitRegEx = re.compile(r'[^\d^\.]')
+    def _file_to_data_uri_scheme(self, filename):
+        if not _is_inline_debug():
+            return filename
 
-    def __init__(self, paranoia_level, *args, **kwargs):
-        selenium.webdriver.remote.webelement.WebElement.__init__(self, *args, **kwargs)
+        if self.stream_inline_debug:
+            return util.DataURIFile(filename) if util.is_non_empty_file(filename) else None
 
-        self._paranoia_level = paranoia_level
+        return util.file_to_data_uri_scheme(filename)
 
-    def __eq__(self, other):
-        """This is here only to resolve https://lgtm.com/rules/9990086/."""
-        if not isinstance(other, WebElement):
-            return False
-        if not selenium.webdriver.remote.webelement.WebElement.__eq__(self, other):
-            return False
-        return self._paranoia_level == other._paranoia_level
+    def _add_debug_file_to_crawl_response(self, key, value, crawl_response):
+        if key and value:
+            if '_debug' not in crawl_response:
+                crawl_response['_debug'] = {}
 
-    def get_text(self):
-        """This method exists so spider code can access element data
-        using a set of methods instead of a text property and some
-        other methods like ```get_int()``` and ```get_float()```.
-        """
-        return self.text
+            crawl_response['_debug'][key] = value
 
-    def _get_number(self, number_type, reg_ex):
-        text = self.get_text()
+    def _get_spider_class(self):
+        #
+        # deal with scenario where self.full_spider_class_name
+        # is in fact already a spider's class
+        #
+        if not isinstance(self.full_spider_class_name, str):
+            #
+            # so self.full_spider_class_name wasn't actually the name
+            # of the spider. or more precisely it wasn't a string and
+            # therefore we assume it's actually the spider's class
+            #
+            return (self.full_spider_class_name, None)
 
-        if reg_ex:
-            match = reg_ex.match(text)
-            if match is None:
-                return None
-            match_groups = match.groups()
-            if 1 != len(match_groups):
-                return None
-            text = match_groups[0]
+        #
+        # is self.full_spider_class_name actually a pointer to a
+        # spider sitting in some arbitrary file. this is particuarly
+        # useful when testing spiderhost.py
+        #
+        reg_ex_pattern = r'\s*(?P<spider_module_filename>.+.py):(?P<spider_class_name>[^\s]+Spider)\s*$'
+        reg_ex = re.compile(reg_ex_pattern, flags=re.IGNORECASE)
+        match = reg_ex.match(self.full_spider_class_name)
+        if match:
+            try:
+                spider_module_filename = match.group('spider_module_filename')
+                spider_class_name = match.group('spider_class_name')
+                spider_module = _load_source('doicareaboutthisname', spider_module_filename)
+                spider_class = getattr(spider_module, spider_class_name)
+                return (spider_class, None)
+            except Exception:
+                return (None, CrawlResponseSpiderNotFound(self.full_spider_class_name))
 
-        text = type(self)._nonDigitAndNonDigitRegEx.sub('', text)
-        return number_type(text)
+        #
+        # parse the full name of the spider, identify & load the
+        # module containing the spider and find the spider class
+        # in the loaded module
+        #
+        try:
+            split_full_spider_class_name = self.full_spider_class_name.split(".")
+            spider_module_name = ".".join(split_full_spider_class_name[:-1])
+            spider_class_name = split_full_spider_class_name[-1]
+            spider_module = importlib.import_module(spider_module_name)
+            spider_class = getattr(spider_module, spider_class_name)
+            return (spider_class, None)
+        except Exception:
+            return (None, CrawlResponseSpiderNotFound(self.full_spider_class_name))
 
-    def get_int(self, reg_ex=None):
-        return self._get_number(int, reg_ex)
+    def _get_browser(self, url, paranoia_level, chromedriver_log_file, engine='chrome', fixtures_proxy=None):
+        """This private method exists to allow unit tests to mock out the method.
+        export CLF_REMOTE_CHROMEDRIVER=http://host.docker.internal:9515
+        """
+        if engine == 'http':
+            # neither selenium nor chrome are needed
+            from . import httpbrowser
+            return httpbrowser.HTTPBrowser(url, paranoia_level, fixtures_proxy=fixtures_proxy)
 
-    def get_float(self, reg_ex=None):
-        return self._get_number(float, reg_ex)
+        from . import browser
 
-    def get_selected(self):
-        """This method is here only to act as a shortcut so that a spider
-        author can write a single line of code to get the correctly selected
-        option in a list rather than the few lines of code that's seen
-        in this method's implementation.
+        remote_chromedriver = os.environ.get('CLF_REMOTE_CHROMEDRIVER', None)
+        if remote_chromedriver:
+            return browser.RemoteBrowser(remote_chromedriver, url, paranoia_level)
+        return browser.Browser(url, paranoia_level, chromedriver_log_file, fixtures_proxy)
 
-        If an option is selected the option's text is returned otherwise
-        None is returned.
+    def _take_screenshot(self, browser, crawl_state):
+        """This is a private method which takes a screenshot of the browser's
+        current window and then adds the name of the temp file containing the
+        screenshot to the crawl response.
         """
-        select = selenium.webdriver.support.select.Select(self)
-        try:
-            return select.first_selected_option
-        except NoSuchElementException:
+        screenshot_file = crawl_state.artifact_filename('screenshot.png')
+        if not browser.save_screenshot(screenshot_file):
+            # ex the http engine can't take screenshots
             return None
+        return screenshot_file
 
-    def select_by_visible_text(self, visible_text):
-        """This method is here only to act as a shortcut so that a spider
-        author can write a single line of code to select an option in a list
-        rather than two lines of code. Perhaps not a huge saving by every
-        little bit helps. As an aside, feels like this is the way the
-        select functionality should have been implemented anyway.
-        """
-        select = selenium.webdriver.support.select.Select(self)
-        select.select_by_visible_text(visible_text)
+    def _configure_logging(self, crawl_args):
+        clf_debug_value = os.environ.get('CLF_DEBUG', '')
+        reg_ex_pattern = '^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$'
+        reg_ex = re.compile(reg_ex_pattern, re.IGNORECASE)
+        logging_level = clf_debug_value.upper() if reg_ex.match(clf_debug_value) else 'ERROR'
+
+        self.logging_file = self._artifact_filename('crawl-log.txt')
 
-    def send_keys(self, value):
-        """:ODD: yes this implementation pattern looks odd. This approach is used
-        so there's a default implemenation which can be used during development
-        but also provides a clean approach to override the implementation.
+        self._redactor = privacy.Redactor(crawl_args)
+
+        # captures only this crawl's log records, with crawl args
+        # redacted, and leaves global logging config alone
+        self._crawl_log = logcapture.CrawlLog(
+            self.logging_file,
+            getattr(logging, logging_level),
+            redactor=self._redactor)
+        self._crawl_log.start()
+
+    def _redact_chromedriver_log(self):
+        """Replace crawl args in the chromedriver log with their hashes before
+        the chromedriver log is added to the crawl response.
         """
-        cloudfeaster_extension.send_keys(self._paranoia_level, self, value)
+        if not self._redactor or not self.chromedriver_log_file or not os.path.isfile(self.chromedriver_log_file):
+            return
+
+        try:
+            self._redactor.redact_file(self.chromedriver_log_file)
+        except Exception as ex:
+            # never leak crawl args - drop the chromedriver log if it can't be redacted
+            _logger.error('error redacting chromedriver log - %s', ex)
+            try:
+                os.unlink(self.chromedriver_log_file)
+            except OSError:
+                pass
+            self.chromedriver_log_file = None
+
+
+def _fully_qualified_class_name(cls):
+    return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+def _spider_base_classes(spider_class):
+    return [base for base in spider_class.__mro__[1:] if issubclass(base, Spider) and base is not Spider]
 
 
 class SpiderDiscovery(object):
     """Discover all available spiders. This means locating concrete derived classes
     of ```Spider``` in all available distributions.
+
+    Importing every spider module and validating every spider's metadata
+    is expensive. If ```index_filename``` is supplied, the results of discovery
+    are saved in a JSON index keyed on each spider module's distro name & version,
+    the module's filename, modification time and size and a fingerprint of every
+    module in the module's spider package (a spider module can import other modules
+    in its package). The index as a whole is discarded if cloudfeaster's version
+    or the set of installed distros (and their versions) changes. Subsequent discoveries
+    only import spider modules whose key has changed and serve everything else
+    from the index. If ```rebuild_index``` is ```True``` the existing index is
+    ignored and a new index is written.
+
+    If ```static``` is ```True```, spider modules are parsed rather than
+    imported - see :py:meth:`SpiderDiscovery._discover_statically`. Static
+    discovery doesn't use an index so ```static``` and ```index_filename```
+    can't be used together.
+
+    If ```processes``` is greater than 1, spider modules are imported and spider
+    metadata validated by a pool of ```processes``` worker processes (0 means
+    one worker process per cpu) - see :py:meth:`SpiderDiscovery._import_spider_modules`.
+    This applies to all spider modules which would otherwise be imported
+    including those which need to be imported when using an index or
+    discovering spiders statically.
     """
 
     #
@@ -995,22 +1715,52 @@ class SpiderDiscovery(object):
         r'^\s*(?P<egg_name>.+spiders)-\d+\.\d+\.\d+\-py\d+\.\d+\s*$',
         re.IGNORECASE)
 
-    def __init__(self, samples=False):
+    def __init__(self, samples=False, index_filename=None, rebuild_index=False, static=False, processes=1):
         object.__init__(self)
 
+        if static and index_filename:
+            raise ValueError('static discovery can\'t be used with a spider index')
+
         self._samples = samples
+        self._index_filename = index_filename
+        self._rebuild_index = rebuild_index
+        self._static = static
+        self._processes = processes if processes else os.cpu_count()
 
     def discover(self):
+        if self._static:
+            spiders_metadata = self._discover_statically()
+        elif self._index_filename:
+            spiders_metadata = self._discover_using_index()
+        elif 1 < self._processes:
+            spiders_metadata = self._discover_in_parallel()
+        else:
+            spiders_metadata = self._discover_by_importing()
+
+        #
+        # now for some fancy formatting of the results
+        #
+        rv = {}
+        for metadata in spiders_metadata:
+            fully_qualified_class = metadata['fullyQualifiedClassName']
+            spider = fully_qualified_class.split('.')[-2]
+
+            for category in metadata['categories']:
+                if category not in rv:
+                    rv[category] = {}
+                rv[category][spider] = metadata
+
+        #
+        # all done!
+        #
+        return rv
+
+    def _discover_by_importing(self):
         #
         # find and import all packages that might contain spiders
         #
-        for distro in pkg_resources.working_set:
-            match = type(self)._egg_name_reg_ex.match(distro.egg_name())
-            _logger.info("assessing distro for spiders '%s'", distro.egg_name())
-            if match:
-                egg_name = match.group('egg_name')
-                _logger.info("matched distro for spiders '%s'", egg_name)
-                type(self).load_and_discover_all_spiders_in_package(egg_name)
+        for (spider_package_name, _) in self._find_spider_distros():
+            type(self).load_and_discover_all_spiders_in_package(spider_package_name)
 
         if self._samples:
             importlib.import_module('cloudfeaster.samples')
@@ -1027,24 +1777,344 @@ class SpiderDiscovery(object):
         #
         concrete_spider_classes = self._find_concrete_spider_classes(Spider)
 
-        #
-        # now for some fancy formatting of the results
-        #
-        rv = {}
-        for concrete_spider_class in concrete_spider_classes:
-            metadata = concrete_spider_class.get_validated_metadata()
-            fully_qualified_class = metadata['fullyQualifiedClassName']
-            spider = fully_qualified_class.split('.')[-2]
+        return [concrete_spider_class.get_validated_metadata() for concrete_spider_class in concrete_spider_classes]
 
-            for category in metadata['categories']:
-                if category not in rv:
-                    rv[category] = {}
-                rv[category][spider] = metadata
+    def _discover_using_index(self):
+        index = self._read_index()
 
         #
-        # all done!
+        # import only those spider modules which aren't in the index
+        # or whose key has changed since the index was written
         #
-        return rv
+        modules = {}
+        stale_module_names = []
+        for (module_name, key) in self._find_spider_modules():
+            module_index_entry = index.get(module_name, None)
+            if module_index_entry and module_index_entry['key'] == key:
+                _logger.info("using index for spider module '%s'", module_name)
+                modules[module_name] = module_index_entry
+            else:
+                modules[module_name] = {'key': key}
+                stale_module_names.append(module_name)
+
+        index_changed = bool(stale_module_names) or set(index.keys()) != set(modules.keys())
+
+        imported_module_names = self._import_spider_modules(modules, stale_module_names)
+
+        spiders = self._describe_loaded_spider_classes(modules, imported_module_names)
+
+        self._raise_discovery_errors(modules, spiders)
+
+        (spiders_metadata, imported_spider_classes) = self._get_concrete_spiders_metadata(spiders)
+        if imported_spider_classes:
+            index_changed = True
+
+        if index_changed:
+            self._write_index(modules)
+
+        return spiders_metadata
+
+    def _discover_statically(self):
+        """Discover spiders by parsing spider modules rather than importing them.
+        Only spider modules which can't be understood by parsing them (ex a spider
+        class derives from a class outside of the spider packages) are imported. A spider
+        module is also imported if a concrete spider class' metadata isn't a literal
+        or if the spider class doesn't inherit from :py:class:`Spider` using single inheritance.
+
+        Metadata for spiders which are discovered statically is validated against the
+        spider metadata jsonschema, checked for consistency with the spider's source code
+        and has defaults added as per :py:meth:`Spider.get_validated_metadata`. If any of
+        these fail the spider's module is imported so invalid metadata is rejected
+        (ie. :py:class:`SpiderMetadataError` is raised) as it is when discovery imports
+        spider modules.
+        """
+        static_spider_modules = [
+            _StaticSpiderModule(module_name, key['filename']) for (module_name, key) in self._find_spider_modules()
+        ]
+        static_spider_catalog = _StaticSpiderCatalog(static_spider_modules)
+
+        modules = {}
+        not_understood_module_names = []
+        for static_spider_module in static_spider_modules:
+            module_name = static_spider_module.module_name
+            if static_spider_catalog.is_understood(static_spider_module):
+                _logger.info("statically discovered spiders in module '%s'", module_name)
+                modules[module_name] = {'spiders': static_spider_catalog.describe_spiders(static_spider_module)}
+            else:
+                modules[module_name] = {}
+                not_understood_module_names.append(module_name)
+
+        imported_module_names = self._import_spider_modules(modules, not_understood_module_names)
+
+        spiders = self._describe_loaded_spider_classes(modules, imported_module_names)
+
+        self._raise_discovery_errors(modules, spiders)
+
+        (spiders_metadata, _) = self._get_concrete_spiders_metadata(spiders)
+
+        return spiders_metadata
+
+    def _discover_in_parallel(self):
+        modules = {module_name: {} for (module_name, _) in self._find_spider_modules()}
+
+        imported_module_names = self._import_spider_modules(modules, list(modules.keys()))
+
+        spiders = self._describe_loaded_spider_classes(modules, imported_module_names)
+
+        self._raise_discovery_errors(modules, spiders)
+
+        (spiders_metadata, _) = self._get_concrete_spiders_metadata(spiders)
+
+        return spiders_metadata
+
+    def _import_spider_modules(self, modules, module_names):
+        """Import the spider modules named in ```module_names```.
+
+        By default spider modules are imported into this process, the spiders in
+        each module are left for :py:meth:`SpiderDiscovery._describe_loaded_spider_classes`
+        to describe and the list of imported module names is returned.
+
+        When discovering spiders in parallel, ```module_names``` are spread across
+        a pool of worker processes. Each worker imports its share of the spider
+        modules and describes (including validating metadata) the spiders in each
+        module. The descriptions are added to ```modules``` in module name order so
+        the results are deterministic regardless of which worker describes which
+        module. Errors are recorded per module rather than raised so all errors
+        can be reported together - see :py:meth:`SpiderDiscovery._raise_discovery_errors`.
+        Since nothing is imported into this process an empty list is returned.
+        """
+        if self._processes <= 1 or len(module_names) <= 1:
+            for module_name in module_names:
+                _logger.info("importing spider module '%s'", module_name)
+                importlib.import_module(module_name)
+                modules[module_name]['spiders'] = []
+            return module_names
+
+        module_names = sorted(module_names)
+        processes = min(self._processes, len(module_names))
+        _logger.info("importing %d spider modules using %d processes", len(module_names), processes)
+
+        import concurrent.futures
+
+        chunksize = max(1, len(module_names) // (4 * processes))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            module_descriptions = executor.map(_describe_spider_module, module_names, chunksize=chunksize)
+            for (module_name, (spiders, error)) in zip(module_names, module_descriptions):
+                modules[module_name]['spiders'] = spiders
+                if error:
+                    modules[module_name]['error'] = error
+
+        return []
+
+    def _raise_discovery_errors(self, modules, spiders):
+        """Raises :py:class:`SpiderDiscoveryError` if any spider module couldn't
+        be imported or any concrete spider class has invalid metadata. Errors
+        are only recorded when discovering spiders in parallel.
+        """
+        abstract_spider_class_names = set([base for spider in spiders for base in spider['bases']])
+
+        errors = {}
+        for (module_name, module) in modules.items():
+            if module.get('error', None):
+                errors.setdefault(module_name, []).append(module['error'])
+
+        for spider in spiders:
+            fully_qualified_class_name = spider['fullyQualifiedClassName']
+            if spider.get('error', None) and fully_qualified_class_name not in abstract_spider_class_names:
+                module_name = fully_qualified_class_name.rsplit('.', 1)[0]
+                errors.setdefault(module_name, []).append(spider['error'])
+
+        if errors:
+            for module_name in sorted(errors.keys()):
+                for error in errors[module_name]:
+                    _logger.error("error discovering spiders in module '%s' - %s", module_name, error)
+            raise SpiderDiscoveryError(errors)
+
+    def _describe_loaded_spider_classes(self, modules, imported_module_names):
+        """Describe each spider class in each freshly imported module and add the
+        description to ```modules```. Spider classes in ```modules``` that weren't
+        imported are assumed to already be described. Spider classes which have been
+        loaded by some means other than discovery are also described.
+
+        Returns a list of all spider descriptions.
+        """
+        unknown_module_spiders = []
+        for spider_class in self._find_all_spider_classes(Spider):
+            if spider_class.__module__ in modules and spider_class.__module__ not in imported_module_names:
+                continue
+
+            spider = {
+                'fullyQualifiedClassName': _fully_qualified_class_name(spider_class),
+                'bases': [_fully_qualified_class_name(base) for base in _spider_base_classes(spider_class)],
+                'metadata': None if spider_class.__subclasses__() else spider_class.get_validated_metadata(),
+            }
+
+            if spider_class.__module__ in modules:
+                modules[spider_class.__module__]['spiders'].append(spider)
+            else:
+                unknown_module_spiders.append(spider)
+
+        spiders = [spider for module in modules.values() for spider in module['spiders']]
+        spiders.extend(unknown_module_spiders)
+        return spiders
+
+    def _get_concrete_spiders_metadata(self, spiders):
+        """A spider class is concrete if no other spider class derives from
+        it - determining this once all spiders are known permits spider
+        class hierarchies to span modules.
+
+        Spider descriptions without metadata are either abstract or their
+        metadata couldn't be determined without importing the spider class.
+        If such a spider class turns out to be concrete, the spider class
+        is imported and its metadata added to the spider's description.
+
+        Returns a tuple - list of metadata for all concrete spiders, ordered
+        by fully qualified class name, and a boolean indicating if any
+        spider classes were imported.
+        """
+        abstract_spider_class_names = set([base for spider in spiders for base in spider['bases']])
+
+        spiders_metadata = []
+        imported_spider_classes = False
+        for spider in sorted(spiders, key=lambda spider: spider['fullyQualifiedClassName']):
+            fully_qualified_class_name = spider['fullyQualifiedClassName']
+            if fully_qualified_class_name in abstract_spider_class_names:
+                continue
+
+            if spider['metadata'] is None:
+                (module_name, class_name) = fully_qualified_class_name.rsplit('.', 1)
+                _logger.info("importing spider class '%s'", fully_qualified_class_name)
+                spider_class = getattr(importlib.import_module(module_name), class_name)
+                spider['metadata'] = spider_class.get_validated_metadata()
+                imported_spider_classes = True
+
+            spiders_metadata.append(spider['metadata'])
+
+        return (spiders_metadata, imported_spider_classes)
+
+    def _find_spider_distros(self):
+        """Generates a ```(package name, distro)``` tuple for every installed
+        distro that might contain spiders.
+        """
+        import pkg_resources
+
+        for distro in pkg_resources.working_set:
+            match = type(self)._egg_name_reg_ex.match(distro.egg_name())
+            _logger.info("assessing distro for spiders '%s'", distro.egg_name())
+            if match:
+                egg_name = match.group('egg_name')
+                _logger.info("matched distro for spiders '%s'", egg_name)
+                yield (egg_name, '%s==%s' % (distro.project_name, distro.version))
+
+    def _find_spider_modules(self):
+        """Generates a ```(module name, key)``` tuple for every module in all
+        packages that might contain spiders. A module's key changes when
+        the module's distro or source code changes or when the source code
+        of any module in the module's package changes.
+        """
+        spider_packages = list(self._find_spider_distros())
+        if self._samples:
+            spider_packages.append(('cloudfeaster.samples', 'cloudfeaster==%s' % cloudfeaster.__version__))
+
+        for (spider_package_name, distro) in spider_packages:
+            # find_spec() rather than import_module() so spider package isn't imported
+            spider_package_spec = importlib.util.find_spec(spider_package_name)
+            spider_package_dir_names = spider_package_spec.submodule_search_locations or []
+            package_fingerprint = self._package_fingerprint(spider_package_dir_names)
+            for (module_finder, name, ispkg) in pkgutil.iter_modules(spider_package_dir_names):
+                if ispkg:
+                    continue
+
+                module_name = '%s.%s' % (spider_package_name, name)
+                filename = module_finder.find_spec(module_name).origin
+                stat = os.stat(filename)
+                key = {
+                    'distro': distro,
+                    'filename': filename,
+                    'mtime': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'package': package_fingerprint,
+                }
+                yield (module_name, key)
+
+    def _package_fingerprint(self, package_dir_names):
+        """Returns a fingerprint of the filename, modification time and size
+        of every python source file in a package including sub-packages.
+        """
+        fingerprint = hashlib.sha256()
+        for package_dir_name in package_dir_names:
+            for (dir_name, sub_dir_names, filenames) in os.walk(package_dir_name):
+                sub_dir_names[:] = sorted(name for name in sub_dir_names if name != '__pycache__')
+                for filename in sorted(filenames):
+                    if not filename.endswith('.py'):
+                        continue
+                    filename = os.path.join(dir_name, filename)
+                    stat = os.stat(filename)
+                    fingerprint.update(('%s:%d:%d\n' % (filename, stat.st_mtime_ns, stat.st_size)).encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    def _installed_distros_fingerprint(self):
+        """Returns a fingerprint of the python version and the name & version of
+        every installed distro - spider modules can depend on any of them.
+        """
+        import pkg_resources
+
+        distros = sorted('%s==%s' % (distro.project_name, distro.version) for distro in pkg_resources.working_set)
+        fingerprint = hashlib.sha256(sys.version.encode('utf-8'))
+        for distro in distros:
+            fingerprint.update(('%s\n' % distro).encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    def _read_index(self):
+        """Returns a dict of module name to module index entry."""
+        if self._rebuild_index:
+            _logger.info("rebuilding spider index '%s'", self._index_filename)
+            return {}
+
+        try:
+            with open(self._index_filename, 'r') as fp:
+                index = json.load(fp)
+        except FileNotFoundError:
+            _logger.info("spider index '%s' not found", self._index_filename)
+            return {}
+        except Exception as ex:
+            _logger.warning("unable to read spider index '%s' - %s", self._index_filename, ex)
+            return {}
+
+        if index.get('cloudfeasterVersion', None) != cloudfeaster.__version__:
+            _logger.info("spider index '%s' written by different version of cloudfeaster", self._index_filename)
+            return {}
+
+        if index.get('installedDistros', None) != self._installed_distros_fingerprint():
+            _logger.info("spider index '%s' written with different installed distros", self._index_filename)
+            return {}
+
+        return index.get('modules', {})
+
+    def _write_index(self, modules):
+        _logger.info("writing spider index '%s'", self._index_filename)
+
+        index = {
+            'cloudfeasterVersion': cloudfeaster.__version__,
+            'installedDistros': self._installed_distros_fingerprint(),
+            'modules': modules,
+        }
+
+        # write to a temp file & then rename so concurrent readers
+        # never see a partially written index
+        index_dir_name = os.path.dirname(os.path.abspath(self._index_filename))
+        os.makedirs(index_dir_name, exist_ok=True)
+        (fd, temp_index_filename) = tempfile.mkstemp(dir=index_dir_name)
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(index, fp, sort_keys=True)
+        os.replace(temp_index_filename, self._index_filename)
+
+    def _find_all_spider_classes(self, base_class):
+        spider_classes = []
+        for sub_class in base_class.__subclasses__():
+            spider_classes.append(sub_class)
+            spider_classes.extend(self._find_all_spider_classes(sub_class))
+        return spider_classes
 
     def _find_concrete_spider_classes(self, base_class):
         base_msg = "looking for concrete spider classes of base class '%s.%s'" % (
@@ -1085,3 +2155,339 @@ class SpiderDiscovery(object):
                 module_name = '%s.%s' % (spider_package_name, name)
                 _logger.info("attempting to import spider module '%s'", module_name)
                 importlib.import_module(module_name)
+
+
+def _describe_spider_module(module_name):
+    """Runs in a :py:class:`SpiderDiscovery` worker process - see
+    :py:meth:`SpiderDiscovery._import_spider_modules`. Imports the spider module
+    ```module_name``` and returns a tuple - a list of descriptions of the spider classes
+    defined in the module and an error message (None if no error).
+
+    Spider classes which are abstract in the worker process are also abstract once
+    all spiders are known so metadata is only validated for spider classes without
+    subclasses. If metadata can't be validated the error is recorded with the
+    spider's description since the spider class may turn out to be abstract.
+    """
+    try:
+        importlib.import_module(module_name)
+    except Exception as ex:
+        return ([], 'unable to import - %s' % ex)
+
+    spiders = []
+    for spider_class in SpiderDiscovery()._find_all_spider_classes(Spider):
+        if spider_class.__module__ != module_name:
+            continue
+
+        spider = {
+            'fullyQualifiedClassName': _fully_qualified_class_name(spider_class),
+            'bases': [_fully_qualified_class_name(base) for base in _spider_base_classes(spider_class)],
+            'metadata': None,
+        }
+
+        if not spider_class.__subclasses__():
+            try:
+                spider['metadata'] = spider_class.get_validated_metadata()
+            except Exception as ex:
+                spider['error'] = str(ex)
+
+        spiders.append(spider)
+
+    return (spiders, None)
+
+
+class _StaticSpiderModule(object):
+    """Uses ```ast``` to parse a spider module and, without importing
+    the module, describe the classes defined in the module and
+    the fully qualified names of all names imported by the module.
+    """
+
+    def __init__(self, module_name, filename):
+        object.__init__(self)
+
+        self.module_name = module_name
+        self.filename = filename
+
+        # module level name -> fully qualified name
+        self.names = {}
+
+        # class name -> ast.ClassDef
+        self.classes = {}
+
+        # False if the module couldn't be completely understood by parsing it
+        self.parsed = False
+
+        if not filename or not filename.endswith('.py'):
+            return
+
+        try:
+            with open(filename, 'rb') as fp:
+                tree = ast.parse(fp.read(), filename)
+        except (OSError, SyntaxError, ValueError) as ex:
+            _logger.info("unable to parse spider module '%s' - %s", module_name, ex)
+            return
+
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        self.names[alias.asname] = alias.name
+                    else:
+                        top_level_package_name = alias.name.split('.')[0]
+                        self.names[top_level_package_name] = top_level_package_name
+            elif isinstance(node, ast.ImportFrom):
+                imported_module_name = node.module or ''
+                if node.level:
+                    package_name_parts = module_name.split('.')[:-node.level]
+                    if node.module:
+                        package_name_parts.append(node.module)
+                    imported_module_name = '.'.join(package_name_parts)
+                for alias in node.names:
+                    if alias.name == '*':
+                        return
+                    self.names[alias.asname or alias.name] = '%s.%s' % (imported_module_name, alias.name)
+            elif isinstance(node, ast.ClassDef):
+                self.classes[node.name] = node
+                self.names[node.name] = '%s.%s' % (module_name, node.name)
+            elif isinstance(node, (ast.If, ast.Try, ast.With, ast.For, ast.While)):
+                # classes defined conditionally can only be found by importing the module
+                if any(isinstance(child, ast.ClassDef) for child in ast.walk(node)):
+                    return
+
+        self.parsed = True
+
+    def resolve(self, node):
+        """Returns the fully qualified name of the module level name
+        referenced by ```node``` (ex ```spider.Spider``` would typically
+        be resolved to ```cloudfeaster.spider.Spider```). If the name
+        can't be resolved None is returned.
+        """
+        names = []
+        while isinstance(node, ast.Attribute):
+            names.insert(0, node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+
+        if node.id in self.names:
+            names.insert(0, self.names[node.id])
+        elif hasattr(builtins, node.id):
+            names.insert(0, 'builtins.%s' % node.id)
+        else:
+            return None
+
+        return '.'.join(names)
+
+
+class _StaticSpiderCatalog(object):
+    """Given the :py:class:`_StaticSpiderModule` for all spider modules, determines
+    which classes are spiders and, where possible, each spider's metadata.
+    """
+
+    _spider_class_name = _fully_qualified_class_name(Spider)
+
+    def __init__(self, static_spider_modules):
+        object.__init__(self)
+
+        # fully qualified class name -> (static spider module, ast.ClassDef)
+        self._classes = {}
+        for static_spider_module in static_spider_modules:
+            for (class_name, class_def) in static_spider_module.classes.items():
+                fully_qualified_class_name = '%s.%s' % (static_spider_module.module_name, class_name)
+                self._classes[fully_qualified_class_name] = (static_spider_module, class_def)
+
+        # fully qualified class name -> True, False or None
+        self._is_spider = {}
+
+    def _base_class_names(self, fully_qualified_class_name):
+        (static_spider_module, class_def) = self._classes[fully_qualified_class_name]
+        return [static_spider_module.resolve(base) for base in class_def.bases]
+
+    def is_spider(self, fully_qualified_class_name):
+        """Returns True if the class is a spider class, False if the class isn't
+        a spider class and None if it's not possible to tell without importing
+        the class.
+        """
+        if fully_qualified_class_name == type(self)._spider_class_name:
+            return True
+
+        if fully_qualified_class_name is None:
+            return None
+
+        if fully_qualified_class_name.startswith('builtins.'):
+            return False
+
+        if fully_qualified_class_name not in self._classes:
+            return None
+
+        if fully_qualified_class_name not in self._is_spider:
+            # assume not a spider while figuring out the answer - protects against cycles
+            self._is_spider[fully_qualified_class_name] = False
+
+            answers = [self.is_spider(base) for base in self._base_class_names(fully_qualified_class_name)]
+            if True in answers:
+                answer = True
+            elif None in answers:
+                answer = None
+            else:
+                answer = False
+            self._is_spider[fully_qualified_class_name] = answer
+
+        return self._is_spider[fully_qualified_class_name]
+
+    def is_understood(self, static_spider_module):
+        """Returns True if all spider classes in the module can be determined by parsing
+        the module otherwise returns False.
+        """
+        if not static_spider_module.parsed:
+            return False
+
+        for class_name in static_spider_module.classes.keys():
+            if self.is_spider('%s.%s' % (static_spider_module.module_name, class_name)) is None:
+                return False
+
+        return True
+
+    def describe_spiders(self, static_spider_module):
+        """Describe all spider classes defined in ```static_spider_module```
+        using the same approach as :py:meth:`SpiderDiscovery._describe_loaded_spider_classes`.
+        """
+        spiders = []
+        for class_name in static_spider_module.classes.keys():
+            fully_qualified_class_name = '%s.%s' % (static_spider_module.module_name, class_name)
+            if not self.is_spider(fully_qualified_class_name):
+                continue
+
+            spiders.append({
+                'fullyQualifiedClassName': fully_qualified_class_name,
+                'bases': self._spider_base_class_names(fully_qualified_class_name),
+                'metadata': self._get_metadata(fully_qualified_class_name),
+            })
+
+        return spiders
+
+    def _spider_base_class_names(self, fully_qualified_class_name):
+        rv = []
+        for base in self._base_class_names(fully_qualified_class_name):
+            if base == type(self)._spider_class_name or not self.is_spider(base):
+                continue
+            for spider_base_class_name in [base] + self._spider_base_class_names(base):
+                if spider_base_class_name not in rv:
+                    rv.append(spider_base_class_name)
+        return rv
+
+    def _get_metadata(self, fully_qualified_class_name):
+        """Returns the spider's metadata or None if the metadata can't be
+        determined without importing the spider.
+        """
+        #
+        # to avoid reimplementing python's method resolution order
+        # only deal with single inheritance
+        #
+        class_defs = []
+        class_name = fully_qualified_class_name
+        while class_name != type(self)._spider_class_name:
+            (_, class_def) = self._classes[class_name]
+            class_defs.append(class_def)
+
+            base_class_names = [base for base in self._base_class_names(class_name) if base != 'builtins.object']
+            if len(base_class_names) != 1:
+                return None
+            class_name = base_class_names[0]
+
+        def find_method(method_name):
+            for class_def in class_defs:
+                for node in class_def.body:
+                    if isinstance(node, ast.FunctionDef) and node.name == method_name:
+                        return node
+            return None
+
+        if find_method('get_default_category'):
+            return None
+
+        crawl_method = find_method('crawl')
+        if crawl_method is None or crawl_method.decorator_list:
+            return None
+        crawl_method_args = crawl_method.args.posonlyargs + crawl_method.args.args
+        # 2: below since all crawl methods should have @ least 2 args - see
+        # Spider._get_crawl_method_arg_names_for_use_as_factors()
+        crawl_method_arg_names = [arg.arg for arg in crawl_method_args][2:]
+
+        get_metadata_method = find_method('get_metadata')
+        if get_metadata_method is None:
+            return None
+        decorators = get_metadata_method.decorator_list
+        if len(decorators) != 1 or not isinstance(decorators[0], ast.Name) or decorators[0].id != 'classmethod':
+            return None
+        if not get_metadata_method.args.args:
+            return None
+        cls_arg_name = get_metadata_method.args.args[0].arg
+
+        body = get_metadata_method.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+            # skip docstring
+            body = body[1:]
+        if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+            return None
+
+        default_category = Spider._replace_spiders_postfix_reg_ex.sub('', fully_qualified_class_name.split('.')[0])
+
+        try:
+            metadata = _literal_eval(body[0].value, cls_arg_name, default_category)
+        except ValueError:
+            return None
+        if not isinstance(metadata, dict):
+            return None
+
+        (static_spider_module, _) = self._classes[fully_qualified_class_name]
+
+        # as per Spider._validate_metadata() - if the metadata is invalid the
+        # spider is imported which reports the error just like import based discovery
+        try:
+            jsonschemas.validate_metadata(metadata)
+            return _complete_metadata(
+                fully_qualified_class_name.split('.')[-1],
+                metadata,
+                default_category,
+                static_spider_module.filename,
+                fully_qualified_class_name,
+                crawl_method_arg_names)
+        except Exception:
+            return None
+
+
+def _literal_eval(node, cls_arg_name, default_category):
+    """Like ```ast.literal_eval()``` but also evaluates calls to ```cls.get_default_category()```
+    which is a common pattern in :py:meth:`Spider.get_metadata`. Raises ```ValueError```
+    if ```node``` isn't a literal.
+    """
+    def literal_eval(node):
+        return _literal_eval(node, cls_arg_name, default_category)
+
+    if isinstance(node, ast.Constant):
+        return node.value
+
+    if isinstance(node, ast.Dict):
+        if None in node.keys:
+            # ** unpacking
+            raise ValueError()
+        return {literal_eval(key): literal_eval(value) for (key, value) in zip(node.keys, node.values)}
+
+    if isinstance(node, ast.List):
+        return [literal_eval(element) for element in node.elts]
+
+    if isinstance(node, ast.Tuple):
+        return tuple([literal_eval(element) for element in node.elts])
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = literal_eval(node.operand)
+        if not isinstance(operand, (int, float)):
+            raise ValueError()
+        return -operand if isinstance(node.op, ast.USub) else operand
+
+    if isinstance(node, ast.Call) and not node.args and not node.keywords:
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == 'get_default_category':
+            if isinstance(func.value, ast.Name) and func.value.id == cls_arg_name:
+                return default_category
+
+    raise ValueError()
@@ -0,0 +1,229 @@
+"""This module contains unit tests for the ```aio``` module."""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+import unittest
+
+import mock
+
+from .. import aio
+from .. import spider
+
+
+# set to release crawls of SlowSpider and HungSpider
+slow_crawl_event = threading.Event()
+
+
+class QuickSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'identifyingFactors': {
+                'symbol': {
+                    'pattern': '^.+$',
+                },
+            },
+        }
+
+    def crawl(self, browser, symbol):
+        return spider.CrawlResponseOk({'symbol': symbol, 'thread': threading.current_thread().name})
+
+
+class SlowSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+        }
+
+    def crawl(self, browser):
+        slow_crawl_event.wait(10)
+        return spider.CrawlResponseOk()
+
+
+class HungSpider(SlowSpider):
+    """Times out long before it's released."""
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'maxCrawlTime': '1s',
+        }
+
+
+def get_browser_patch(url, *args, **kwargs):
+    return mock.MagicMock()
+
+
+@mock.patch('cloudfeaster.spider.SpiderCrawler._get_browser', side_effect=get_browser_patch)
+@mock.patch('cloudfeaster.spider.SpiderCrawler._take_screenshot', return_value=None)
+class TestAsyncSpiderCrawler(unittest.TestCase):
+
+    def setUp(self):
+        slow_crawl_event.clear()
+        self.addCleanup(slow_crawl_event.set)
+
+    def test_crawl(self, *args):
+        async def crawl():
+            crawler = aio.AsyncSpiderCrawler(QuickSpider)
+            return await crawler.crawl('IBM')
+
+        crawl_response = asyncio.run(crawl())
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        self.assertEqual('IBM', crawl_response['symbol'])
+        self.assertTrue(crawl_response['thread'].startswith('crawl'))
+
+    def test_event_loop_not_blocked(self, *args):
+        async def crawl():
+            crawl_executor = aio.AsyncCrawlExecutor(max_concurrent_crawls=1)
+            crawler = aio.AsyncSpiderCrawler(SlowSpider, crawl_executor)
+            task = asyncio.ensure_future(crawler.crawl())
+
+            # event loop keeps running while the crawl is in progress
+            number_ticks = 0
+            while number_ticks < 5:
+                await asyncio.sleep(0.01)
+                number_ticks += 1
+            self.assertFalse(task.done())
+
+            slow_crawl_event.set()
+            crawl_response = await task
+            crawl_executor.shutdown()
+            return crawl_response
+
+        crawl_response = asyncio.run(crawl())
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+
+    def test_max_concurrent_crawls(self, *args):
+        async def crawl():
+            crawl_executor = aio.AsyncCrawlExecutor(max_concurrent_crawls=1)
+            tasks = [asyncio.ensure_future(crawl_executor.crawl(SlowSpider)) for _ in range(3)]
+            await asyncio.sleep(0.1)
+            number_running = crawl_executor.number_running
+
+            slow_crawl_event.set()
+            crawl_responses = await asyncio.gather(*tasks)
+            crawl_executor.shutdown()
+            return (number_running, crawl_responses)
+
+        (number_running, crawl_responses) = asyncio.run(crawl())
+        self.assertEqual(1, number_running)
+        for crawl_response in crawl_responses:
+            self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+
+    def test_cancel_kills_browser(self, mock_take_screenshot, mock_get_browser):
+        mock_browser = mock.MagicMock()
+        mock_get_browser.side_effect = None
+        mock_get_browser.return_value = mock_browser
+
+        async def crawl():
+            crawl_executor = aio.AsyncCrawlExecutor(max_concurrent_crawls=1)
+            task = asyncio.ensure_future(crawl_executor.crawl(SlowSpider))
+            while not mock_browser.method_calls and not mock_get_browser.called:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # the abandoned crawl thread is still running so don't wait for it
+            crawl_executor.shutdown(wait=False)
+
+        started = time.time()
+        asyncio.run(crawl())
+        self.assertLess(time.time() - started, 5)
+        mock_browser.kill.assert_called_once_with()
+
+    def test_cancel_waiting_crawl(self, *args):
+        async def crawl():
+            crawl_executor = aio.AsyncCrawlExecutor(max_concurrent_crawls=1)
+            running_task = asyncio.ensure_future(crawl_executor.crawl(SlowSpider))
+            waiting_task = asyncio.ensure_future(crawl_executor.crawl(QuickSpider, 'IBM'))
+            await asyncio.sleep(0.1)
+
+            waiting_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting_task
+
+            slow_crawl_event.set()
+            crawl_response = await running_task
+            crawl_executor.shutdown()
+            return crawl_response
+
+        crawl_response = asyncio.run(crawl())
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+
+    def test_max_concurrent_crawls_enforced_after_cancel(self, *args):
+        async def crawl():
+            crawl_executor = aio.AsyncCrawlExecutor(max_concurrent_crawls=1)
+            # a bigger thread pool so only the semaphore limits concurrent crawls
+            crawl_executor._executor.shutdown()
+            crawl_executor._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+            running_task = asyncio.ensure_future(crawl_executor.crawl(SlowSpider))
+            await asyncio.sleep(0.1)
+
+            # the cancelled crawl's thread is still running so the next crawl has to wait
+            running_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await running_task
+            waiting_task = asyncio.ensure_future(crawl_executor.crawl(QuickSpider, 'IBM'))
+            await asyncio.sleep(0.1)
+            waiting_task_done = waiting_task.done()
+            number_running = crawl_executor.number_running
+
+            slow_crawl_event.set()
+            crawl_response = await waiting_task
+            crawl_executor.shutdown()
+            return (waiting_task_done, number_running, crawl_response)
+
+        # the crawl ignores cancellation so its thread keeps running
+        with mock.patch.object(spider.SpiderCrawler, 'cancel'):
+            (waiting_task_done, number_running, crawl_response) = asyncio.run(crawl())
+
+        self.assertFalse(waiting_task_done)
+        self.assertEqual(1, number_running)
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+
+    def test_max_concurrent_crawls_enforced_after_timeout(self, *args):
+        async def crawl():
+            crawl_executor = aio.AsyncCrawlExecutor(max_concurrent_crawls=1)
+            # a bigger thread pool so only the semaphore limits concurrent crawls
+            crawl_executor._executor.shutdown()
+            crawl_executor._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+            # the timed out crawl's thread is still running so the next crawl has to wait
+            timed_out_crawl_response = await crawl_executor.crawl(HungSpider)
+            waiting_task = asyncio.ensure_future(crawl_executor.crawl(QuickSpider, 'IBM'))
+            await asyncio.sleep(0.1)
+            waiting_task_done = waiting_task.done()
+            number_running = crawl_executor.number_running
+
+            slow_crawl_event.set()
+            crawl_response = await waiting_task
+            crawl_executor.shutdown()
+            return (timed_out_crawl_response, waiting_task_done, number_running, crawl_response)
+
+        (timed_out_crawl_response, waiting_task_done, number_running, crawl_response) = asyncio.run(crawl())
+
+        self.assertEqual(spider.CrawlResponse.SC_CRAWL_TIMED_OUT, timed_out_crawl_response.status_code)
+        self.assertFalse(waiting_task_done)
+        self.assertEqual(1, number_running)
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+
+
+class TestSpiderCrawlerCancel(unittest.TestCase):
+
+    def test_cancel_before_crawl(self):
+        spider_crawler = spider.SpiderCrawler(QuickSpider)
+        spider_crawler.cancel()
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser') as mock_get_browser:
+            crawl_response = spider_crawler.crawl('IBM')
+        self.assertEqual(spider.CrawlResponse.SC_CRAWL_CANCELLED, crawl_response.status_code)
+        mock_get_browser.assert_not_called()
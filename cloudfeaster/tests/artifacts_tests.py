@@ -0,0 +1,133 @@
+"""This module contains unit tests for the ```artifacts``` module."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from .. import artifacts
+
+
+class TestArtifactManager(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write(self, crawl_artifacts, name, size):
+        with open(crawl_artifacts.filename(name), 'wb') as fp:
+            fp.write(b'x' * size)
+
+    def test_default_directory(self):
+        with mock.patch.dict(os.environ, {'CLF_ARTIFACT_DIR': self.directory}):
+            artifact_manager = artifacts.ArtifactManager()
+        self.assertEqual(os.path.join(self.directory, 'clf-artifacts'), artifact_manager.directory)
+
+    def test_create(self):
+        artifact_manager = artifacts.ArtifactManager(self.directory)
+        crawl_artifacts1 = artifact_manager.create()
+        crawl_artifacts2 = artifact_manager.create()
+
+        self.assertNotEqual(crawl_artifacts1.directory, crawl_artifacts2.directory)
+        self.assertTrue(os.path.isdir(crawl_artifacts1.directory))
+        self.assertEqual(crawl_artifacts1.directory, os.path.dirname(crawl_artifacts1.filename('screenshot.png')))
+        self.assertFalse(os.path.exists(crawl_artifacts1.filename('screenshot.png')))
+
+    def test_delete(self):
+        artifact_manager = artifacts.ArtifactManager(self.directory)
+        crawl_artifacts = artifact_manager.create()
+        self._write(crawl_artifacts, 'screenshot.png', 10)
+
+        crawl_artifacts.delete()
+
+        self.assertFalse(os.path.exists(crawl_artifacts.directory))
+
+    def test_retain_empty_directory_deleted(self):
+        artifact_manager = artifacts.ArtifactManager(self.directory)
+        crawl_artifacts = artifact_manager.create()
+
+        crawl_artifacts.retain()
+
+        self.assertFalse(os.path.exists(crawl_artifacts.directory))
+
+    def test_retention_cap(self):
+        artifact_manager = artifacts.ArtifactManager(self.directory, max_retained_size_in_bytes=250)
+
+        crawl_artifacts1 = artifact_manager.create()
+        self._write(crawl_artifacts1, 'screenshot.png', 100)
+        crawl_artifacts1.retain()
+        os.utime(crawl_artifacts1.directory, (time.time() - 60, time.time() - 60))
+
+        crawl_artifacts2 = artifact_manager.create()
+        self._write(crawl_artifacts2, 'screenshot.png', 100)
+        crawl_artifacts2.retain()
+
+        # in progress crawls are never evicted
+        crawl_artifacts3 = artifact_manager.create()
+        self._write(crawl_artifacts3, 'screenshot.png', 1000)
+
+        crawl_artifacts4 = artifact_manager.create()
+        self._write(crawl_artifacts4, 'screenshot.png', 100)
+        crawl_artifacts4.retain()
+
+        self.assertFalse(os.path.exists(crawl_artifacts1.directory))
+        self.assertTrue(os.path.exists(crawl_artifacts2.directory))
+        self.assertTrue(os.path.exists(crawl_artifacts3.directory))
+        self.assertTrue(os.path.exists(crawl_artifacts4.directory))
+
+    def test_other_processes_in_progress_crawls_not_evicted(self):
+        # flock() locks belong to open files so a 2nd artifact manager in
+        # this process behaves like an artifact manager in another process
+        artifact_manager = artifacts.ArtifactManager(self.directory, max_retained_size_in_bytes=250)
+        other_artifact_manager = artifacts.ArtifactManager(self.directory, max_retained_size_in_bytes=250)
+
+        other_crawl_artifacts = other_artifact_manager.create()
+        self._write(other_crawl_artifacts, 'screenshot.png', 1000)
+        os.utime(other_crawl_artifacts.directory, (time.time() - 60, time.time() - 60))
+
+        crawl_artifacts = artifact_manager.create()
+        self._write(crawl_artifacts, 'screenshot.png', 100)
+        crawl_artifacts.retain()
+
+        self.assertTrue(os.path.exists(other_crawl_artifacts.directory))
+        self.assertTrue(os.path.exists(crawl_artifacts.directory))
+
+        # once the other crawl's over its artifacts can be evicted
+        other_crawl_artifacts.retain()
+        self.assertFalse(os.path.exists(other_crawl_artifacts.directory))
+        self.assertTrue(os.path.exists(crawl_artifacts.directory))
+
+    def test_artifacts_of_crawl_whose_process_died_evicted(self):
+        artifact_manager = artifacts.ArtifactManager(self.directory, max_retained_size_in_bytes=250)
+        other_artifact_manager = artifacts.ArtifactManager(self.directory, max_retained_size_in_bytes=250)
+
+        other_crawl_artifacts = other_artifact_manager.create()
+        self._write(other_crawl_artifacts, 'screenshot.png', 1000)
+        os.utime(other_crawl_artifacts.directory, (time.time() - 60, time.time() - 60))
+        # when a process dies its files are closed which releases its locks
+        other_artifact_manager._active_directories[other_crawl_artifacts.directory].close()
+
+        crawl_artifacts = artifact_manager.create()
+        self._write(crawl_artifacts, 'screenshot.png', 100)
+        crawl_artifacts.retain()
+
+        self.assertFalse(os.path.exists(other_crawl_artifacts.directory))
+        self.assertFalse(os.path.exists(artifact_manager._marker_filename(other_crawl_artifacts.directory)))
+        self.assertTrue(os.path.exists(crawl_artifacts.directory))
+
+    def test_marker_removed_when_crawl_over(self):
+        artifact_manager = artifacts.ArtifactManager(self.directory)
+        crawl_artifacts = artifact_manager.create()
+        self.assertTrue(os.path.exists(artifact_manager._marker_filename(crawl_artifacts.directory)))
+
+        crawl_artifacts.delete()
+
+        self.assertFalse(os.path.exists(artifact_manager._marker_filename(crawl_artifacts.directory)))
+
+    def test_get_default_artifact_manager(self):
+        self.assertIs(artifacts.get_default_artifact_manager(), artifacts.get_default_artifact_manager())
@@ -0,0 +1,457 @@
+"""This module contains unit tests for the ```browser``` module."""
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+import mock
+from selenium.webdriver.common.by import By
+
+from .. import browser
+from .. import spider
+from .. import tracing
+
+
+class PatchedBrowserPool(browser.BrowserPool):
+    """A :py:class:`browser.BrowserPool` which creates mock browsers
+    rather than starting Chrome.
+    """
+
+    def _create_browser(self, paranoia_level):
+        mock_browser = mock.MagicMock()
+        mock_browser.paranoia_level = paranoia_level
+        mock_browser.window_handles = ['window-1']
+        mock_browser.execute_cdp_cmd.side_effect = _execute_cdp_cmd
+        return mock_browser
+
+
+def _execute_cdp_cmd(cmd, cmd_args):
+    if cmd == 'Page.getNavigationHistory':
+        return {'currentIndex': 0, 'entries': [{'url': 'https://www.example.com/'}]}
+    if cmd == 'Page.getFrameTree':
+        return {'frameTree': {'frame': {'url': 'https://www.example.com/'}}}
+    return {}
+
+
+class FakeChrome(object):
+    """Just enough of Chrome's per origin state (storage, cookies and HTTP cache),
+    windows, navigation history and frames to check what a leased browser can see.
+    """
+
+    def __init__(self):
+        object.__init__(self)
+
+        # window handle -> list of urls
+        self._histories = {'window-1': ['about:blank']}
+        # window handle -> urls of the current page's frames
+        self._frames = {'window-1': []}
+        self._current_window_handle = 'window-1'
+
+        # origin -> set of storage types with data
+        self.storage = {}
+        self.cookies = set()
+        self.http_cache = set()
+
+        self.switch_to = mock.Mock()
+        self.switch_to.window.side_effect = self._switch_to_window
+
+    @property
+    def window_handles(self):
+        return sorted(self._histories.keys())
+
+    @property
+    def current_url(self):
+        return self._histories[self._current_window_handle][-1]
+
+    def _switch_to_window(self, window_handle):
+        self._current_window_handle = window_handle
+
+    def get(self, url):
+        self._histories[self._current_window_handle].append(url)
+        self._frames[self._current_window_handle] = []
+
+        origin = browser._origin(url)
+        if origin:
+            self.storage.setdefault(origin, set()).update(['indexeddb', 'cache_storage', 'service_workers'])
+            self.cookies.add(origin)
+            self.http_cache.add(url)
+
+    def open_window(self, url):
+        window_handle = 'window-%d' % (len(self._histories) + 1)
+        self._histories[window_handle] = []
+        self._frames[window_handle] = []
+        self._current_window_handle = window_handle
+        self.get(url)
+
+    def load_frame(self, url):
+        self._frames[self._current_window_handle].append(url)
+        self.storage.setdefault(browser._origin(url), set()).add('local_storage')
+
+    def execute_script(self, script):
+        pass
+
+    def close(self):
+        del self._histories[self._current_window_handle]
+        del self._frames[self._current_window_handle]
+
+    def quit(self):
+        pass
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        window_handle = self._current_window_handle
+        if cmd == 'Page.getNavigationHistory':
+            entries = [{'url': url} for url in self._histories[window_handle]]
+            return {'currentIndex': len(entries) - 1, 'entries': entries}
+        if cmd == 'Page.getFrameTree':
+            return {
+                'frameTree': {
+                    'frame': {'url': self.current_url},
+                    'childFrames': [{'frame': {'url': url}} for url in self._frames[window_handle]],
+                },
+            }
+        if cmd == 'Page.resetNavigationHistory':
+            self._histories[window_handle] = self._histories[window_handle][-1:]
+        elif cmd == 'Storage.clearDataForOrigin':
+            if cmd_args['storageTypes'] == 'all':
+                self.storage.pop(cmd_args['origin'], None)
+        elif cmd == 'Network.clearBrowserCache':
+            self.http_cache.clear()
+        elif cmd == 'Network.clearBrowserCookies':
+            self.cookies.clear()
+        return {}
+
+
+class FakeChromeBrowserPool(browser.BrowserPool):
+
+    def _create_browser(self, paranoia_level):
+        return FakeChrome()
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def test_browser_reused(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease('https://www.example.com', 'low') as browser1:
+                browser1.get.assert_called_with('https://www.example.com')
+
+            with browser_pool.lease('https://www.example.com', 'low') as browser2:
+                pass
+
+            self.assertIs(browser1, browser2)
+            self.assertEqual(1, browser_pool.number_browsers_created)
+            self.assertEqual(2, browser_pool.number_leases)
+            browser1.quit.assert_not_called()
+
+        browser1.quit.assert_called_once_with()
+
+    def test_browser_reset_between_leases(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser:
+                browser.window_handles = ['window-1', 'window-2']
+
+            browser.close.assert_called_once_with()
+            browser.switch_to.window.assert_called_with('window-1')
+            browser.execute_cdp_cmd.assert_any_call(
+                'Storage.clearDataForOrigin',
+                {'origin': 'https://www.example.com', 'storageTypes': 'all'})
+            browser.execute_cdp_cmd.assert_any_call('Network.clearBrowserCache', {})
+            browser.execute_cdp_cmd.assert_any_call('Network.clearBrowserCookies', {})
+            self.assertIn('localStorage.clear()', browser.execute_script.call_args[0][0])
+            self.assertIn('sessionStorage.clear()', browser.execute_script.call_args[0][0])
+            browser.get.assert_called_with('about:blank')
+
+    def test_second_lease_cant_see_first_leases_state(self):
+        with FakeChromeBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease('https://login.example.com/sign-in', 'low') as browser1:
+                # navigations the pool doesn't see - links followed, new windows and iframes
+                browser1.get('https://account.example.com:8443/home')
+                browser1.load_frame('https://widgets.example.net/chat')
+                browser1.open_window('https://docs.example.org/')
+                self.assertEqual(4, len(browser1.storage))
+
+            with browser_pool.lease(None, 'low') as browser2:
+                self.assertIs(browser1, browser2)
+                self.assertEqual({}, browser2.storage)
+                self.assertEqual(set(), browser2.cookies)
+                self.assertEqual(set(), browser2.http_cache)
+                self.assertEqual(['window-1'], browser2.window_handles)
+                self.assertEqual(
+                    {'entries': [{'url': 'about:blank'}], 'currentIndex': 0},
+                    browser2.execute_cdp_cmd('Page.getNavigationHistory', {}))
+
+    def test_browser_discarded_without_chrome_devtools_protocol(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser1:
+                del browser1.execute_cdp_cmd
+
+            browser1.quit.assert_called_once_with()
+
+    def test_origin(self):
+        self.assertEqual('https://www.example.com', browser._origin('https://www.example.com/a?b=c'))
+        self.assertEqual('https://www.example.com', browser._origin('https://WWW.example.com:443/'))
+        self.assertEqual('http://www.example.com:8080', browser._origin('http://user@www.example.com:8080/'))
+        self.assertEqual('http://[::1]:8080', browser._origin('http://[::1]:8080/'))
+        self.assertIsNone(browser._origin('about:blank'))
+        self.assertIsNone(browser._origin('data:text/html,hello'))
+
+    def test_browsers_per_paranoia_level(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser1:
+                pass
+
+            with browser_pool.lease(None, 'high') as browser2:
+                pass
+
+            self.assertIsNot(browser1, browser2)
+            self.assertEqual('low', browser1.paranoia_level)
+            self.assertEqual('high', browser2.paranoia_level)
+
+    def test_browsers_per_proxy(self):
+        proxies = [('proxy1.example.com', 8080), ('proxy2.example.com', 8080)]
+
+        def proxy_patch(paranoia_level):
+            return proxies.pop(0)
+
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with mock.patch('cloudfeaster_extension.proxy', proxy_patch):
+                with browser_pool.lease(None, 'low') as browser1:
+                    pass
+
+                with browser_pool.lease(None, 'low') as browser2:
+                    pass
+
+            self.assertIsNot(browser1, browser2)
+
+    def test_browser_recycled_after_max_leases(self):
+        with PatchedBrowserPool(size=1, max_leases=2) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser1:
+                pass
+
+            with browser_pool.lease(None, 'low') as browser2:
+                pass
+
+            self.assertIs(browser1, browser2)
+            browser1.quit.assert_called_once_with()
+
+            with browser_pool.lease(None, 'low') as browser3:
+                pass
+
+            self.assertIsNot(browser1, browser3)
+            self.assertEqual(2, browser_pool.number_browsers_created)
+
+    def test_browser_discarded_when_reset_fails(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser1:
+                browser1.execute_cdp_cmd.side_effect = Exception('session deleted')
+
+            browser1.quit.assert_called_once_with()
+
+            with browser_pool.lease(None, 'low') as browser2:
+                pass
+
+            self.assertIsNot(browser1, browser2)
+
+    def test_browser_discarded_when_lease_raises_exception(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with self.assertRaises(ValueError):
+                with browser_pool.lease(None, 'low') as browser1:
+                    raise ValueError()
+
+            browser1.quit.assert_called_once_with()
+            self.assertEqual(1, browser_pool.number_browsers_discarded)
+
+    def test_broken_browser_discarded_by_health_check(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser1:
+                pass
+
+            type(browser1).current_url = mock.PropertyMock(side_effect=Exception('chrome not reachable'))
+
+            with browser_pool.lease(None, 'low') as browser2:
+                pass
+
+            self.assertIsNot(browser1, browser2)
+            browser1.quit.assert_called_once_with()
+
+    def test_pool_size(self):
+        with PatchedBrowserPool(size=1) as browser_pool:
+            with browser_pool.lease(None, 'low') as browser1:
+                with browser_pool.lease(None, 'low') as browser2:
+                    pass
+
+            # browser2 is returned to the pool first which leaves no room for browser1
+            self.assertIsNot(browser1, browser2)
+            browser1.quit.assert_called_once_with()
+            browser2.quit.assert_not_called()
+
+    def test_warm(self):
+        with PatchedBrowserPool(size=3) as browser_pool:
+            browser_pool.warm('low')
+            self.assertEqual(3, browser_pool.number_browsers_created)
+
+            browser_pool.warm('low')
+            self.assertEqual(3, browser_pool.number_browsers_created)
+
+            with browser_pool.lease(None, 'low'):
+                pass
+            self.assertEqual(3, browser_pool.number_browsers_created)
+
+    def test_remote_browser_execute_cdp_cmd(self):
+        with mock.patch('selenium.webdriver.Remote.__init__', return_value=None):
+            remote_browser = browser.RemoteBrowser.__new__(browser.RemoteBrowser)
+            remote_browser.command_executor = mock.Mock(_commands={})
+            browser.RemoteBrowser.__init__(remote_browser, 'http://127.0.0.1:9515', None, 'low')
+
+        self.assertEqual(
+            ('POST', '/session/$sessionId/goog/cdp/execute'),
+            remote_browser.command_executor._commands['executeCdpCommand'])
+
+        with mock.patch('cloudfeaster.browser.RemoteBrowser.execute', return_value={'value': {}}) as mock_execute:
+            self.assertEqual({}, remote_browser.execute_cdp_cmd('Network.clearBrowserCache', {}))
+        mock_execute.assert_called_once_with(
+            'executeCdpCommand',
+            {'cmd': 'Network.clearBrowserCache', 'params': {}})
+
+    def test_remote_chromedriver(self):
+        browser_pool = browser.BrowserPool(remote_chromedriver='http://127.0.0.1:9515')
+        with mock.patch('cloudfeaster.browser.RemoteBrowser') as mock_remote_browser:
+            browser_pool._create_browser('low')
+        mock_remote_browser.assert_called_once_with('http://127.0.0.1:9515', None, 'low')
+
+
+class TestChromeOptions(unittest.TestCase):
+
+    def test_proxy(self):
+        with mock.patch('cloudfeaster_extension.proxy', return_value=('proxy.example.com', 3128)):
+            arguments = browser.Browser.get_chrome_options('low').arguments
+        self.assertIn('--proxy-server=proxy.example.com:3128', arguments)
+        self.assertNotIn('--ignore-certificate-errors', arguments)
+
+    def test_network_fixtures_proxy(self):
+        with mock.patch('cloudfeaster_extension.proxy', return_value=('proxy.example.com', 3128)):
+            arguments = browser.Browser.get_chrome_options('low', ('127.0.0.1', 8888)).arguments
+        self.assertIn('--proxy-server=127.0.0.1:8888', arguments)
+        self.assertNotIn('--proxy-server=proxy.example.com:3128', arguments)
+        self.assertIn('--ignore-certificate-errors', arguments)
+
+    def test_netfixtures_not_imported(self):
+        code = 'import sys; import cloudfeaster.browser; print("cloudfeaster.netfixtures" in sys.modules)'
+        completed_process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual('False', completed_process.stdout.strip())
+
+
+class TestKillBrowser(unittest.TestCase):
+
+    @unittest.skipUnless(os.path.isdir('/proc'), 'requires /proc')
+    def test_kill_process_tree(self):
+        # a parent process with a child process - like chromedriver and chrome
+        code = (
+            'import subprocess, sys, time; '
+            'child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"]); '
+            'print(child.pid, flush=True); '
+            'time.sleep(60)'
+        )
+        parent = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, text=True)
+        child_pid = int(parent.stdout.readline())
+
+        self.assertIn(child_pid, browser._descendant_pids(parent.pid))
+
+        browser._kill_process_tree(parent.pid)
+        parent.wait(10)
+        parent.stdout.close()
+
+        # the child is reparented once killed so poll /proc until it's gone (or a zombie)
+        for _ in range(100):
+            try:
+                with open('/proc/%d/stat' % child_pid, 'r') as fp:
+                    if fp.read().split(')')[-1].split()[0] == 'Z':
+                        break
+            except OSError:
+                break
+            time.sleep(0.05)
+        else:
+            self.fail('child process %d not killed' % child_pid)
+
+    def test_kill(self):
+        mock_browser = mock.MagicMock()
+        mock_browser.service.process.pid = 1234
+        with mock.patch('cloudfeaster.browser._kill_process_tree') as mock_kill_process_tree:
+            browser.Browser.kill(mock_browser)
+        mock_kill_process_tree.assert_called_once_with(1234)
+        mock_browser.service.process.wait.assert_called_once_with()
+        mock_browser.quit.assert_not_called()
+
+    def test_kill_remote_browser(self):
+        mock_browser = mock.MagicMock()
+        browser.RemoteBrowser.kill(mock_browser)
+        for _ in range(100):
+            if mock_browser._quit_quietly.called:
+                break
+            time.sleep(0.01)
+        mock_browser._quit_quietly.assert_called_once_with()
+
+
+class TestTraceCommands(unittest.TestCase):
+
+    def test_commands_traced(self):
+        for browser_class in [browser.Browser, browser.RemoteBrowser]:
+            # no __init__() so Chrome isn't started
+            a_browser = object.__new__(browser_class)
+
+            command_trace = tracing.CommandTrace()
+            with mock.patch('selenium.webdriver.remote.webdriver.WebDriver.execute') as mock_execute:
+                mock_execute.return_value = {'value': 'dave'}
+                command_trace.start()
+                try:
+                    response = a_browser.execute('getTitle')
+                finally:
+                    command_trace.stop()
+
+            self.assertEqual({'value': 'dave'}, response)
+            mock_execute.assert_called_once_with('getTitle', None)
+            self.assertEqual(['getTitle'], [command['command'] for command in command_trace.commands])
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_snapshot(self):
+        for browser_class in [browser.Browser, browser.RemoteBrowser]:
+            # no __init__() so Chrome isn't started
+            a_browser = object.__new__(browser_class)
+            a_browser._paranoia_level = 'low'
+
+            page_source = '<html><body><h1>42</h1></body></html>'
+            with mock.patch.object(browser_class, 'execute_script') as mock_execute_script:
+                mock_execute_script.return_value = [page_source, 'https://www.example.com/']
+                page = a_browser.snapshot()
+
+            mock_execute_script.assert_called_once()
+            self.assertEqual(42, page.find_element(By.XPATH, '//h1').get_int())
+            self.assertEqual('https://www.example.com/', page.current_url)
+
+
+class TestSpiderCrawlerWithBrowserPool(unittest.TestCase):
+
+    def test_crawl_uses_browser_pool(self):
+        class MySpider(spider.Spider):
+
+            @classmethod
+            def get_metadata(cls):
+                return {'url': 'https://www.example.com'}
+
+            def crawl(self, browser):
+                return spider.CrawlResponseOk({'paranoiaLevel': browser.paranoia_level})
+
+        with PatchedBrowserPool(size=1) as browser_pool:
+            for _ in range(3):
+                spider_crawler = spider.SpiderCrawler(MySpider, browser_pool=browser_pool)
+                with mock.patch.object(spider_crawler, '_take_screenshot', return_value=None):
+                    crawl_response = spider_crawler.crawl()
+                self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+                self.assertEqual(crawl_response['paranoiaLevel'], 'low')
+                self.assertIsNone(spider_crawler.chromedriver_log_file)
+
+            self.assertEqual(1, browser_pool.number_browsers_created)
+            self.assertEqual(3, browser_pool.number_leases)
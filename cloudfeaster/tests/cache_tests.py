@@ -0,0 +1,225 @@
+"""This module contains unit tests for the ```cache``` module."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from .. import cache
+from .. import spider
+
+
+class CountingSpider(spider.Spider):
+
+    number_crawls = 0
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'ttl': '1h',
+            'identifyingFactors': {
+                'symbol': {
+                    'pattern': '^.+$',
+                },
+            },
+        }
+
+    def crawl(self, browser, symbol):
+        type(self).number_crawls += 1
+        return spider.CrawlResponseOk({'symbol': symbol, 'crawl': type(self).number_crawls})
+
+
+class OtherCountingSpider(CountingSpider):
+    """Same module and so the same version and crawl args as ```CountingSpider```."""
+
+    number_crawls = 0
+
+
+class FailingSpider(spider.Spider):
+
+    number_crawls = 0
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+        }
+
+    def crawl(self, browser):
+        type(self).number_crawls += 1
+        return spider.CrawlResponseBadCredentials()
+
+
+class TestCrawlResultCacheKey(unittest.TestCase):
+
+    def test_key_depends_on_spider_version_and_args(self):
+        key = cache.crawl_result_cache_key('spiders.ASpider', 'sha256:abc', ['dave', 'secret'])
+
+        self.assertEqual(key, cache.crawl_result_cache_key('spiders.ASpider', 'sha256:abc', ['dave', 'secret']))
+        self.assertNotEqual(key, cache.crawl_result_cache_key('spiders.ASpider', 'sha256:def', ['dave', 'secret']))
+        self.assertNotEqual(key, cache.crawl_result_cache_key('spiders.BSpider', 'sha256:abc', ['dave', 'secret']))
+        self.assertNotEqual(key, cache.crawl_result_cache_key('spiders.ASpider', 'sha256:abc', ['dave', 'other']))
+        self.assertNotEqual(
+            key,
+            cache.crawl_result_cache_key('spiders.ASpider', 'sha256:abc', ['dave', 'secret'], {'x': 'y'}))
+
+    def test_key_does_not_contain_crawl_args(self):
+        key = cache.crawl_result_cache_key('spiders.ASpider', 'sha256:abc', ['dave', 'secret'])
+        self.assertNotIn('secret', key)
+
+
+class CrawlResultCacheTestMixin(object):
+    """Tests which apply to all crawl result cache backends. Derived classes
+    implement ```create_cache()```.
+    """
+
+    def test_get_and_put(self):
+        crawl_result_cache = self.create_cache()
+        self.assertIsNone(crawl_result_cache.get('key'))
+
+        crawl_result_cache.put('key', {'a': 1, '_debug': {'crawlLog': '/tmp/log'}}, 60)
+        self.assertEqual({'a': 1}, crawl_result_cache.get('key'))
+
+        self.assertEqual(1, crawl_result_cache.number_hits)
+        self.assertEqual(1, crawl_result_cache.number_misses)
+
+    def test_expiry(self):
+        crawl_result_cache = self.create_cache()
+        crawl_result_cache.put('key', {'a': 1}, 60)
+
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(crawl_result_cache.get('key'))
+
+        self.assertIsNone(crawl_result_cache.get('key'))
+
+    def test_clear(self):
+        crawl_result_cache = self.create_cache()
+        crawl_result_cache.put('key', {'a': 1}, 60)
+        crawl_result_cache.clear()
+        self.assertIsNone(crawl_result_cache.get('key'))
+
+
+class TestMemoryCrawlResultCache(CrawlResultCacheTestMixin, unittest.TestCase):
+
+    def create_cache(self, *args, **kwargs):
+        return cache.MemoryCrawlResultCache(*args, **kwargs)
+
+    def test_lru_eviction_by_number_of_entries(self):
+        crawl_result_cache = self.create_cache(max_entries=2)
+        crawl_result_cache.put('key1', {'a': 1}, 60)
+        crawl_result_cache.put('key2', {'a': 2}, 60)
+        crawl_result_cache.get('key1')
+        crawl_result_cache.put('key3', {'a': 3}, 60)
+
+        self.assertEqual(2, len(crawl_result_cache))
+        self.assertIsNotNone(crawl_result_cache.get('key1'))
+        self.assertIsNone(crawl_result_cache.get('key2'))
+        self.assertIsNotNone(crawl_result_cache.get('key3'))
+
+    def test_lru_eviction_by_size(self):
+        crawl_result_cache = self.create_cache(max_size_in_bytes=50)
+        crawl_result_cache.put('key1', {'a': 'x' * 20}, 60)
+        crawl_result_cache.put('key2', {'a': 'y' * 20}, 60)
+
+        self.assertIsNone(crawl_result_cache.get('key1'))
+        self.assertIsNotNone(crawl_result_cache.get('key2'))
+
+    def test_crawl_result_too_big_to_cache(self):
+        crawl_result_cache = self.create_cache(max_size_in_bytes=10)
+        crawl_result_cache.put('key', {'a': 'x' * 20}, 60)
+        self.assertEqual(0, len(crawl_result_cache))
+
+
+class TestDiskCrawlResultCache(CrawlResultCacheTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def create_cache(self, *args, **kwargs):
+        return cache.DiskCrawlResultCache(self.directory, *args, **kwargs)
+
+    def test_shared_across_instances(self):
+        self.create_cache().put('key', {'a': 1}, 60)
+        self.assertEqual({'a': 1}, self.create_cache().get('key'))
+
+    def test_lru_eviction_by_size(self):
+        crawl_result_cache = self.create_cache(max_size_in_bytes=200)
+        crawl_result_cache.put('key1', {'a': 'x' * 20}, 60)
+        crawl_result_cache.put('key2', {'a': 'y' * 20}, 60)
+        os.utime(os.path.join(self.directory, 'key1.json'), (time.time() - 60, time.time() - 60))
+        crawl_result_cache.put('key3', {'a': 'z' * 20}, 60)
+
+        self.assertIsNone(crawl_result_cache.get('key1'))
+        self.assertIsNotNone(crawl_result_cache.get('key2'))
+        self.assertIsNotNone(crawl_result_cache.get('key3'))
+
+    def test_corrupt_file_is_a_miss(self):
+        crawl_result_cache = self.create_cache()
+        with open(os.path.join(self.directory, 'key.json'), 'w') as fp:
+            fp.write('{')
+        self.assertIsNone(crawl_result_cache.get('key'))
+
+
+@mock.patch('cloudfeaster.spider.SpiderCrawler._get_browser', side_effect=lambda *args, **kwargs: mock.MagicMock())
+@mock.patch('cloudfeaster.spider.SpiderCrawler._take_screenshot', return_value=None)
+class TestSpiderCrawlerWithCrawlResultCache(unittest.TestCase):
+
+    def setUp(self):
+        CountingSpider.number_crawls = 0
+        OtherCountingSpider.number_crawls = 0
+        FailingSpider.number_crawls = 0
+
+    def test_cache_hit(self, *args):
+        crawl_result_cache = cache.MemoryCrawlResultCache()
+
+        crawl_response1 = spider.SpiderCrawler(CountingSpider, crawl_result_cache=crawl_result_cache).crawl('IBM')
+        crawl_response2 = spider.SpiderCrawler(CountingSpider, crawl_result_cache=crawl_result_cache).crawl('IBM')
+
+        self.assertEqual(1, CountingSpider.number_crawls)
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response2.status_code)
+        self.assertIsInstance(crawl_response2, spider.CrawlResponse)
+        self.assertFalse(crawl_response1['_metadata']['cacheHit'])
+        self.assertTrue(crawl_response2['_metadata']['cacheHit'])
+        self.assertEqual(crawl_response1['crawl'], crawl_response2['crawl'])
+        self.assertEqual(crawl_response1['_metadata']['crawlTime'], crawl_response2['_metadata']['crawlTime'])
+
+    def test_different_crawl_args_not_cached(self, *args):
+        crawl_result_cache = cache.MemoryCrawlResultCache()
+
+        spider.SpiderCrawler(CountingSpider, crawl_result_cache=crawl_result_cache).crawl('IBM')
+        crawl_response = spider.SpiderCrawler(CountingSpider, crawl_result_cache=crawl_result_cache).crawl('AAPL')
+
+        self.assertEqual(2, CountingSpider.number_crawls)
+        self.assertFalse(crawl_response['_metadata']['cacheHit'])
+
+    def test_different_spiders_not_cached(self, *args):
+        crawl_result_cache = cache.MemoryCrawlResultCache()
+        self.assertEqual(CountingSpider.version(), OtherCountingSpider.version())
+
+        spider.SpiderCrawler(CountingSpider, crawl_result_cache=crawl_result_cache).crawl('IBM')
+        crawl_response = spider.SpiderCrawler(OtherCountingSpider, crawl_result_cache=crawl_result_cache).crawl('IBM')
+
+        self.assertEqual(1, CountingSpider.number_crawls)
+        self.assertEqual(1, OtherCountingSpider.number_crawls)
+        self.assertFalse(crawl_response['_metadata']['cacheHit'])
+        self.assertEqual(2, len(crawl_result_cache))
+
+    def test_unsuccessful_crawls_not_cached(self, *args):
+        crawl_result_cache = cache.MemoryCrawlResultCache()
+
+        for _ in range(2):
+            crawl_response = spider.SpiderCrawler(FailingSpider, crawl_result_cache=crawl_result_cache).crawl()
+            self.assertEqual(spider.CrawlResponse.SC_BAD_CREDENTIALS, crawl_response.status_code)
+
+        self.assertEqual(2, FailingSpider.number_crawls)
+
+    def test_no_cache(self, *args):
+        crawl_response = spider.SpiderCrawler(CountingSpider).crawl('IBM')
+        self.assertNotIn('cacheHit', crawl_response['_metadata'])
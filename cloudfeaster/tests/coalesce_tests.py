@@ -0,0 +1,277 @@
+"""This module contains unit tests for the ```coalesce``` module."""
+
+import concurrent.futures
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from .. import artifacts
+from .. import coalesce
+from .. import jsonschemas
+from .. import spider
+from .. import util
+
+
+class TestCrawlKey(unittest.TestCase):
+
+    def test_key(self):
+        key = coalesce.crawl_key('cloudfeaster.samples.pypi.PyPISpider', ['dave', 'secret'])
+
+        self.assertEqual(key, coalesce.crawl_key('cloudfeaster.samples.pypi.PyPISpider', ['dave', 'secret']))
+        self.assertNotEqual(key, coalesce.crawl_key('cloudfeaster.samples.pypi.PyPISpider', ['dave', 'other']))
+        self.assertNotEqual(key, coalesce.crawl_key('cloudfeaster.samples.pypi.OtherSpider', ['dave', 'secret']))
+        self.assertNotIn('secret', repr(key))
+
+    def test_key_from_spider_class(self):
+        self.assertEqual(
+            coalesce.crawl_key(spider.Spider, []),
+            coalesce.crawl_key('cloudfeaster.spider.Spider', []))
+
+
+class TestCrawlCoalescer(unittest.TestCase):
+
+    def test_identical_crawls_coalesced(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', ['arg'])
+
+        crawl_started = threading.Event()
+        finish_crawl = threading.Event()
+        number_crawls = []
+
+        def crawl():
+            number_crawls.append(1)
+            crawl_started.set()
+            finish_crawl.wait(5)
+            return spider.CrawlResponseOk({'answer': 42})
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(crawl_coalescer.crawl, key, crawl)
+            crawl_started.wait(5)
+            followers = [executor.submit(crawl_coalescer.crawl, key, crawl) for _ in range(3)]
+
+            # wait for the followers to be waiting on the leader's crawl
+            while crawl_coalescer.number_coalesced_crawls < 3:
+                threading.Event().wait(0.01)
+
+            finish_crawl.set()
+            crawl_responses = [future.result() for future in [leader] + followers]
+
+        self.assertEqual(1, len(number_crawls))
+        self.assertEqual(1, crawl_coalescer.number_crawls)
+        self.assertEqual(0, len(crawl_coalescer))
+        for crawl_response in crawl_responses:
+            self.assertIsInstance(crawl_response, spider.CrawlResponseOk)
+            self.assertEqual(42, crawl_response['answer'])
+
+        # each caller has its own copy of _metadata
+        crawl_responses[0]['_metadata']['status']['message'] = 'changed'
+        self.assertEqual('Ok', crawl_responses[1]['_metadata']['status']['message'])
+
+    def test_sequential_crawls_not_coalesced(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        for _ in range(2):
+            crawl_coalescer.crawl(key, spider.CrawlResponseOk)
+
+        self.assertEqual(2, crawl_coalescer.number_crawls)
+        self.assertEqual(0, crawl_coalescer.number_coalesced_crawls)
+
+    def test_crawl_raises_exception(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        def crawl():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            crawl_coalescer.crawl(key, crawl)
+        self.assertEqual(0, len(crawl_coalescer))
+
+    def test_submit(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        in_flight_future = concurrent.futures.Future()
+        futures = [crawl_coalescer.submit(key, lambda: in_flight_future) for _ in range(3)]
+        self.assertEqual(1, crawl_coalescer.number_crawls)
+        self.assertEqual(2, crawl_coalescer.number_coalesced_crawls)
+
+        in_flight_future.set_running_or_notify_cancel()
+        in_flight_future.set_result(spider.CrawlResponseOk())
+
+        crawl_responses = [future.result() for future in futures]
+        self.assertEqual(0, len(crawl_coalescer))
+        self.assertIsNot(crawl_responses[0]['_metadata'], crawl_responses[1]['_metadata'])
+
+    def test_submit_in_flight_crawl_cancelled(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        in_flight_future = concurrent.futures.Future()
+        futures = [crawl_coalescer.submit(key, lambda: in_flight_future) for _ in range(2)]
+        in_flight_future.cancel()
+
+        for future in futures:
+            self.assertTrue(future.cancelled())
+
+    def test_submit_already_done(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        in_flight_future = concurrent.futures.Future()
+        in_flight_future.set_result(spider.CrawlResponseOk())
+
+        future = crawl_coalescer.submit(key, lambda: in_flight_future)
+        self.assertEqual(spider.CrawlResponse.SC_OK, future.result().status_code)
+        self.assertEqual(0, len(crawl_coalescer))
+
+    def test_submit_crawl_called_without_lock(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+        other_key = coalesce.crawl_key('x.y.OtherSpider', [])
+
+        submit_started = threading.Event()
+        finish_submit = threading.Event()
+        in_flight_future = concurrent.futures.Future()
+
+        def slow_submit_crawl():
+            submit_started.set()
+            finish_submit.wait(5)
+            return in_flight_future
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(crawl_coalescer.submit, key, slow_submit_crawl)
+            submit_started.wait(5)
+
+            # neither a crawl for another key nor a crawl for the same key waits for slow_submit_crawl()
+            other_in_flight_future = concurrent.futures.Future()
+            other_in_flight_future.set_result(spider.CrawlResponseOk())
+            other_future = crawl_coalescer.submit(other_key, lambda: other_in_flight_future)
+            self.assertEqual(spider.CrawlResponse.SC_OK, other_future.result(5).status_code)
+            follower = crawl_coalescer.submit(key, slow_submit_crawl)
+            self.assertEqual(1, crawl_coalescer.number_coalesced_crawls)
+
+            finish_submit.set()
+            in_flight_future.set_result(spider.CrawlResponseOk())
+            futures = [leader.result(5), follower]
+
+        for future in futures:
+            self.assertEqual(spider.CrawlResponse.SC_OK, future.result(5).status_code)
+        self.assertEqual(0, len(crawl_coalescer))
+
+    def test_reentrant_submit_crawl(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        in_flight_future = concurrent.futures.Future()
+        reentrant_futures = []
+
+        def submit_crawl():
+            reentrant_futures.append(crawl_coalescer.submit(key, submit_crawl))
+            return in_flight_future
+
+        future = crawl_coalescer.submit(key, submit_crawl)
+        in_flight_future.set_result(spider.CrawlResponseOk())
+
+        self.assertEqual(spider.CrawlResponse.SC_OK, future.result(5).status_code)
+        self.assertEqual(spider.CrawlResponse.SC_OK, reentrant_futures[0].result(5).status_code)
+
+    def test_submit_crawl_raises_exception(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        def submit_crawl():
+            raise RuntimeError('queue full')
+
+        with self.assertRaises(RuntimeError):
+            crawl_coalescer.submit(key, submit_crawl)
+        self.assertEqual(0, len(crawl_coalescer))
+
+        in_flight_future = concurrent.futures.Future()
+        in_flight_future.set_result(spider.CrawlResponseOk())
+        future = crawl_coalescer.submit(key, lambda: in_flight_future)
+        self.assertEqual(spider.CrawlResponse.SC_OK, future.result(5).status_code)
+
+
+class TestCoalescedDebugFiles(unittest.TestCase):
+    """Streamed debug files are deleted once dumped so they're inlined before fan out."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def crawl(self):
+        crawl_artifacts = artifacts.ArtifactManager(self.directory).create()
+        crawl_log = crawl_artifacts.filename('crawl-log.txt')
+        with open(crawl_log, 'w') as fp:
+            fp.write('crawl log')
+        crawl_artifacts.retain()
+
+        crawl_response = spider.CrawlResponseOk({'answer': 42})
+        crawl_response['_metadata'].update({
+            'spider': {'name': 'spider.py', 'version': 'sha256:%s' % ('0' * 64)},
+            'crawlArgs': [],
+            'crawlTime': {'started': '2022-10-18T16:32:56.198453+00:00', 'durationInMs': 4157},
+        })
+        crawl_response['_debug'] = {'crawlLog': util.DataURIFile(crawl_log)}
+        crawl_response.crawl_artifacts = crawl_artifacts
+
+        return crawl_response
+
+    def assert_dumps_include_debug_files(self, crawl_responses):
+        self.assertEqual(2, len(crawl_responses))
+        for crawl_response in crawl_responses:
+            fp = io.StringIO()
+            crawl_response.dump(fp)
+            dumped_crawl_response = json.loads(fp.getvalue())
+            self.assertEqual(
+                'data:text/plain;base64,Y3Jhd2wgbG9n',
+                dumped_crawl_response['_debug']['crawlLog'])
+            jsonschemas.validate_crawl_result(dumped_crawl_response)
+
+        # the crawl's artifacts were deleted once the debug files were inlined
+        self.assertEqual([], os.listdir(os.path.join(self.directory, 'clf-artifacts')))
+
+    def test_crawl(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        crawl_started = threading.Event()
+        finish_crawl = threading.Event()
+
+        def crawl():
+            crawl_started.set()
+            finish_crawl.wait(5)
+            return self.crawl()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(crawl_coalescer.crawl, key, crawl)
+            crawl_started.wait(5)
+            follower = executor.submit(crawl_coalescer.crawl, key, crawl)
+
+            while crawl_coalescer.number_coalesced_crawls < 1:
+                threading.Event().wait(0.01)
+
+            finish_crawl.set()
+            crawl_responses = [leader.result(), follower.result()]
+
+        self.assert_dumps_include_debug_files(crawl_responses)
+
+    def test_submit(self):
+        crawl_coalescer = coalesce.CrawlCoalescer()
+        key = coalesce.crawl_key('x.y.ZSpider', [])
+
+        in_flight_future = concurrent.futures.Future()
+        futures = [crawl_coalescer.submit(key, lambda: in_flight_future) for _ in range(2)]
+
+        in_flight_future.set_running_or_notify_cancel()
+        in_flight_future.set_result(self.crawl())
+
+        self.assert_dumps_include_debug_files([future.result() for future in futures])
@@ -0,0 +1,202 @@
+"""This module contains unit tests for the ```executor``` module."""
+
+import threading
+import time
+import unittest
+
+import mock
+
+from .. import executor
+from .. import spider
+
+
+class ConcurrencyTracker(object):
+    """Tracks the number of concurrent crawls - in total and per spider."""
+
+    def __init__(self):
+        object.__init__(self)
+
+        self._lock = threading.Lock()
+        self.running = {}
+        self.max_running = {}
+        self.total_running = 0
+        self.max_total_running = 0
+
+    def crawl(self, name, duration_in_seconds):
+        with self._lock:
+            self.running[name] = self.running.get(name, 0) + 1
+            self.max_running[name] = max(self.max_running.get(name, 0), self.running[name])
+            self.total_running += 1
+            self.max_total_running = max(self.max_total_running, self.total_running)
+
+        time.sleep(duration_in_seconds)
+
+        with self._lock:
+            self.running[name] -= 1
+            self.total_running -= 1
+
+
+tracker = ConcurrencyTracker()
+
+
+class TwoAtATimeSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'maxConcurrentCrawls': 2,
+        }
+
+    def crawl(self, browser):
+        tracker.crawl(type(self).__name__, 0.05)
+        return spider.CrawlResponseOk()
+
+
+class OneAtATimeSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'maxConcurrentCrawls': 1,
+            'identifyingFactors': {
+                'duration_in_seconds': {
+                    'pattern': '^.+$',
+                },
+            },
+        }
+
+    def crawl(self, browser, duration_in_seconds):
+        tracker.crawl(type(self).__name__, float(duration_in_seconds))
+        return spider.CrawlResponseOk({'durationInSeconds': duration_in_seconds})
+
+
+hung_crawl_event = threading.Event()
+
+
+class HungCrawlSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'maxCrawlTime': '1s',
+        }
+
+    def crawl(self, browser):
+        hung_crawl_event.wait(10)
+        return spider.CrawlResponseOk()
+
+
+def get_browser_patch(url, *args, **kwargs):
+    return mock.MagicMock()
+
+
+@mock.patch('cloudfeaster.spider.SpiderCrawler._get_browser', side_effect=get_browser_patch)
+@mock.patch('cloudfeaster.spider.SpiderCrawler._take_screenshot', return_value=None)
+class TestCrawlExecutor(unittest.TestCase):
+
+    def setUp(self):
+        global tracker
+        tracker = ConcurrencyTracker()
+
+    def test_max_concurrent_crawls_per_spider(self, *args):
+        with executor.CrawlExecutor(max_concurrent_crawls=8) as crawl_executor:
+            futures = [crawl_executor.submit(TwoAtATimeSpider) for _ in range(8)]
+            crawl_responses = [future.result() for future in futures]
+
+        for crawl_response in crawl_responses:
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertEqual(2, tracker.max_running['TwoAtATimeSpider'])
+
+    def test_max_concurrent_crawls_global(self, *args):
+        with executor.CrawlExecutor(max_concurrent_crawls=2) as crawl_executor:
+            futures = [crawl_executor.submit(TwoAtATimeSpider) for _ in range(4)]
+            futures.extend([crawl_executor.submit(OneAtATimeSpider, '0.05') for _ in range(4)])
+            for future in futures:
+                future.result()
+
+        self.assertLessEqual(tracker.max_total_running, 2)
+        self.assertEqual(1, tracker.max_running['OneAtATimeSpider'])
+
+    def test_queued_crawls_do_not_starve_other_spiders(self, *args):
+        with executor.CrawlExecutor(max_concurrent_crawls=2) as crawl_executor:
+            slow_futures = [crawl_executor.submit(OneAtATimeSpider, '0.2') for _ in range(3)]
+            fast_future = crawl_executor.submit(TwoAtATimeSpider)
+
+            fast_future.result()
+            self.assertFalse(slow_futures[-1].done())
+
+    def test_as_completed(self, *args):
+        crawl_requests = [
+            (OneAtATimeSpider, ['0.2']),
+            (TwoAtATimeSpider, []),
+        ]
+        with executor.CrawlExecutor(max_concurrent_crawls=2) as crawl_executor:
+            results = list(crawl_executor.as_completed(crawl_requests))
+
+        self.assertEqual([crawl_request for (crawl_request, _) in results], list(reversed(crawl_requests)))
+        for (_, crawl_response) in results:
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+
+    def test_spider_by_name(self, *args):
+        with executor.CrawlExecutor() as crawl_executor:
+            future = crawl_executor.submit('%s.%s' % (__name__, TwoAtATimeSpider.__name__))
+            self.assertEqual(future.result().status_code, spider.CrawlResponse.SC_OK)
+
+            future = crawl_executor.submit('%s.%s' % (__name__, 'NoSuchSpiderKnownToMan'))
+            self.assertEqual(future.result().status_code, spider.CrawlResponse.SC_SPIDER_NOT_FOUND)
+
+    def test_cancel_pending_crawls(self, *args):
+        crawl_executor = executor.CrawlExecutor(max_concurrent_crawls=2)
+        futures = [crawl_executor.submit(OneAtATimeSpider, '0.1') for _ in range(3)]
+        crawl_executor.shutdown(cancel_pending=True)
+
+        self.assertEqual(futures[0].result().status_code, spider.CrawlResponse.SC_OK)
+        self.assertTrue(futures[1].cancelled())
+        self.assertTrue(futures[2].cancelled())
+
+    def test_cancelled_future_not_crawled(self, *args):
+        with executor.CrawlExecutor(max_concurrent_crawls=2) as crawl_executor:
+            futures = [crawl_executor.submit(OneAtATimeSpider, '0.1') for _ in range(3)]
+            self.assertTrue(futures[1].cancel())
+
+        self.assertTrue(futures[1].cancelled())
+        self.assertEqual(futures[2].result().status_code, spider.CrawlResponse.SC_OK)
+
+    def test_coalesce_crawls(self, *args):
+        with executor.CrawlExecutor(max_concurrent_crawls=2, coalesce_crawls=True) as crawl_executor:
+            futures = [crawl_executor.submit(OneAtATimeSpider, '0.1') for _ in range(3)]
+            futures.append(crawl_executor.submit(OneAtATimeSpider, '0.05'))
+            crawl_responses = [future.result() for future in futures]
+
+        for crawl_response in crawl_responses:
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertEqual(2, crawl_executor.crawl_coalescer.number_crawls)
+        self.assertEqual(2, crawl_executor.crawl_coalescer.number_coalesced_crawls)
+        self.assertIsNot(crawl_responses[0]['_metadata'], crawl_responses[1]['_metadata'])
+
+    def test_timed_out_crawl_keeps_slot_until_crawl_thread_exits(self, *args):
+        hung_crawl_event.clear()
+        self.addCleanup(hung_crawl_event.set)
+
+        with executor.CrawlExecutor(max_concurrent_crawls=1) as crawl_executor:
+            hung_future = crawl_executor.submit(HungCrawlSpider)
+            waiting_future = crawl_executor.submit(TwoAtATimeSpider)
+
+            # the timed out crawl's future resolves while its crawl thread is still running
+            crawl_response = hung_future.result(10)
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_TIMED_OUT)
+            time.sleep(0.2)
+            self.assertFalse(waiting_future.done())
+
+            hung_crawl_event.set()
+            crawl_response = waiting_future.result(10)
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+
+    def test_submit_after_shutdown(self, *args):
+        crawl_executor = executor.CrawlExecutor()
+        crawl_executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            crawl_executor.submit(TwoAtATimeSpider)
@@ -0,0 +1,97 @@
+"""This module contains unit tests for the ```extraction``` module."""
+
+import re
+import unittest
+
+import mock
+
+from .. import extraction
+
+
+class TestToNumber(unittest.TestCase):
+
+    def test_to_number(self):
+        self.assertEqual(42, extraction.to_number(int, '42'))
+        self.assertEqual(42.43, extraction.to_number(float, ' 42.43 '))
+        self.assertEqual(1342.43, extraction.to_number(float, ' miles 1,342.43 ### '))
+
+    def test_to_number_with_reg_ex(self):
+        reg_ex = re.compile(r'.*is\s+(?P<number>\d+).*', re.DOTALL)
+        self.assertEqual(666, extraction.to_number(int, 'this\nis\n666\nand 2', reg_ex))
+        self.assertIsNone(extraction.to_number(int, 'no match', reg_ex))
+
+    def test_to_number_reg_ex_without_single_group(self):
+        self.assertIsNone(extraction.to_number(int, '42', re.compile(r'(\d)(\d)')))
+
+
+class TestExtract(unittest.TestCase):
+
+    def test_extract(self):
+        browser = mock.MagicMock()
+        browser.execute_script.return_value = [
+            ['USD / CAD', 'https://www.example.com/usd-cad', '1,342.43', ['1', '2']],
+            ['USD / EUR', None, '0.98', []],
+        ]
+
+        columns = {
+            'fromTo': 'td[1]',
+            'url': {'xpath': 'td[1]/a', 'attribute': 'href'},
+            'rate': {'xpath': 'td[2]', 'type': float},
+            'history': {'xpath': 'td[3]/a', 'type': int, 'all': True},
+        }
+        rows = extraction.extract(browser, '//tr', columns)
+
+        self.assertEqual(
+            [
+                {
+                    'fromTo': 'USD / CAD',
+                    'url': 'https://www.example.com/usd-cad',
+                    'rate': 1342.43,
+                    'history': [1, 2],
+                },
+                {
+                    'fromTo': 'USD / EUR',
+                    'url': None,
+                    'rate': 0.98,
+                    'history': [],
+                },
+            ],
+            rows)
+
+        # one webdriver command regardless of the number of rows and columns
+        browser.execute_script.assert_called_once_with(
+            extraction._extract_script,
+            '//tr',
+            [
+                ['td[1]', None, False],
+                ['td[1]/a', 'href', False],
+                ['td[2]', None, False],
+                ['td[3]/a', None, True],
+            ])
+
+    def test_extract_no_rows(self):
+        browser = mock.MagicMock()
+        browser.execute_script.return_value = []
+        self.assertEqual([], extraction.extract(browser, '//tr', {'name': 'td[1]'}))
+
+    def test_extract_default_xpath_and_reg_ex(self):
+        browser = mock.MagicMock()
+        browser.execute_script.return_value = [['miles 42 of 100']]
+
+        columns = {
+            'miles': {'type': int, 'reg_ex': r'^miles\s+(\d+)'},
+        }
+        self.assertEqual([{'miles': 42}], extraction.extract(browser, '//h1', columns))
+        self.assertEqual([['.', None, False]], browser.execute_script.call_args[0][2])
+
+    def test_extract_invalid_columns(self):
+        browser = mock.MagicMock()
+        invalid_columns = [
+            {'name': 42},
+            {'name': {'xpath': 'td[1]', 'atribute': 'href'}},
+            {'name': {'xpath': 'td[1]', 'type': bool}},
+        ]
+        for columns in invalid_columns:
+            with self.assertRaises(ValueError):
+                extraction.extract(browser, '//tr', columns)
+        browser.execute_script.assert_not_called()
@@ -0,0 +1,247 @@
+"""This module contains unit tests for the ```httpbrowser``` module."""
+
+import http.server
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+import mock
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from .. import httpbrowser
+from .. import spider
+from .. import tracing
+
+
+class HTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    # path -> (status code, headers, body)
+    responses = {}
+
+    def do_GET(self):
+        (status_code, headers, body) = type(self).responses.get(self.path, (404, {}, b'<html>not found</html>'))
+        self.send_response(status_code)
+        for (name, value) in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HTTPServer(object):
+
+    def __init__(self):
+        object.__init__(self)
+
+        self._httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), HTTPRequestHandler)
+        self.port = self._httpd.server_port
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return 'http://127.0.0.1:%d%s' % (self.port, path)
+
+    def shutdown(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+_rates_page = (
+    '<html>'
+    '<head><title>Rates</title></head>'
+    '<body>'
+    '<table>'
+    '<tr><td>USD / CAD</td><td>1.37</td></tr>'
+    '<tr><td>USD / EUR</td><td>0.98</td></tr>'
+    '</table>'
+    '<select id="province">'
+    '<option value="AB">Alberta</option>'
+    '<option value="ON" selected>Ontario</option>'
+    '</select>'
+    '<a href="/other">other</a>'
+    '</body>'
+    '</html>'
+).encode('utf-8')
+
+
+class RatesSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': _http_server.url('/rates'),
+            'engine': 'http',
+        }
+
+    def crawl(self, browser):
+        rates = {}
+        for row in browser.find_elements(By.XPATH, '//tr'):
+            rates[row.find_element(By.XPATH, 'td[1]').get_text()] = row.find_element(By.XPATH, 'td[2]').get_float()
+        return spider.CrawlResponseOk({'rates': rates})
+
+
+_http_server = None
+
+
+def setUpModule():
+    global _http_server
+    _http_server = HTTPServer()
+    HTTPRequestHandler.responses = {
+        '/rates': (200, {'Content-Type': 'text/html; charset=utf-8'}, _rates_page),
+        '/redirect': (302, {'Location': '/rates'}, b''),
+        '/redirect/chain/1': (302, {'Location': '/redirect/hop/2'}, b''),
+        '/redirect/hop/2': (302, {'Location': 'rates'}, b''),
+        '/redirect/hop/rates': (200, {'Content-Type': 'text/html; charset=utf-8'}, _rates_page),
+        '/latin-1': (200, {'Content-Type': 'text/html; charset=ISO-8859-1'}, '<h1>café</h1>'.encode('latin-1')),
+        '/empty': (200, {'Content-Type': 'text/html'}, b''),
+    }
+
+
+def tearDownModule():
+    _http_server.shutdown()
+
+
+class TestHTTPBrowser(unittest.TestCase):
+
+    def test_get(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/rates'), 'low') as browser:
+            self.assertEqual(_http_server.url('/rates'), browser.current_url)
+            self.assertEqual('Rates', browser.title)
+            self.assertEqual(_rates_page.decode('utf-8'), browser.page_source)
+
+            rows = browser.find_elements(By.XPATH, '//tr')
+            self.assertEqual(2, len(rows))
+            self.assertEqual(1.37, rows[0].find_element(By.XPATH, 'td[2]').get_float())
+            self.assertEqual('Ontario', browser.find_element(By.ID, 'province').get_selected().get_text())
+            self.assertEqual(_http_server.url('/other'), browser.find_element(By.XPATH, '//a').get_attribute('href'))
+
+            with self.assertRaises(NoSuchElementException):
+                browser.find_element(By.XPATH, '//h1')
+
+            rates = browser.extract('//tr', {'currency': 'td[1]', 'rate': {'xpath': 'td[2]', 'type': float}})
+            self.assertEqual([{'currency': 'USD / CAD', 'rate': 1.37}, {'currency': 'USD / EUR', 'rate': 0.98}], rates)
+
+            self.assertIs(browser.snapshot(), browser.snapshot())
+
+    def test_no_url(self):
+        with httpbrowser.HTTPBrowser(None, 'low') as browser:
+            self.assertEqual('about:blank', browser.current_url)
+            self.assertEqual([], browser.find_elements(By.XPATH, '//tr'))
+
+    def test_redirect(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/redirect'), 'low') as browser:
+            self.assertEqual('Rates', browser.title)
+            self.assertEqual(_http_server.url('/rates'), browser.current_url)
+
+    def test_redirect_chain(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/redirect/chain/1'), 'low') as browser:
+            self.assertEqual('Rates', browser.title)
+            self.assertEqual(_http_server.url('/redirect/hop/rates'), browser.current_url)
+
+    def test_relative_links_resolved_after_redirect(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/redirect'), 'low') as browser:
+            self.assertEqual(_http_server.url('/other'), browser.find_element(By.XPATH, '//a').get_attribute('href'))
+
+    def test_http_error_page_loaded(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/no-such-page'), 'low') as browser:
+            self.assertEqual('not found', browser.find_element(By.XPATH, '//html').get_text())
+
+    def test_charset(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/latin-1'), 'low') as browser:
+            self.assertEqual('café', browser.find_element(By.XPATH, '//h1').get_text())
+
+    def test_empty_page(self):
+        with httpbrowser.HTTPBrowser(_http_server.url('/empty'), 'low') as browser:
+            self.assertEqual([], browser.find_elements(By.XPATH, '//h1'))
+
+    def test_no_screenshots(self):
+        with httpbrowser.HTTPBrowser(None, 'low') as browser:
+            self.assertFalse(browser.save_screenshot('screenshot.png'))
+
+    def test_get_traced(self):
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        try:
+            with httpbrowser.HTTPBrowser(_http_server.url('/rates'), 'low'):
+                pass
+        finally:
+            command_trace.stop()
+
+        self.assertEqual(['get'], [command['command'] for command in command_trace.commands])
+        # response size is the size of the page source's JSON encoding
+        self.assertLess(len(_rates_page), command_trace.commands[0]['responseBytes'])
+
+    def test_pool_manager_per_proxy(self):
+        pool_manager = httpbrowser._get_pool_manager('low')
+        self.assertIs(pool_manager, httpbrowser._get_pool_manager('low'))
+
+        with mock.patch('cloudfeaster_extension.proxy', return_value=('proxy.example.com', 3128)):
+            proxy_manager = httpbrowser._get_pool_manager('high')
+        self.assertIsNot(pool_manager, proxy_manager)
+        self.assertEqual('proxy.example.com', proxy_manager.proxy.host)
+
+    def test_charset_parsing(self):
+        self.assertEqual('utf-8', httpbrowser._charset('text/html; charset=utf-8'))
+        self.assertEqual('ISO-8859-1', httpbrowser._charset('text/html;Charset="ISO-8859-1"'))
+        self.assertIsNone(httpbrowser._charset('text/html'))
+        self.assertIsNone(httpbrowser._charset(None))
+
+
+class TestSpiderCrawlerWithHTTPEngine(unittest.TestCase):
+
+    def test_crawl(self):
+        crawl_response = spider.SpiderCrawler(RatesSpider).crawl()
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        self.assertEqual({'USD / CAD': 1.37, 'USD / EUR': 0.98}, crawl_response['rates'])
+        # no chrome so no chromedriver log and no screenshot
+        self.assertNotIn('chromeDriverLog', crawl_response.get('_debug', {}))
+        self.assertNotIn('screenshot', crawl_response.get('_debug', {}))
+
+    def test_browser_pool_not_used(self):
+        browser_pool = mock.MagicMock()
+        crawl_response = spider.SpiderCrawler(RatesSpider, browser_pool=browser_pool).crawl()
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        browser_pool.lease.assert_not_called()
+
+    def test_selenium_not_imported(self):
+        code = (
+            'import json, sys\n'
+            'from cloudfeaster import spider\n'
+            'class RatesSpider(spider.Spider):\n'
+            '    @classmethod\n'
+            '    def get_metadata(cls):\n'
+            '        return {"url": %r, "engine": "http"}\n'
+            '    def crawl(self, browser):\n'
+            '        rows = browser.find_elements("xpath", "//tr")\n'
+            '        return spider.CrawlResponseOk({"rate": rows[0].find_element("xpath", "td[2]").get_float()})\n'
+            'crawl_response = spider.SpiderCrawler(RatesSpider).crawl()\n'
+            'print(json.dumps({\n'
+            '    "rate": crawl_response.get("rate", None),\n'
+            '    "selenium": sorted(name for name in sys.modules if name.split(".")[0] == "selenium"),\n'
+            '    "netfixtures": "cloudfeaster.netfixtures" in sys.modules,\n'
+            '}))\n'
+        ) % _http_server.url('/rates')
+        # spiders need a source file so the code is run as a script rather than with -c
+        with tempfile.NamedTemporaryFile('w', suffix='.py') as fp:
+            fp.write(code)
+            fp.flush()
+            env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+            completed_process = subprocess.run(
+                [sys.executable, fp.name],
+                capture_output=True,
+                text=True,
+                check=True,
+                env=env)
+        output = json.loads(completed_process.stdout)
+
+        self.assertEqual(1.37, output['rate'])
+        self.assertEqual([], output['selenium'])
+        # network fixtures aren't used so aren't imported
+        self.assertFalse(output['netfixtures'])
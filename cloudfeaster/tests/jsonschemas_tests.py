@@ -0,0 +1,157 @@
+"""This module contains unit tests for the ```jsonschemas``` module."""
+
+import unittest
+
+import jsonschema
+import mock
+
+from .. import jsonschemas
+
+
+class TestValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = {
+            'type': 'object',
+            'properties': {
+                'a': {'type': 'integer'},
+                'b': {'type': 'string'},
+            },
+            'additionalProperties': False,
+        }
+
+    def test_valid_instance(self):
+        validator = jsonschemas._Validator('test', self.schema)
+        validator.validate({'a': 1, 'b': 'dave'})
+
+    def test_invalid_instance(self):
+        validator = jsonschemas._Validator('test', self.schema)
+        with self.assertRaises(jsonschema.ValidationError):
+            validator.validate({'a': 'one', 'b': 2})
+
+    def test_invalid_instance_first_error_only(self):
+        validator = jsonschemas._Validator('test', self.schema)
+        with self.assertRaises(jsonschema.ValidationError):
+            validator.validate({'a': 'one', 'b': 2}, first_error_only=True)
+
+    def test_invalid_schema(self):
+        validator = jsonschemas._Validator('test', {'type': 42})
+        with self.assertRaises(jsonschema.SchemaError):
+            validator.validate({})
+
+    def test_validator_compiled_once(self):
+        validator = jsonschemas._Validator('test', self.schema)
+        self.assertIsNone(validator._validator)
+        validator.validate({'a': 1})
+        compiled_validator = validator._validator
+        self.assertIsNotNone(compiled_validator)
+        with mock.patch.object(validator, '_compile') as mock_compile:
+            for _ in range(3):
+                validator.validate({'a': 1})
+            mock_compile.assert_not_called()
+        self.assertIs(compiled_validator, validator._validator)
+
+    def test_timings(self):
+        validator = jsonschemas._Validator('test', self.schema)
+        self.assertEqual(validator.get_timings(), {'numberValidations': 0, 'validationTimeInMs': 0.0})
+        validator.validate({'a': 1})
+        with self.assertRaises(jsonschema.ValidationError):
+            validator.validate({'a': 'one'})
+        timings = validator.get_timings()
+        self.assertEqual(2, timings['numberValidations'])
+        self.assertLessEqual(0.0, timings['validationTimeInMs'])
+
+
+class TestValidateFunctions(unittest.TestCase):
+
+    def test_schemas(self):
+        self.assertEqual('object', jsonschemas.spider_metadata['type'])
+        self.assertEqual('object', jsonschemas.crawl_result['type'])
+        with self.assertRaises(AttributeError):
+            jsonschemas.this_is_not_a_schema
+
+    def test_validate_metadata(self):
+        jsonschemas.validate_metadata({'url': 'https://www.example.com'})
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_metadata({'url': 'https://www.example.com', 'ttl': 'dave'})
+
+    def test_validate_crawl_result(self):
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result({}, first_error_only=True)
+
+    def test_validate_crawl_result_crawl_time_phases(self):
+        def crawl_result(phases):
+            return {
+                '_metadata': {
+                    'status': {'code': 0, 'message': 'Ok'},
+                    'spider': {'name': 'spider.py', 'version': 'sha256:%s' % ('0' * 64)},
+                    'crawlArgs': [],
+                    'crawlTime': {
+                        'started': '2022-10-18T16:32:56.198453+00:00',
+                        'durationInMs': 4157,
+                        'phases': phases,
+                    },
+                },
+            }
+
+        jsonschemas.validate_crawl_result(crawl_result({'browserLaunch': 1234.567, 'crawl': 2000}))
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result(crawl_result({'notAPhase': 1}))
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result(crawl_result({'crawl': -1}))
+
+    def test_validate_crawl_result_web_driver_commands(self):
+        def crawl_result(web_driver_commands):
+            return {
+                '_metadata': {
+                    'status': {'code': 0, 'message': 'Ok'},
+                    'spider': {'name': 'spider.py', 'version': 'sha256:%s' % ('0' * 64)},
+                    'crawlArgs': [],
+                    'crawlTime': {
+                        'started': '2022-10-18T16:32:56.198453+00:00',
+                        'durationInMs': 4157,
+                    },
+                    'webDriverCommands': web_driver_commands,
+                },
+            }
+
+        find_element = {
+            'count': 12,
+            'totalInMs': 130.5,
+            'p95InMs': 21.25,
+            'requestBytes': 540,
+            'responseBytes': 1044,
+        }
+        jsonschemas.validate_crawl_result(crawl_result({'findElement': find_element}))
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result(crawl_result({'findElement': dict(find_element, count=0)}))
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result(crawl_result({'findElement': {'count': 1}}))
+
+    def test_validate_crawl_result_network_fixtures(self):
+        def crawl_result(network_fixtures):
+            return {
+                '_metadata': {
+                    'status': {'code': 0, 'message': 'Ok'},
+                    'spider': {'name': 'spider.py', 'version': 'sha256:%s' % ('0' * 64)},
+                    'crawlArgs': [],
+                    'crawlTime': {
+                        'started': '2022-10-18T16:32:56.198453+00:00',
+                        'durationInMs': 4157,
+                    },
+                    'networkFixtures': network_fixtures,
+                },
+            }
+
+        jsonschemas.validate_crawl_result(crawl_result({'mode': 'replay', 'requests': 12, 'misses': 1}))
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result(crawl_result({'mode': 'live', 'requests': 12, 'misses': 1}))
+        with self.assertRaises(jsonschema.ValidationError):
+            jsonschemas.validate_crawl_result(crawl_result({'mode': 'record', 'requests': 12}))
+
+    def test_get_validation_timings(self):
+        jsonschemas.validate_metadata({'url': 'https://www.example.com'})
+        timings = jsonschemas.get_validation_timings()
+        self.assertIn('spider_metadata', timings)
+        self.assertIn('crawl_result', timings)
+        self.assertLessEqual(1, timings['spider_metadata']['numberValidations'])
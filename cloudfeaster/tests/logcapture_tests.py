@@ -0,0 +1,111 @@
+"""This module contains unit tests for the ```logcapture``` module."""
+
+import concurrent.futures
+import contextvars
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from .. import logcapture
+
+_logger = logging.getLogger(__name__)
+
+
+class TestCrawlLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _crawl(self, name, level=logging.INFO):
+        filename = os.path.join(self.directory, '%s.txt' % name)
+        crawl_log = logcapture.CrawlLog(filename, level)
+        crawl_log.start()
+        try:
+            self.assertIs(crawl_log, logcapture.get_current_crawl_log())
+            _logger.debug('debug from %s', name)
+            _logger.info('info from %s', name)
+            _logger.error('error from %s', name)
+        finally:
+            crawl_log.close()
+
+        self.assertIsNone(logcapture.get_current_crawl_log())
+
+        with open(filename, 'r') as fp:
+            return (crawl_log, fp.read().splitlines())
+
+    def test_captures_log_records_at_or_above_level(self):
+        (crawl_log, lines) = self._crawl('crawl', logging.INFO)
+
+        self.assertEqual(2, len(lines))
+        self.assertRegex(lines[0], r'\+00:00 INFO logcapture_tests:\d+ info from crawl$')
+        self.assertRegex(lines[1], r'\+00:00 ERROR logcapture_tests:\d+ error from crawl$')
+        self.assertEqual(lines, crawl_log.lines)
+
+    def test_log_records_outside_crawl_not_captured(self):
+        (crawl_log, _) = self._crawl('crawl')
+        _logger.error('not in a crawl')
+        self.assertEqual(2, len(crawl_log.lines))
+
+    def test_file_created_when_nothing_logged(self):
+        filename = os.path.join(self.directory, 'empty.txt')
+        crawl_log = logcapture.CrawlLog(filename, logging.CRITICAL)
+        crawl_log.start()
+        crawl_log.close()
+        self.assertEqual(0, os.path.getsize(filename))
+
+    def test_ring_buffer(self):
+        crawl_log = logcapture.CrawlLog(None, logging.INFO, max_lines=2)
+        crawl_log.start()
+        try:
+            for i in range(5):
+                _logger.info('line %d', i)
+        finally:
+            crawl_log.close()
+
+        self.assertEqual(2, len(crawl_log.lines))
+        self.assertTrue(crawl_log.lines[-1].endswith('line 4'))
+
+    def test_concurrent_crawls(self):
+        names = ['crawl-%d' % i for i in range(8)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(names)) as executor:
+            results = list(executor.map(self._crawl, names))
+
+        for (name, (_, lines)) in zip(names, results):
+            self.assertEqual(2, len(lines))
+            for line in lines:
+                self.assertTrue(line.endswith('from %s' % name))
+
+    def test_threads_started_with_copy_of_context(self):
+        crawl_log = logcapture.CrawlLog(None, logging.INFO)
+        crawl_log.start()
+        try:
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(_logger.info, 'from thread'))
+            thread.start()
+            thread.join()
+        finally:
+            crawl_log.close()
+
+        self.assertEqual(1, len(crawl_log.lines))
+
+    def test_root_logger_handlers_keep_level(self):
+        root_logger = logging.getLogger()
+        handler = logging.NullHandler()
+        original_root_level = root_logger.level
+        root_logger.addHandler(handler)
+        try:
+            root_logger.setLevel(logging.WARNING)
+            crawl_log = logcapture.CrawlLog(None, logging.DEBUG)
+            crawl_log.start()
+            crawl_log.close()
+
+            self.assertEqual(logging.DEBUG, root_logger.level)
+            self.assertEqual(logging.WARNING, handler.level)
+        finally:
+            root_logger.removeHandler(handler)
+            root_logger.setLevel(original_root_level)
@@ -0,0 +1,321 @@
+"""This module contains unit tests for the ```netfixtures``` module."""
+
+import base64
+import http.server
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mock
+from selenium.webdriver.common.by import By
+
+import cloudfeaster_extension
+from .. import httpbrowser
+from .. import netfixtures
+from .. import spider
+
+
+class OriginRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    # path -> body
+    pages = {}
+
+    # number of requests the origin server has received
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        body = type(self).pages.get(self.path, None)
+        if body is None:
+            self.send_response(404)
+            body = b'<html><head><title>Not Found</title></head></html>'
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _page(title):
+    return ('<html><head><title>%s</title></head><body><h1>%s</h1></body></html>' % (title, title)).encode('utf-8')
+
+
+def _exchange(url, body, status=200):
+    return {
+        'method': 'GET',
+        'url': url,
+        'status': status,
+        'reason': 'OK',
+        'headers': [['Content-Type', 'text/html; charset=utf-8']],
+        'body': base64.b64encode(body).decode('ascii'),
+    }
+
+
+_origin = None
+
+
+def setUpModule():
+    global _origin
+    _origin = http.server.ThreadingHTTPServer(('127.0.0.1', 0), OriginRequestHandler)
+    threading.Thread(target=_origin.serve_forever, daemon=True).start()
+
+
+def tearDownModule():
+    _origin.shutdown()
+    _origin.server_close()
+
+
+def _origin_url(path):
+    return 'http://127.0.0.1:%d%s' % (_origin.server_port, path)
+
+
+def _http_browser(url, network_fixtures):
+    return httpbrowser.HTTPBrowser(url, 'low', fixtures_proxy=network_fixtures.proxy)
+
+
+class RatesSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': _origin_url('/rates'),
+            'engine': 'http',
+        }
+
+    def crawl(self, browser):
+        return spider.CrawlResponseOk({'title': browser.find_element(By.XPATH, '//h1').get_text()})
+
+
+class NetworkFixturesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'fixtures.json')
+        OriginRequestHandler.pages = {'/rates': _page('Rates')}
+        OriginRequestHandler.requests = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def save_archive(self, exchanges):
+        netfixtures.FixtureArchive(exchanges).save(self.filename)
+
+
+class TestNetworkFixtures(NetworkFixturesTestCase):
+
+    def test_record_and_replay(self):
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.RECORD)
+        network_fixtures.start('low')
+        try:
+            with _http_browser(_origin_url('/rates'), network_fixtures) as browser:
+                self.assertEqual('Rates', browser.title)
+        finally:
+            network_fixtures.stop()
+
+        self.assertEqual(1, OriginRequestHandler.requests)
+        self.assertEqual({'mode': 'record', 'requests': 1, 'misses': 0}, network_fixtures.summary())
+
+        archive = netfixtures.FixtureArchive.load(self.filename)
+        self.assertEqual(1, len(archive.exchanges))
+        self.assertEqual(_origin_url('/rates'), archive.exchanges[0]['url'])
+        self.assertEqual(200, archive.exchanges[0]['status'])
+
+        # the origin changes but replays answer with what was recorded without touching the origin
+        OriginRequestHandler.pages = {'/rates': _page('Changed')}
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        for _ in range(2):
+            network_fixtures.start('low')
+            try:
+                with _http_browser(_origin_url('/rates'), network_fixtures) as browser:
+                    self.assertEqual('Rates', browser.title)
+            finally:
+                network_fixtures.stop()
+
+        self.assertEqual(1, OriginRequestHandler.requests)
+        self.assertEqual({'mode': 'replay', 'requests': 1, 'misses': 0}, network_fixtures.summary())
+
+    def test_replay_https(self):
+        self.save_archive([_exchange('https://www.example.com/rates', _page('Secure Rates'))])
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        network_fixtures.start('low')
+        try:
+            with _http_browser('https://www.example.com/rates', network_fixtures) as browser:
+                self.assertEqual('Secure Rates', browser.title)
+        finally:
+            network_fixtures.stop()
+
+    def test_replay_order_query_strings_and_misses(self):
+        self.save_archive([
+            _exchange('http://www.example.com/rates?t=1', _page('First')),
+            _exchange('http://www.example.com/rates?t=1', _page('Second')),
+        ])
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        network_fixtures.start('low')
+        try:
+            with _http_browser(None, network_fixtures) as browser:
+                titles = []
+                for url in ['/rates?t=1', '/rates?t=1', '/rates?t=1', '/rates?t=2', '/history']:
+                    browser.get('http://www.example.com%s' % url)
+                    titles.append(browser.title)
+        finally:
+            network_fixtures.stop()
+
+        self.assertEqual(['First', 'Second', 'Second', 'First', ''], titles)
+        self.assertEqual({'mode': 'replay', 'requests': 5, 'misses': 1}, network_fixtures.summary())
+
+    def test_proxy(self):
+        self.save_archive([])
+        original_proxy = cloudfeaster_extension.proxy
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        self.assertEqual((None, None), network_fixtures.proxy)
+        network_fixtures.start('low')
+        try:
+            proxy = network_fixtures.proxy
+            self.assertEqual('127.0.0.1', proxy[0])
+            # the proxy is passed to browsers rather than replacing cloudfeaster_extension.proxy()
+            self.assertIs(original_proxy, cloudfeaster_extension.proxy)
+            with self.assertRaises(RuntimeError):
+                network_fixtures.start('low')
+        finally:
+            network_fixtures.stop()
+
+        self.assertEqual((None, None), network_fixtures.proxy)
+        # stopping twice is harmless
+        network_fixtures.stop()
+
+    def test_concurrent_network_fixtures_stopped_out_of_order(self):
+        self.save_archive([_exchange('http://www.example.com/rates', _page('Rates'))])
+        original_proxy = cloudfeaster_extension.proxy
+
+        first_network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        second_network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        first_network_fixtures.start('low')
+        second_network_fixtures.start('low')
+        try:
+            self.assertNotEqual(first_network_fixtures.proxy, second_network_fixtures.proxy)
+            first_network_fixtures.stop()
+
+            with _http_browser('http://www.example.com/rates', second_network_fixtures) as browser:
+                self.assertEqual('Rates', browser.title)
+        finally:
+            first_network_fixtures.stop()
+            second_network_fixtures.stop()
+
+        self.assertIs(original_proxy, cloudfeaster_extension.proxy)
+        self.assertEqual({'mode': 'replay', 'requests': 0, 'misses': 0}, first_network_fixtures.summary())
+        self.assertEqual({'mode': 'replay', 'requests': 1, 'misses': 0}, second_network_fixtures.summary())
+
+    def test_pool_manager_not_shared(self):
+        self.save_archive([_exchange('http://www.example.com/rates', _page('Rates'))])
+        pool_managers = dict(httpbrowser._pool_managers)
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        network_fixtures.start('low')
+        try:
+            browser = _http_browser('http://www.example.com/rates', network_fixtures)
+            with mock.patch.object(browser._pool_manager, 'clear', wraps=browser._pool_manager.clear) as mock_clear:
+                with browser:
+                    self.assertEqual('Rates', browser.title)
+        finally:
+            network_fixtures.stop()
+
+        # the browser's pool manager is cleared when the browser quits and was never shared
+        mock_clear.assert_called_once_with()
+        self.assertEqual(pool_managers, httpbrowser._pool_managers)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            netfixtures.NetworkFixtures(self.filename, 'live')
+
+    def test_load_invalid_archive(self):
+        with open(self.filename, 'w') as fp:
+            json.dump({'version': 2, 'exchanges': []}, fp)
+
+        with self.assertRaises(ValueError):
+            netfixtures.FixtureArchive.load(self.filename)
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        with self.assertRaises(ValueError):
+            network_fixtures.start('low')
+        self.assertEqual((None, None), network_fixtures.proxy)
+
+
+class TestSpiderCrawlerWithNetworkFixtures(NetworkFixturesTestCase):
+
+    def test_record_and_replay(self):
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.RECORD)
+        crawl_response = spider.SpiderCrawler(RatesSpider, network_fixtures=network_fixtures).crawl()
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        self.assertEqual('Rates', crawl_response['title'])
+        self.assertEqual(
+            {'mode': 'record', 'requests': 1, 'misses': 0},
+            crawl_response['_metadata']['networkFixtures'])
+
+        OriginRequestHandler.pages = {}
+
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        crawl_response = spider.SpiderCrawler(RatesSpider, network_fixtures=network_fixtures).crawl()
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        self.assertEqual('Rates', crawl_response['title'])
+        self.assertEqual(
+            {'mode': 'replay', 'requests': 1, 'misses': 0},
+            crawl_response['_metadata']['networkFixtures'])
+
+        self.assertEqual(1, OriginRequestHandler.requests)
+
+    def test_replay_with_environment_variable(self):
+        self.save_archive([_exchange(_origin_url('/rates'), _page('Replayed Rates'))])
+
+        with mock.patch.dict(os.environ, {'CLF_REPLAY_FIXTURES': self.filename}):
+            crawl_response = spider.SpiderCrawler(RatesSpider).crawl()
+
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        self.assertEqual('Replayed Rates', crawl_response['title'])
+        self.assertEqual('replay', crawl_response['_metadata']['networkFixtures']['mode'])
+        self.assertEqual(0, OriginRequestHandler.requests)
+
+    def test_record_and_replay_environment_variables_are_exclusive(self):
+        environ = {
+            'CLF_RECORD_FIXTURES': self.filename,
+            'CLF_REPLAY_FIXTURES': self.filename,
+        }
+        with mock.patch.dict(os.environ, environ):
+            crawl_response = spider.SpiderCrawler(RatesSpider).crawl()
+
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        self.assertNotIn('networkFixtures', crawl_response['_metadata'])
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_missing_archive(self):
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        crawl_response = spider.SpiderCrawler(RatesSpider, network_fixtures=network_fixtures).crawl()
+        self.assertEqual(spider.CrawlResponse.SC_CRAWL_RAISED_EXCEPTION, crawl_response.status_code)
+
+    def test_cache_and_browser_pool_not_used(self):
+        self.save_archive([_exchange(_origin_url('/rates'), _page('Replayed Rates'))])
+
+        crawl_result_cache = mock.MagicMock()
+        browser_pool = mock.MagicMock()
+        network_fixtures = netfixtures.NetworkFixtures(self.filename, netfixtures.REPLAY)
+        crawler = spider.SpiderCrawler(
+            RatesSpider,
+            browser_pool=browser_pool,
+            crawl_result_cache=crawl_result_cache,
+            network_fixtures=network_fixtures)
+        crawl_response = crawler.crawl()
+
+        self.assertEqual(spider.CrawlResponse.SC_OK, crawl_response.status_code)
+        crawl_result_cache.get.assert_not_called()
+        crawl_result_cache.put.assert_not_called()
+        browser_pool.lease.assert_not_called()
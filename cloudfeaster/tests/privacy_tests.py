@@ -1,8 +1,14 @@
 """This module contains unit tests for the ```privacy``` module."""
 
+import io
+import logging
+import os
 import re
+import tempfile
 import unittest
 
+import mock
+
 from .. import privacy
 
 
@@ -14,3 +20,112 @@ class TestHashSpiderArg(unittest.TestCase):
         self.assertNotEqual(crawl_arg, hashed_crawl_arg)
         reg_ex = re.compile(r'^[^\s]+:[^\s]+$')
         self.assertTrue(reg_ex.match(hashed_crawl_arg))
+
+
+class TestRedactor(unittest.TestCase):
+
+    def test_no_crawl_args(self):
+        redactor = privacy.Redactor([])
+        self.assertFalse(redactor)
+        self.assertEqual('nothing to see here', redactor.redact('nothing to see here'))
+
+    def test_empty_crawl_arg_ignored(self):
+        redactor = privacy.Redactor([''])
+        self.assertFalse(redactor)
+
+    def test_redact(self):
+        redactor = privacy.Redactor(['dave', 'secret'])
+        self.assertTrue(redactor)
+        self.assertEqual(
+            'user %s password %s' % (privacy.hash_crawl_arg('dave'), privacy.hash_crawl_arg('secret')),
+            redactor.redact('user dave password secret'))
+
+    def test_redact_keys_sent_to_element(self):
+        redactor = privacy.Redactor(['abc'])
+        expected = '"value": ["%s"]' % '", "'.join(privacy.hash_crawl_arg('abc'))
+        self.assertEqual(expected, redactor.redact('"value": ["a", "b", "c"]'))
+
+    def test_longest_overlapping_crawl_arg_redacted(self):
+        redactor = privacy.Redactor(['pass', 'password'])
+        self.assertEqual(privacy.hash_crawl_arg('password'), redactor.redact('password'))
+
+    def test_regular_expression_characters_are_literal(self):
+        redactor = privacy.Redactor(['a.c'])
+        self.assertEqual('abc', redactor.redact('abc'))
+        self.assertEqual(privacy.hash_crawl_arg('a.c'), redactor.redact('a.c'))
+
+    def test_str_find_and_reg_ex_find_the_same_matches(self):
+        tests = [
+            (['pass', 'password'], 'password pass passwor passpassword'),
+            (['abc', 'cde'], 'abcde cdeabc abcabc'),
+            (['aa'], 'aaaaa a aa "a", "a"'),
+            (['a', '5'], 'a5 "a", "5" sha256'),
+            (['dave', 'secret'], 'user dave password secret "d", "a", "v", "e" nothing'),
+        ]
+        for (crawl_args, text) in tests:
+            redactor = privacy.Redactor(crawl_args)
+            expected = redactor._reg_ex.sub(redactor._replace, text)
+            self.assertEqual(expected, redactor.redact(text))
+            for chunk_size in [1, 2, 3, 5, 64]:
+                output_fp = io.StringIO()
+                redactor.redact_stream(io.StringIO(text * 3), output_fp, chunk_size)
+                self.assertEqual(expected * 3, output_fp.getvalue())
+
+    def test_reg_ex_only_used_with_many_crawl_args(self):
+        crawl_args = ['arg%d' % i for i in range(7)]
+        text = ' '.join(crawl_args)
+
+        redactor = privacy.Redactor(crawl_args[:2])
+        redactor._reg_ex = mock.Mock(wraps=redactor._reg_ex)
+        self.assertNotIn('arg0', redactor.redact(text))
+        redactor._reg_ex.sub.assert_not_called()
+
+        redactor = privacy.Redactor(crawl_args)
+        redactor._reg_ex = mock.Mock(wraps=redactor._reg_ex)
+        self.assertNotIn('arg6', redactor.redact(text))
+        redactor._reg_ex.sub.assert_called_once()
+
+    def test_redact_stream_crawl_args_spanning_chunks(self):
+        redactor = privacy.Redactor(['secret', 'dave'])
+        text = ''.join('line %d secret and dave\n' % i for i in range(1000))
+        for chunk_size in [1, 2, 5, 7, 64, 4096]:
+            output_fp = io.StringIO()
+            redactor.redact_stream(io.StringIO(text), output_fp, chunk_size)
+            self.assertEqual(redactor.redact(text), output_fp.getvalue())
+
+    def test_redact_file(self):
+        redactor = privacy.Redactor(['secret'])
+        (fd, filename) = tempfile.mkstemp()
+        self.addCleanup(os.unlink, filename)
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(b'the secret is \xff out\r\n')
+
+        redactor.redact_file(filename)
+
+        with open(filename, 'rb') as fp:
+            expected = 'the {} is \xff out\r\n'.format(privacy.hash_crawl_arg('secret')).encode('latin-1')
+            self.assertEqual(expected, fp.read())
+
+
+class TestRedactingFilter(unittest.TestCase):
+
+    def _record(self, msg, args):
+        return logging.LogRecord('name', logging.INFO, __file__, 1, msg, args, None)
+
+    def test_filter(self):
+        record = self._record('user %s has %d things', ('dave', 3))
+        self.assertTrue(privacy.RedactingFilter(['dave']).filter(record))
+        self.assertEqual('user %s has 3 things' % privacy.hash_crawl_arg('dave'), record.getMessage())
+
+    def test_filter_dict_args(self):
+        record = self._record('user %(user)s', ({'user': 'dave'},))
+        privacy.RedactingFilter(['dave']).filter(record)
+        self.assertEqual('user %s' % privacy.hash_crawl_arg('dave'), record.getMessage())
+
+
+class TestRedactingFormatter(unittest.TestCase):
+
+    def test_format(self):
+        formatter = privacy.RedactingFormatter(logging.Formatter('%(message)s'), ['dave'])
+        record = logging.LogRecord('name', logging.INFO, __file__, 1, 'user %s', ('dave',), None)
+        self.assertEqual('user %s' % privacy.hash_crawl_arg('dave'), formatter.format(record))
@@ -0,0 +1,70 @@
+"""This module contains unit tests for the ```profiling``` module."""
+
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+from .. import profiling
+
+
+def _busy_wait(seconds):
+    started = time.monotonic()
+    while time.monotonic() - started < seconds:
+        pass
+
+
+class TestProfilers(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_create_profiler(self):
+        self.assertIsNone(profiling.create_profiler('off'))
+        self.assertIsInstance(profiling.create_profiler('cprofile'), profiling.CProfileProfiler)
+        self.assertIsInstance(profiling.create_profiler('sample'), profiling.SamplingProfiler)
+
+    def test_cprofile(self):
+        profiler = profiling.CProfileProfiler()
+        profiler.start()
+        _busy_wait(0.01)
+        profiler.stop()
+
+        filename = os.path.join(self.directory, profiler.filename)
+        profiler.dump(filename)
+
+        stats = pstats.Stats(filename)
+        function_names = [function_name for (_, _, function_name) in stats.stats.keys()]
+        self.assertIn('_busy_wait', function_names)
+
+    def test_sample(self):
+        profiler = profiling.SamplingProfiler(interval=0.001)
+        profiler.start()
+        _busy_wait(0.1)
+        profiler.stop()
+
+        self.assertGreater(profiler.number_samples, 0)
+        self.assertEqual(profiler.number_samples, sum(profiler.stacks.values()))
+
+        filename = os.path.join(self.directory, profiler.filename)
+        profiler.dump(filename)
+
+        with open(filename, 'r') as fp:
+            lines = fp.read().splitlines()
+        self.assertEqual(len(profiler.stacks), len(lines))
+        for line in lines:
+            (stack, count) = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any('_busy_wait' in line for line in lines))
+
+    def test_frame_name(self):
+        frame_name = profiling._frame_name(sys._getframe())
+        self.assertNotIn(';', frame_name)
+        self.assertNotIn(' ', frame_name)
+        self.assertIn('test_frame_name', frame_name)
@@ -0,0 +1,192 @@
+"""This module contains unit tests for the ```snapshot``` module."""
+
+import re
+import unittest
+
+import mock
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import UnexpectedTagNameException
+from selenium.webdriver.common.by import By
+
+from .. import snapshot
+
+_page_source = (
+    '<html>\n'
+    '<head>\n'
+    '<title> Dave Was Here!!! </title>\n'
+    '<script>var dave = "not text";</script>\n'
+    '</head>\n'
+    '<body>\n'
+    '<h1 id="42" class="big title">42</h1>\n'
+    '<h2> miles 1,342.43 ### </h2>\n'
+    '<h3> this\n'
+    'is\n'
+    '666\n'
+    'over many   lines\n'
+    '</h3>\n'
+    '<!-- a comment -->\n'
+    '<div>line 1<br>line 2 <span>and more</span></div>\n'
+    '<table>\n'
+    '<tbody>\n'
+    '<tr><td>USD / CAD</td><td>1.37</td><td><a href="/usd-cad">history</a></td></tr>\n'
+    '<tr><td>USD / EUR</td><td>0.98</td><td><a href="https://www.example.com/eur">history</a></td></tr>\n'
+    '</tbody>\n'
+    '</table>\n'
+    '<form><input name="q" value="dave"></form>\n'
+    '</body>\n'
+    '</html>\n'
+)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = snapshot.Snapshot(_page_source, 'https://www.example.com/rates/', 'low')
+
+    def test_title(self):
+        self.assertEqual('Dave Was Here!!!', self.snapshot.title)
+
+    def test_get_text_get_int_and_get_float(self):
+        self.assertEqual('42', self.snapshot.find_element(By.XPATH, '//h1').get_text())
+        self.assertEqual(42, self.snapshot.find_element(By.XPATH, '//h1').get_int())
+        self.assertEqual(1342.43, self.snapshot.find_element(By.XPATH, '//h2').get_float())
+
+        element = self.snapshot.find_element(By.XPATH, '//h3')
+        self.assertEqual('this is 666 over many lines', element.text)
+        self.assertEqual(666, element.get_int(re.compile(r'.*is\s+(\d+).*')))
+        self.assertIsNone(element.get_int(re.compile(r'^no match$')))
+
+    def test_text(self):
+        self.assertEqual('line 1\nline 2 and more', self.snapshot.find_element(By.XPATH, '//div').text)
+        self.assertEqual('USD / CAD 1.37 history', self.snapshot.find_element(By.XPATH, '//tr').text)
+        self.assertNotIn('not text', self.snapshot.find_element(By.XPATH, '/html').text)
+
+    def test_get_attribute(self):
+        h1 = self.snapshot.find_element(By.ID, '42')
+        self.assertEqual('big title', h1.get_attribute('class'))
+        self.assertIsNone(h1.get_attribute('href'))
+
+        hrefs = [a.get_attribute('href') for a in self.snapshot.find_elements(By.TAG_NAME, 'a')]
+        self.assertEqual(['https://www.example.com/usd-cad', 'https://www.example.com/eur'], hrefs)
+
+    def test_find_elements_relative_to_element(self):
+        rows = self.snapshot.find_elements(By.XPATH, '//table/tbody/tr')
+        self.assertEqual(2, len(rows))
+        self.assertEqual([1.37, 0.98], [row.find_element(By.XPATH, 'td[2]').get_float() for row in rows])
+        self.assertEqual('tr', rows[0].tag_name)
+        self.assertEqual(rows[0], self.snapshot.find_elements(By.XPATH, '//tr')[0])
+        self.assertNotEqual(rows[0], rows[1])
+
+    def test_find_elements_locators(self):
+        self.assertEqual('42', self.snapshot.find_element(By.ID, '42').text)
+        self.assertEqual('42', self.snapshot.find_element(By.CLASS_NAME, 'title').text)
+        self.assertEqual([], self.snapshot.find_elements(By.CLASS_NAME, 'tit'))
+        self.assertEqual('dave', self.snapshot.find_element(By.NAME, 'q').get_attribute('value'))
+        self.assertEqual(2, len(self.snapshot.find_elements(By.LINK_TEXT, 'history')))
+        self.assertEqual(2, len(self.snapshot.find_elements(By.PARTIAL_LINK_TEXT, 'hist')))
+        with self.assertRaises(ValueError):
+            self.snapshot.find_elements(By.CSS_SELECTOR, 'h1')
+
+    def test_find_elements_only_returns_elements(self):
+        # as per selenium, xpaths which select something other than elements are invalid
+        for xpath in ['//a/@href', '//td/text()', '//comment()', 'count(//tr)']:
+            with self.assertRaises(InvalidSelectorException):
+                self.snapshot.find_elements(By.XPATH, xpath)
+            with self.assertRaises(InvalidSelectorException):
+                self.snapshot.find_element(By.XPATH, xpath)
+
+    def test_page_source_with_encoding_declaration(self):
+        page_source = '<?xml version="1.0" encoding="ISO-8859-1"?>\n<html><head><title>Café</title></head></html>'
+        a_snapshot = snapshot.Snapshot(page_source)
+        self.assertEqual(page_source, a_snapshot.page_source)
+        self.assertEqual('Café', a_snapshot.title)
+
+    def test_find_element_no_such_element(self):
+        with self.assertRaises(NoSuchElementException):
+            self.snapshot.find_element(By.XPATH, '//h4')
+
+    def test_get_selected(self):
+        page = snapshot.Snapshot(
+            '<html><body>'
+            '<select id="explicit"><option>Alberta</option><option selected>Ontario</option></select>'
+            '<select id="implicit"><option>Alberta</option><option>Ontario</option></select>'
+            '<select id="multiple" multiple><option>Alberta</option><option>Ontario</option></select>'
+            '<select id="empty"></select>'
+            '</body></html>')
+        self.assertEqual('Ontario', page.find_element(By.ID, 'explicit').get_selected().get_text())
+        self.assertEqual('Alberta', page.find_element(By.ID, 'implicit').get_selected().get_text())
+        self.assertIsNone(page.find_element(By.ID, 'multiple').get_selected())
+        self.assertIsNone(page.find_element(By.ID, 'empty').get_selected())
+
+    def test_get_selected_on_non_select_element(self):
+        with self.assertRaises(UnexpectedTagNameException):
+            self.snapshot.find_element(By.XPATH, '//h1').get_selected()
+
+    def test_extract(self):
+        columns = {
+            'fromTo': 'td[1]',
+            'rate': {'xpath': 'td[2]', 'type': float},
+            'url': {'xpath': 'td[3]/a', 'attribute': 'href'},
+            'links': {'xpath': 'td//a', 'all': True},
+            'missing': 'td[4]',
+        }
+        self.assertEqual(
+            [
+                {
+                    'fromTo': 'USD / CAD',
+                    'rate': 1.37,
+                    'url': 'https://www.example.com/usd-cad',
+                    'links': ['history'],
+                    'missing': None,
+                },
+                {
+                    'fromTo': 'USD / EUR',
+                    'rate': 0.98,
+                    'url': 'https://www.example.com/eur',
+                    'links': ['history'],
+                    'missing': None,
+                },
+            ],
+            self.snapshot.extract('//table/tbody/tr', columns))
+
+    def test_extract_attributes_and_text(self):
+        # like the browser's extract(), xpaths can select attribute values and text
+        columns = {
+            'href': 'td[3]/a/@href',
+            'fromTo': 'td[1]/text()',
+            'text': {'xpath': 'td/text()', 'all': True},
+            'noAttributes': {'xpath': 'td[3]/a/@href', 'attribute': 'href'},
+        }
+        self.assertEqual(
+            [
+                {
+                    'href': '/usd-cad',
+                    'fromTo': 'USD / CAD',
+                    'text': ['USD / CAD', '1.37'],
+                    'noAttributes': None,
+                },
+                {
+                    'href': 'https://www.example.com/eur',
+                    'fromTo': 'USD / EUR',
+                    'text': ['USD / EUR', '0.98'],
+                    'noAttributes': None,
+                },
+            ],
+            self.snapshot.extract('//table/tbody/tr', columns))
+
+    def test_take_snapshot(self):
+        browser = mock.MagicMock()
+        browser.execute_script.return_value = [_page_source, 'https://www.example.com/rates/']
+
+        a_snapshot = snapshot.take_snapshot(browser, 'low')
+
+        browser.execute_script.assert_called_once()
+        self.assertEqual('https://www.example.com/rates/', a_snapshot.current_url)
+        self.assertEqual(_page_source, a_snapshot.page_source)
+        self.assertEqual('Dave Was Here!!!', a_snapshot.title)
+
+    def test_xpath_literal(self):
+        self.assertEqual('"dave"', snapshot._xpath_literal('dave'))
+        self.assertEqual("'da\"ve'", snapshot._xpath_literal('da"ve'))
+        self.assertEqual('concat("da", \'"\', "v\'e")', snapshot._xpath_literal('da"v\'e'))
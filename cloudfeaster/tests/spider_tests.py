@@ -1,11 +1,20 @@
 """This module contains unit tests for the ```spider``` module."""
 
+import concurrent.futures
+import gc
 import hashlib
 import http.server
 import importlib
 import inspect
+import io
+import json
+import logging
+import os
 import re
+import shutil
+import subprocess
 import sys
+import tempfile
 import threading
 import time
 import unittest
@@ -16,7 +25,11 @@ import mock
 from nose.plugins.attrib import attr
 import selenium
 
+from .. import artifacts
+from .. import privacy
+from .. import profiling
 from .. import spider
+from .. import tracing
 import cloudfeaster_extension
 
 
@@ -134,6 +147,18 @@ class TestCrawlResponse(unittest.TestCase):
             cr,
             spider.CrawlResponse.SC_SPIDER_NOT_FOUND)
 
+    def test_crawl_response_crawl_timed_out(self):
+        cr = spider.CrawlResponseCrawlTimedOut('45s')
+        self.assertCoreResponse(
+            cr,
+            spider.CrawlResponse.SC_CRAWL_TIMED_OUT)
+
+    def test_crawl_response_crawl_cancelled(self):
+        cr = spider.CrawlResponseCrawlCancelled()
+        self.assertCoreResponse(
+            cr,
+            spider.CrawlResponse.SC_CRAWL_CANCELLED)
+
     def test_status_code(self):
         cr = spider.CrawlResponseOk()
         self.assertEqual(cr.status_code, spider.CrawlResponse.SC_OK)
@@ -200,6 +225,26 @@ class HappyPathSpider(spider.Spider):
         return spider.CrawlResponseOk()
 
 
+class LoggingSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            "url": "http://www.example.com",
+            "identifyingFactors": {
+                "q": {
+                    "pattern": "^.+$",
+                },
+            },
+        }
+
+    def crawl(self, browser, q):
+        logging.getLogger(__name__).error('crawling %s', q)
+        time.sleep(0.1)
+        logging.getLogger(__name__).error('crawled %s', q)
+        return spider.CrawlResponseOk()
+
+
 class CtrThrowsExceptionSpider(spider.Spider):
 
     @classmethod
@@ -232,6 +277,39 @@ class CrawlMethodThatReturnsUnexpectedTypeSpider(spider.Spider):
         return None
 
 
+# set to release crawls of HungCrawlSpider which have been abandoned by SpiderCrawler
+hung_crawl_event = threading.Event()
+
+
+class HungCrawlSpider(spider.Spider):
+    @classmethod
+    def get_metadata(cls):
+        return {"url": "http://www.example.com", "maxCrawlTime": "1s"}
+
+    def crawl(self, browser):
+        hung_crawl_event.wait(10)
+        return spider.CrawlResponseOk()
+
+
+class CommandIssuingSpider(spider.Spider):
+    """Issues webdriver commands the same way :py:class:`cloudfeaster.browser.Browser` does."""
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            "url": "http://www.example.com",
+        }
+
+    def crawl(self, browser):
+        def execute_command(driver_command, params):
+            return {'value': 'dave'}
+
+        for _ in range(3):
+            tracing.execute(execute_command, 'findElement', {'using': 'xpath', 'value': '//td'})
+        tracing.execute(execute_command, 'getElementText', {'id': '1'})
+        return spider.CrawlResponseOk()
+
+
 def get_browser_patch(url, *args, **kwargs):
     return mock.MagicMock()
 
@@ -329,6 +407,395 @@ class TestSpiderCrawler(unittest.TestCase):
         self.assertIn('started', crawl_response['_metadata']['crawlTime'])
         self.assertIn('durationInMs', crawl_response['_metadata']['crawlTime'])
 
+    @mock.patch('cloudfeaster.spider.SpiderCrawler._get_browser', side_effect=get_browser_patch)
+    def test_crawl_metadata_crawl_time_phases(self, mock_get_browser):
+        with mock.patch.object(spider.SpiderCrawler, '_take_screenshot', return_value=None):
+            crawl_response = spider.SpiderCrawler(HappyPathSpider).crawl()
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+
+        phases = crawl_response['_metadata']['crawlTime']['phases']
+        expected_phases = [
+            'spiderClass',
+            'spiderConstruction',
+            'browserLaunch',
+            'navigation',
+            'crawl',
+            'screenshot',
+            'artifactEncoding',
+            'validation',
+        ]
+        self.assertEqual(sorted(expected_phases), sorted(phases.keys()))
+        for duration_in_ms in phases.values():
+            self.assertGreaterEqual(duration_in_ms, 0)
+
+    @mock.patch('cloudfeaster.spider.SpiderCrawler._get_browser', side_effect=get_browser_patch)
+    def test_crawl_all_good_from_spider_filename(self, mock_get_browser):
+        source = (
+            'from cloudfeaster import spider\n'
+            '\n'
+            'class FromFileSpider(spider.Spider):\n'
+            '    @classmethod\n'
+            '    def get_metadata(cls):\n'
+            '        # explicit category so spider discovery tests aren\'t upset\n'
+            '        return {"url": "http://www.example.com", "categories": ["cloudfeaster"]}\n'
+            '\n'
+            '    def crawl(self, browser):\n'
+            '        return spider.CrawlResponseOk()\n'
+        )
+        (fd, spider_module_filename) = tempfile.mkstemp(suffix='.py')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                fp.write(source)
+
+            full_spider_class_name = '%s:FromFileSpider' % spider_module_filename
+            spider_crawler = spider.SpiderCrawler(full_spider_class_name)
+            crawl_response = spider_crawler.crawl()
+            self.assertEqual(
+                crawl_response.status_code,
+                spider.CrawlResponse.SC_OK)
+        finally:
+            os.unlink(spider_module_filename)
+
+    def test_crawl_exceeds_max_crawl_time(self):
+        hung_crawl_event.clear()
+        self.addCleanup(hung_crawl_event.set)
+
+        mock_browser = mock.MagicMock()
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', return_value=mock_browser):
+            spider_crawler = spider.SpiderCrawler(HungCrawlSpider)
+            crawl_response = spider_crawler.crawl()
+
+        self.assertEqual(
+            crawl_response.status_code,
+            spider.CrawlResponse.SC_CRAWL_TIMED_OUT)
+        self.assertLess(crawl_response['_metadata']['crawlTime']['durationInMs'], 5000)
+        self.assertNotIn('screenshot', crawl_response.get('_debug', {}))
+        mock_browser.kill.assert_called_once_with()
+
+    def test_abandoned_crawl_thread_doesnt_update_crawler(self):
+        hung_crawl_event.clear()
+        self.addCleanup(hung_crawl_event.set)
+
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', return_value=mock.MagicMock()):
+            with mock.patch.object(spider.SpiderCrawler, '_take_screenshot', return_value='screenshot.png'):
+                spider_crawler = spider.SpiderCrawler(HungCrawlSpider)
+                crawl_response = spider_crawler.crawl()
+                self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_TIMED_OUT)
+                phases = dict(spider_crawler._phases)
+                self.assertNotIn('crawl', phases)
+
+                # let the abandoned crawl thread finish its crawl
+                hung_crawl_event.set()
+                for crawl_thread in [thread for thread in threading.enumerate() if thread.name == 'crawl']:
+                    crawl_thread.join(10)
+
+        self.assertEqual(phases, spider_crawler._phases)
+        self.assertIsNone(spider_crawler.screenshot_file)
+        self.assertIsNone(spider_crawler._crawl_state)
+
+    def test_wait_for_crawl_threads(self):
+        hung_crawl_event.clear()
+        self.addCleanup(hung_crawl_event.set)
+
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', return_value=mock.MagicMock()):
+            with mock.patch.object(spider.SpiderCrawler, '_take_screenshot', return_value=None):
+                spider_crawler = spider.SpiderCrawler(HungCrawlSpider)
+                self.assertTrue(spider_crawler.wait_for_crawl_threads())
+
+                crawl_response = spider_crawler.crawl()
+                self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_TIMED_OUT)
+
+                # the abandoned crawl thread is still running
+                self.assertFalse(spider_crawler.wait_for_crawl_threads(0.1))
+
+                hung_crawl_event.set()
+                self.assertTrue(spider_crawler.wait_for_crawl_threads(10))
+
+    def test_profiler_stopped_when_crawl_exceeds_max_crawl_time(self):
+        hung_crawl_event.clear()
+        self.addCleanup(hung_crawl_event.set)
+
+        stop = mock.patch.object(
+            profiling.SamplingProfiler,
+            'stop',
+            autospec=True,
+            side_effect=profiling.SamplingProfiler.stop)
+        with mock.patch.dict(os.environ, {'CLF_PROFILE': 'sample'}):
+            with mock.patch.object(spider.SpiderCrawler, '_get_browser', return_value=mock.MagicMock()):
+                with stop as mock_stop:
+                    crawl_response = spider.SpiderCrawler(HungCrawlSpider).crawl()
+
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_TIMED_OUT)
+        # stopped by the watchdog while the crawl thread is still hung
+        mock_stop.assert_called_once()
+        profiler = mock_stop.call_args[0][0]
+        self.assertFalse(profiler._sampling_thread.is_alive())
+        self.assertNotIn('profile', crawl_response.get('_debug', {}))
+
+    def test_cancel_doesnt_cancel_later_crawls(self):
+        hung_crawl_event.clear()
+        self.addCleanup(hung_crawl_event.set)
+
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', side_effect=get_browser_patch):
+            with mock.patch.object(spider.SpiderCrawler, '_take_screenshot', return_value=None):
+                spider_crawler = spider.SpiderCrawler(HungCrawlSpider)
+
+                cancel_timer = threading.Timer(0.1, spider_crawler.cancel)
+                cancel_timer.start()
+                crawl_response = spider_crawler.crawl()
+                cancel_timer.join()
+                self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_CANCELLED)
+
+                hung_crawl_event.set()
+                crawl_response = spider_crawler.crawl()
+                self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+
+    def test_cancel_before_crawl_only_cancels_next_crawl(self):
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', side_effect=get_browser_patch):
+            with mock.patch.object(spider.SpiderCrawler, '_take_screenshot', return_value=None):
+                spider_crawler = spider.SpiderCrawler(HappyPathSpider)
+                spider_crawler.cancel()
+                self.assertEqual(spider_crawler.crawl().status_code, spider.CrawlResponse.SC_CRAWL_CANCELLED)
+                self.assertEqual(spider_crawler.crawl().status_code, spider.CrawlResponse.SC_OK)
+
+    def test_browser_killed_if_created_after_crawl_aborted(self):
+        spider_crawler = spider.SpiderCrawler(HappyPathSpider)
+        crawl_state = spider._Crawl()
+        crawl_state.cancelled = True
+        browser = mock.MagicMock()
+        spider_crawler._set_browser(crawl_state, browser)
+        browser.kill.assert_called_once_with()
+
+    def test_debug_capture(self):
+        self.assertEqual((True, True), spider._debug_capture('always'))
+        self.assertEqual((True, False), spider._debug_capture('onFailure'))
+        self.assertEqual((False, False), spider._debug_capture('never'))
+        self.assertEqual((False, False), spider._debug_capture('0%'))
+        self.assertEqual((True, True), spider._debug_capture('100%'))
+        with mock.patch('random.random', return_value=0.05):
+            self.assertEqual((True, True), spider._debug_capture('10%'))
+        with mock.patch('random.random', return_value=0.5):
+            self.assertEqual((False, False), spider._debug_capture('10%'))
+
+    def _crawl_with_debug_capture(self, spider_class, debug_capture):
+        with mock.patch.dict(os.environ, {'CLF_DEBUG_CAPTURE': debug_capture}):
+            with mock.patch.object(spider.SpiderCrawler, '_get_browser') as mock_get_browser:
+                mock_get_browser.side_effect = get_browser_patch
+                with mock.patch.object(spider.SpiderCrawler, '_take_screenshot') as mock_take_screenshot:
+                    (_, screenshot_file) = tempfile.mkstemp()
+                    self.addCleanup(os.unlink, screenshot_file)
+                    mock_take_screenshot.return_value = screenshot_file
+                    spider_crawler = spider.SpiderCrawler(spider_class)
+                    crawl_response = spider_crawler.crawl()
+        return (crawl_response, mock_get_browser, mock_take_screenshot, screenshot_file)
+
+    def test_debug_capture_never(self):
+        (crawl_response, mock_get_browser, mock_take_screenshot, _) = self._crawl_with_debug_capture(
+            HappyPathSpider,
+            'never')
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertNotIn('_debug', crawl_response)
+        mock_take_screenshot.assert_not_called()
+        self.assertIsNone(mock_get_browser.call_args[0][2])
+
+    def test_debug_capture_on_failure_and_crawl_succeeds(self):
+        (crawl_response, mock_get_browser, mock_take_screenshot, screenshot_file) = self._crawl_with_debug_capture(
+            HappyPathSpider,
+            'onFailure')
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertNotIn('_debug', crawl_response)
+        mock_take_screenshot.assert_not_called()
+        # chromedriver log is captured in case the crawl fails and then discarded
+        self.assertFalse(os.path.exists(mock_get_browser.call_args[0][2]))
+
+    def test_debug_capture_on_failure_and_crawl_fails(self):
+        (crawl_response, mock_get_browser, mock_take_screenshot, screenshot_file) = self._crawl_with_debug_capture(
+            CrawlThrowsExceptionSpider,
+            'onFailure')
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_RAISED_EXCEPTION)
+        self.assertEqual(screenshot_file, crawl_response['_debug']['screenshot'])
+        self.assertIn('crawlLog', crawl_response['_debug'])
+        self.assertIn('chromeDriverLog', crawl_response['_debug'])
+
+    def test_debug_capture_invalid_environment_variable_ignored(self):
+        (crawl_response, _, mock_take_screenshot, screenshot_file) = self._crawl_with_debug_capture(
+            HappyPathSpider,
+            'sometimes')
+        self.assertEqual(screenshot_file, crawl_response['_debug']['screenshot'])
+
+    def _crawl_with_artifact_manager(self, spider_class, environ, stream_inline_debug=False):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        artifact_manager = artifacts.ArtifactManager(directory)
+
+        with mock.patch.dict(os.environ, environ):
+            with mock.patch.object(spider.SpiderCrawler, '_get_browser', side_effect=get_browser_patch):
+                spider_crawler = spider.SpiderCrawler(
+                    spider_class,
+                    stream_inline_debug=stream_inline_debug,
+                    artifact_manager=artifact_manager)
+                crawl_response = spider_crawler.crawl()
+
+        return (crawl_response, artifact_manager)
+
+    def test_debug_files_retained_in_crawl_artifact_directory(self):
+        (crawl_response, artifact_manager) = self._crawl_with_artifact_manager(CrawlThrowsExceptionSpider, {})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_RAISED_EXCEPTION)
+
+        for debug_file in ['screenshot', 'crawlLog', 'chromeDriverLog']:
+            filename = crawl_response['_debug'][debug_file]
+            self.assertEqual(artifact_manager.directory, os.path.dirname(os.path.dirname(filename)))
+        self.assertTrue(os.path.exists(crawl_response['_debug']['crawlLog']))
+
+    def test_inlined_debug_files_deleted(self):
+        (crawl_response, artifact_manager) = self._crawl_with_artifact_manager(
+            CrawlThrowsExceptionSpider,
+            {'CLF_INLINE_DEBUG': 'true'})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_CRAWL_RAISED_EXCEPTION)
+        self.assertEqual([], os.listdir(artifact_manager.directory))
+
+    def test_streamed_debug_files_deleted_when_dumped(self):
+        (crawl_response, artifact_manager) = self._crawl_with_artifact_manager(
+            CrawlThrowsExceptionSpider,
+            {'CLF_INLINE_DEBUG': 'true'},
+            stream_inline_debug=True)
+        self.assertEqual(1, len(os.listdir(artifact_manager.directory)))
+
+        crawl_response.dump(io.StringIO())
+
+        self.assertEqual([], os.listdir(artifact_manager.directory))
+
+    def test_profile_environment_variable(self):
+        for (profile, expected_extension) in [('cprofile', '.pstats'), ('sample', '.txt')]:
+            (crawl_response, _) = self._crawl_with_artifact_manager(HappyPathSpider, {'CLF_PROFILE': profile})
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+            self.assertTrue(crawl_response['_debug']['profile'].endswith(expected_extension))
+            self.assertTrue(os.path.exists(crawl_response['_debug']['profile']))
+
+    def test_profile_off_by_default(self):
+        (crawl_response, _) = self._crawl_with_artifact_manager(HappyPathSpider, {})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertNotIn('profile', crawl_response['_debug'])
+
+    def test_profile_invalid_environment_variable_ignored(self):
+        (crawl_response, _) = self._crawl_with_artifact_manager(HappyPathSpider, {'CLF_PROFILE': 'yappi'})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertNotIn('profile', crawl_response['_debug'])
+
+    def test_profile_not_captured_without_debug_capture(self):
+        (crawl_response, _) = self._crawl_with_artifact_manager(
+            HappyPathSpider,
+            {'CLF_PROFILE': 'sample', 'CLF_DEBUG_CAPTURE': 'never'})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertNotIn('_debug', crawl_response)
+
+    def test_trace_commands_environment_variable(self):
+        (crawl_response, _) = self._crawl_with_artifact_manager(CommandIssuingSpider, {'CLF_TRACE_COMMANDS': 'true'})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+
+        web_driver_commands = crawl_response['_metadata']['webDriverCommands']
+        self.assertEqual(['findElement', 'getElementText'], sorted(web_driver_commands.keys()))
+        self.assertEqual(3, web_driver_commands['findElement']['count'])
+        self.assertEqual(1, web_driver_commands['getElementText']['count'])
+
+        with open(crawl_response['_debug']['webDriverTrace'], 'r') as fp:
+            commands = [json.loads(line) for line in fp]
+        self.assertEqual(
+            ['findElement', 'findElement', 'findElement', 'getElementText'],
+            [command['command'] for command in commands])
+
+    def test_trace_commands_off_by_default(self):
+        (crawl_response, _) = self._crawl_with_artifact_manager(CommandIssuingSpider, {})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertNotIn('webDriverCommands', crawl_response['_metadata'])
+        self.assertNotIn('webDriverTrace', crawl_response['_debug'])
+
+    def test_trace_commands_without_debug_capture(self):
+        (crawl_response, _) = self._crawl_with_artifact_manager(
+            CommandIssuingSpider,
+            {'CLF_TRACE_COMMANDS': 'true', 'CLF_DEBUG_CAPTURE': 'never'})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        web_driver_commands = crawl_response['_metadata']['webDriverCommands']
+        self.assertEqual(4, sum(summary['count'] for summary in web_driver_commands.values()))
+        self.assertNotIn('_debug', crawl_response)
+
+    def test_concurrent_crawls_capture_own_crawl_logs(self):
+        def crawl(q):
+            return spider.SpiderCrawler(LoggingSpider).crawl(q)
+
+        qs = ['q%d' % i for i in range(4)]
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', side_effect=get_browser_patch):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(qs)) as executor:
+                crawl_responses = list(executor.map(crawl, qs))
+
+        for (q, crawl_response) in zip(qs, crawl_responses):
+            with open(crawl_response['_debug']['crawlLog'], 'r') as fp:
+                lines = fp.read().splitlines()
+            # crawl args are redacted from crawl logs
+            self.assertEqual(2, len(lines))
+            self.assertTrue(lines[0].endswith('crawling %s' % privacy.hash_crawl_arg(q)))
+            self.assertTrue(lines[1].endswith('crawled %s' % privacy.hash_crawl_arg(q)))
+
+    def test_chromedriver_log_redacted(self):
+        def get_browser(url, paranoia_level, chromedriver_log_file, **kwargs):
+            with open(chromedriver_log_file, 'w') as fp:
+                fp.write('[INFO]: COMMAND SendKeysToElement {"value": ["s", "e", "c", "r", "e", "t"]}\n')
+                fp.write('[INFO]: COMMAND Navigate {"url": "https://www.example.com/?q=secret"}\n')
+            return mock.MagicMock()
+
+        with mock.patch.object(spider.SpiderCrawler, '_get_browser', side_effect=get_browser):
+            crawl_response = spider.SpiderCrawler(LoggingSpider).crawl('secret')
+
+        with open(crawl_response['_debug']['chromeDriverLog'], 'r') as fp:
+            chromedriver_log = fp.read()
+        self.assertNotIn('secret', chromedriver_log)
+        self.assertNotIn('"s", "e", "c"', chromedriver_log)
+        self.assertIn(privacy.hash_crawl_arg('secret'), chromedriver_log)
+
+    def test_duration_in_seconds(self):
+        self.assertEqual(45, spider._duration_in_seconds('45s'))
+        self.assertEqual(45, spider._duration_in_seconds('45S'))
+        self.assertEqual(120, spider._duration_in_seconds('2m'))
+        self.assertEqual(120, spider._duration_in_seconds('2M'))
+        self.assertEqual(3 * 60 * 60, spider._duration_in_seconds('3h'))
+        self.assertEqual(2 * 24 * 60 * 60, spider._duration_in_seconds('2d'))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Importing ```cloudfeaster.spider``` should be cheap so expensive dependencies
+    are only imported when they're used - see tests/benchmarks/import_time.py
+    for the import time budget.
+    """
+
+    def test_expensive_dependencies_not_imported(self):
+        code = (
+            'import json, sys; import cloudfeaster.spider; '
+            'print(json.dumps(sorted(sys.modules.keys())))'
+        )
+        completed_process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        module_names = json.loads(completed_process.stdout)
+
+        expensive_module_names = [
+            'cloudfeaster.browser',
+            'colorama',
+            'dateutil',
+            'jsonschema',
+            'pkg_resources',
+            'selenium.webdriver',
+        ]
+        for expensive_module_name in expensive_module_names:
+            self.assertNotIn(expensive_module_name, module_names)
+
+    def test_browser_names(self):
+        from .. import browser
+        self.assertIs(spider.Browser, browser.Browser)
+        self.assertIs(spider.RemoteBrowser, browser.RemoteBrowser)
+        self.assertIs(spider.WebElement, browser.WebElement)
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            spider.ThisIsNotAName
+
 
 class TestSpiderMetadata(unittest.TestCase):
 
@@ -451,6 +918,10 @@ class TestSpiderMetadata(unittest.TestCase):
                 "paranoiaLevel": "high",
                 "maxConcurrentCrawls": 5,
                 "maxCrawlTime": "45s",
+                "debugCapture": "onFailure",
+                "profile": "off",
+                "traceCommands": False,
+                "engine": "chrome",
                 "identifyingFactors": {
                     "memberId": {
                         "pattern": r"^[^\s]+$",
@@ -499,6 +970,10 @@ class TestSpiderMetadata(unittest.TestCase):
                 "paranoiaLevel": "high",
                 "maxConcurrentCrawls": 5,
                 "maxCrawlTime": "45s",
+                "debugCapture": "onFailure",
+                "profile": "off",
+                "traceCommands": False,
+                "engine": "chrome",
                 "identifyingFactors": {
                     "memberId": {
                         "pattern": r"^[^\s]+$",
@@ -941,6 +1416,137 @@ class TestSpiderMetadata(unittest.TestCase):
             MySpider.get_validated_metadata()["maxCrawlTime"],
             "30s")
 
+    def test_debug_capture_invalid_value(self):
+        for debug_capture in ["sometimes", "101%", "-1%", "5"]:
+            class MySpider(spider.Spider):
+                @classmethod
+                def get_metadata(cls):
+                    rv = {
+                        "url": "http://www.google.com",
+                        "debugCapture": debug_capture,
+                    }
+                    return rv
+
+                def crawl(self, browser):
+                    return None
+
+            with self.assertRaises(spider.SpiderMetadataError):
+                MySpider.get_validated_metadata()
+
+    def test_debug_capture_happy_path(self):
+        for debug_capture in ["always", "onFailure", "never", "0%", "10%", "100%"]:
+            class MySpider(spider.Spider):
+                @classmethod
+                def get_metadata(cls):
+                    rv = {
+                        "url": "http://www.google.com",
+                        "debugCapture": debug_capture,
+                    }
+                    return rv
+
+                def crawl(self, browser):
+                    return None
+
+            self.assertEqual(
+                MySpider.get_validated_metadata()["debugCapture"],
+                debug_capture)
+
+    def test_debug_capture_default_value(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                rv = {
+                    "url": "http://www.google.com",
+                }
+                return rv
+
+            def crawl(self, browser):
+                return None
+
+        self.assertEqual(
+            MySpider.get_validated_metadata()["debugCapture"],
+            "always")
+
+    def test_profile_invalid_value(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                rv = {
+                    "url": "http://www.google.com",
+                    "profile": "yappi",
+                }
+                return rv
+
+            def crawl(self, browser):
+                return None
+
+        with self.assertRaises(spider.SpiderMetadataError):
+            MySpider.get_validated_metadata()
+
+    def test_profile_default_value(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                rv = {
+                    "url": "http://www.google.com",
+                }
+                return rv
+
+            def crawl(self, browser):
+                return None
+
+        self.assertEqual(
+            MySpider.get_validated_metadata()["profile"],
+            "off")
+
+    def test_trace_commands_default_value(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                rv = {
+                    "url": "http://www.google.com",
+                }
+                return rv
+
+            def crawl(self, browser):
+                return None
+
+        self.assertFalse(MySpider.get_validated_metadata()["traceCommands"])
+
+    def test_engine(self):
+        for (engine, is_valid) in [("chrome", True), ("http", True), ("firefox", False)]:
+            class MySpider(spider.Spider):
+                @classmethod
+                def get_metadata(cls):
+                    rv = {
+                        "url": "http://www.google.com",
+                        "engine": engine,
+                    }
+                    return rv
+
+                def crawl(self, browser):
+                    return None
+
+            if is_valid:
+                self.assertEqual(engine, MySpider.get_validated_metadata()["engine"])
+            else:
+                with self.assertRaises(spider.SpiderMetadataError):
+                    MySpider.get_validated_metadata()
+
+    def test_engine_default_value(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                rv = {
+                    "url": "http://www.google.com",
+                }
+                return rv
+
+            def crawl(self, browser):
+                return None
+
+        self.assertEqual("chrome", MySpider.get_validated_metadata()["engine"])
+
     def test_paranoia_invalid_type(self):
         class MySpider(spider.Spider):
             @classmethod
@@ -1033,6 +1639,59 @@ class TestSpiderMetadata(unittest.TestCase):
             validated_metadata['factorDisplayOrder'],
             ['username', 'password'])
 
+    def test_validated_metadata_is_cached(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                return {"url": "http://www.google.com"}
+
+            def crawl(self, browser):
+                return None
+
+        with mock.patch('cloudfeaster.jsonschemas.validate_metadata') as mock_validate:
+            validated_metadata = MySpider.get_validated_metadata()
+            self.assertEqual(validated_metadata, MySpider.get_validated_metadata())
+            self.assertEqual(MySpider().url, "http://www.google.com")
+            self.assertEqual(MySpider().paranoia_level, "low")
+            self.assertEqual(1, mock_validate.call_count)
+
+    def test_validated_metadata_cache_returns_copies(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                return {"url": "http://www.google.com"}
+
+            def crawl(self, browser):
+                return None
+
+        validated_metadata = MySpider.get_validated_metadata()
+        validated_metadata["url"] = "http://www.example.com"
+        validated_metadata["categories"].append("bindle")
+
+        validated_metadata = MySpider.get_validated_metadata()
+        self.assertEqual(validated_metadata["url"], "http://www.google.com")
+        self.assertNotIn("bindle", validated_metadata["categories"])
+
+    def test_validated_metadata_cache_invalidated_by_new_version(self):
+        class MySpider(spider.Spider):
+            @classmethod
+            def get_metadata(cls):
+                return {"url": "http://www.google.com"}
+
+            def crawl(self, browser):
+                return None
+
+        with mock.patch('cloudfeaster.jsonschemas.validate_metadata') as mock_validate:
+            MySpider.get_validated_metadata()
+            self.assertEqual(1, mock_validate.call_count)
+
+            with mock.patch.object(MySpider, 'version', return_value='sha256:%s' % ('0' * 64)):
+                MySpider.get_validated_metadata()
+                self.assertEqual(2, mock_validate.call_count)
+
+                MySpider.get_validated_metadata()
+                self.assertEqual(2, mock_validate.call_count)
+
 
 class TestSpiderMetadataError(unittest.TestCase):
 
@@ -1609,3 +2268,480 @@ class TestSpiderDiscovery(unittest.TestCase):
         expected_spider_names.sort()
 
         self.assertEqual(spider_names, expected_spider_names)
+
+    def _samples_only(self, spiders_by_category):
+        """Multiple test spiders live in the same module and therefore have the same
+        spider name so which test spider ends up in discovery output depends on
+        discovery order - filtering out all but the sample spiders avoids this problem.
+        """
+        rv = {}
+        for (category, spiders_by_spider_name) in spiders_by_category.items():
+            for (spider_name, metadata) in spiders_by_spider_name.items():
+                if metadata['fullyQualifiedClassName'].startswith('cloudfeaster.samples'):
+                    rv.setdefault(category, {})[spider_name] = metadata
+        return rv
+
+    def test_spiders_with_index(self):
+        index_dir_name = tempfile.mkdtemp()
+        index_filename = os.path.join(index_dir_name, 'index.json')
+        try:
+            expected_spiders_by_category = self._samples_only(spider.SpiderDiscovery(samples=True).discover())
+
+            #
+            # 1st discovery writes the index
+            #
+            sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+            self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+            self.assertTrue(os.path.isfile(index_filename))
+
+            #
+            # 2nd discovery shouldn't need to import any spider modules
+            #
+            def import_module_patch(name, *args, **kwargs):
+                raise Exception("unexpected import of '%s'" % name)
+
+            with mock.patch('importlib.import_module', import_module_patch):
+                sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+                self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+
+            #
+            # change a module's key and only that module should be imported
+            #
+            with open(index_filename, 'r') as fp:
+                index = json.load(fp)
+            index['modules']['cloudfeaster.samples.pypi']['key']['mtime'] = 0
+            with open(index_filename, 'w') as fp:
+                json.dump(index, fp)
+
+            with mock.patch('importlib.import_module', wraps=importlib.import_module) as mock_import_module:
+                sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+                self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+                mock_import_module.assert_called_once_with('cloudfeaster.samples.pypi')
+
+            with open(index_filename, 'r') as fp:
+                index = json.load(fp)
+            self.assertNotEqual(0, index['modules']['cloudfeaster.samples.pypi']['key']['mtime'])
+
+            #
+            # rebuilding the index means importing all spider modules
+            #
+            with mock.patch('importlib.import_module', wraps=importlib.import_module) as mock_import_module:
+                sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename, rebuild_index=True)
+                self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+                self.assertEqual(len(index['modules']), mock_import_module.call_count)
+        finally:
+            shutil.rmtree(index_dir_name)
+
+    def test_spiders_with_corrupt_index(self):
+        (fd, index_filename) = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                fp.write('this is not json')
+
+            expected_spiders_by_category = self._samples_only(spider.SpiderDiscovery(samples=True).discover())
+
+            sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+            self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+
+            with open(index_filename, 'r') as fp:
+                index = json.load(fp)
+            self.assertIn('cloudfeaster.samples.pypi', index['modules'])
+        finally:
+            os.unlink(index_filename)
+
+    def test_spiders_with_index_dependencies_changed(self):
+        index_dir_name = tempfile.mkdtemp()
+        index_filename = os.path.join(index_dir_name, 'index.json')
+        try:
+            expected_spiders_by_category = self._samples_only(spider.SpiderDiscovery(samples=True).discover())
+
+            sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+            self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+
+            with open(index_filename, 'r') as fp:
+                index = json.load(fp)
+            sample_module_names = sorted(index['modules'].keys())
+
+            #
+            # a change to any module in a spider package means all the
+            # package's spider modules are imported
+            #
+            package_fingerprint = mock.patch.object(
+                spider.SpiderDiscovery,
+                '_package_fingerprint',
+                return_value='changed')
+            with package_fingerprint:
+                with mock.patch('importlib.import_module', wraps=importlib.import_module) as mock_import_module:
+                    sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+                    self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+                    imported_module_names = sorted(call[0][0] for call in mock_import_module.call_args_list)
+                    self.assertEqual(sample_module_names, imported_module_names)
+
+            #
+            # a change to the installed distros means the index is discarded
+            #
+            installed_distros_fingerprint = mock.patch.object(
+                spider.SpiderDiscovery,
+                '_installed_distros_fingerprint',
+                return_value='changed')
+            with installed_distros_fingerprint:
+                with mock.patch('importlib.import_module', wraps=importlib.import_module) as mock_import_module:
+                    sd = spider.SpiderDiscovery(samples=True, index_filename=index_filename)
+                    self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+                    imported_module_names = sorted(call[0][0] for call in mock_import_module.call_args_list)
+                    self.assertEqual(sample_module_names, imported_module_names)
+
+            with open(index_filename, 'r') as fp:
+                index = json.load(fp)
+            self.assertEqual('changed', index['installedDistros'])
+        finally:
+            shutil.rmtree(index_dir_name)
+
+    def test_package_fingerprint(self):
+        package_dir_name = tempfile.mkdtemp()
+        try:
+            for filename in ['__init__.py', 'spider.py', 'README.md']:
+                with open(os.path.join(package_dir_name, filename), 'w') as fp:
+                    fp.write('# %s\n' % filename)
+            os.makedirs(os.path.join(package_dir_name, '__pycache__'))
+            os.makedirs(os.path.join(package_dir_name, 'helpers'))
+
+            sd = spider.SpiderDiscovery()
+            fingerprint = sd._package_fingerprint([package_dir_name])
+            self.assertEqual(fingerprint, sd._package_fingerprint([package_dir_name]))
+
+            # files which aren't python source code don't change the fingerprint
+            with open(os.path.join(package_dir_name, 'README.md'), 'a') as fp:
+                fp.write('more\n')
+            with open(os.path.join(package_dir_name, '__pycache__', 'spider.py'), 'w') as fp:
+                fp.write('# compiled\n')
+            self.assertEqual(fingerprint, sd._package_fingerprint([package_dir_name]))
+
+            # python source code in sub-packages does change the fingerprint
+            with open(os.path.join(package_dir_name, 'helpers', 'xpaths.py'), 'w') as fp:
+                fp.write('# xpaths\n')
+            helpers_fingerprint = sd._package_fingerprint([package_dir_name])
+            self.assertNotEqual(fingerprint, helpers_fingerprint)
+
+            with open(os.path.join(package_dir_name, 'spider.py'), 'a') as fp:
+                fp.write('# more\n')
+            self.assertNotEqual(helpers_fingerprint, sd._package_fingerprint([package_dir_name]))
+        finally:
+            shutil.rmtree(package_dir_name)
+
+    def test_spiders_static_with_index(self):
+        with self.assertRaises(ValueError):
+            spider.SpiderDiscovery(samples=True, index_filename='index.json', static=True)
+
+    def test_spiders_static(self):
+        expected_spiders_by_category = self._samples_only(spider.SpiderDiscovery(samples=True).discover())
+
+        def import_module_patch(name, *args, **kwargs):
+            raise Exception("unexpected import of '%s'" % name)
+
+        with mock.patch('importlib.import_module', import_module_patch):
+            sd = spider.SpiderDiscovery(samples=True, static=True)
+            self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+
+    def test_spiders_static_invalid_metadata_rejected(self):
+        package_name = 'static_%s_spiders' % uuid.uuid4().hex
+        dir_name = tempfile.mkdtemp()
+        package_dir_name = os.path.join(dir_name, package_name)
+        os.mkdir(package_dir_name)
+
+        sources = {
+            '__init__': '',
+            'bad_metadata': (
+                'from cloudfeaster import spider\n'
+                '\n'
+                'class BadMetadataSpider(spider.Spider):\n'
+                '    @classmethod\n'
+                '    def get_metadata(cls):\n'
+                '        return {"url": "https://www.example.com", "ttl": "dave"}\n'
+                '\n'
+                '    def crawl(self, browser):\n'
+                '        pass\n'
+            ),
+        }
+        for (name, source) in sources.items():
+            with open(os.path.join(package_dir_name, '%s.py' % name), 'w') as fp:
+                fp.write(source)
+
+        def find_spider_distros_patch(*args, **kwargs):
+            yield (package_name, '%s==1.0.0' % package_name)
+
+        sys.path.insert(0, dir_name)
+        try:
+            for static in [False, True]:
+                with mock.patch.object(spider.SpiderDiscovery, '_find_spider_distros', find_spider_distros_patch):
+                    sd = spider.SpiderDiscovery(static=static)
+                    with self.assertRaisesRegex(spider.SpiderMetadataError, 'BadMetadataSpider'):
+                        sd.discover()
+        finally:
+            sys.path.remove(dir_name)
+            shutil.rmtree(dir_name, ignore_errors=True)
+            # stop the imported spider class leaking into other tests' discovery
+            for module_name in [module_name for module_name in sys.modules if module_name.startswith(package_name)]:
+                del sys.modules[module_name]
+            gc.collect()
+
+    def test_spiders_in_parallel(self):
+        # static discovery so no sample spiders are imported into this process
+        # which would upset test_spiders_no_samples()
+        expected_spiders_by_category = self._samples_only(spider.SpiderDiscovery(samples=True, static=True).discover())
+
+        sd = spider.SpiderDiscovery(samples=True, processes=2)
+        self.assertEqual(expected_spiders_by_category, self._samples_only(sd.discover()))
+
+    def test_spiders_in_parallel_errors_reported_per_module(self):
+        package_name = 'parallel_%s_spiders' % uuid.uuid4().hex
+        dir_name = tempfile.mkdtemp()
+        package_dir_name = os.path.join(dir_name, package_name)
+        os.mkdir(package_dir_name)
+
+        sources = {
+            '__init__': '',
+            'good': (
+                'from cloudfeaster import spider\n'
+                '\n'
+                'class GoodSpider(spider.Spider):\n'
+                '    @classmethod\n'
+                '    def get_metadata(cls):\n'
+                '        return {"url": "https://www.example.com", "categories": ["%s"]}\n'
+                '\n'
+                '    def crawl(self, browser):\n'
+                '        pass\n'
+            ) % package_name,
+            'bad_import': 'raise Exception("dave was here")\n',
+            'bad_metadata': (
+                'from cloudfeaster import spider\n'
+                '\n'
+                'class BadMetadataSpider(spider.Spider):\n'
+                '    @classmethod\n'
+                '    def get_metadata(cls):\n'
+                '        return {"url": "https://www.example.com", "ttl": "dave"}\n'
+                '\n'
+                '    def crawl(self, browser):\n'
+                '        pass\n'
+            ),
+        }
+        for (name, source) in sources.items():
+            with open(os.path.join(package_dir_name, '%s.py' % name), 'w') as fp:
+                fp.write(source)
+
+        def find_spider_distros_patch(*args, **kwargs):
+            yield (package_name, '%s==1.0.0' % package_name)
+
+        sys.path.insert(0, dir_name)
+        try:
+            with mock.patch.object(spider.SpiderDiscovery, '_find_spider_distros', find_spider_distros_patch):
+                sd = spider.SpiderDiscovery(processes=2)
+                with self.assertRaises(spider.SpiderDiscoveryError) as cm:
+                    sd.discover()
+
+            self.assertEqual(
+                sorted(cm.exception.errors.keys()),
+                ['%s.bad_import' % package_name, '%s.bad_metadata' % package_name])
+            self.assertIn('dave was here', cm.exception.errors['%s.bad_import' % package_name][0])
+            self.assertIn('BadMetadataSpider', cm.exception.errors['%s.bad_metadata' % package_name][0])
+
+            #
+            # with errors fixed discovery should succeed - :ODD: 2 modules remain
+            # so modules are still only imported in worker processes and no
+            # spider classes leak into other tests
+            #
+            os.unlink(os.path.join(package_dir_name, 'bad_import.py'))
+            with open(os.path.join(package_dir_name, 'bad_metadata.py'), 'w') as fp:
+                fp.write(sources['bad_metadata'].replace('"ttl": "dave"', '"categories": ["%s"]' % package_name))
+
+            with mock.patch.object(spider.SpiderDiscovery, '_find_spider_distros', find_spider_distros_patch):
+                sd = spider.SpiderDiscovery(processes=2)
+                spiders_by_category = sd.discover()
+
+            self.assertEqual(
+                sorted(spiders_by_category[package_name].keys()),
+                ['bad_metadata', 'good'])
+        finally:
+            sys.path.remove(dir_name)
+            shutil.rmtree(dir_name, ignore_errors=True)
+
+
+class TestStaticSpiderCatalog(unittest.TestCase):
+    """A series of unit tests that validate ```spider._StaticSpiderModule```
+    and ```spider._StaticSpiderCatalog```.
+    """
+
+    def setUp(self):
+        self._dir_name = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir_name, ignore_errors=True)
+
+    def _static_spider_module(self, module_name, source):
+        filename = os.path.join(self._dir_name, '%s.py' % module_name.split('.')[-1])
+        with open(filename, 'w') as fp:
+            fp.write(source)
+        return spider._StaticSpiderModule(module_name, filename)
+
+    def test_metadata_same_as_import(self):
+        module_names = [
+            'cloudfeaster.tests.some_test_spiders.abstract',
+            'cloudfeaster.tests.some_test_spiders.supersimpleconcrete',
+        ]
+        for module_name in module_names:
+            module = importlib.import_module(module_name)
+            static_spider_module = spider._StaticSpiderModule(module_name, module.__file__)
+            static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+            self.assertTrue(static_spider_catalog.is_understood(static_spider_module))
+
+            spiders = static_spider_catalog.describe_spiders(static_spider_module)
+            spiders = {spider['fullyQualifiedClassName']: spider for spider in spiders}
+
+            fully_qualified_class_name = '%s.Spider' % module_name
+            self.assertEqual(
+                spiders[fully_qualified_class_name]['metadata'],
+                module.Spider.get_validated_metadata())
+
+        self.assertEqual(
+            spiders['cloudfeaster.tests.some_test_spiders.supersimpleconcrete.Spider']['bases'],
+            [])
+
+    def test_bases(self):
+        source = (
+            'from cloudfeaster.spider import Spider as S\n'
+            '\n'
+            'class A(S):\n'
+            '    pass\n'
+            '\n'
+            'class B(A):\n'
+            '    pass\n'
+            '\n'
+            'class NotASpider(object):\n'
+            '    pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.bases', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+        self.assertTrue(static_spider_catalog.is_understood(static_spider_module))
+
+        spiders = static_spider_catalog.describe_spiders(static_spider_module)
+        self.assertEqual(
+            [(spider['fullyQualifiedClassName'], spider['bases']) for spider in spiders],
+            [('dave_spiders.bases.A', []), ('dave_spiders.bases.B', ['dave_spiders.bases.A'])])
+
+    def test_unknown_base_not_understood(self):
+        source = (
+            'import somewhere\n'
+            '\n'
+            'class A(somewhere.Spider):\n'
+            '    pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.unknown', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+        self.assertFalse(static_spider_catalog.is_understood(static_spider_module))
+
+    def test_star_import_not_understood(self):
+        source = (
+            'from cloudfeaster.spider import *\n'
+            '\n'
+            'class A(Spider):\n'
+            '    pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.star', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+        self.assertFalse(static_spider_catalog.is_understood(static_spider_module))
+
+    def test_syntax_error_not_understood(self):
+        static_spider_module = self._static_spider_module('dave_spiders.syntax', 'class A(:\n')
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+        self.assertFalse(static_spider_catalog.is_understood(static_spider_module))
+
+    def test_non_literal_metadata(self):
+        source = (
+            'from cloudfeaster import spider\n'
+            '\n'
+            'URL = "https://www.example.com"\n'
+            '\n'
+            'class A(spider.Spider):\n'
+            '    @classmethod\n'
+            '    def get_metadata(cls):\n'
+            '        return {"url": URL}\n'
+            '\n'
+            '    def crawl(self, browser):\n'
+            '        pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.nonliteral', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+        self.assertTrue(static_spider_catalog.is_understood(static_spider_module))
+
+        spiders = static_spider_catalog.describe_spiders(static_spider_module)
+        self.assertEqual(1, len(spiders))
+        self.assertIsNone(spiders[0]['metadata'])
+
+    def test_literal_metadata(self):
+        source = (
+            'from cloudfeaster import spider\n'
+            '\n'
+            'class A(spider.Spider):\n'
+            '    @classmethod\n'
+            '    def get_metadata(cls):\n'
+            '        """docstring"""\n'
+            '        return {\n'
+            '            "url": "https://www.example.com",\n'
+            '            "categories": [cls.get_default_category(), "other"],\n'
+            '            "identifyingFactors": {"q": {"pattern": "^.+$"}},\n'
+            '            "ttl": "5m",\n'
+            '        }\n'
+            '\n'
+            '    def crawl(self, browser, q):\n'
+            '        pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.literal', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+
+        spiders = static_spider_catalog.describe_spiders(static_spider_module)
+        self.assertEqual(1, len(spiders))
+        metadata = spiders[0]['metadata']
+        self.assertEqual(metadata['categories'], ['dave', 'other'])
+        self.assertEqual(metadata['fullyQualifiedClassName'], 'dave_spiders.literal.A')
+        self.assertEqual(metadata['absoluteFilename'], static_spider_module.filename)
+        self.assertEqual(metadata['factorDisplayOrder'], ['q'])
+        self.assertEqual(metadata['ttl'], '5m')
+        self.assertEqual(metadata['maxConcurrentCrawls'], 3)
+
+    def test_invalid_metadata(self):
+        source = (
+            'from cloudfeaster import spider\n'
+            '\n'
+            'class A(spider.Spider):\n'
+            '    @classmethod\n'
+            '    def get_metadata(cls):\n'
+            '        return {"url": "https://www.example.com", "ttl": "dave"}\n'
+            '\n'
+            '    def crawl(self, browser):\n'
+            '        pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.invalid', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+
+        spiders = static_spider_catalog.describe_spiders(static_spider_module)
+        self.assertEqual(1, len(spiders))
+        self.assertIsNone(spiders[0]['metadata'])
+
+    def test_inconsistent_metadata(self):
+        source = (
+            'from cloudfeaster import spider\n'
+            '\n'
+            'class A(spider.Spider):\n'
+            '    @classmethod\n'
+            '    def get_metadata(cls):\n'
+            '        return {"url": "https://www.example.com"}\n'
+            '\n'
+            '    def crawl(self, browser, q):\n'
+            '        pass\n'
+        )
+        static_spider_module = self._static_spider_module('dave_spiders.inconsistent', source)
+        static_spider_catalog = spider._StaticSpiderCatalog([static_spider_module])
+
+        spiders = static_spider_catalog.describe_spiders(static_spider_module)
+        self.assertEqual(1, len(spiders))
+        self.assertIsNone(spiders[0]['metadata'])
@@ -0,0 +1,140 @@
+"""This module contains unit tests for the ```tracing``` module."""
+
+import concurrent.futures
+import contextvars
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from .. import tracing
+
+
+def _execute_command(driver_command, params):
+    return {'value': {'element-6066-11e4-a52e-4f735466cecf': 'dave'}}
+
+
+class TestCommandTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_commands_not_traced_without_command_trace(self):
+        self.assertIsNone(tracing.get_current_command_trace())
+        self.assertEqual(_execute_command('findElement', {}), tracing.execute(_execute_command, 'findElement', {}))
+
+    def test_start_and_stop(self):
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        self.assertIs(command_trace, tracing.get_current_command_trace())
+        self.assertTrue(command_trace.stop())
+        self.assertIsNone(tracing.get_current_command_trace())
+        self.assertFalse(command_trace.stop())
+
+    def test_execute(self):
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        try:
+            params = {'using': 'xpath', 'value': '//td'}
+            response = tracing.execute(_execute_command, 'findElement', params)
+        finally:
+            command_trace.stop()
+
+        self.assertEqual(_execute_command('findElement', params), response)
+
+        commands = command_trace.commands
+        self.assertEqual(1, len(commands))
+        self.assertEqual('findElement', commands[0]['command'])
+        self.assertLessEqual(0, commands[0]['startedInMs'])
+        self.assertLessEqual(0, commands[0]['durationInMs'])
+        self.assertEqual(len(json.dumps(params)), commands[0]['requestBytes'])
+        self.assertEqual(len(json.dumps(response['value'])), commands[0]['responseBytes'])
+        self.assertNotIn('error', commands[0])
+
+    def test_execute_raises_exception(self):
+        def execute_command(driver_command, params):
+            raise Exception('no such element')
+
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        try:
+            with self.assertRaises(Exception):
+                tracing.execute(execute_command, 'findElement', {})
+        finally:
+            command_trace.stop()
+
+        commands = command_trace.commands
+        self.assertEqual(1, len(commands))
+        self.assertTrue(commands[0]['error'])
+        self.assertEqual(0, commands[0]['responseBytes'])
+
+    def test_summary(self):
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        command_trace.stop()
+
+        for duration_in_ms in range(1, 21):
+            command_trace.record('findElement', command_trace._started, duration_in_ms, 10, 20)
+        command_trace.record('getElementText', command_trace._started, 5, 1, 2)
+
+        summary = command_trace.summary()
+        self.assertEqual(
+            {
+                'count': 20,
+                'totalInMs': 210,
+                'p95InMs': 19,
+                'requestBytes': 200,
+                'responseBytes': 400,
+            },
+            summary['findElement'])
+        self.assertEqual(
+            {
+                'count': 1,
+                'totalInMs': 5,
+                'p95InMs': 5,
+                'requestBytes': 1,
+                'responseBytes': 2,
+            },
+            summary['getElementText'])
+
+    def test_dump(self):
+        command_trace = tracing.CommandTrace()
+        command_trace.start()
+        try:
+            tracing.execute(_execute_command, 'findElement', {})
+            tracing.execute(_execute_command, 'getElementText', {})
+        finally:
+            command_trace.stop()
+
+        filename = os.path.join(self.directory, 'webdriver-trace.jsonl')
+        command_trace.dump(filename)
+
+        with open(filename, 'r') as fp:
+            commands = [json.loads(line) for line in fp]
+        self.assertEqual(command_trace.commands, commands)
+
+    def test_concurrent_command_traces(self):
+        def trace(number_commands):
+            command_trace = tracing.CommandTrace()
+            command_trace.start()
+            try:
+                for _ in range(number_commands):
+                    tracing.execute(_execute_command, 'findElement', {})
+            finally:
+                command_trace.stop()
+            return command_trace
+
+        numbers_commands = [1, 2, 3, 4]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(numbers_commands)) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, trace, number_commands)
+                for number_commands in numbers_commands
+            ]
+            command_traces = [future.result() for future in futures]
+
+        for (number_commands, command_trace) in zip(numbers_commands, command_traces):
+            self.assertEqual(number_commands, len(command_trace.commands))
@@ -1,6 +1,10 @@
-"""This module contains unit tests for the ```privacy``` module."""
+"""This module contains unit tests for the ```util``` module."""
 
+import base64
+import io
+import json
 import os
+import tempfile
 import unittest
 import uuid
 
@@ -52,3 +56,85 @@ class TestFileToDataUriScheme(unittest.TestCase):
             'data',
             'chrome-driver-log.txt')
         self.assertTrue(util.file_to_data_uri_scheme(filename).startswith('data:text/plain;base64,'))
+
+
+class TestWriteDataUriScheme(unittest.TestCase):
+
+    def test_matches_file_to_data_uri_scheme(self):
+        filename = os.path.join(
+            os.path.dirname(__file__),
+            'data',
+            'screenshot.png')
+        fp = io.StringIO()
+        util.write_data_uri_scheme(filename, fp)
+        self.assertEqual(fp.getvalue(), util.file_to_data_uri_scheme(filename))
+
+    def test_file_spanning_many_chunks(self):
+        with tempfile.NamedTemporaryFile(suffix='.txt') as f:
+            data = os.urandom(3 * util._data_uri_scheme_chunk_size + 7)
+            f.write(data)
+            f.flush()
+
+            fp = io.StringIO()
+            util.write_data_uri_scheme(f.name, fp)
+
+        (prefix, encoded_data) = fp.getvalue().split(',', 1)
+        self.assertEqual(prefix, 'data:text/plain;base64')
+        self.assertEqual(base64.b64decode(encoded_data), data)
+
+
+class TestWriteJson(unittest.TestCase):
+
+    def test_same_as_json_dumps(self):
+        obj = {
+            'a': 1,
+            'b': [1.5, 'two', None, True, {'c': []}],
+            'd': {'e': 'quote " and unicode é'},
+            'f': {},
+        }
+        fp = io.StringIO()
+        util.write_json(obj, fp)
+        self.assertEqual(fp.getvalue(), json.dumps(obj))
+
+    def test_keys_same_as_json_dumps(self):
+        filename = os.path.join(
+            os.path.dirname(__file__),
+            'data',
+            'chrome-driver-log.txt')
+        keys = {'a': 1, True: 2, None: 3, 4: 4, 5.5: 5, False: 6}
+        obj = {
+            'keys': dict(keys),
+            '_debug': dict(keys, log=util.DataURIFile(filename)),
+        }
+
+        fp = io.StringIO()
+        util.write_json(obj, fp)
+
+        expected = dict(obj, _debug=dict(keys, log=util.file_to_data_uri_scheme(filename)))
+        self.assertEqual(fp.getvalue(), json.dumps(expected))
+
+    def test_invalid_key(self):
+        obj = {('a', 'b'): util.DataURIFile(uuid.uuid4().hex)}
+        with self.assertRaises(TypeError):
+            json.dumps(obj)
+        with self.assertRaises(TypeError):
+            util.write_json(obj, io.StringIO())
+
+    def test_data_uri_file(self):
+        filename = os.path.join(
+            os.path.dirname(__file__),
+            'data',
+            'chrome-driver-log.txt')
+        obj = {'_debug': {'chromeDriverLog': util.DataURIFile(filename)}}
+
+        fp = io.StringIO()
+        util.write_json(obj, fp)
+
+        self.assertEqual(
+            json.loads(fp.getvalue()),
+            {'_debug': {'chromeDriverLog': util.file_to_data_uri_scheme(filename)}})
+
+    def test_data_uri_file_does_not_exist(self):
+        fp = io.StringIO()
+        util.write_json([util.DataURIFile(uuid.uuid4().hex)], fp)
+        self.assertEqual(fp.getvalue(), '[null]')
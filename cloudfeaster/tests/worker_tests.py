@@ -0,0 +1,169 @@
+"""This module contains unit tests for the ```worker``` module."""
+
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+import mock
+
+from .. import spider
+from .. import worker
+
+
+class WorkerSpider(spider.Spider):
+
+    @classmethod
+    def get_metadata(cls):
+        return {
+            'url': 'https://www.example.com',
+            'identifyingFactors': {
+                'q': {
+                    'pattern': '^.+$',
+                },
+            },
+        }
+
+    def crawl(self, browser, q):
+        return spider.CrawlResponseOk({'q': q})
+
+
+def get_browser_patch(url, *args, **kwargs):
+    return mock.MagicMock()
+
+
+_full_spider_class_name = '%s.%s' % (__name__, WorkerSpider.__name__)
+
+
+@mock.patch('cloudfeaster.spider.SpiderCrawler._get_browser', side_effect=get_browser_patch)
+@mock.patch('cloudfeaster.spider.SpiderCrawler._take_screenshot', return_value=None)
+class TestCrawlWorker(unittest.TestCase):
+
+    def test_crawl(self, *args):
+        crawl_worker = worker.CrawlWorker()
+        crawl_request = {
+            'spider': _full_spider_class_name,
+            'args': ['dave'],
+            'deadline': time.time() + 60,
+        }
+        crawl_response = crawl_worker.crawl(crawl_request)
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+        self.assertEqual(crawl_response['q'], 'dave')
+
+    def test_spider_class_cached(self, *args):
+        crawl_worker = worker.CrawlWorker()
+        crawl_request = {
+            'spider': _full_spider_class_name,
+            'args': ['dave'],
+        }
+        crawl_worker.crawl(crawl_request)
+
+        with mock.patch('importlib.import_module') as mock_import_module:
+            crawl_response = crawl_worker.crawl(crawl_request)
+            mock_import_module.assert_not_called()
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_OK)
+
+    def test_spider_not_found(self, *args):
+        crawl_worker = worker.CrawlWorker()
+        crawl_response = crawl_worker.crawl({'spider': '%s.NoSuchSpiderKnownToMan' % __name__})
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_SPIDER_NOT_FOUND)
+
+    def test_deadline_exceeded(self, *args):
+        crawl_worker = worker.CrawlWorker()
+        crawl_request = {
+            'spider': _full_spider_class_name,
+            'args': ['dave'],
+            'deadline': time.time() - 1,
+        }
+        crawl_response = crawl_worker.crawl(crawl_request)
+        self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_DEADLINE_EXCEEDED)
+
+    def test_invalid_crawl_requests(self, *args):
+        crawl_worker = worker.CrawlWorker()
+        crawl_requests = [
+            [],
+            {},
+            {'spider': 42},
+            {'spider': _full_spider_class_name, 'args': 'dave'},
+            {'spider': _full_spider_class_name, 'args': [42]},
+            {'spider': _full_spider_class_name, 'deadline': 'tomorrow'},
+            {'spider': _full_spider_class_name, 'deadline': True},
+        ]
+        for crawl_request in crawl_requests:
+            crawl_response = crawl_worker.crawl(crawl_request)
+            self.assertEqual(crawl_response.status_code, spider.CrawlResponse.SC_INVALID_CRAWL_REQUEST)
+
+    def test_preload(self, *args):
+        crawl_worker = worker.CrawlWorker()
+        crawl_worker.preload([_full_spider_class_name, '%s.NoSuchSpiderKnownToMan' % __name__])
+        self.assertEqual(list(crawl_worker._spider_classes.keys()), [_full_spider_class_name])
+
+    def test_serve(self, *args):
+        crawl_requests = [
+            json.dumps({'spider': _full_spider_class_name, 'args': ['dave']}),
+            '',
+            'this is not json',
+            json.dumps({'spider': _full_spider_class_name, 'args': ['was here']}),
+        ]
+        input_fp = io.StringIO('\n'.join(crawl_requests) + '\n')
+        output_fp = io.StringIO()
+
+        worker.CrawlWorker().serve(input_fp, output_fp)
+
+        crawl_responses = [json.loads(line) for line in output_fp.getvalue().splitlines()]
+        self.assertEqual(3, len(crawl_responses))
+        self.assertEqual(crawl_responses[0]['q'], 'dave')
+        self.assertEqual(
+            crawl_responses[1]['_metadata']['status']['code'],
+            spider.CrawlResponse.SC_INVALID_CRAWL_REQUEST)
+        self.assertEqual(crawl_responses[2]['q'], 'was here')
+
+    def test_serve_streams_inline_debug(self, *args):
+        input_fp = io.StringIO('%s\n' % json.dumps({'spider': _full_spider_class_name, 'args': ['dave']}))
+        output_fp = io.StringIO()
+
+        (fd, screenshot_file) = tempfile.mkstemp(suffix='.png')
+        os.close(fd)
+        shutil.copyfile(os.path.join(os.path.dirname(__file__), 'data', 'screenshot.png'), screenshot_file)
+
+        try:
+            with mock.patch.dict(os.environ, {'CLF_INLINE_DEBUG': 'true'}):
+                with mock.patch('cloudfeaster.spider.SpiderCrawler._take_screenshot', return_value=screenshot_file):
+                    worker.CrawlWorker().serve(input_fp, output_fp)
+        finally:
+            os.unlink(screenshot_file)
+
+        crawl_response = json.loads(output_fp.getvalue())
+        self.assertEqual(crawl_response['q'], 'dave')
+        self.assertTrue(crawl_response['_debug']['screenshot'].startswith('data:image/png;base64,'))
+
+    def test_serve_unix_socket(self, *args):
+        dir_name = tempfile.mkdtemp()
+        socket_filename = os.path.join(dir_name, 'worker.sock')
+        try:
+            crawl_worker = worker.CrawlWorker()
+            thread = threading.Thread(target=crawl_worker.serve_unix_socket, args=(socket_filename,), daemon=True)
+            thread.start()
+
+            for _ in range(100):
+                if os.path.exists(socket_filename):
+                    break
+                time.sleep(0.05)
+
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_filename)
+                crawl_request = {'spider': _full_spider_class_name, 'args': ['dave']}
+                client.sendall(('%s\n' % json.dumps(crawl_request)).encode('utf-8'))
+                client.shutdown(socket.SHUT_WR)
+                with client.makefile('r') as fp:
+                    crawl_responses = [json.loads(line) for line in fp]
+
+            self.assertEqual(1, len(crawl_responses))
+            self.assertEqual(crawl_responses[0]['q'], 'dave')
+        finally:
+            shutil.rmtree(dir_name, ignore_errors=True)
@@ -0,0 +1,160 @@
+"""This module implements webdriver command tracing. Every ```find_element```,
+```WebElement.text```, ```get_attribute``` and ```click``` in a spider is a
+separate HTTP round trip to chromedriver. When a crawl's commands are traced
+the command name, duration and payload sizes of each round trip are recorded
+so crawl results can describe where a crawl's time goes.
+
+    command_trace = CommandTrace()
+    command_trace.start()
+    try:
+        ... crawl ...
+    finally:
+        command_trace.stop()
+    summary = command_trace.summary()
+
+:py:class:`cloudfeaster.browser.Browser` and :py:class:`cloudfeaster.browser.RemoteBrowser`
+route all webdriver commands (including those issued by
+:py:class:`cloudfeaster.browser.WebElement`) through :py:func:`execute` which
+records commands in the command trace of the current context - like crawl logs
+(see ```cloudfeaster.logcapture```) the current command trace is tracked with a
+```contextvars.ContextVar``` so concurrent crawls each trace only their own commands.
+"""
+
+import contextvars
+import json
+import math
+import threading
+import time
+
+_current_command_trace = contextvars.ContextVar('command_trace', default=None)
+
+
+def get_current_command_trace():
+    """Return the :py:class:`CommandTrace` tracing commands in the current context or ```None```."""
+    return _current_command_trace.get()
+
+
+def _payload_size_in_bytes(payload):
+    """Approximate size of a webdriver command's request or response payload.
+    Selenium doesn't expose the bytes it sends and receives so the size is
+    that of the payload's JSON encoding.
+    """
+    if payload is None:
+        return 0
+    return len(json.dumps(payload, default=str))
+
+
+def _p95(durations_in_ms):
+    """95th percentile using the nearest rank method."""
+    sorted_durations_in_ms = sorted(durations_in_ms)
+    return sorted_durations_in_ms[max(0, math.ceil(0.95 * len(sorted_durations_in_ms)) - 1)]
+
+
+class CommandTrace(object):
+    """Records the webdriver commands executed in the context in which
+    :py:meth:`CommandTrace.start` was called.
+    """
+
+    def __init__(self):
+        object.__init__(self)
+
+        self._lock = threading.Lock()
+
+        # list of dicts - one per command in the order commands were executed
+        self._commands = []
+
+        self._started = None
+        self._token = None
+
+    def start(self):
+        """Start tracing commands executed in the current context."""
+        self._started = time.monotonic()
+        self._token = _current_command_trace.set(self)
+
+    def stop(self):
+        """Stop tracing commands. Returns ```False``` if the trace had already been stopped."""
+        if self._token is None:
+            return False
+
+        try:
+            _current_command_trace.reset(self._token)
+        except ValueError:
+            # stop() called from a different context than start()
+            pass
+        self._token = None
+
+        return True
+
+    @property
+    def commands(self):
+        with self._lock:
+            return list(self._commands)
+
+    def record(self, command, started, duration_in_ms, request_size_in_bytes, response_size_in_bytes, error=False):
+        """Record a command which started at ```started``` (from ```time.monotonic()```)."""
+        command = {
+            'command': command,
+            'startedInMs': round(1000.0 * (started - self._started), 3),
+            'durationInMs': duration_in_ms,
+            'requestBytes': request_size_in_bytes,
+            'responseBytes': response_size_in_bytes,
+        }
+        if error:
+            command['error'] = True
+
+        with self._lock:
+            self._commands.append(command)
+
+    def summary(self):
+        """Summarize the trace - returns a dict of command name to the number
+        of times the command was executed, the total and 95th percentile duration
+        in ms and the total request and response payload sizes.
+        """
+        durations_in_ms = {}
+        summary = {}
+        for command in self.commands:
+            name = command['command']
+            durations_in_ms.setdefault(name, []).append(command['durationInMs'])
+            command_summary = summary.setdefault(name, {'requestBytes': 0, 'responseBytes': 0})
+            command_summary['requestBytes'] += command['requestBytes']
+            command_summary['responseBytes'] += command['responseBytes']
+
+        for (name, command_summary) in summary.items():
+            command_summary['count'] = len(durations_in_ms[name])
+            command_summary['totalInMs'] = round(sum(durations_in_ms[name]), 3)
+            command_summary['p95InMs'] = _p95(durations_in_ms[name])
+
+        return summary
+
+    def dump(self, filename):
+        """Write the trace to ```filename``` as JSON lines - one line per command."""
+        with open(filename, 'w', encoding='utf-8') as fp:
+            for command in self.commands:
+                fp.write(json.dumps(command))
+                fp.write('\n')
+
+
+def execute(execute_command, driver_command, params):
+    """Call ```execute_command(driver_command, params)``` (ex ```webdriver.Remote.execute```)
+    recording the command in the current context's command trace, if there is one.
+    """
+    command_trace = _current_command_trace.get()
+    if command_trace is None:
+        return execute_command(driver_command, params)
+
+    started = time.monotonic()
+    response = None
+    error = True
+    try:
+        response = execute_command(driver_command, params)
+        error = False
+        return response
+    finally:
+        duration_in_ms = round(1000.0 * (time.monotonic() - started), 3)
+        command_trace.record(
+            driver_command,
+            started,
+            duration_in_ms,
+            _payload_size_in_bytes(params),
+            _payload_size_in_bytes(response.get('value', None) if response else None),
+            error)
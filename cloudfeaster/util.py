@@ -1,23 +1,131 @@
 import base64
+import io
+import json
 import mimetypes
 import os
 
+# files are base64 encoded in chunks - the chunk size is a multiple of 3
+# so each chunk encodes to base64 without padding
+_data_uri_scheme_chunk_size = 3 * 64 * 1024
 
-def file_to_data_uri_scheme(filename):
+
+class DataURIFile(str):
+    """The name of a file which :py:func:`write_json` writes as a
+    data URI (see :py:func:`write_data_uri_scheme`) rather than as
+    the file's name. Since a :py:class:`DataURIFile` is a ```str```,
+    ```json.dumps()``` writes the file's name.
+    """
+    pass
+
+
+def is_non_empty_file(filename):
+    return filename and os.path.isfile(filename) and 0 < os.path.getsize(filename)
+
+
+def write_data_uri_scheme(filename, fp):
+    """Write the data URI for ```filename``` to the text file ```fp``` reading
+    and base64 encoding the file in chunks so the file is never entirely in memory.
+    """
     # https://en.wikipedia.org/wiki/Data_URI_scheme
     # data:[<media type>][;base64],<data>
+    fp.write('data:{mime_type};base64,'.format(mime_type=mimetypes.guess_type(filename)[0]))
+
+    with open(filename, 'rb') as f:
+        while True:
+            chunk = f.read(_data_uri_scheme_chunk_size)
+            if not chunk:
+                break
+            fp.write(base64.b64encode(chunk).decode('ascii'))
 
-    if not filename:
-        return None
 
-    if not os.path.isfile(filename):
+def file_to_data_uri_scheme(filename):
+    if not is_non_empty_file(filename):
         return None
 
-    with open(filename, 'rb') as f:
-        file_contents = f.read()
-        if not file_contents:
-            return None
+    fp = io.StringIO()
+    write_data_uri_scheme(filename, fp)
+    return fp.getvalue()
+
+
+def write_json(obj, fp):
+    """Equivalent of ```json.dump(obj, fp)``` except :py:class:`DataURIFile`
+    instances in ```obj``` are written as data URIs streamed from the file.
+    Only dicts, lists and tuples which contain a :py:class:`DataURIFile` are
+    walked - everything else (ex a crawl result's data) is written by
+    ```json```'s C encoder in a single call.
+    """
+    encoder = json.JSONEncoder()
+
+    containers = set()
+    _find_data_uri_file_containers(obj, containers)
+
+    def write(obj):
+        if isinstance(obj, DataURIFile):
+            if not is_non_empty_file(obj):
+                fp.write('null')
+                return
+            fp.write('"')
+            write_data_uri_scheme(obj, fp)
+            fp.write('"')
+        elif id(obj) not in containers:
+            fp.write(encoder.encode(obj))
+        elif isinstance(obj, dict):
+            fp.write('{')
+            for (i, (key, value)) in enumerate(obj.items()):
+                if i:
+                    fp.write(', ')
+                fp.write(encoder.encode(_json_key(key)))
+                fp.write(': ')
+                write(value)
+            fp.write('}')
+        else:
+            fp.write('[')
+            for (i, value) in enumerate(obj):
+                if i:
+                    fp.write(', ')
+                write(value)
+            fp.write(']')
+
+    write(obj)
+
+
+def _find_data_uri_file_containers(obj, containers):
+    """Add the ids of the dicts, lists and tuples in ```obj``` (including ```obj```)
+    which contain a :py:class:`DataURIFile` to ```containers```. Returns ```True```
+    if ```obj``` is or contains a :py:class:`DataURIFile```.
+    """
+    if isinstance(obj, DataURIFile):
+        return True
+
+    if isinstance(obj, dict):
+        values = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        values = obj
+    else:
+        return False
+
+    contains_data_uri_file = False
+    for value in values:
+        if isinstance(value, (str, int, float)) and not isinstance(value, DataURIFile):
+            continue
+        if _find_data_uri_file_containers(value, containers):
+            contains_data_uri_file = True
+
+    if contains_data_uri_file:
+        containers.add(id(obj))
+    return contains_data_uri_file
+
 
-        return 'data:{mime_type};base64,{data}'.format(
-            mime_type=mimetypes.guess_type(filename)[0],
-            data=base64.b64encode(file_contents).decode('utf-8'))
+def _json_key(key):
+    """Convert a dict key to a ```str``` as per ```json```."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError('keys must be str, int, float, bool or None, not %s' % type(key).__name__)
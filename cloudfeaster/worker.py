@@ -0,0 +1,175 @@
+"""This module implements a long lived crawl worker. Rather than paying for
+interpreter startup, spider import, metadata validation and browser startup
+on every crawl, a :py:class:`CrawlWorker` stays resident and runs crawl
+requests read as JSON lines from a file (ex stdin) or a unix domain socket.
+
+Each crawl request is a JSON object on a single line:
+
+    {"spider": "cloudfeaster.samples.pypi.PyPISpider", "args": ["dave", "secret"], "deadline": 1666110776.5}
+
+* ```spider``` - the spider's fully qualified class name (required)
+* ```args``` - list of string crawl args (optional, default = no args)
+* ```deadline``` - seconds since the epoch by which the crawl must start (optional)
+
+For each crawl request a single line containing the JSON encoded
+:py:class:`cloudfeaster.spider.CrawlResponse` is written. Crawl requests
+are run one at a time so crawl responses are written in the same order
+as crawl requests were read.
+"""
+
+import io
+import json
+import logging
+import socketserver
+import time
+
+from . import spider
+
+_logger = logging.getLogger(__name__)
+
+
+class CrawlWorker(object):
+    """Runs crawl requests using :py:class:`cloudfeaster.spider.SpiderCrawler`.
+    Spider classes are loaded once and cached for the life of the worker which
+    also means each spider's validated metadata is cached - see
+    :py:meth:`cloudfeaster.spider.Spider.get_validated_metadata`. If ```browser_pool```
+    (a :py:class:`cloudfeaster.browser.BrowserPool`) is supplied crawls lease warm
+    browsers from the pool. If ```crawl_result_cache``` (a
+    :py:class:`cloudfeaster.cache.CrawlResultCache`) is supplied crawl results
+    are cached for each spider's ```ttl```. If ```artifact_manager``` (a
+    :py:class:`cloudfeaster.artifacts.ArtifactManager`) is supplied it
+    manages each crawl's debug files.
+    """
+
+    def __init__(self, browser_pool=None, crawl_result_cache=None, artifact_manager=None):
+        object.__init__(self)
+
+        self.browser_pool = browser_pool
+        self.crawl_result_cache = crawl_result_cache
+        self.artifact_manager = artifact_manager
+
+        # fully qualified spider class name -> spider class
+        self._spider_classes = {}
+
+    def preload(self, full_spider_class_names):
+        """Load and validate the metadata of spiders before the first crawl request
+        arrives. Spiders which can't be loaded are logged and otherwise ignored.
+        """
+        for full_spider_class_name in full_spider_class_names:
+            (spider_class, crawl_response) = self._get_spider_class(full_spider_class_name)
+            if crawl_response:
+                _logger.error("unable to preload spider '%s' - %s", full_spider_class_name, crawl_response)
+                continue
+
+            try:
+                spider_class.get_validated_metadata()
+            except spider.SpiderMetadataError as ex:
+                _logger.error("unable to preload spider '%s' - %s", full_spider_class_name, ex)
+
+    def _get_spider_class(self, full_spider_class_name):
+        spider_class = self._spider_classes.get(full_spider_class_name, None)
+        if spider_class:
+            return (spider_class, None)
+
+        (spider_class, crawl_response) = spider.SpiderCrawler(full_spider_class_name)._get_spider_class()
+        if crawl_response:
+            return (None, crawl_response)
+
+        self._spider_classes[full_spider_class_name] = spider_class
+
+        return (spider_class, None)
+
+    def crawl(self, crawl_request):
+        """Run a single crawl request (a dict as described in the module's docstring)
+        and return a :py:class:`cloudfeaster.spider.CrawlResponse`.
+        """
+        if not isinstance(crawl_request, dict):
+            return spider.CrawlResponseInvalidCrawlRequest('crawl request must be an object')
+
+        full_spider_class_name = crawl_request.get('spider', None)
+        if not isinstance(full_spider_class_name, str):
+            return spider.CrawlResponseInvalidCrawlRequest("'spider' must be a string")
+
+        crawl_args = crawl_request.get('args', [])
+        if not isinstance(crawl_args, list) or not all(isinstance(crawl_arg, str) for crawl_arg in crawl_args):
+            return spider.CrawlResponseInvalidCrawlRequest("'args' must be a list of strings")
+
+        deadline = crawl_request.get('deadline', None)
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))):
+            return spider.CrawlResponseInvalidCrawlRequest("'deadline' must be a number")
+
+        if deadline is not None and deadline <= time.time():
+            return spider.CrawlResponseDeadlineExceeded()
+
+        (spider_class, crawl_response) = self._get_spider_class(full_spider_class_name)
+        if crawl_response:
+            return crawl_response
+
+        spider_crawler = spider.SpiderCrawler(
+            spider_class,
+            browser_pool=self.browser_pool,
+            crawl_result_cache=self.crawl_result_cache,
+            stream_inline_debug=True,
+            artifact_manager=self.artifact_manager)
+        return spider_crawler.crawl(*crawl_args)
+
+    def _crawl_line(self, line):
+        try:
+            crawl_request = json.loads(line)
+        except ValueError as ex:
+            return spider.CrawlResponseInvalidCrawlRequest('invalid JSON - %s' % ex)
+
+        return self.crawl(crawl_request)
+
+    def crawl_json_line(self, line):
+        """Run the JSON encoded crawl request in ```line``` and return the JSON encoded
+        crawl response. The crawl response never contains a new line.
+        """
+        fp = io.StringIO()
+        self._crawl_line(line).dump(fp)
+        return fp.getvalue()
+
+    def crawl_json_line_to_file(self, line, output_fp):
+        """Run the JSON encoded crawl request in ```line``` and write the JSON encoded
+        crawl response, followed by a new line, to the text file ```output_fp```. Inlined
+        debug files are streamed to ```output_fp``` rather than being built in memory.
+        """
+        self._crawl_line(line).dump(output_fp)
+        output_fp.write('\n')
+        output_fp.flush()
+
+    def serve(self, input_fp, output_fp):
+        """Read crawl requests from the text file ```input_fp``` and write crawl
+        responses to the text file ```output_fp``` until ```input_fp``` reaches end
+        of file. Blank lines are ignored.
+        """
+        for line in input_fp:
+            if not line.strip():
+                continue
+
+            self.crawl_json_line_to_file(line, output_fp)
+
+    def serve_unix_socket(self, socket_filename):
+        """Accept connections on the unix domain socket ```socket_filename```
+        and serve crawl requests on each connection in the same way as
+        :py:meth:`CrawlWorker.serve`. Connections are served one at a time.
+        Never returns.
+        """
+        worker = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+
+            def handle(self):
+                _logger.info('accepted connection')
+                output_fp = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+
+                    worker.crawl_json_line_to_file(line.decode('utf-8'), output_fp)
+                output_fp.detach()
+                _logger.info('connection closed')
+
+        with socketserver.UnixStreamServer(socket_filename, RequestHandler) as server:
+            _logger.info("serving crawl requests on '%s'", socket_filename)
+            server.serve_forever()
@@ -2,10 +2,11 @@
 may reimplement at crawl time.
 """
 
-import selenium
-
 
 def send_keys(paranoia_level, webelement, value):
+    # imported here so spiders which don't use selenium (ex the http engine) don't import selenium
+    import selenium.webdriver.remote.webelement
+
     selenium.webdriver.remote.webelement.WebElement.send_keys(webelement, value)
 
 
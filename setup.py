@@ -59,6 +59,7 @@ setup(
     scripts=[
         'bin/check-circleci-config.sh',
         'bin/check-consistent-clf-version.sh',
+        'bin/crawl-worker.py',
         'bin/generate-circleci-config.py',
         'bin/get-clf-version.sh',
         'bin/int-test-run-all-spiders-in-ci-pipeline.py',
@@ -69,8 +70,10 @@ setup(
     install_requires=[
         'colorama>=0.3.5',
         'jsonschema>=2.3.0',
+        'lxml>=4.9.1',
         'python-dateutil==2.8.2',
         'selenium==4.5.0',
+        'urllib3>=1.26',
     ],
     include_package_data=True,
     version=version,
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3.9
+# -*- coding: utf-8 -*-
+"""Compare the per-crawl cost of validating large crawl results using
+```jsonschema.validate()``` vs the precompiled validators in
+```cloudfeaster.jsonschemas```.
+
+The crawl result schema only describes ```_metadata``` and ```_debug``` -
+a spider's own output (ex ```rows``` below) is never walked. The crawl
+result is therefore made large where the schema actually validates it -
+many hashed crawl args, a summary for many webdriver commands and every
+crawl phase and debug file.
+"""
+
+import base64
+import optparse
+import os
+import sys
+import time
+import uuid
+
+import jsonschema
+
+# benchmarks are run from the root of the repo - make sure this repo's
+# cloudfeaster is imported even if cloudfeaster isn't installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cloudfeaster import jsonschemas  # noqa: E402
+from cloudfeaster import privacy  # noqa: E402
+
+
+_phases = [
+    'spiderClass',
+    'spiderConstruction',
+    'browserLaunch',
+    'navigation',
+    'crawl',
+    'screenshot',
+    'artifactEncoding',
+    'validation',
+]
+
+_debug_files = [
+    'crawlLog',
+    'chromeDriverLog',
+    'profile',
+    'webDriverTrace',
+]
+
+
+def _crawl_result(number_rows, screenshot_size_in_bytes, number_crawl_args, number_commands):
+    crawl_result = {
+        'rows': [
+            {
+                'id': i,
+                'title': uuid.uuid4().hex,
+                'link': 'https://www.example.com/%s' % uuid.uuid4().hex,
+                'price': i * 1.5,
+            }
+            for i in range(number_rows)
+        ],
+        '_metadata': {
+            'status': {
+                'code': 0,
+                'message': 'Ok',
+            },
+            'spider': {
+                'name': 'benchmark.py',
+                'version': 'sha256:%s' % ('0' * 64),
+            },
+            'crawlArgs': [
+                privacy.hash_crawl_arg(uuid.uuid4().hex)
+                for _ in range(number_crawl_args)
+            ],
+            'crawlTime': {
+                'started': '2022-10-18T16:32:56.198453+00:00',
+                'durationInMs': 4157,
+                'phases': {phase: 10.5 * (i + 1) for (i, phase) in enumerate(_phases)},
+            },
+            'cacheHit': False,
+            'webDriverCommands': {
+                'command%d' % i: {
+                    'count': i + 1,
+                    'totalInMs': 1.5 * (i + 1),
+                    'p95InMs': 1.25,
+                    'requestBytes': 100 * (i + 1),
+                    'responseBytes': 200 * (i + 1),
+                }
+                for i in range(number_commands)
+            },
+        },
+        '_debug': {
+            'screenshot': 'data:image/png;base64,%s' % base64.b64encode(os.urandom(screenshot_size_in_bytes)).decode(),
+        },
+    }
+    for debug_file in _debug_files:
+        crawl_result['_debug'][debug_file] = 'data:text/plain;base64,%s' % base64.b64encode(os.urandom(1024)).decode()
+    return crawl_result
+
+
+def _time(label, iterations, function):
+    start = time.monotonic()
+    for _ in range(iterations):
+        function()
+    mean_in_ms = 1000.0 * (time.monotonic() - start) / iterations
+    print('%-48s %5d iterations  mean %7.3f ms' % (label, iterations, mean_in_ms))
+
+
+class CommandLineParser(optparse.OptionParser):
+
+    def __init__(self):
+        optparse.OptionParser.__init__(
+            self,
+            'usage: %prog [options]',
+            description='benchmark crawl result validation')
+
+        default = 5000
+        self.add_option(
+            '--rows',
+            action='store',
+            dest='rows',
+            default=default,
+            type='int',
+            help='rows in crawl result (never walked by the schema) - default = %d' % default)
+
+        default = 1024 * 1024
+        self.add_option(
+            '--screenshot',
+            action='store',
+            dest='screenshot',
+            default=default,
+            type='int',
+            help='bytes in screenshot - default = %d' % default)
+
+        default = 16
+        self.add_option(
+            '--crawl-args',
+            action='store',
+            dest='crawl_args',
+            default=default,
+            type='int',
+            help='hashed crawl args in _metadata - default = %d' % default)
+
+        default = 40
+        self.add_option(
+            '--commands',
+            action='store',
+            dest='commands',
+            default=default,
+            type='int',
+            help='webdriver commands summarized in _metadata - default = %d' % default)
+
+        default = 100
+        self.add_option(
+            '--iterations',
+            action='store',
+            dest='iterations',
+            default=default,
+            type='int',
+            help='iterations - default = %d' % default)
+
+
+if __name__ == '__main__':
+    clp = CommandLineParser()
+    (clo, cla) = clp.parse_args()
+
+    crawl_result = _crawl_result(clo.rows, clo.screenshot, clo.crawl_args, clo.commands)
+    jsonschemas.validate_crawl_result(crawl_result)
+
+    _time(
+        'jsonschema.validate()',
+        clo.iterations,
+        lambda: jsonschema.validate(crawl_result, jsonschemas.crawl_result))
+    _time(
+        'jsonschemas.validate_crawl_result()',
+        clo.iterations,
+        lambda: jsonschemas.validate_crawl_result(crawl_result))
+    _time(
+        'jsonschemas.validate_crawl_result(first only)',
+        clo.iterations,
+        lambda: jsonschemas.validate_crawl_result(crawl_result, first_error_only=True))
+
+    sys.exit(0)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3.9
+# -*- coding: utf-8 -*-
+"""Measure the cost of importing modules using ```python -X importtime```
+and fail if the cost exceeds the budget in ```import_time_budget.json```
+or if a module pulls in dependencies it's expected to import lazily.
+"""
+
+import json
+import optparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# import time:     14364 |      50068 | cloudfeaster.spider
+_import_time_reg_ex = re.compile(
+    r'^import time:\s*(?P<self>\d+)\s*\|\s*(?P<cumulative>\d+)\s*\|\s*(?P<module>\S+)\s*$')
+
+
+def _import_time(module_name, forbidden_module_names):
+    """Import ```module_name``` in a fresh interpreter and return a tuple - the
+    cumulative import time in ms and the list of ```forbidden_module_names```
+    which were imported.
+    """
+    code = (
+        'import json, sys; import {module_name}; '
+        'print(json.dumps([name for name in {forbidden_module_names} if name in sys.modules]))'
+    )
+    code = code.format(module_name=module_name, forbidden_module_names=json.dumps(forbidden_module_names))
+    args = [sys.executable, '-X', 'importtime', '-c', code]
+    completed_process = subprocess.run(args, capture_output=True, text=True, check=True)
+
+    cumulative_in_us = None
+    for line in completed_process.stderr.splitlines():
+        match = _import_time_reg_ex.match(line)
+        if match and match.group('module') == module_name:
+            cumulative_in_us = int(match.group('cumulative'))
+
+    if cumulative_in_us is None:
+        raise Exception("no import time for '%s' - already imported by site?" % module_name)
+
+    return (cumulative_in_us / 1000.0, json.loads(completed_process.stdout))
+
+
+class CommandLineParser(optparse.OptionParser):
+
+    def __init__(self):
+        optparse.OptionParser.__init__(
+            self,
+            'usage: %prog [options]',
+            description='check import time against budget')
+
+        default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_time_budget.json')
+        self.add_option(
+            '--budget',
+            action='store',
+            dest='budget_filename',
+            default=default,
+            type='string',
+            help='budget file - default = %s' % default)
+
+        default = 11
+        self.add_option(
+            '--iterations',
+            action='store',
+            dest='iterations',
+            default=default,
+            type='int',
+            help='iterations - default = %d' % default)
+
+
+if __name__ == '__main__':
+    clp = CommandLineParser()
+    (clo, cla) = clp.parse_args()
+
+    with open(clo.budget_filename, 'r') as fp:
+        budgets = json.load(fp)
+
+    over_budget = False
+    for (module_name, budget) in budgets.items():
+        forbidden_module_names = budget.get('forbiddenModules', [])
+
+        import_times_in_ms = []
+        imported_forbidden_module_names = set()
+        for _ in range(clo.iterations):
+            (import_time_in_ms, forbidden) = _import_time(module_name, forbidden_module_names)
+            import_times_in_ms.append(import_time_in_ms)
+            imported_forbidden_module_names.update(forbidden)
+
+        # median rather than mean since a cold disk cache makes the 1st iteration an outlier
+        median_in_ms = statistics.median(import_times_in_ms)
+        ok = median_in_ms <= budget['budgetInMs'] and not imported_forbidden_module_names
+        print('%-32s %5d iterations  median %7.1f ms  budget %7.1f ms  %s' % (
+            module_name,
+            clo.iterations,
+            median_in_ms,
+            budget['budgetInMs'],
+            'ok' if ok else 'OVER BUDGET'))
+        for forbidden_module_name in sorted(imported_forbidden_module_names):
+            print('%-32s imported %s' % (module_name, forbidden_module_name))
+
+        if not ok:
+            over_budget = True
+
+    sys.exit(1 if over_budget else 0)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3.9
+# -*- coding: utf-8 -*-
+"""Compare the cost of redacting crawl args from a verbose chromedriver log
+using one ```str.replace()``` per pattern (what Cloudfeaster used to do)
+vs the single pass ```cloudfeaster.privacy.Redactor```.
+"""
+
+import optparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+# benchmarks are run from the root of the repo - make sure this repo's
+# cloudfeaster is imported even if cloudfeaster isn't installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cloudfeaster import privacy  # noqa: E402
+
+
+def _chromedriver_log_line(i, crawl_args):
+    """Generate a line which looks like a line from a verbose chromedriver log."""
+    timestamp = '[%.3f][INFO]:' % (1607059362.695 + i / 1000.0)
+    session = uuid.uuid4().hex
+    choice = random.random()
+    if choice < 0.01:
+        crawl_arg = random.choice(crawl_args)
+        return '%s [%s] COMMAND ElementSendKeys {"id": "%s", "value": [ %s ]}' % (
+            timestamp,
+            session,
+            uuid.uuid4().hex,
+            ', '.join('"%s"' % c for c in crawl_arg))
+    if choice < 0.02:
+        return '%s [%s] COMMAND Navigate {"url": "https://www.example.com/search?q=%s"}' % (
+            timestamp,
+            session,
+            random.choice(crawl_args))
+    if choice < 0.5:
+        return '%s [%s] COMMAND FindElement {"using": "xpath", "value": "//div[@id=\'%s\']/a"}' % (
+            timestamp,
+            session,
+            uuid.uuid4().hex)
+    return '%s [%s] RESPONSE FindElement {"element-6066-11e4-a52e-4f735466cecf": "%s"}' % (
+        timestamp,
+        session,
+        uuid.uuid4().hex)
+
+
+def _chromedriver_log(filename, size_in_bytes, crawl_args):
+    with open(filename, 'w') as fp:
+        i = 0
+        while fp.tell() < size_in_bytes:
+            fp.write(_chromedriver_log_line(i, crawl_args))
+            fp.write('\n')
+            i += 1
+    return i
+
+
+def _patterns_and_replacements(crawl_args):
+    patterns_and_replacements = []
+    for crawl_arg in crawl_args:
+        patterns_and_replacements.append((crawl_arg, privacy.hash_crawl_arg(crawl_arg)))
+        pattern = '"' + '", "'.join(crawl_arg) + '"'
+        replacement = '"' + '", "'.join(privacy.hash_crawl_arg(crawl_arg)) + '"'
+        patterns_and_replacements.append((pattern, replacement))
+    return patterns_and_replacements
+
+
+def _redact_with_str_replace(text, patterns_and_replacements):
+    for (pattern, replacement) in patterns_and_replacements:
+        text = text.replace(pattern, replacement)
+    return text
+
+
+def _time(label, iterations, function):
+    start = time.monotonic()
+    for _ in range(iterations):
+        function()
+    mean_in_ms = 1000.0 * (time.monotonic() - start) / iterations
+    print('%-48s %5d iterations  mean %9.3f ms' % (label, iterations, mean_in_ms))
+
+
+class CommandLineParser(optparse.OptionParser):
+
+    def __init__(self):
+        optparse.OptionParser.__init__(
+            self,
+            'usage: %prog [options]',
+            description='benchmark crawl arg redaction')
+
+        default = 32
+        self.add_option(
+            '--size',
+            action='store',
+            dest='size_in_mb',
+            default=default,
+            type='int',
+            help='MB in chromedriver log - default = %d' % default)
+
+        default = 4
+        self.add_option(
+            '--crawl-args',
+            action='store',
+            dest='number_crawl_args',
+            default=default,
+            type='int',
+            help='number of crawl args - default = %d' % default)
+
+        default = 3
+        self.add_option(
+            '--iterations',
+            action='store',
+            dest='iterations',
+            default=default,
+            type='int',
+            help='iterations - default = %d' % default)
+
+
+if __name__ == '__main__':
+    clp = CommandLineParser()
+    (clo, cla) = clp.parse_args()
+
+    crawl_args = ['crawl-arg-%d-%s' % (i, uuid.uuid4().hex[:8]) for i in range(clo.number_crawl_args)]
+    redactor = privacy.Redactor(crawl_args)
+    patterns_and_replacements = _patterns_and_replacements(crawl_args)
+
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'chromedriver-log.txt')
+        number_lines = _chromedriver_log(filename, clo.size_in_mb * 1024 * 1024, crawl_args)
+        print('chromedriver log %d MB, %d lines, %d crawl args' % (clo.size_in_mb, number_lines, len(crawl_args)))
+
+        with open(filename, 'r') as fp:
+            text = fp.read()
+        lines = text.splitlines()
+
+        assert _redact_with_str_replace(text, patterns_and_replacements) == redactor.redact(text)
+
+        _time(
+            'str.replace() per pattern per line',
+            clo.iterations,
+            lambda: [_redact_with_str_replace(line, patterns_and_replacements) for line in lines])
+        _time(
+            'Redactor.redact() per line',
+            clo.iterations,
+            lambda: [redactor.redact(line) for line in lines])
+        _time(
+            'str.replace() per pattern whole file in memory',
+            clo.iterations,
+            lambda: _redact_with_str_replace(text, patterns_and_replacements))
+        _time(
+            'Redactor.redact_file()',
+            clo.iterations,
+            lambda: redactor.redact_file(shutil.copyfile(filename, os.path.join(directory, 'copy.txt'))))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    sys.exit(0)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3.9
+# -*- coding: utf-8 -*-
+"""Benchmark a spider offline by replaying a fixture archive of the spider's
+network traffic (see ```cloudfeaster.netfixtures```) so crawl timings aren't
+swamped by the noise of crawling a live site. Each engine is crawled against
+identical inputs so engines, spider code and framework overhead can be compared.
+"""
+
+import importlib
+import optparse
+import os
+import statistics
+import sys
+
+# benchmarks are run from the root of the repo - make sure this repo's
+# cloudfeaster is imported even if cloudfeaster isn't installed
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from cloudfeaster import netfixtures  # noqa: E402
+from cloudfeaster import spider  # noqa: E402
+
+
+def _spider_class(full_spider_class_name, engine):
+    """Import the spider's class and, if ```engine``` is supplied, return
+    a subclass of the spider which overrides the spider's engine.
+    """
+    (spider_module_name, _, spider_class_name) = full_spider_class_name.rpartition('.')
+    spider_class = getattr(importlib.import_module(spider_module_name), spider_class_name)
+    if engine is None:
+        return spider_class
+
+    def get_metadata(cls):
+        metadata = spider_class.get_metadata()
+        metadata['engine'] = engine
+        return metadata
+
+    return type(spider_class_name, (spider_class,), {'get_metadata': classmethod(get_metadata)})
+
+
+def _crawl(spider_class, network_fixtures, crawl_args):
+    crawler = spider.SpiderCrawler(spider_class, network_fixtures=network_fixtures)
+    crawl_result = crawler.crawl(*crawl_args)
+    if crawl_result.status_code != spider.CrawlResponse.SC_OK:
+        print('crawl failed - %s' % crawl_result['_metadata']['status'])
+        sys.exit(1)
+    return crawl_result['_metadata']
+
+
+def _summarize(label, iterations, metadatas):
+    durations = [metadata['crawlTime']['durationInMs'] for metadata in metadatas]
+    misses = sum(metadata['networkFixtures']['misses'] for metadata in metadatas)
+    print('%-36s %5d iterations  mean %9.1f ms  median %9.1f ms  misses %d' % (
+        label,
+        iterations,
+        statistics.mean(durations),
+        statistics.median(durations),
+        misses))
+
+    phases = sorted(set(phase for metadata in metadatas for phase in metadata['crawlTime']['phases']))
+    for phase in phases:
+        phase_durations = [metadata['crawlTime']['phases'].get(phase, 0) for metadata in metadatas]
+        print('    %-32s mean %9.1f ms' % (phase, statistics.mean(phase_durations)))
+
+
+class CommandLineParser(optparse.OptionParser):
+
+    def __init__(self):
+        optparse.OptionParser.__init__(
+            self,
+            'usage: %prog [options] <spider> <fixture archive> [<crawl arg> ...]',
+            description='benchmark a spider by replaying a fixture archive')
+
+        self.add_option(
+            '--record',
+            action='store_true',
+            dest='record',
+            default=False,
+            help='record the fixture archive, with the first engine, before replaying it')
+
+        default = 10
+        self.add_option(
+            '--iterations',
+            action='store',
+            dest='iterations',
+            default=default,
+            type='int',
+            help='iterations - default = %d' % default)
+
+        self.add_option(
+            '--engine',
+            action='append',
+            dest='engines',
+            default=None,
+            choices=['chrome', 'http'],
+            help="replay with this engine - repeat to compare engines - default = spider's engine")
+
+    def parse_args(self, *args, **kwargs):
+        (clo, cla) = optparse.OptionParser.parse_args(self, *args, **kwargs)
+        if len(cla) < 2:
+            self.error('spider and fixture archive are required')
+        return (clo, cla)
+
+
+if __name__ == '__main__':
+    clp = CommandLineParser()
+    (clo, cla) = clp.parse_args()
+
+    (full_spider_class_name, filename) = cla[:2]
+    crawl_args = cla[2:]
+
+    engines = clo.engines or [None]
+
+    if clo.record:
+        # recorded with the first engine
+        network_fixtures = netfixtures.NetworkFixtures(filename, netfixtures.RECORD)
+        metadata = _crawl(_spider_class(full_spider_class_name, engines[0]), network_fixtures, crawl_args)
+        print('recorded %d requests to %s' % (metadata['networkFixtures']['requests'], filename))
+
+    network_fixtures = netfixtures.NetworkFixtures(filename, netfixtures.REPLAY)
+    for engine in engines:
+        spider_class = _spider_class(full_spider_class_name, engine)
+
+        # the first crawl warms up imports, the proxy's certificate, etc
+        _crawl(spider_class, network_fixtures, crawl_args)
+
+        metadatas = [_crawl(spider_class, network_fixtures, crawl_args) for _ in range(clo.iterations)]
+        _summarize('replay (engine %s)' % (engine or 'default'), clo.iterations, metadatas)
+
+    sys.exit(0)